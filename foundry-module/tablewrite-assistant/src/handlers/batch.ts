@@ -0,0 +1,229 @@
+/**
+ * Handle batched document operations from backend.
+ *
+ * Each batch is one WebSocket round trip and, where Foundry allows it, one
+ * createDocuments/deleteDocuments call. Results are returned per item, in
+ * input order, so one bad entry does not fail the rest.
+ *
+ * Message format for actors_batch_create: {actors: [{actor: {...}, spell_uuids: [...]}, ...]}
+ * Message format for documents_batch_delete: {uuids: string[]}
+ * Message format for documents_batch_fetch: {uuids: string[]}
+ */
+
+import type { CreateResult, GetResult, DeleteResult } from './index.js';
+
+export interface BatchActorCreateItem extends CreateResult {
+  spells_added?: number;
+}
+
+export interface BatchCreateResult {
+  success: boolean;
+  results?: BatchActorCreateItem[];
+  created?: number;
+  error?: string;
+}
+
+export interface BatchDeleteResult {
+  success: boolean;
+  results?: DeleteResult[];
+  deleted?: number;
+  error?: string;
+}
+
+export interface BatchFetchResult {
+  success: boolean;
+  results?: (GetResult & { uuid: string })[];
+  error?: string;
+}
+
+export interface ActorBatchEntry {
+  actor?: Record<string, unknown>;
+  spell_uuids?: string[];
+}
+
+/**
+ * Create several actors with one Actor.createDocuments call, then attach their spells.
+ *
+ * If the bulk call is rejected (e.g. one actor fails validation), actors are
+ * created one by one so the valid ones still succeed.
+ */
+export async function handleActorsBatchCreate(data: { actors?: ActorBatchEntry[] }): Promise<BatchCreateResult> {
+  const entries = data.actors ?? [];
+  if (entries.length === 0) {
+    return { success: false, error: 'No actors in batch' };
+  }
+
+  const results: BatchActorCreateItem[] = entries.map(() => ({ success: false }));
+  const valid: number[] = [];
+  entries.forEach((entry, index) => {
+    if (entry?.actor) {
+      valid.push(index);
+    } else {
+      results[index].error = 'No actor data in entry';
+    }
+  });
+
+  let created: (FoundryDocument | null)[] = [];
+  try {
+    created = await Actor.createDocuments(valid.map((index) => entries[index].actor as Record<string, unknown>));
+  } catch (error) {
+    console.warn('[Tablewrite] Batch actor create rejected, creating individually:', error);
+    created = [];
+    for (const index of valid) {
+      try {
+        created.push(await Actor.create(entries[index].actor as Record<string, unknown>) as FoundryDocument | null);
+      } catch (e) {
+        results[index].error = String(e);
+        created.push(null);
+      }
+    }
+  }
+
+  // Compendium spells are fetched once per batch, not once per actor
+  const spellCache = new Map<string, Record<string, unknown> | null>();
+  const loadSpell = async (uuid: string): Promise<Record<string, unknown> | null> => {
+    if (!spellCache.has(uuid)) {
+      try {
+        const item = await fromUuid(uuid);
+        const itemData = item ? item.toObject() : null;
+        if (itemData) {
+          delete itemData._id;
+        }
+        spellCache.set(uuid, itemData);
+      } catch {
+        spellCache.set(uuid, null);
+      }
+    }
+    return spellCache.get(uuid) ?? null;
+  };
+
+  for (let i = 0; i < valid.length; i++) {
+    const index = valid[i];
+    const actor = created[i];
+    if (!actor) {
+      results[index].error = results[index].error ?? 'Actor creation returned null';
+      continue;
+    }
+
+    const result: BatchActorCreateItem = {
+      success: true,
+      id: actor.id,
+      uuid: `Actor.${actor.id}`,
+      name: actor.name ?? undefined
+    };
+
+    const spellUuids = entries[index].spell_uuids ?? [];
+    if (spellUuids.length > 0) {
+      const spells = (await Promise.all(spellUuids.map(loadSpell))).filter(
+        (spell): spell is Record<string, unknown> => spell !== null
+      );
+      if (spells.length > 0) {
+        try {
+          const embedded = await actor.createEmbeddedDocuments('Item', spells);
+          result.spells_added = embedded?.length ?? 0;
+        } catch (e) {
+          console.warn('[Tablewrite] Failed to add spells to', actor.name, e);
+        }
+      }
+    }
+    results[index] = result;
+  }
+
+  const createdCount = results.filter((r) => r.success).length;
+  console.log(`[Tablewrite] Batch created ${createdCount}/${entries.length} actors`);
+  ui.notifications?.info(`Created ${createdCount} actors`);
+
+  return { success: true, results, created: createdCount };
+}
+
+/**
+ * Delete documents by UUID, with one deleteDocuments call per world collection.
+ *
+ * UUIDs that are not plain world documents (compendium or embedded) are
+ * deleted individually.
+ */
+export async function handleDocumentsBatchDelete(data: { uuids?: string[] }): Promise<BatchDeleteResult> {
+  const uuids = data.uuids ?? [];
+  if (uuids.length === 0) {
+    return { success: false, error: 'No uuids in batch' };
+  }
+
+  const results: DeleteResult[] = uuids.map((uuid) => ({ success: false, uuid }));
+  const byCollection = new Map<WorldCollection, { index: number; id: string; name?: string }[]>();
+  const individual: number[] = [];
+
+  uuids.forEach((uuid, index) => {
+    const parts = uuid.split('.');
+    const collection = parts.length === 2 ? game.collections?.get(parts[0]) : undefined;
+    if (!collection) {
+      individual.push(index);
+      return;
+    }
+    const doc = collection.get(parts[1]);
+    if (!doc) {
+      results[index].error = `Document not found: ${uuid}`;
+      return;
+    }
+    const group = byCollection.get(collection) ?? [];
+    group.push({ index, id: parts[1], name: doc.name });
+    byCollection.set(collection, group);
+  });
+
+  for (const [collection, docs] of byCollection) {
+    try {
+      await collection.documentClass.deleteDocuments(docs.map((doc) => doc.id));
+      for (const doc of docs) {
+        results[doc.index] = { success: true, uuid: uuids[doc.index], name: doc.name };
+      }
+    } catch (error) {
+      for (const doc of docs) {
+        results[doc.index].error = String(error);
+      }
+    }
+  }
+
+  for (const index of individual) {
+    try {
+      const doc = await fromUuid(uuids[index]);
+      if (!doc) {
+        results[index].error = `Document not found: ${uuids[index]}`;
+        continue;
+      }
+      const name = doc.name;
+      await doc.delete();
+      results[index] = { success: true, uuid: uuids[index], name };
+    } catch (error) {
+      results[index].error = String(error);
+    }
+  }
+
+  const deletedCount = results.filter((r) => r.success).length;
+  console.log(`[Tablewrite] Batch deleted ${deletedCount}/${uuids.length} documents`);
+  ui.notifications?.info(`Deleted ${deletedCount} documents`);
+
+  return { success: true, results, deleted: deletedCount };
+}
+
+/**
+ * Fetch several documents by UUID in one round trip.
+ */
+export async function handleDocumentsBatchFetch(data: { uuids?: string[] }): Promise<BatchFetchResult> {
+  const uuids = data.uuids ?? [];
+  if (uuids.length === 0) {
+    return { success: false, error: 'No uuids in batch' };
+  }
+
+  const results = await Promise.all(uuids.map(async (uuid) => {
+    try {
+      const doc = await fromUuid(uuid);
+      if (!doc) {
+        return { uuid, success: false, error: `Document not found: ${uuid}` };
+      }
+      return { uuid, success: true, entity: doc.toObject() as Record<string, unknown> };
+    } catch (error) {
+      return { uuid, success: false, error: String(error) };
+    }
+  }));
+
+  return { success: true, results };
+}
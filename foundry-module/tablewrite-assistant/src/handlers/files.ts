@@ -68,55 +68,187 @@ export async function handleFileUpload(data: {
     for (let i = 0; i < binaryString.length; i++) {
       bytes[i] = binaryString.charCodeAt(i);
     }
-    const blob = new Blob([bytes]);
-    const file = new File([blob], filename);
-
-    console.log('[Tablewrite] Created file blob, size:', blob.size, 'bytes');
-
-    // Construct target path: worlds/<current-world>/<destination>/
-    const worldPath = `worlds/${game.world.id}/${destination}`;
-    console.log('[Tablewrite] Target path:', worldPath);
-
-    // Ensure each directory level exists (createDirectory is not in types but exists in Foundry)
-    const pathParts = destination.split('/');
-    let currentPath = `worlds/${game.world.id}`;
-    for (const part of pathParts) {
-      currentPath = `${currentPath}/${part}`;
-      try {
-        await (FilePicker as any).createDirectory("data", currentPath);
-        console.log('[Tablewrite] Created directory:', currentPath);
-      } catch (dirError: any) {
-        // Directory may already exist, which is fine - EEXIST error
-        const errStr = String(dirError);
-        if (!errStr.includes('EEXIST') && !errStr.includes('already exists')) {
-          console.log('[Tablewrite] Directory creation note for', currentPath, ':', errStr);
-        }
+
+    return await uploadToWorld(new File([new Blob([bytes])], filename), destination);
+  } catch (error) {
+    console.error('[Tablewrite] Failed to upload file:', error);
+    return {
+      success: false,
+      error: String(error)
+    };
+  }
+}
+
+/**
+ * Save a file under worlds/<current-world>/<destination>/ via FilePicker.upload().
+ */
+async function uploadToWorld(file: File, destination: string): Promise<FileUploadResult> {
+  console.log('[Tablewrite] Created file blob, size:', file.size, 'bytes');
+
+  // Construct target path: worlds/<current-world>/<destination>/
+  const worldPath = `worlds/${game.world.id}/${destination}`;
+  console.log('[Tablewrite] Target path:', worldPath);
+
+  // Ensure each directory level exists (createDirectory is not in types but exists in Foundry)
+  const pathParts = destination.split('/');
+  let currentPath = `worlds/${game.world.id}`;
+  for (const part of pathParts) {
+    currentPath = `${currentPath}/${part}`;
+    try {
+      await (FilePicker as any).createDirectory("data", currentPath);
+      console.log('[Tablewrite] Created directory:', currentPath);
+    } catch (dirError: any) {
+      // Directory may already exist, which is fine - EEXIST error
+      const errStr = String(dirError);
+      if (!errStr.includes('EEXIST') && !errStr.includes('already exists')) {
+        console.log('[Tablewrite] Directory creation note for', currentPath, ':', errStr);
       }
     }
+  }
+
+  // Upload using FilePicker
+  const response = await FilePicker.upload(
+    "data",
+    worldPath,
+    file,
+    {}
+  );
+
+  console.log('[Tablewrite] FilePicker.upload response:', JSON.stringify(response));
+
+  // Handle various response formats
+  const uploadedPath = response?.path || (response as any)?.result?.path;
+
+  if (!uploadedPath) {
+    throw new Error(`Upload failed: no path in response. Full response: ${JSON.stringify(response)}`);
+  }
+
+  console.log('[Tablewrite] Uploaded file:', uploadedPath);
+
+  return {
+    success: true,
+    path: uploadedPath
+  };
+}
+
+/*
+ * Chunked uploads.
+ *
+ * The backend sends upload_begin, then each chunk as a binary frame with
+ * {upload_id, seq} in its header, then upload_finish. Each chunk is acked.
+ * Partial uploads are kept here (module memory, so they survive a WebSocket
+ * reconnect): a repeated upload_begin for the same upload_id answers with the
+ * first missing chunk so the backend can resume from there.
+ */
+
+// Partial uploads older than this are dropped on the next upload_begin
+const STALE_UPLOAD_MS = 10 * 60 * 1000;
+
+interface PendingUpload {
+  filename: string;
+  destination: string;
+  size: number;
+  chunks: (Uint8Array | undefined)[];
+  updatedAt: number;
+}
 
-    // Upload using FilePicker
-    const response = await FilePicker.upload(
-      "data",
-      worldPath,
-      file,
-      {}
-    );
+const pendingUploads = new Map<string, PendingUpload>();
 
-    console.log('[Tablewrite] FilePicker.upload response:', JSON.stringify(response));
+export interface UploadReadyResult {
+  success: boolean;
+  upload_id?: string;
+  next_seq?: number;
+  error?: string;
+}
+
+export interface UploadChunkAck {
+  success: boolean;
+  upload_id?: string;
+  seq?: number;
+  error?: string;
+}
 
-    // Handle various response formats
-    const uploadedPath = response?.path || (response as any)?.result?.path;
+function firstMissingChunk(upload: PendingUpload): number {
+  const index = upload.chunks.findIndex((chunk) => chunk === undefined);
+  return index === -1 ? upload.chunks.length : index;
+}
 
-    if (!uploadedPath) {
-      throw new Error(`Upload failed: no path in response. Full response: ${JSON.stringify(response)}`);
+/**
+ * Start (or resume) a chunked upload.
+ */
+export function handleUploadBegin(data: {
+  upload_id: string;
+  filename: string;
+  destination: string;
+  size: number;
+  total_chunks: number;
+}): UploadReadyResult {
+  const now = Date.now();
+  for (const [id, upload] of pendingUploads) {
+    if (now - upload.updatedAt > STALE_UPLOAD_MS) {
+      pendingUploads.delete(id);
     }
+  }
 
-    console.log('[Tablewrite] Uploaded file:', uploadedPath);
+  const { upload_id, filename, destination, size, total_chunks } = data;
+  if (!upload_id || !filename || !destination || !(total_chunks > 0)) {
+    return { success: false, error: 'Missing upload_id, filename, destination or total_chunks' };
+  }
 
-    return {
-      success: true,
-      path: uploadedPath
-    };
+  let upload = pendingUploads.get(upload_id);
+  if (!upload || upload.size !== size || upload.chunks.length !== total_chunks) {
+    upload = { filename, destination, size, chunks: new Array(total_chunks).fill(undefined), updatedAt: now };
+    pendingUploads.set(upload_id, upload);
+  }
+  upload.updatedAt = now;
+
+  const next_seq = firstMissingChunk(upload);
+  console.log('[Tablewrite] Upload', upload_id, filename, next_seq ? `resuming at chunk ${next_seq}` : 'starting',
+    `of ${total_chunks}`);
+  return { success: true, upload_id, next_seq };
+}
+
+/**
+ * Store one chunk of a chunked upload.
+ */
+export function handleUploadChunk(header: { upload_id?: string; seq?: number }, payload: Uint8Array): UploadChunkAck {
+  const { upload_id, seq } = header;
+  const upload = upload_id ? pendingUploads.get(upload_id) : undefined;
+  if (!upload || seq === undefined) {
+    return { success: false, upload_id, seq, error: `Unknown upload: ${upload_id}` };
+  }
+  if (seq < 0 || seq >= upload.chunks.length) {
+    return { success: false, upload_id, seq, error: `Chunk ${seq} out of range` };
+  }
+  upload.chunks[seq] = payload;
+  upload.updatedAt = Date.now();
+  return { success: true, upload_id, seq };
+}
+
+/**
+ * Assemble a completed chunked upload and save it to the world folder.
+ */
+export async function handleUploadFinish(data: { upload_id: string }): Promise<FileUploadResult> {
+  const upload = pendingUploads.get(data.upload_id);
+  if (!upload) {
+    return { success: false, error: `Unknown upload: ${data.upload_id}` };
+  }
+
+  const missing = firstMissingChunk(upload);
+  if (missing < upload.chunks.length) {
+    return { success: false, error: `Upload incomplete: missing chunk ${missing}` };
+  }
+
+  const blob = new Blob(upload.chunks as Uint8Array[]);
+  if (blob.size !== upload.size) {
+    pendingUploads.delete(data.upload_id);
+    return { success: false, error: `Upload size mismatch: got ${blob.size} bytes, expected ${upload.size}` };
+  }
+
+  try {
+    const result = await uploadToWorld(new File([blob], upload.filename), upload.destination);
+    pendingUploads.delete(data.upload_id);
+    return result;
   } catch (error) {
     console.error('[Tablewrite] Failed to upload file:', error);
     return {
@@ -13,16 +13,20 @@ import { handleActorCreate, handleGetActor, handleUpdateActor, handleDeleteActor
 import { handleGetJournal, handleJournalCreate, handleJournalDelete, handleListJournals, handleUpdateJournal, JournalListResult, UpdateJournalResult } from './journal.js';
 import { handleSceneCreate, handleGetScene, handleDeleteScene, handleListScenes } from './scene.js';
 import { handleSearchItems, handleGetItem, handleListCompendiumItems } from './items.js';
-import { handleListFiles, handleFileUpload } from './files.js';
+import { handleListFiles, handleFileUpload, handleUploadBegin, handleUploadChunk, handleUploadFinish, UploadReadyResult, UploadChunkAck } from './files.js';
+import { handleActorsBatchCreate, handleDocumentsBatchDelete, handleDocumentsBatchFetch, ActorBatchEntry, BatchCreateResult, BatchDeleteResult, BatchFetchResult } from './batch.js';
 import { handleGetOrCreateFolder, handleListFolders, handleDeleteFolder, FolderResult, ListFoldersResult, DeleteFolderResult } from './folder.js';
 
-export type MessageType = 'actor' | 'journal' | 'get_journal' | 'delete_journal' | 'list_journals' | 'update_journal' | 'scene' | 'get_scene' | 'delete_scene' | 'list_scenes' | 'get_actor' | 'update_actor' | 'delete_actor' | 'list_actors' | 'give_items' | 'add_custom_items' | 'remove_actor_items' | 'update_actor_item' | 'search_items' | 'get_item' | 'list_compendium_items' | 'list_files' | 'upload_file' | 'get_or_create_folder' | 'list_folders' | 'delete_folder' | 'module_progress' | 'connected' | 'pong';
+export type MessageType = 'actor' | 'journal' | 'get_journal' | 'delete_journal' | 'list_journals' | 'update_journal' | 'scene' | 'get_scene' | 'delete_scene' | 'list_scenes' | 'get_actor' | 'update_actor' | 'delete_actor' | 'list_actors' | 'give_items' | 'add_custom_items' | 'remove_actor_items' | 'update_actor_item' | 'search_items' | 'get_item' | 'list_compendium_items' | 'list_files' | 'upload_file' | 'upload_begin' | 'upload_chunk' | 'upload_finish' | 'get_or_create_folder' | 'list_folders' | 'delete_folder' | 'actors_batch_create' | 'documents_batch_delete' | 'documents_batch_fetch' | 'module_progress' | 'connected' | 'ping' | 'pong';
 
 export interface TablewriteMessage {
   type: MessageType;
   data?: Record<string, unknown>;
   client_id?: string;
   request_id?: string;
+  // Sent with 'connected': encodings the backend accepts and its compression threshold
+  encodings?: string[];
+  compression_threshold?: number;
 }
 
 export interface CreateResult {
@@ -121,7 +125,7 @@ export interface FileUploadResult {
 export interface MessageResult {
   responseType: string;
   request_id?: string;
-  data?: CreateResult | GetResult | DeleteResult | ListResult | SceneListResult | GiveResult | RemoveItemsResult | SearchResult | FileListResult | FileUploadResult | FolderResult | ListFoldersResult | DeleteFolderResult | JournalListResult | UpdateJournalResult;
+  data?: CreateResult | GetResult | DeleteResult | ListResult | SceneListResult | GiveResult | RemoveItemsResult | SearchResult | FileListResult | FileUploadResult | FolderResult | ListFoldersResult | DeleteFolderResult | JournalListResult | UpdateJournalResult | BatchCreateResult | BatchDeleteResult | BatchFetchResult | UploadReadyResult | UploadChunkAck;
   error?: string;
 }
 
@@ -497,6 +501,42 @@ export async function handleMessage(message: TablewriteMessage): Promise<Message
         request_id: message.request_id,
         error: 'Missing data for upload_file'
       };
+    case 'upload_begin':
+      if (message.data) {
+        const result = handleUploadBegin(message.data as {
+          upload_id: string;
+          filename: string;
+          destination: string;
+          size: number;
+          total_chunks: number;
+        });
+        return {
+          responseType: result.success ? 'upload_ready' : 'file_error',
+          request_id: message.request_id,
+          data: result,
+          error: result.error
+        };
+      }
+      return {
+        responseType: 'file_error',
+        request_id: message.request_id,
+        error: 'Missing data for upload_begin'
+      };
+    case 'upload_finish':
+      if (message.data?.upload_id) {
+        const result = await handleUploadFinish(message.data as { upload_id: string });
+        return {
+          responseType: result.success ? 'file_uploaded' : 'file_error',
+          request_id: message.request_id,
+          data: result,
+          error: result.error
+        };
+      }
+      return {
+        responseType: 'file_error',
+        request_id: message.request_id,
+        error: 'Missing upload_id for upload_finish'
+      };
     case 'get_or_create_folder':
       if (message.data) {
         const result = await handleGetOrCreateFolder(message.data as {
@@ -543,6 +583,51 @@ export async function handleMessage(message: TablewriteMessage): Promise<Message
         request_id: message.request_id,
         error: 'Missing folder_id for delete_folder'
       };
+    case 'actors_batch_create':
+      if (message.data?.actors) {
+        const result = await handleActorsBatchCreate(message.data as { actors: ActorBatchEntry[] });
+        return {
+          responseType: result.success ? 'actors_batch_created' : 'batch_error',
+          request_id: message.request_id,
+          data: result,
+          error: result.error
+        };
+      }
+      return {
+        responseType: 'batch_error',
+        request_id: message.request_id,
+        error: 'Missing actors for actors_batch_create'
+      };
+    case 'documents_batch_delete':
+      if (message.data?.uuids) {
+        const result = await handleDocumentsBatchDelete(message.data as { uuids: string[] });
+        return {
+          responseType: result.success ? 'documents_batch_deleted' : 'batch_error',
+          request_id: message.request_id,
+          data: result,
+          error: result.error
+        };
+      }
+      return {
+        responseType: 'batch_error',
+        request_id: message.request_id,
+        error: 'Missing uuids for documents_batch_delete'
+      };
+    case 'documents_batch_fetch':
+      if (message.data?.uuids) {
+        const result = await handleDocumentsBatchFetch(message.data as { uuids: string[] });
+        return {
+          responseType: result.success ? 'documents_batch_fetched' : 'batch_error',
+          request_id: message.request_id,
+          data: result,
+          error: result.error
+        };
+      }
+      return {
+        responseType: 'batch_error',
+        request_id: message.request_id,
+        error: 'Missing uuids for documents_batch_fetch'
+      };
     case 'module_progress':
       if (message.data) {
         // Emit a Foundry hook for UI components to listen to
@@ -559,6 +644,12 @@ export async function handleMessage(message: TablewriteMessage): Promise<Message
     case 'connected':
       console.log('[Tablewrite] Connected with client_id:', message.client_id);
       return null;  // No response needed
+    case 'ping':
+      // Backend heartbeat: echo the request_id so the backend can measure round-trip time
+      return {
+        responseType: 'pong',
+        request_id: message.request_id
+      };
     case 'pong':
       // Heartbeat response, no action needed
       return null;
@@ -568,3 +659,35 @@ export async function handleMessage(message: TablewriteMessage): Promise<Message
   }
   return null;
 }
+
+/**
+ * Route a binary frame from the backend.
+ *
+ * Layout: 4-byte big-endian header length, UTF-8 JSON header
+ * ({type, request_id, data}), then the raw payload.
+ */
+export async function handleBinaryMessage(buffer: ArrayBuffer): Promise<MessageResult | null> {
+  let header: TablewriteMessage;
+  let payload: Uint8Array;
+  try {
+    const headerLength = new DataView(buffer).getUint32(0);
+    header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+    payload = new Uint8Array(buffer, 4 + headerLength);
+  } catch (e) {
+    console.error('[Tablewrite] Failed to parse binary message:', e);
+    return null;
+  }
+
+  if (header.type === 'upload_chunk') {
+    const result = handleUploadChunk((header.data ?? {}) as { upload_id?: string; seq?: number }, payload);
+    return {
+      responseType: result.success ? 'upload_chunk_ack' : 'file_error',
+      request_id: header.request_id,
+      data: result,
+      error: result.error
+    };
+  }
+
+  console.warn('[Tablewrite] Unknown binary message type:', header.type);
+  return null;
+}
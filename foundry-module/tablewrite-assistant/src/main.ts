@@ -6,6 +6,7 @@
 import { registerSettings, getBackendUrl } from './settings.js';
 import { TablewriteClient } from './websocket/client.js';
 import { TablewriteTab } from './ui/TablewriteTab.js';
+import { registerWorldEventHooks } from './websocket/worldEvents.js';
 
 // Module-scoped client instance
 export let client: TablewriteClient | null = null;
@@ -27,6 +28,9 @@ Hooks.once('ready', () => {
   const backendUrl = getBackendUrl();
   client = new TablewriteClient(backendUrl);
   client.connect();
+
+  // Keep the backend's world index current
+  registerWorldEventHooks((message) => client?.sendEvent(message));
 });
 
 /**
@@ -1,12 +1,29 @@
 /**
  * WebSocket client for connecting to Tablewrite backend.
  */
-import { handleMessage, TablewriteMessage, MessageResult } from '../handlers/index.js';
+import { handleMessage, handleBinaryMessage, TablewriteMessage, MessageResult } from '../handlers/index.js';
+import {
+  DEFAULT_COMPRESSION_THRESHOLD, ENCODED_FRAME_TYPE, decodeCompressed, decodeFrame, encodeCompressed,
+  supportedEncodings
+} from './encoding.js';
+
+// Reconnect backoff after an unexpected close (doubles per attempt, capped)
+const RECONNECT_BASE_MS = 1000;
+const RECONNECT_MAX_MS = 30000;
 
 export class TablewriteClient {
   private ws: WebSocket | null = null;
   private backendUrl: string;
   private wsUrl: string;
+  private reconnectAttempts = 0;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  private closedByUser = false;
+  // Encodings the backend accepts for large messages (from its 'connected' message)
+  private backendEncodings: string[] = [];
+  private compressionThreshold = DEFAULT_COMPRESSION_THRESHOLD;
+  // Tail of in-order sends while a message is being compressed
+  private sendQueue: Promise<void> | null = null;
+  private byteCounts = { sent: 0, received: 0, jsonSent: 0, jsonReceived: 0 };
 
   constructor(backendUrl: string) {
     this.backendUrl = backendUrl;
@@ -32,28 +49,44 @@ export class TablewriteClient {
 
   /**
    * Connect to the backend.
+   *
+   * If the connection drops, it is re-established with exponential backoff
+   * until disconnect() is called. Interrupted chunked uploads resume on the
+   * new connection.
    */
   connect(): void {
     if (this.ws) {
       this.disconnect();
     }
+    this.closedByUser = false;
+    this.backendEncodings = [];
+    this.sendQueue = null;
 
-    this.ws = new WebSocket(this.wsUrl);
+    const socket = new WebSocket(this.wsUrl);
+    socket.binaryType = 'arraybuffer';
+    this.ws = socket;
 
-    this.ws.onopen = () => {
+    socket.onopen = () => {
+      this.reconnectAttempts = 0;
       ui.notifications?.info('TABLEWRITE_ASSISTANT.Connected', { localize: true });
+      this.sendWorldInfo();
     };
 
-    this.ws.onclose = () => {
+    socket.onclose = () => {
+      // Ignore sockets replaced by a newer connect()
+      if (this.ws !== socket) {
+        return;
+      }
       ui.notifications?.warn('TABLEWRITE_ASSISTANT.Disconnected', { localize: true });
       this.ws = null;
+      this.scheduleReconnect();
     };
 
-    this.ws.onerror = (error) => {
+    socket.onerror = (error) => {
       console.error('[Tablewrite] WebSocket error:', error);
     };
 
-    this.ws.onmessage = (event) => {
+    socket.onmessage = (event) => {
       this.handleMessage(event.data);
     };
   }
@@ -62,12 +95,30 @@ export class TablewriteClient {
    * Disconnect from the backend.
    */
   disconnect(): void {
+    this.closedByUser = true;
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
     if (this.ws) {
       this.ws.close();
       this.ws = null;
     }
   }
 
+  private scheduleReconnect(): void {
+    if (this.closedByUser || this.reconnectTimer) {
+      return;
+    }
+    const delay = Math.min(RECONNECT_BASE_MS * 2 ** this.reconnectAttempts, RECONNECT_MAX_MS);
+    this.reconnectAttempts++;
+    console.log(`[Tablewrite] Reconnecting in ${delay} ms`);
+    this.reconnectTimer = setTimeout(() => {
+      this.reconnectTimer = null;
+      this.connect();
+    }, delay);
+  }
+
   /**
    * Check if connected.
    */
@@ -75,15 +126,86 @@ export class TablewriteClient {
     return this.ws !== null && this.ws.readyState === WebSocket.OPEN;
   }
 
+  /**
+   * Bytes sent/received on the socket and the JSON size they carried.
+   */
+  getByteCounts(): { sent: number; received: number; jsonSent: number; jsonReceived: number } {
+    return { ...this.byteCounts };
+  }
+
   /**
    * Send a message to the backend.
+   *
+   * Messages of at least the backend's compression threshold are gzipped if
+   * the backend accepts gzip. Compression is async, so later messages queue
+   * behind it to keep their order.
    */
   private send(message: Record<string, unknown>): void {
-    if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-      this.ws.send(JSON.stringify(message));
-    } else {
+    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
       console.error('[Tablewrite] Cannot send message, WebSocket not connected');
+      return;
+    }
+    const socket = this.ws;
+    const json = JSON.stringify(message);
+    const compress = json.length >= this.compressionThreshold && this.backendEncodings.includes('gzip')
+      && supportedEncodings().includes('gzip');
+
+    if (!compress && !this.sendQueue) {
+      this.transmit(socket, json, json.length);
+      return;
+    }
+
+    const queued = (this.sendQueue ?? Promise.resolve())
+      .then(async () => this.transmit(socket, compress ? await encodeCompressed(json) : json, json.length))
+      .catch((e) => console.error('[Tablewrite] Failed to send message:', e));
+    this.sendQueue = queued;
+    queued.finally(() => {
+      if (this.sendQueue === queued) {
+        this.sendQueue = null;
+      }
+    });
+  }
+
+  private transmit(socket: WebSocket, frame: string | ArrayBuffer, jsonSize: number): void {
+    if (socket.readyState !== WebSocket.OPEN) {
+      return;
     }
+    socket.send(frame);
+    this.byteCounts.sent += typeof frame === 'string' ? frame.length : frame.byteLength;
+    this.byteCounts.jsonSent += jsonSize;
+  }
+
+  /**
+   * Send an unsolicited event (e.g. world_event) to the backend.
+   *
+   * Events raised while disconnected are dropped: the backend discards its
+   * world index on every connect, so it never relies on missed events.
+   */
+  sendEvent(message: Record<string, unknown>): void {
+    if (this.isConnected()) {
+      this.send(message);
+    }
+  }
+
+  /**
+   * Tell the backend which world and game system this client serves.
+   * The backend keys its persisted compendium/icon caches on these values.
+   * world_events announces that document changes are pushed as world_event
+   * messages, which lets the backend serve lookups from its world index.
+   * encodings lists the compressed encodings this browser can read.
+   */
+  private sendWorldInfo(): void {
+    this.send({
+      type: 'world_info',
+      data: {
+        world_id: game.world?.id,
+        system_id: game.system?.id,
+        system_version: game.system?.version,
+        foundry_version: game.version,
+        world_events: true,
+        encodings: supportedEncodings()
+      }
+    });
   }
 
   /**
@@ -100,12 +222,43 @@ export class TablewriteClient {
 
   /**
    * Handle incoming WebSocket message.
+   *
+   * Text frames are JSON messages; binary frames carry upload chunks or
+   * compressed JSON messages.
    */
-  private async handleMessage(data: string): Promise<void> {
+  private async handleMessage(data: string | ArrayBuffer): Promise<void> {
+    let text: string;
+    if (data instanceof ArrayBuffer) {
+      this.byteCounts.received += data.byteLength;
+      try {
+        const { header, payload } = decodeFrame(data);
+        if (header.type !== ENCODED_FRAME_TYPE) {
+          const result = await handleBinaryMessage(data);
+          if (result) {
+            this.sendResponse(result);
+          }
+          return;
+        }
+        text = await decodeCompressed(header, payload);
+      } catch (e) {
+        console.error('[Tablewrite] Failed to decode binary message:', e);
+        return;
+      }
+    } else {
+      this.byteCounts.received += data.length;
+      text = data;
+    }
+    this.byteCounts.jsonReceived += text.length;
+
     try {
-      const message: TablewriteMessage = JSON.parse(data);
+      const message: TablewriteMessage = JSON.parse(text);
       console.log('[Tablewrite] Received:', message.type);
 
+      if (message.type === 'connected') {
+        this.backendEncodings = message.encodings ?? [];
+        this.compressionThreshold = message.compression_threshold ?? DEFAULT_COMPRESSION_THRESHOLD;
+      }
+
       const result = await handleMessage(message);
 
       // If there's a result and a request_id, send response back
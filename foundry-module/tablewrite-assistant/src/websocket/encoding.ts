@@ -0,0 +1,68 @@
+/**
+ * Message encodings for the backend WebSocket.
+ *
+ * Large JSON messages can travel gzip-compressed as binary frames with the
+ * same layout as upload chunks: 4-byte big-endian header length, JSON header
+ * {type: 'encoded', encoding: 'gzip'}, then the gzipped JSON. Both sides
+ * announce which encodings they accept (the backend in its 'connected'
+ * message, this module in world_info) and only compress for a peer that
+ * accepts it.
+ */
+
+export const ENCODED_FRAME_TYPE = 'encoded';
+
+// Default minimum JSON size worth compressing (the backend may announce its own)
+export const DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024;
+
+/**
+ * Encodings this browser can produce and read.
+ */
+export function supportedEncodings(): string[] {
+  return typeof CompressionStream !== 'undefined' && typeof DecompressionStream !== 'undefined' ? ['gzip'] : [];
+}
+
+/**
+ * Pack a JSON header and raw bytes into one binary frame.
+ */
+export function encodeFrame(header: Record<string, unknown>, payload: Uint8Array): ArrayBuffer {
+  const headerBytes = new TextEncoder().encode(JSON.stringify(header));
+  const buffer = new ArrayBuffer(4 + headerBytes.length + payload.length);
+  new DataView(buffer).setUint32(0, headerBytes.length);
+  new Uint8Array(buffer, 4).set(headerBytes);
+  new Uint8Array(buffer, 4 + headerBytes.length).set(payload);
+  return buffer;
+}
+
+/**
+ * Split a binary frame into its JSON header and payload.
+ */
+export function decodeFrame(buffer: ArrayBuffer): { header: Record<string, unknown>; payload: Uint8Array } {
+  const headerLength = new DataView(buffer).getUint32(0);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+  return { header, payload: new Uint8Array(buffer, 4 + headerLength) };
+}
+
+async function pipe(bytes: Uint8Array, transform: CompressionStream | DecompressionStream): Promise<Uint8Array> {
+  const stream = new Blob([bytes]).stream().pipeThrough(transform);
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+/**
+ * Build a gzip-encoded frame for a JSON message.
+ */
+export async function encodeCompressed(json: string): Promise<ArrayBuffer> {
+  const compressed = await pipe(new TextEncoder().encode(json), new CompressionStream('gzip'));
+  return encodeFrame({ type: ENCODED_FRAME_TYPE, encoding: 'gzip' }, compressed);
+}
+
+/**
+ * Return the JSON text carried by an encoded frame.
+ *
+ * @throws Error if the frame uses an encoding this module cannot read
+ */
+export async function decodeCompressed(header: Record<string, unknown>, payload: Uint8Array): Promise<string> {
+  if (header.encoding !== 'gzip') {
+    throw new Error(`Unsupported encoding: ${String(header.encoding)}`);
+  }
+  return new TextDecoder().decode(await pipe(payload, new DecompressionStream('gzip')));
+}
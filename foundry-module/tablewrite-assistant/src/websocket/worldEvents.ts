@@ -0,0 +1,76 @@
+/**
+ * Push world document changes to the backend.
+ *
+ * The backend keeps an index of actor, journal, scene and folder names and
+ * folders (see app/websocket/world_index.py) so it does not have to list the
+ * whole world on every lookup. These hooks keep that index current.
+ *
+ * Message format: {type: 'world_event', data: {action, document_type, id, uuid, name, folder, folder_type}}
+ */
+
+// Foundry document types the backend indexes
+export const WORLD_EVENT_TYPES = ['Actor', 'JournalEntry', 'Scene', 'Folder'] as const;
+
+type WorldEventAction = 'create' | 'update' | 'delete';
+
+interface HookedDocument {
+  id: string;
+  uuid?: string;
+  name?: string | null;
+  type?: string;
+  folder?: { id: string } | string | null;
+  pack?: string | null;
+  parent?: unknown;
+}
+
+export interface WorldEventData {
+  action: WorldEventAction;
+  document_type: string;
+  id: string;
+  uuid: string;
+  name: string;
+  folder: string | null;
+  folder_type: string | null;
+}
+
+/**
+ * Build the event payload for a document change.
+ */
+export function buildWorldEvent(action: WorldEventAction, documentType: string, doc: HookedDocument): WorldEventData {
+  const folder = doc.folder;
+  return {
+    action,
+    document_type: documentType,
+    id: doc.id,
+    uuid: doc.uuid ?? `${documentType}.${doc.id}`,
+    name: doc.name ?? '',
+    folder: typeof folder === 'string' ? folder : folder?.id ?? null,
+    folder_type: documentType === 'Folder' ? doc.type ?? null : null
+  };
+}
+
+/**
+ * Register create/update/delete hooks for the indexed document types.
+ *
+ * Updates are only sent when the name or folder changed, since nothing else
+ * is indexed. Compendium and embedded documents are not world documents and
+ * are skipped.
+ *
+ * @param send - Called with each world_event message
+ */
+export function registerWorldEventHooks(send: (message: Record<string, unknown>) => void): void {
+  const emit = (action: WorldEventAction, documentType: string, doc: HookedDocument) => {
+    if (doc.pack || doc.parent) return;
+    send({ type: 'world_event', data: buildWorldEvent(action, documentType, doc) });
+  };
+
+  for (const documentType of WORLD_EVENT_TYPES) {
+    Hooks.on(`create${documentType}`, (doc: HookedDocument) => emit('create', documentType, doc));
+    Hooks.on(`update${documentType}`, (doc: HookedDocument, changes: Record<string, unknown>) => {
+      if (changes && ('name' in changes || 'folder' in changes)) {
+        emit('update', documentType, doc);
+      }
+    });
+    Hooks.on(`delete${documentType}`, (doc: HookedDocument) => emit('delete', documentType, doc));
+  }
+}
@@ -0,0 +1,158 @@
+// foundry-module/tablewrite-assistant/tests/handlers/batch.test.ts
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+function makeActor(id: string, name: string) {
+  return {
+    id,
+    name,
+    createEmbeddedDocuments: vi.fn(async (_type: string, data: unknown[]) => data),
+  };
+}
+
+const mockActor = {
+  create: vi.fn(),
+  createDocuments: vi.fn(),
+};
+
+// @ts-ignore
+globalThis.Actor = mockActor;
+
+// @ts-ignore
+globalThis.ui = { notifications: { info: vi.fn(), error: vi.fn() } };
+
+const mockFromUuid = vi.fn();
+// @ts-ignore
+globalThis.fromUuid = mockFromUuid;
+
+const actorDocs = new Map<string, { id: string; name: string }>();
+const deleteDocuments = vi.fn(async (ids: string[]) => ids);
+const actorCollection = {
+  get: (id: string) => actorDocs.get(id),
+  documentClass: { deleteDocuments },
+};
+
+// @ts-ignore
+globalThis.game = { collections: new Map([['Actor', actorCollection]]) };
+
+describe('handleActorsBatchCreate', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('creates all actors with one createDocuments call', async () => {
+    mockActor.createDocuments.mockResolvedValue([makeActor('a1', 'Goblin'), makeActor('a2', 'Orc')]);
+    const { handleActorsBatchCreate } = await import('../../src/handlers/batch');
+
+    const result = await handleActorsBatchCreate({
+      actors: [{ actor: { name: 'Goblin' } }, { actor: { name: 'Orc' } }]
+    });
+
+    expect(mockActor.createDocuments).toHaveBeenCalledTimes(1);
+    expect(mockActor.createDocuments).toHaveBeenCalledWith([{ name: 'Goblin' }, { name: 'Orc' }]);
+    expect(mockActor.create).not.toHaveBeenCalled();
+    expect(result.success).toBe(true);
+    expect(result.created).toBe(2);
+    expect(result.results?.map((r) => r.uuid)).toEqual(['Actor.a1', 'Actor.a2']);
+  });
+
+  it('fetches each shared spell once for the whole batch', async () => {
+    const goblin = makeActor('a1', 'Goblin');
+    const shaman = makeActor('a2', 'Shaman');
+    mockActor.createDocuments.mockResolvedValue([goblin, shaman]);
+    mockFromUuid.mockImplementation(async (uuid: string) => ({
+      toObject: () => ({ _id: 'x', name: uuid })
+    }));
+    const { handleActorsBatchCreate } = await import('../../src/handlers/batch');
+
+    const result = await handleActorsBatchCreate({
+      actors: [
+        { actor: { name: 'Goblin' }, spell_uuids: ['Compendium.spells.fire'] },
+        { actor: { name: 'Shaman' }, spell_uuids: ['Compendium.spells.fire', 'Compendium.spells.ice'] }
+      ]
+    });
+
+    expect(mockFromUuid).toHaveBeenCalledTimes(2);
+    expect(shaman.createEmbeddedDocuments).toHaveBeenCalledWith('Item', [
+      { name: 'Compendium.spells.fire' },
+      { name: 'Compendium.spells.ice' }
+    ]);
+    expect(result.results?.[1].spells_added).toBe(2);
+  });
+
+  it('falls back to per-actor create and reports each failure', async () => {
+    mockActor.createDocuments.mockRejectedValue(new Error('validation failed'));
+    mockActor.create
+      .mockResolvedValueOnce(makeActor('a1', 'Goblin'))
+      .mockRejectedValueOnce(new Error('bad actor'));
+    const { handleActorsBatchCreate } = await import('../../src/handlers/batch');
+
+    const result = await handleActorsBatchCreate({
+      actors: [{ actor: { name: 'Goblin' } }, { actor: { name: 'Broken' } }, {}]
+    });
+
+    expect(result.success).toBe(true);
+    expect(result.created).toBe(1);
+    expect(result.results?.[0].success).toBe(true);
+    expect(result.results?.[1].error).toContain('bad actor');
+    expect(result.results?.[2].error).toBe('No actor data in entry');
+  });
+
+  it('rejects an empty batch', async () => {
+    const { handleActorsBatchCreate } = await import('../../src/handlers/batch');
+
+    const result = await handleActorsBatchCreate({ actors: [] });
+
+    expect(result.success).toBe(false);
+  });
+});
+
+describe('handleDocumentsBatchDelete', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    actorDocs.clear();
+  });
+
+  it('deletes world documents with one deleteDocuments call per type', async () => {
+    actorDocs.set('a1', { id: 'a1', name: 'Goblin' });
+    actorDocs.set('a2', { id: 'a2', name: 'Orc' });
+    const { handleDocumentsBatchDelete } = await import('../../src/handlers/batch');
+
+    const result = await handleDocumentsBatchDelete({ uuids: ['Actor.a1', 'Actor.missing', 'Actor.a2'] });
+
+    expect(deleteDocuments).toHaveBeenCalledTimes(1);
+    expect(deleteDocuments).toHaveBeenCalledWith(['a1', 'a2']);
+    expect(result.deleted).toBe(2);
+    expect(result.results?.map((r) => r.success)).toEqual([true, false, true]);
+    expect(result.results?.[1].error).toContain('Document not found');
+  });
+
+  it('deletes other UUIDs individually', async () => {
+    const doc = { name: 'Fire Bolt', delete: vi.fn() };
+    mockFromUuid.mockResolvedValue(doc);
+    const { handleDocumentsBatchDelete } = await import('../../src/handlers/batch');
+
+    const result = await handleDocumentsBatchDelete({ uuids: ['Actor.a1.Item.i1'] });
+
+    expect(doc.delete).toHaveBeenCalled();
+    expect(result.results?.[0]).toEqual({ success: true, uuid: 'Actor.a1.Item.i1', name: 'Fire Bolt' });
+  });
+});
+
+describe('handleDocumentsBatchFetch', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('returns each document or a per-item error', async () => {
+    mockFromUuid.mockImplementation(async (uuid: string) =>
+      uuid === 'Actor.a1' ? { toObject: () => ({ name: 'Goblin' }) } : null
+    );
+    const { handleDocumentsBatchFetch } = await import('../../src/handlers/batch');
+
+    const result = await handleDocumentsBatchFetch({ uuids: ['Actor.a1', 'Actor.gone'] });
+
+    expect(result.success).toBe(true);
+    expect(result.results?.[0]).toEqual({ uuid: 'Actor.a1', success: true, entity: { name: 'Goblin' } });
+    expect(result.results?.[1].success).toBe(false);
+  });
+});
@@ -0,0 +1,90 @@
+// foundry-module/tablewrite-assistant/tests/handlers/files.test.ts
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const mockFilePicker = {
+  upload: vi.fn(),
+  createDirectory: vi.fn(),
+};
+
+// @ts-ignore
+globalThis.FilePicker = mockFilePicker;
+
+// @ts-ignore
+globalThis.game = { world: { id: 'test-world' } };
+
+function encodeFrame(header: Record<string, unknown>, payload: Uint8Array): ArrayBuffer {
+  const headerBytes = new TextEncoder().encode(JSON.stringify(header));
+  const buffer = new ArrayBuffer(4 + headerBytes.length + payload.length);
+  new DataView(buffer).setUint32(0, headerBytes.length);
+  new Uint8Array(buffer, 4).set(headerBytes);
+  new Uint8Array(buffer, 4 + headerBytes.length).set(payload);
+  return buffer;
+}
+
+describe('chunked upload', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    mockFilePicker.upload.mockImplementation(async (_source: string, path: string, file: File) => ({
+      path: `${path}/${file.name}`
+    }));
+  });
+
+  it('reassembles binary chunks and uploads the file', async () => {
+    const { handleMessage, handleBinaryMessage } = await import('../../src/handlers/index');
+
+    const begin = await handleMessage({
+      type: 'upload_begin',
+      request_id: 'r1',
+      data: { upload_id: 'u1', filename: 'map.webp', destination: 'uploaded-maps', size: 6, total_chunks: 2 }
+    });
+    expect(begin?.responseType).toBe('upload_ready');
+    expect(begin?.data).toMatchObject({ next_seq: 0 });
+
+    // Chunks may arrive out of order
+    const ack = await handleBinaryMessage(encodeFrame(
+      { type: 'upload_chunk', request_id: 'r2', data: { upload_id: 'u1', seq: 1 } },
+      new Uint8Array([4, 5, 6])
+    ));
+    expect(ack).toMatchObject({ responseType: 'upload_chunk_ack', request_id: 'r2' });
+    await handleBinaryMessage(encodeFrame(
+      { type: 'upload_chunk', request_id: 'r3', data: { upload_id: 'u1', seq: 0 } },
+      new Uint8Array([1, 2, 3])
+    ));
+
+    const finish = await handleMessage({ type: 'upload_finish', request_id: 'r4', data: { upload_id: 'u1' } });
+
+    expect(finish?.responseType).toBe('file_uploaded');
+    expect(finish?.data).toMatchObject({ path: 'worlds/test-world/uploaded-maps/map.webp' });
+    const file: File = mockFilePicker.upload.mock.calls[0][2];
+    expect(new Uint8Array(await file.arrayBuffer())).toEqual(new Uint8Array([1, 2, 3, 4, 5, 6]));
+  });
+
+  it('resumes from the first missing chunk', async () => {
+    const { handleUploadBegin, handleUploadChunk } = await import('../../src/handlers/files');
+    const begin = { upload_id: 'u2', filename: 'map.webp', destination: 'uploaded-maps', size: 9, total_chunks: 3 };
+
+    handleUploadBegin(begin);
+    handleUploadChunk({ upload_id: 'u2', seq: 0 }, new Uint8Array([1, 2, 3]));
+
+    expect(handleUploadBegin(begin).next_seq).toBe(1);
+  });
+
+  it('refuses to finish an incomplete upload', async () => {
+    const { handleUploadBegin, handleUploadFinish } = await import('../../src/handlers/files');
+    handleUploadBegin({ upload_id: 'u3', filename: 'a.webp', destination: 'uploaded-maps', size: 4, total_chunks: 2 });
+
+    const result = await handleUploadFinish({ upload_id: 'u3' });
+
+    expect(result.success).toBe(false);
+    expect(result.error).toContain('missing chunk 0');
+    expect(mockFilePicker.upload).not.toHaveBeenCalled();
+  });
+
+  it('rejects chunks for unknown uploads', async () => {
+    const { handleUploadChunk } = await import('../../src/handlers/files');
+
+    const ack = handleUploadChunk({ upload_id: 'nope', seq: 0 }, new Uint8Array([1]));
+
+    expect(ack.success).toBe(false);
+  });
+});
@@ -117,6 +117,14 @@ describe('handleMessage', () => {
     expect(result).toBeNull();
   });
 
+  it('answers backend ping with pong carrying the request_id', async () => {
+    const { handleMessage } = await import('../../src/handlers/index');
+
+    const result = await handleMessage({ type: 'ping', request_id: 'ping-1' });
+
+    expect(result).toEqual({ responseType: 'pong', request_id: 'ping-1' });
+  });
+
   it('warns on unknown message type and returns null', async () => {
     const { handleMessage } = await import('../../src/handlers/index');
 
@@ -36,6 +36,13 @@ const mockNotifications = {
 // @ts-ignore
 globalThis.ui = { notifications: mockNotifications };
 
+// @ts-ignore
+globalThis.game = {
+  world: { id: 'test-world' },
+  system: { id: 'dnd5e', version: '4.1.2' },
+  version: '12.331',
+};
+
 describe('TablewriteClient', () => {
   beforeEach(() => {
     vi.clearAllMocks();
@@ -78,4 +85,47 @@ describe('TablewriteClient', () => {
 
     expect(client.isConnected()).toBe(false);
   });
+
+  it('sends world info on open', async () => {
+    const { TablewriteClient } = await import('../../src/websocket/client');
+
+    const client = new TablewriteClient('http://localhost:8000');
+    client.connect();
+    await new Promise((resolve) => setTimeout(resolve, 0));
+
+    // @ts-ignore - inspect the mock socket
+    const sent = client.ws.send.mock.calls.map((call: string[]) => JSON.parse(call[0]));
+    expect(sent).toContainEqual({
+      type: 'world_info',
+      data: {
+        world_id: 'test-world',
+        system_id: 'dnd5e',
+        system_version: '4.1.2',
+        foundry_version: '12.331',
+        world_events: true,
+        encodings: ['gzip'],
+      },
+    });
+  });
+
+  it('compresses large messages once the backend accepts gzip', async () => {
+    const { TablewriteClient } = await import('../../src/websocket/client');
+    const { decodeFrame, decodeCompressed } = await import('../../src/websocket/encoding');
+
+    const client = new TablewriteClient('http://localhost:8000');
+    client.connect();
+    await new Promise((resolve) => setTimeout(resolve, 0));
+    // @ts-ignore - drive the mock socket
+    const ws = client.ws;
+    ws.onmessage({ data: JSON.stringify({ type: 'connected', client_id: 'c1', encodings: ['gzip'], compression_threshold: 100 }) });
+    ws.send.mockClear();
+
+    ws.onmessage({ data: JSON.stringify({ type: 'ping', request_id: 'r'.repeat(200) }) });
+    await vi.waitFor(() => expect(ws.send).toHaveBeenCalled());
+
+    const frame: ArrayBuffer = ws.send.mock.calls[0][0];
+    const { header, payload } = decodeFrame(frame);
+    expect(JSON.parse(await decodeCompressed(header, payload))).toMatchObject({ type: 'pong', request_id: 'r'.repeat(200) });
+    expect(client.getByteCounts().sent).toBe(frame.byteLength);
+  });
 });
@@ -0,0 +1,22 @@
+// foundry-module/tablewrite-assistant/tests/websocket/encoding.test.ts
+import { describe, it, expect } from 'vitest';
+import { decodeCompressed, decodeFrame, encodeCompressed, ENCODED_FRAME_TYPE } from '../../src/websocket/encoding';
+
+describe('message encoding', () => {
+  it('round-trips a gzip-encoded message', async () => {
+    const json = JSON.stringify({ type: 'actors_list', data: { actors: Array(500).fill({ name: 'Goblin' }) } });
+
+    const frame = await encodeCompressed(json);
+    const { header, payload } = decodeFrame(frame);
+
+    expect(header).toEqual({ type: ENCODED_FRAME_TYPE, encoding: 'gzip' });
+    expect(frame.byteLength).toBeLessThan(json.length / 10);
+    expect(await decodeCompressed(header, payload)).toBe(json);
+  });
+
+  it('rejects unknown encodings', async () => {
+    await expect(decodeCompressed({ type: ENCODED_FRAME_TYPE, encoding: 'zstd' }, new Uint8Array())).rejects.toThrow(
+      'Unsupported encoding'
+    );
+  });
+});
@@ -0,0 +1,61 @@
+// foundry-module/tablewrite-assistant/tests/websocket/worldEvents.test.ts
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const hookCallbacks: Record<string, (...args: unknown[]) => void> = {};
+
+// @ts-ignore
+globalThis.Hooks = {
+  once: vi.fn(),
+  on: vi.fn((hookName: string, callback: (...args: unknown[]) => void) => {
+    hookCallbacks[hookName] = callback;
+  }),
+};
+
+describe('registerWorldEventHooks', () => {
+  const send = vi.fn();
+
+  beforeEach(async () => {
+    vi.clearAllMocks();
+    const { registerWorldEventHooks } = await import('../../src/websocket/worldEvents');
+    registerWorldEventHooks(send);
+  });
+
+  it('sends create events with the containing folder', () => {
+    hookCallbacks['createActor']({ id: 'a1', uuid: 'Actor.a1', name: 'Goblin', folder: { id: 'f1' } });
+
+    expect(send).toHaveBeenCalledWith({
+      type: 'world_event',
+      data: {
+        action: 'create', document_type: 'Actor', id: 'a1', uuid: 'Actor.a1',
+        name: 'Goblin', folder: 'f1', folder_type: null
+      }
+    });
+  });
+
+  it('sends the folder type and parent for folders', () => {
+    hookCallbacks['deleteFolder']({ id: 'f2', uuid: 'Folder.f2', name: 'Tablewrite', type: 'Actor', folder: null });
+
+    expect(send.mock.calls[0][0].data).toMatchObject({ action: 'delete', folder: null, folder_type: 'Actor' });
+  });
+
+  it('ignores compendium and embedded documents', () => {
+    hookCallbacks['createActor']({ id: 'a2', uuid: 'Compendium.dnd5e.monsters.Actor.a2', name: 'Goblin', pack: 'dnd5e.monsters' });
+    hookCallbacks['updateJournalEntry'](
+      { id: 'j1', uuid: 'Compendium.world.lore.JournalEntry.j1', name: 'Lore', pack: 'world.lore' },
+      { name: 'Lore' }
+    );
+    hookCallbacks['deleteScene']({ id: 's2', name: 'Embedded', parent: { id: 'adv1' } });
+
+    expect(send).not.toHaveBeenCalled();
+  });
+
+  it('only sends updates that change the name or folder', () => {
+    const scene = { id: 's1', uuid: 'Scene.s1', name: 'Cave' };
+
+    hookCallbacks['updateScene'](scene, { grid: { size: 50 } });
+    expect(send).not.toHaveBeenCalled();
+
+    hookCallbacks['updateScene'](scene, { name: 'Cave' });
+    expect(send.mock.calls[0][0].data).toMatchObject({ action: 'update', document_type: 'Scene' });
+  });
+});
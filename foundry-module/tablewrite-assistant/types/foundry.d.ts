@@ -84,9 +84,18 @@ declare global {
     items: ItemCollection | null;
     folders: FolderCollection | null;
     packs: CompendiumCollection;
+    collections: Map<string, WorldCollection>;
     world: World;
   }
 
+  // World collection keyed by document name in game.collections (e.g. 'Actor')
+  interface WorldCollection {
+    get(id: string): FoundryDocument | undefined;
+    documentClass: {
+      deleteDocuments(ids: string[]): Promise<unknown[]>;
+    };
+  }
+
   interface ActorCollection {
     contents: FoundryDocument[];
     map<T>(fn: (actor: FoundryDocument) => T): T[];
@@ -125,6 +134,7 @@ declare global {
   // Foundry Document classes
   const Actor: {
     create(data: Record<string, unknown>): Promise<{ id: string; name: string } | null>;
+    createDocuments(data: Record<string, unknown>[]): Promise<FoundryDocument[]>;
   };
 
   const JournalEntry: {
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark util.geometry simplification against the original pure-Python versions.
+
+Builds large synthetic wall sets (noisy pixel paths, as traced from a skeleton),
+times the original recursive RDP and fixpoint collinear simplification against
+the vectorized single-polyline and batch versions, and checks the results.
+
+Usage:
+    uv run python scripts/benchmark_polyline_simplify.py [--walls 3000] [--max-len 400]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from util.geometry import rdp, rdp_batch, simplify_collinear, simplify_collinear_batch
+
+
+# ---------- Original implementations (from wall_detection/polygonize.py) ----------
+
+def rdp_reference(points, eps):
+    """Ramer–Douglas–Peucker on list[(x,y)]."""
+    if len(points) < 3: return points
+    def dpt(p,a,b):
+        ax,ay=a; bx,by=b; px,py=p
+        if ax==bx and ay==by: return math.hypot(px-ax, py-ay)
+        t=max(0,min(1,((px-ax)*(bx-ax)+(py-ay)*(by-ay))/((bx-ax)**2+(by-ay)**2)))
+        q=(ax+t*(bx-ax), ay+t*(by-ay)); return math.hypot(px-q[0], py-q[1])
+    imax, dmax = 0, 0.0
+    for i in range(1,len(points)-1):
+        d = dpt(points[i], points[0], points[-1])
+        if d>dmax: imax, dmax = i, d
+    if dmax>eps:
+        a = rdp_reference(points[:imax+1], eps)
+        b = rdp_reference(points[imax:],   eps)
+        return a[:-1]+b
+    return [points[0], points[-1]]
+
+
+def simplify_collinear_reference(points, tolerance=1.0):
+    """Remove nearly collinear points, one sequential pass at a time until fixpoint."""
+    if len(points) <= 2:
+        return points
+    changed = True
+    result = list(points)
+    while changed:
+        changed = False
+        simplified = [result[0]]
+        for i in range(1, len(result) - 1):
+            (ax, ay), (px, py), (bx, by) = simplified[-1], result[i], result[i + 1]
+            dx, dy = bx - ax, by - ay
+            len_sq = dx * dx + dy * dy
+            if len_sq < 1e-10:
+                continue
+            t = max(0, min(1, ((px - ax) * dx + (py - ay) * dy) / len_sq))
+            if math.hypot(px - (ax + t * dx), py - (ay + t * dy)) > tolerance:
+                simplified.append(result[i])
+            else:
+                changed = True
+        simplified.append(result[-1])
+        result = simplified
+    return result
+
+
+# ---------- Synthetic walls ----------
+
+def synthetic_walls(count: int, max_len: int, seed: int = 0, size: int = 4000, jitter: float = 0.4):
+    """Mostly straight pixel paths with occasional turns and sub-pixel noise."""
+    rnd = random.Random(seed)
+    steps = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+    walls = []
+    for _ in range(count):
+        x, y = rnd.randint(0, size), rnd.randint(0, size)
+        dx, dy = rnd.choice(steps)
+        pts = [(float(x), float(y))]
+        for _ in range(rnd.randint(2, max_len) - 1):
+            if rnd.random() < 0.05:
+                dx, dy = rnd.choice(steps)
+            x, y = x + dx, y + dy
+            pts.append((x + rnd.uniform(-jitter, jitter), y + rnd.uniform(-jitter, jitter)))
+        walls.append(pts)
+    return walls
+
+
+def timed(label, fn, baseline=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:5.1f}x)" if baseline else ""
+    points = sum(len(p) for p in result)
+    print(f"  {label:28} {elapsed:8.3f}s  {points:9} points{speedup}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized polyline simplification")
+    parser.add_argument("--walls", type=int, default=3000, help="number of synthetic walls")
+    parser.add_argument("--max-len", type=int, default=400, help="maximum points per wall")
+    parser.add_argument("--eps", type=float, default=5.0, help="RDP epsilon (px)")
+    parser.add_argument("--collinear", type=float, default=0.5, help="collinear tolerance (px)")
+    args = parser.parse_args()
+
+    walls = synthetic_walls(args.walls, args.max_len)
+    print(f"{len(walls)} walls, {sum(len(w) for w in walls)} points")
+
+    print(f"\nRDP (eps={args.eps})")
+    expected, base = timed("reference (recursive)", lambda: [rdp_reference(w, args.eps) for w in walls])
+    single, _ = timed("rdp (per polyline)", lambda: [rdp(w, args.eps) for w in walls], base)
+    batch, _ = timed("rdp_batch", lambda: rdp_batch(walls, args.eps), base)
+    print(f"  identical to reference: {single == expected and batch == expected}")
+
+    for label, inputs in [("raw paths", walls), ("after RDP eps=1", rdp_batch(walls, 1.0))]:
+        print(f"\nCollinear (tolerance={args.collinear}, {label})")
+        expected, base = timed("reference (fixpoint)", lambda: [simplify_collinear_reference(w, args.collinear) for w in inputs])
+        timed("simplify_collinear", lambda: [simplify_collinear(w, args.collinear) for w in inputs], base)
+        batch, _ = timed("simplify_collinear_batch", lambda: simplify_collinear_batch(inputs, args.collinear), base)
+        same = sum(a == b for a, b in zip(batch, expected))
+        print(f"  identical to reference: {same}/{len(inputs)} polylines")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,20 @@ This script coordinates the complete workflow:
 4. Upload XML to FoundryVTT (upload_to_foundry.py)
 5. Export journal from FoundryVTT to HTML (export_from_foundry.py)
 
+Steps 2-5 run as a dependency graph (see build_pipeline): map extraction
+runs alongside XML generation, and scene artwork, maps and actors run side
+by side once the XML exists.
+
 Each step can be skipped with flags for resuming interrupted runs.
 """
 
 import asyncio
 import os
+import shutil
 import sys
 import subprocess
 import logging
+import tempfile
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -29,6 +35,7 @@ if _src_dir not in sys.path:
     sys.path.insert(0, _src_dir)
 
 from logging_config import setup_logging
+from util.dag import DagPipeline, Stage
 
 logger = setup_logging(__name__)
 
@@ -180,70 +187,6 @@ def process_actors(run_dir: Path, target: str = "local") -> dict:
         raise RuntimeError(f"Actor processing failed: {e}")
 
 
-def run_scene_artwork_generation(
-    run_dir: Path,
-    style_prompt: str = None,
-    continue_on_error: bool = False
-) -> None:
-    """
-    Generate scene artwork from chapter XML files.
-
-    Args:
-        run_dir: Run directory containing documents/ folder
-        style_prompt: Optional custom style prompt for image generation
-        continue_on_error: Continue processing other chapters if one fails
-
-    Raises:
-        RuntimeError: If scene generation fails and continue_on_error is False
-    """
-    logger.info("=" * 60)
-    logger.info("STEP 2.5: Generating scene artwork")
-    logger.info("=" * 60)
-
-    output_dir = run_dir / "scene_artwork"
-
-    try:
-        # Import scene generation functions
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-        from generate_scene_art import process_chapter, sanitize_filename
-
-        # Find XML files to process
-        xml_files = list((run_dir / "documents").glob("*.xml"))
-
-        if not xml_files:
-            logger.warning("No XML files found, skipping scene artwork generation")
-            return
-
-        logger.info(f"Processing {len(xml_files)} chapter file(s)...")
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        total_scenes = 0
-        total_images = 0
-        failed_chapters = []
-
-        for xml_file in xml_files:
-            try:
-                stats = process_chapter(xml_file, output_dir, style_prompt)
-                total_scenes += stats["scenes_found"]
-                total_images += stats["images_generated"]
-                logger.info(f"  ✓ {xml_file.name}: {stats['scenes_found']} scenes, {stats['images_generated']} images")
-            except Exception as e:
-                logger.error(f"Failed to process {xml_file.name}: {e}")
-                failed_chapters.append(xml_file.name)
-                if not continue_on_error:
-                    raise
-
-        logger.info("✓ Scene artwork generation completed")
-        logger.info(f"  Total scenes: {total_scenes}, Images: {total_images}")
-
-        if failed_chapters:
-            logger.warning(f"  Failed chapters: {', '.join(failed_chapters)}")
-
-    except Exception as e:
-        logger.error(f"Scene artwork generation failed: {e}")
-        raise RuntimeError(f"Scene artwork generation failed: {e}") from e
-
-
 def run_map_extraction(
     run_dir: Path,
     pdf_path: Optional[str] = None,
@@ -457,6 +400,144 @@ def export_from_foundry(
         raise RuntimeError(f"Export failed: {e}")
 
 
+def find_run_dir(project_root: Path, run_dir: Optional[str] = None) -> Path:
+    """
+    Resolve the run directory to reuse: the given one, or the latest run.
+
+    Raises:
+        RuntimeError: If the directory does not exist or there are no runs
+    """
+    if run_dir:
+        path = Path(run_dir)
+        if not path.exists():
+            raise RuntimeError(f"Specified run directory not found: {path}")
+        return path
+
+    runs_dir = project_root / "output" / "runs"
+    if not runs_dir.exists():
+        raise RuntimeError("No runs directory found")
+    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
+    if not run_dirs:
+        raise RuntimeError("No run directories found")
+    return sorted(run_dirs, key=lambda d: d.name)[-1]
+
+
+def build_pipeline(project_root: Path, args, run_dir: Optional[Path] = None) -> DagPipeline:
+    """
+    Build the stage graph for steps 2-5.
+
+    Stages:
+        xml: Generate XML (or reuse run_dir); result is the chapter XML files
+        maps: Extract map assets; runs alongside xml, into a staging directory
+            when the run directory does not exist yet
+        artwork: Scene artwork, one chapter at a time as XML files are known
+        actors: Actors and NPCs (reads every chapter, so waits for all XML)
+        upload: Journal upload, after the artwork and maps it embeds
+        export: HTML export of the uploaded journal
+
+    Artwork, maps and actors are non-fatal; xml, upload and export failures
+    stop the pipeline. An upload that reports failed pages counts as failed,
+    so export is skipped.
+
+    Args:
+        project_root: Project root directory
+        args: Parsed command line arguments
+        run_dir: Existing run directory to reuse (skips XML generation)
+    """
+    style_prompt = os.getenv("IMAGE_STYLE_PROMPT")
+    maps_dir = run_dir
+
+    def xml_stage(inputs):
+        current = run_dir or run_pdf_to_xml(project_root, chapter_file=args.chapter_file)
+        return sorted((current / "documents").glob("*.xml"))
+
+    def run_dir_of(inputs) -> Path:
+        xml_files = inputs["xml"]
+        return run_dir or (xml_files[0].parent.parent if xml_files else find_run_dir(project_root))
+
+    def maps_stage(inputs):
+        map_stats = run_map_extraction(maps_dir, continue_on_error=True)
+        if map_stats.get("errors"):
+            logger.warning("Map extraction had errors, continuing...")
+        return map_stats
+
+    def place_maps_stage(inputs):
+        """Move maps extracted before the run directory existed into it."""
+        target = run_dir_of(inputs)
+        if maps_dir != target:
+            staged = maps_dir / "map_assets"
+            if staged.exists():
+                shutil.move(str(staged), str(target / "map_assets"))
+            shutil.rmtree(maps_dir, ignore_errors=True)
+
+    def artwork_stage(xml_file, inputs):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+        from generate_scene_art import process_chapter
+
+        output_dir = xml_file.parent.parent / "scene_artwork"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stats = process_chapter(xml_file, output_dir, style_prompt)
+        logger.info(f"  ✓ {xml_file.name}: {stats['scenes_found']} scenes, {stats['images_generated']} images")
+        return stats
+
+    def actors_stage(inputs):
+        return process_actors(run_dir_of(inputs), target=args.target)
+
+    def upload_stage(inputs):
+        upload_result = upload_to_foundry(run_dir_of(inputs), target=args.target, journal_name=args.journal_name)
+        # Partial uploads stop the pipeline before export, as a failed upload does
+        if upload_result["failed"] > 0 or upload_result.get("errors"):
+            raise RuntimeError("Some uploads failed, check logs above")
+        return upload_result
+
+    def export_stage(inputs):
+        upload_result = inputs["upload"]
+        export_from_foundry(
+            run_dir_of(inputs),
+            target=args.target,
+            # Use journal UUID from upload result (saves an API search call)
+            journal_name=upload_result.get("journal_name") or args.journal_name or "D&D Module",
+            journal_uuid=upload_result.get("journal_uuid")
+        )
+
+    stages = [Stage("xml", xml_stage)]
+    upload_deps = ["xml"]
+
+    if args.skip_scenes:
+        logger.info("Skipping scene artwork generation (--skip-scenes)")
+    else:
+        stages.append(Stage("artwork", artwork_stage, for_each="xml", fatal=False))
+        upload_deps.append("artwork")
+
+    if args.skip_maps:
+        logger.info("Skipping map extraction (--skip-maps)")
+    else:
+        if maps_dir is None:
+            (project_root / "output").mkdir(parents=True, exist_ok=True)
+            maps_dir = Path(tempfile.mkdtemp(prefix="maps_", dir=project_root / "output"))
+        stages.append(Stage("maps", maps_stage, fatal=False))
+        stages.append(Stage("place_maps", place_maps_stage, depends_on=("xml", "maps"), fatal=False))
+        upload_deps.append("place_maps")
+
+    if args.skip_actors:
+        logger.info("Skipping actor processing (--skip-actors)")
+    else:
+        stages.append(Stage("actors", actors_stage, depends_on=("xml",), fatal=False))
+
+    if args.skip_upload:
+        logger.info("Skipping FoundryVTT upload (--skip-upload)")
+        if not args.skip_export:
+            logger.info("Skipping export (upload was skipped)")
+    else:
+        stages.append(Stage("upload", upload_stage, depends_on=upload_deps))
+        if args.skip_export:
+            logger.info("Skipping FoundryVTT export (--skip-export)")
+        else:
+            stages.append(Stage("export", export_stage, depends_on=("xml", "upload")))
+
+    return DagPipeline(stages)
+
+
 def main():
     """Main entry point for full pipeline orchestration."""
     import argparse
@@ -575,99 +656,24 @@ def main():
         else:
             run_pdf_split(project_root)
 
-        # Step 2: Generate XML
+        # Steps 2-5 run as a dependency graph: map extraction runs alongside
+        # XML generation, and artwork, maps and actors run side by side once
+        # the XML exists
         if args.skip_xml:
             logger.info("Skipping XML generation (--skip-xml), using latest run...")
-
-            if args.run_dir:
-                run_dir = Path(args.run_dir)
-                if not run_dir.exists():
-                    logger.error(f"Specified run directory not found: {run_dir}")
-                    sys.exit(1)
-            else:
-                runs_dir = project_root / "output" / "runs"
-
-                if not runs_dir.exists():
-                    logger.error("No runs directory found")
-                    sys.exit(1)
-
-                run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
-                if not run_dirs:
-                    logger.error("No run directories found")
-                    sys.exit(1)
-
-                run_dir = sorted(run_dirs, key=lambda d: d.name)[-1]
-
-            logger.info(f"Using run: {run_dir.name}")
-        else:
-            run_dir = run_pdf_to_xml(project_root, chapter_file=args.chapter_file)
-
-        # Step 2.5: Generate scene artwork (optional)
-        if args.skip_scenes:
-            logger.info("Skipping scene artwork generation (--skip-scenes)")
-        else:
-            try:
-                # Get style prompt from environment variable if not in args
-                style_prompt = os.getenv("IMAGE_STYLE_PROMPT")
-                run_scene_artwork_generation(run_dir, style_prompt=style_prompt, continue_on_error=True)
-            except Exception as e:
-                logger.error(f"Scene artwork generation failed: {e}")
-                logger.warning("Continuing with pipeline despite scene generation failure")
-
-        # Step 2.6: Extract map assets (optional)
-        if args.skip_maps:
-            logger.info("Skipping map extraction (--skip-maps)")
-        else:
-            try:
-                map_stats = run_map_extraction(run_dir, continue_on_error=True)
-                if map_stats.get("errors"):
-                    logger.warning("Map extraction had errors, continuing...")
-            except Exception as e:
-                logger.error(f"Map extraction failed: {e}")
-                logger.warning("Continuing with pipeline despite map extraction failure")
-
-        # Step 3: Process actors and NPCs
-        if args.skip_actors:
-            logger.info("Skipping actor processing (--skip-actors)")
-        else:
-            try:
-                actor_stats = process_actors(run_dir, target=args.target)
-            except Exception as e:
-                logger.error(f"Actor processing failed: {e}")
-                logger.warning("Continuing with pipeline...")
-
-        # Step 4: Upload to FoundryVTT
-        upload_result = None
-        if args.skip_upload:
-            logger.info("Skipping FoundryVTT upload (--skip-upload)")
+            known_run_dir = find_run_dir(project_root, args.run_dir)
+            logger.info(f"Using run: {known_run_dir.name}")
         else:
-            upload_result = upload_to_foundry(
-                run_dir,
-                target=args.target,
-                journal_name=args.journal_name
-            )
-
-            if upload_result["failed"] > 0 or upload_result.get("errors"):
-                logger.warning("Some uploads failed, check logs above")
-                sys.exit(1)
+            known_run_dir = None
 
-        # Step 5: Export from FoundryVTT
-        if args.skip_export:
-            logger.info("Skipping FoundryVTT export (--skip-export)")
-        elif args.skip_upload:
-            logger.info("Skipping export (upload was skipped)")
-        else:
-            # Use journal UUID from upload result (saves an API search call)
-            journal_uuid = upload_result.get("journal_uuid") if upload_result else None
-            journal_name = upload_result.get("journal_name") if upload_result else (args.journal_name or "D&D Module")
-
-            export_from_foundry(
-                run_dir,
-                target=args.target,
-                journal_name=journal_name,
-                journal_uuid=journal_uuid
-            )
+        result = build_pipeline(project_root, args, known_run_dir).run()
+        for stage, errors in result.errors.items():
+            for error in errors:
+                logger.warning(f"{stage} failed, continued without it: {error}")
+        if not result.success:
+            raise result.error
 
+        logger.info("Stage timings: " + ", ".join(f"{k}={v:.1f}s" for k, v in result.timings.items()))
         logger.info("=" * 60)
         logger.info("PIPELINE COMPLETE!")
         logger.info("=" * 60)
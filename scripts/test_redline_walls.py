@@ -40,7 +40,8 @@ async def test_pipeline():
         save_dir=Path("output/wall_detection_test"),
         make_run=True,
         temperature=0.5,
-        alpha=0.8
+        alpha=0.8,
+        debug_images=True
     )
 
     # Display results
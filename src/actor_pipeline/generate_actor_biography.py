@@ -2,12 +2,10 @@
 
 import asyncio
 import logging
-import os
 from typing import Optional
-from google import genai
 
 from foundry_converters.actors.models import ParsedActorData
-from util.gemini import generate_content_async
+from util.gemini import generate_content_async, get_client
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +100,7 @@ Write ONLY the biography text (2-4 sentences), nothing else:"""
 
     try:
         # Initialize client and call Gemini
-        client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+        client = get_client()
         response = await generate_content_async(
             client=client,
             model=model_name,
@@ -10,14 +10,12 @@ the existing pipeline:
 
 import asyncio
 import logging
-import os
 from pathlib import Path
 from typing import Optional
 
-from google import genai
 from dotenv import load_dotenv
 
-from util.gemini import generate_content_async
+from util.gemini import generate_content_async, get_client
 
 # Load environment
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -270,7 +268,7 @@ OUTPUT ONLY THE STAT BLOCK AND BIO. No additional commentary or explanations.
         logger.info(f"Generating creature (auto CR): {description[:100]}...")
 
     # Initialize client (uses GEMINI_API_KEY or GeminiImageAPI env var)
-    client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+    client = get_client()
 
     response = await generate_content_async(
         client=client,
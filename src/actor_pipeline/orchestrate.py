@@ -15,7 +15,7 @@ from actor_pipeline.statblock_parser import parse_raw_text_to_statblock
 from actor_pipeline.models import ActorCreationResult
 from foundry_converters.actors.parser import parse_stat_block_parallel
 from foundry_converters.actors.converter import convert_to_foundry
-from caches import SpellCache, IconCache
+from caches import SpellCache, IconCache, get_shared_caches
 from foundry.client import FoundryClient
 
 logger = logging.getLogger(__name__)
@@ -124,7 +124,7 @@ async def create_actor_from_description(
         challenge_rating: Optional CR (0.125, 0.25, 0.5, 1-30). If None, Gemini determines it.
         model_name: Gemini model to use (default: "gemini-2.0-flash")
         output_dir_base: Base directory for output (default: "output/runs")
-        spell_cache: Optional pre-loaded SpellCache (will create if None)
+        spell_cache: Optional pre-loaded SpellCache (defaults to the shared cache)
         foundry_client: Optional FoundryClient (will create if None)
         actor_upload_fn: Optional async function(actor_data: dict) -> str that uploads
                         actor and returns UUID. Used to bypass FoundryClient when
@@ -177,15 +177,11 @@ async def create_actor_from_description(
 
         # Initialize caches early so they're available for parsing
         # SpellCache is needed for spell UUID resolution during trait parsing
-        if spell_cache is None:
-            logger.info("Loading spell cache...")
-            spell_cache = SpellCache()
-            spell_cache.load()
-
-        if icon_cache is None:
-            logger.info("Loading icon cache...")
-            icon_cache = IconCache()
-            icon_cache.load()
+        if spell_cache is None or icon_cache is None:
+            logger.info("Loading shared spell/icon caches...")
+            shared_spells, shared_icons = await get_shared_caches().get()
+            spell_cache = spell_cache or shared_spells
+            icon_cache = icon_cache or shared_icons
 
         # Step 3: Parse to detailed ParsedActorData
         logger.info("Step 3/6: Parsing to detailed ParsedActorData...")
@@ -351,8 +347,7 @@ async def create_actors_batch(
         crs = [2.0, 1.0, 9.0]
 
         # Pre-load shared resources for efficiency
-        spell_cache = SpellCache()
-        spell_cache.load()
+        spell_cache, icon_cache = await get_shared_caches().get()
         client = FoundryClient()
 
         results = await create_actors_batch(
@@ -378,15 +373,11 @@ async def create_actors_batch(
         challenge_ratings = [None] * len(descriptions)
 
     # Pre-load shared resources if not provided
-    if spell_cache is None:
-        logger.info("Loading spell cache for batch processing...")
-        spell_cache = SpellCache()
-        spell_cache.load()
-
-    if icon_cache is None:
-        logger.info("Loading icon cache for batch processing...")
-        icon_cache = IconCache()
-        icon_cache.load()
+    if spell_cache is None or icon_cache is None:
+        logger.info("Loading shared spell/icon caches for batch processing...")
+        shared_spells, shared_icons = await get_shared_caches().get()
+        spell_cache = spell_cache or shared_spells
+        icon_cache = icon_cache or shared_icons
 
     if foundry_client is None:
         logger.info("Creating FoundryVTT client for batch processing...")
@@ -156,6 +156,7 @@ def process_actors_for_run(
 
     # Step 4: Create NPC actors
     logger.info("Step 4: Creating NPC actors in FoundryVTT")
+    npc_actors = []  # (npc, actor_data, spell_uuids) built for the batch create
 
     for npc in all_npcs:
         try:
@@ -173,21 +174,41 @@ def process_actors_for_run(
                     f"creating without stat block"
                 )
 
-            # Create NPC actor with stat block if available
-            logger.info(f"Creating NPC actor: {npc.name}")
-            npc_uuid = foundry_client.create_npc_actor(
+            # Build NPC actor with stat block if available
+            logger.info(f"Building NPC actor: {npc.name}")
+            actor_data, spell_uuids = foundry_client.build_npc_actor(
                 npc,
                 stat_block_uuid=stat_block_uuid,
-                stat_block=stat_block,
-                folder=folder_id
+                stat_block=stat_block
             )
-            stats["npcs_created"] += 1
-            stats["created_actors"].append({"uuid": npc_uuid, "name": npc.name})
+            npc_actors.append((npc, actor_data, spell_uuids))
 
         except Exception as e:
             logger.error(f"Failed to create NPC actor '{npc.name}': {e}")
             stats["errors"].append(f"NPC actor creation failed for {npc.name}: {e}")
 
+    # Create all NPCs in one batch (one Foundry createDocuments call)
+    if npc_actors:
+        try:
+            results = foundry_client.create_actors(
+                [(actor_data, spell_uuids) for _, actor_data, spell_uuids in npc_actors],
+                folder=folder_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to create NPC actors: {e}")
+            results = [{"success": False, "error": str(e)}] * len(npc_actors)
+        results = list(results) + [{"success": False, "error": "Missing from batch response"}] * (
+            len(npc_actors) - len(results))
+
+        for (npc, _, _), result in zip(npc_actors, results):
+            if result.get("success"):
+                stats["npcs_created"] += 1
+                stats["created_actors"].append({"uuid": result.get("uuid"), "name": npc.name})
+            else:
+                error = result.get("error", "Unknown error")
+                logger.error(f"Failed to create NPC actor '{npc.name}': {error}")
+                stats["errors"].append(f"NPC actor creation failed for {npc.name}: {error}")
+
     # Summary
     logger.info("=" * 60)
     logger.info("Actor processing complete!")
@@ -3,15 +3,13 @@
 import asyncio
 import json
 import logging
-import os
 from pathlib import Path
 from typing import Optional
 
-from google import genai
 from dotenv import load_dotenv
 
 from actor_pipeline.models import StatBlock
-from util.gemini import generate_content_async
+from util.gemini import generate_content_async, get_client
 
 # Load environment
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -140,7 +138,7 @@ OUTPUT ONLY VALID JSON. No explanations.
 """
 
     # Initialize client
-    client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+    client = get_client()
 
     response = await generate_content_async(
         client=client,
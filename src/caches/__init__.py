@@ -3,6 +3,7 @@
 This module provides caches for:
 - SpellCache: Spell name -> compendium UUID
 - IconCache: Icon path lookups
+- SharedCaches: Process-lifetime SpellCache/IconCache pair persisted to disk
 
 These caches are separated from foundry/ because they are data structures,
 not network operations.
@@ -10,5 +11,6 @@ not network operations.
 
 from .spell_cache import SpellCache
 from .icon_cache import IconCache
+from .shared import SharedCaches, get_shared_caches, set_shared_caches
 
-__all__ = ["SpellCache", "IconCache"]
+__all__ = ["SpellCache", "IconCache", "SharedCaches", "get_shared_caches", "set_shared_caches"]
@@ -3,18 +3,25 @@
 import asyncio
 import logging
 import os
+import time
 import httpx
-from difflib import SequenceMatcher
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Union
-from google import genai
 
-from util.gemini import generate_content_async
+from util.gemini import generate_content_async, get_client
+from .icon_index import IconIndex, lowest_id
 
 logger = logging.getLogger(__name__)
 
 # Backend URL for WebSocket-based file listing
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
+# Number of ranked candidates offered to Gemini when there is no perfect match
+AI_CANDIDATE_LIMIT = 200
+
+# Resolved (search term, categories) -> icon entries kept by get_icon_with_ai_fallback
+ICON_MEMO_SIZE = 4096
+
 
 class IconCache:
     """
@@ -35,6 +42,16 @@ class IconCache:
         self._icons_by_category: Dict[str, List[str]] = {}  # Full paths: "weapons/swords" -> [icons...]
         self._all_icons: List[str] = []
         self._loaded = False
+        self._index: Optional[IconIndex] = None
+        self._index_signature: Optional[tuple] = None
+        # Memo of get_icon_with_ai_fallback results, cleared whenever the index is rebuilt
+        self._memo: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self._memo_size = ICON_MEMO_SIZE
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._generation = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_coalesced = 0
 
     @property
     def loaded(self) -> bool:
@@ -107,9 +124,31 @@ class IconCache:
                 self._categorize_icon(path)
 
         self._loaded = True
+        self._index = None
+        self._get_index()
         logger.info(f"Loaded {len(self._all_icons)} icons into cache")
         logger.info(f"  Categories: {list(self._icons_by_category.keys())}")
 
+    def _get_index(self) -> IconIndex:
+        """Return the lookup index, (re)building it if the icon lists were replaced."""
+        signature = (id(self._all_icons), len(self._all_icons),
+                     id(self._icons_by_category), len(self._icons_by_category))
+        if self._index is None or signature != self._index_signature:
+            start = time.perf_counter()
+            self._index = IconIndex(self._all_icons, self._icons_by_category)
+            self._index_signature = signature
+            # Resolutions against the old icon list are no longer valid
+            self._generation += 1
+            self._memo.clear()
+            self._inflight.clear()
+            logger.debug(f"Built icon index: {len(self._index.keys)} keys, "
+                         f"{len(self._index.postings)} tokens in {time.perf_counter() - start:.3f}s")
+        return self._index
+
+    def to_data(self) -> List[str]:
+        """Return the cached icon paths, suitable for load_from_data()."""
+        return list(self._all_icons)
+
     def _load_via_websocket(self, extensions: List[str]) -> List[str]:
         """Load icons via HTTP API (which internally uses WebSocket).
 
@@ -205,38 +244,22 @@ class IconCache:
         search_term = search_term.lower().replace(" ", "-")
 
         # Determine search pool
-        if category and category in self._icons_by_category:
-            search_pool = self._icons_by_category[category]
-        else:
-            search_pool = self._all_icons
+        index = self._get_index()
+        search_pool = index.category_mask(category)
+        if search_pool is None:
+            search_pool = index.all_mask
 
         if not search_pool:
             return None
 
-        # Find best match using fuzzy string matching
-        best_match = None
-        best_score = 0.0
-
-        for icon_path in search_pool:
-            # Extract filename without extension for matching
-            filename = icon_path.split('/')[-1].rsplit('.', 1)[0]
-
-            # Calculate similarity against full filename
-            similarity = SequenceMatcher(None, search_term, filename).ratio()
-
-            # Also check similarity against individual words in filename (separated by hyphens)
-            words = filename.split('-')
-            for word in words:
-                word_similarity = SequenceMatcher(None, search_term, word).ratio()
-                similarity = max(similarity, word_similarity)
-
-            if similarity > best_score and similarity >= threshold:
-                best_score = similarity
-                best_match = icon_path
-
-        if best_match:
-            logger.debug(f"Matched '{search_term}' -> '{best_match}' (score: {best_score:.2f})")
+        # Best similarity against full filenames and their hyphen-separated words,
+        # scoring only index keys that can reach the threshold
+        match = index.best_fuzzy(search_term, search_pool, threshold)
+        if match is None:
+            return None
 
+        best_match = index.icons[match[0]]
+        logger.debug(f"Matched '{search_term}' -> '{best_match}' (score: {match[1]:.2f})")
         return best_match
 
     def get_icon_by_keywords(
@@ -313,7 +336,7 @@ Your response (number only):"""
 
         try:
             # Initialize client and call Gemini
-            client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+            client = get_client()
             response = await generate_content_async(
                 client=client,
                 model=model_name,
@@ -350,6 +373,10 @@ Your response (number only):"""
         complete words in icon filename). If no perfect match is found, it uses Gemini
         to intelligently select from the category's icons.
 
+        Results are memoized per (normalized term, categories, model) until the icon
+        list changes, and concurrent lookups for the same key share one resolution,
+        so repeated attack/trait names across a batch of actors resolve once.
+
         Args:
             search_term: Item/attack/trait name to match
             category: Optional category or list of categories to narrow search
@@ -371,43 +398,116 @@ Your response (number only):"""
             logger.warning("IconCache.get_icon_with_ai_fallback() called before load()")
             return None
 
+        self._get_index()  # Rebuilds (and clears the memo) if the icon list changed
+        key = self._memo_key(search_term, category, model_name)
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            self.memo_hits += 1
+            return self._memo[key]
+
+        # Coalesce concurrent lookups for the same key onto one resolution
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.memo_coalesced += 1
+            icon, _ = await asyncio.shield(task)
+            return icon
+
+        self.memo_misses += 1
+        generation = self._generation
+        task = asyncio.ensure_future(self._resolve_icon(search_term, category, model_name))
+        self._inflight[key] = task
+
+        def remember(done: asyncio.Task):
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            if done.cancelled() or done.exception() is not None or generation != self._generation:
+                return
+            icon, cacheable = done.result()
+            if cacheable:
+                self._memo[key] = icon
+                self._memo.move_to_end(key)
+                while len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+
+        task.add_done_callback(remember)
+        icon, _ = await asyncio.shield(task)
+        return icon
+
+    @staticmethod
+    def _memo_key(
+        search_term: str,
+        category: Optional[Union[str, List[str]]],
+        model_name: str
+    ) -> tuple:
+        """Return the memo key: normalized term, categories (order matters for perfect matches), model."""
+        term = " ".join(search_term.lower().replace("-", " ").split())
+        if not category:
+            categories = None
+        elif isinstance(category, str):
+            categories = (category,)
+        else:
+            categories = tuple(dict.fromkeys(category))
+        return term, categories, model_name
+
+    def memo_stats(self) -> dict:
+        """Return icon resolution memo counters."""
+        return {
+            "size": len(self._memo),
+            "hits": self.memo_hits,
+            "misses": self.memo_misses,
+            "coalesced": self.memo_coalesced,
+            "inflight": len(self._inflight),
+        }
+
+    async def _resolve_icon(
+        self,
+        search_term: str,
+        category: Optional[Union[str, List[str]]],
+        model_name: str
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Resolve an icon by perfect word match, then Gemini over ranked candidates.
+
+        Returns:
+            (icon path or None, whether the result may be memoized). Last-resort
+            results after a failed Gemini call are not memoized, so a later
+            lookup retries Gemini.
+        """
         # Normalize search term and extract words
         search_words = set(search_term.lower().replace("-", " ").split())
 
         # Determine search pool (merge multiple categories if list provided)
-        search_pool = []
+        index = self._get_index()
         if category:
             categories = [category] if isinstance(category, str) else category
-            seen_icons = set()  # Deduplicate icons that appear in multiple categories
-
-            for cat in categories:
-                if cat in self._icons_by_category:
-                    for icon in self._icons_by_category[cat]:
-                        if icon not in seen_icons:
-                            search_pool.append(icon)
-                            seen_icons.add(icon)
+            category_masks = [index.category_masks[cat] for cat in categories if cat in index.category_masks]
         else:
-            search_pool = self._all_icons
+            category_masks = [index.all_mask]
 
-        if not search_pool:
-            return None
-
-        # Try perfect word matching first
-        for icon_path in search_pool:
-            filename = icon_path.split('/')[-1].rsplit('.', 1)[0]
-            icon_words = set(filename.lower().split('-'))
+        search_pool = 0
+        for mask in category_masks:
+            search_pool |= mask
 
-            # Check if ALL search words are in icon words (perfect match)
-            if search_words <= icon_words:  # search_words is subset of icon_words
+        if not search_pool:
+            return None, True
+
+        # Try perfect word matching first (all search words appear in the filename);
+        # categories are searched in the order given
+        perfect = index.words_mask(search_words)
+        for mask in category_masks:
+            if perfect & mask:
+                icon_path = index.icons[lowest_id(perfect & mask)]
                 logger.info(f"Perfect word match for '{search_term}' -> '{icon_path}'")
-                return icon_path
+                return icon_path, True
 
         # No perfect match found, use Gemini
         logger.info(f"No perfect match for '{search_term}', using Gemini...")
 
-        # Get top 200 icons from category for Gemini to choose from
-        # (limit to 200 to keep prompt manageable while providing good coverage)
-        candidate_icons = search_pool[:200] if len(search_pool) > 200 else search_pool
+        # Offer Gemini the most relevant icons from the pool rather than an arbitrary slice
+        candidate_icons = [
+            index.icons[icon_id]
+            for icon_id in index.rank(search_words, search_pool, AI_CANDIDATE_LIMIT)
+        ]
 
         gemini_choice = await self._select_icon_with_gemini(
             search_term,
@@ -416,14 +516,14 @@ Your response (number only):"""
         )
 
         if gemini_choice:
-            return gemini_choice
+            return gemini_choice, True
 
-        # If Gemini fails, return first icon as last resort
-        if search_pool:
-            logger.warning(f"Gemini failed for '{search_term}', using first icon from category")
-            return search_pool[0]
+        # If Gemini fails, return the best-ranked icon as last resort
+        if candidate_icons:
+            logger.warning(f"Gemini failed for '{search_term}', using best-ranked icon from category")
+            return candidate_icons[0], False
 
-        return None
+        return None, False
 
     async def get_icons_batch(
         self,
@@ -0,0 +1,198 @@
+"""
+Precomputed lookup structures for IconCache.
+
+Icons are numbered by their position in the cache's icon list, and sets of
+icons are Python ints used as bitsets (bit i set = icon i), so category
+filters, token postings and their intersections are single integer ops.
+
+The index holds:
+- category bitsets: category path -> icons under it
+- token postings: lowercase filename word -> icons whose filename contains it
+- match keys: every filename stem and hyphen-separated filename word, each
+  with the bitset of icons it belongs to, plus a padded-trigram index over
+  the keys. Fuzzy lookups only score the few keys that
+  share a trigram with the search term and whose length can reach the
+  threshold, instead of every icon.
+"""
+
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Weights for rank(); a filename word outranks a folder word, partial matches trail both
+_FILENAME_WORD_WEIGHT = 2.0
+_FOLDER_WORD_WEIGHT = 1.0
+_FUZZY_RANK_THRESHOLD = 0.75
+
+
+def icon_stem(path: str) -> str:
+    """Return the filename without directories or extension."""
+    return path.split('/')[-1].rsplit('.', 1)[0]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the padded trigrams of text (padding lets 1-2 character strings match)."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bit_ids(mask: int) -> List[int]:
+    """Return the set bit positions of mask in ascending order."""
+    ids = []
+    bits = bin(mask)[:1:-1]  # Least significant bit first
+    index = bits.find('1')
+    while index != -1:
+        ids.append(index)
+        index = bits.find('1', index + 1)
+    return ids
+
+
+def lowest_id(mask: int) -> int:
+    """Return the lowest set bit position of a non-zero mask."""
+    return (mask & -mask).bit_length() - 1
+
+
+class IconIndex:
+    """Inverted, trigram and category indexes over a fixed icon list."""
+
+    def __init__(self, icons: List[str], icons_by_category: Dict[str, List[str]]):
+        """
+        Args:
+            icons: Icon paths; an icon's id is its position in this list
+            icons_by_category: Category path -> icon paths (as built by IconCache)
+        """
+        self.icons = icons
+        self.all_mask = (1 << len(icons)) - 1
+
+        first_id: Dict[str, int] = {}
+        for icon_id, path in enumerate(icons):
+            first_id.setdefault(path, icon_id)
+
+        self.category_masks: Dict[str, int] = {}
+        for category, paths in icons_by_category.items():
+            mask = 0
+            for path in paths:
+                if path in first_id:
+                    mask |= 1 << first_id[path]
+            self.category_masks[category] = mask
+
+        postings: Dict[str, int] = defaultdict(int)
+        folder_postings: Dict[str, int] = defaultdict(int)
+        key_masks: Dict[str, int] = defaultdict(int)
+        for icon_id, path in enumerate(icons):
+            bit = 1 << icon_id
+            stem = icon_stem(path)
+            for word in stem.lower().split('-'):
+                postings[word] |= bit
+            for folder in path.lower().split('/')[1:-1]:
+                for word in folder.split('-'):
+                    folder_postings[word] |= bit
+            key_masks[stem] |= bit
+            for word in stem.split('-'):
+                key_masks[word] |= bit
+
+        self.postings = dict(postings)
+        self.folder_postings = dict(folder_postings)
+
+        # Match keys (filename stems and words, case preserved as get_icon compares them)
+        self.keys: List[str] = list(key_masks)
+        self.key_masks: List[int] = [key_masks[key] for key in self.keys]
+        trigram_keys: Dict[str, List[int]] = defaultdict(list)
+        for key_id, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                trigram_keys[gram].append(key_id)
+        self.trigram_keys = dict(trigram_keys)
+
+    def category_mask(self, category: Optional[str]) -> Optional[int]:
+        """Return the bitset for a category, or None if the category is unknown."""
+        return self.category_masks.get(category) if category else None
+
+    def scored_keys(self, term: str, threshold: float) -> List[Tuple[float, int]]:
+        """
+        Return (SequenceMatcher ratio, key id) for keys scoring at least threshold.
+
+        Only keys sharing a trigram with term and whose length allows a ratio of
+        at least threshold (ratio <= 2*min(a, b)/(a + b)) are scored.
+        """
+        if not term or threshold <= 0:
+            candidates = set(range(len(self.keys)))
+        else:
+            n = len(term)
+            min_len = int(n * threshold / (2 - threshold))
+            max_len = int(n * (2 - threshold) / threshold) + 1
+            by_trigram: Set[int] = set()
+            for gram in trigrams(term):
+                by_trigram.update(self.trigram_keys.get(gram, ()))
+            candidates = {k for k in by_trigram if min_len <= len(self.keys[k]) <= max_len}
+
+        # SequenceMatcher caches its analysis of the second sequence, so the term
+        # goes second and only the (short) keys are swapped in
+        matcher = SequenceMatcher(None, "", term)
+        scored = []
+        for key_id in candidates:
+            matcher.set_seq1(self.keys[key_id])
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scored.append((ratio, key_id))
+        return scored
+
+    def best_fuzzy(self, term: str, pool_mask: int, threshold: float) -> Optional[Tuple[int, float]]:
+        """
+        Return (icon id, score) of the icon whose stem or stem word best matches term.
+
+        An icon's score is the best ratio over its stem and its words; ties go to
+        the lowest icon id, matching a linear scan of the pool in list order.
+        """
+        by_score: Dict[float, int] = defaultdict(int)
+        for ratio, key_id in self.scored_keys(term, threshold):
+            by_score[ratio] |= self.key_masks[key_id]
+
+        for score in sorted(by_score, reverse=True):
+            mask = by_score[score] & pool_mask
+            if mask:
+                return lowest_id(mask), score
+        return None
+
+    def words_mask(self, words: Iterable[str]) -> int:
+        """Return icons whose filename contains every one of the (lowercase) words."""
+        mask = self.all_mask
+        for word in words:
+            mask &= self.postings.get(word, 0)
+            if not mask:
+                break
+        return mask
+
+    def rank(self, search_words: Iterable[str], pool_mask: int, limit: int) -> List[int]:
+        """
+        Return up to limit icon ids from the pool, most relevant first.
+
+        Icons score per search word: exact filename word, exact folder word, or a
+        close (trigram-filtered) match on a filename word. Remaining slots are
+        filled with unscored pool icons in list order.
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for word in set(search_words):
+            exact = self.postings.get(word, 0) & pool_mask
+            for icon_id in bit_ids(exact):
+                scores[icon_id] += _FILENAME_WORD_WEIGHT
+            folder = self.folder_postings.get(word, 0) & pool_mask
+            for icon_id in bit_ids(folder):
+                scores[icon_id] += _FOLDER_WORD_WEIGHT
+            fuzzy: Dict[int, float] = {}
+            for ratio, key_id in self.scored_keys(word, _FUZZY_RANK_THRESHOLD):
+                for icon_id in bit_ids(self.key_masks[key_id] & pool_mask & ~exact):
+                    fuzzy[icon_id] = max(fuzzy.get(icon_id, 0.0), ratio)
+            for icon_id, ratio in fuzzy.items():
+                scores[icon_id] += ratio
+
+        ranked = sorted(scores, key=lambda icon_id: (-scores[icon_id], icon_id))[:limit]
+        if len(ranked) < limit:
+            chosen = set(ranked)
+            for icon_id in bit_ids(pool_mask):
+                if icon_id not in chosen:
+                    ranked.append(icon_id)
+                    if len(ranked) >= limit:
+                        break
+        return ranked
@@ -0,0 +1,346 @@
+"""
+Process-lifetime SpellCache/IconCache pair, persisted to disk.
+
+Building the caches means listing every spell in the compendiums and every
+icon under icons/ through Foundry, which takes seconds. SharedCaches keeps one
+loaded pair for the lifetime of the process and snapshots it to disk together
+with a fingerprint of the Foundry world and game system it came from:
+
+- get() returns the in-memory pair immediately. On first use it is loaded from
+  the snapshot if the fingerprint still matches, so a restarted backend does
+  not cold-fetch either.
+- Once the pair is older than the refresh interval (or was loaded from disk),
+  get() schedules a background refresh. The refresh re-lists spells and icons,
+  and only swaps in new caches and rewrites the snapshot when the content
+  actually changed.
+- A different world or system version (fingerprint mismatch) discards the
+  pair and blocks on a fresh fetch, since its UUIDs would be wrong.
+
+Usage (backend, with WebSocket-backed fetchers):
+    shared = SharedCaches.from_env(fetch_spells, fetch_icons, fingerprint=foundry_manager.world_fingerprint)
+    spell_cache, icon_cache = await shared.get()
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .icon_cache import IconCache
+from .spell_cache import SpellCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "output" / "cache" / "foundry"
+DEFAULT_REFRESH_INTERVAL = 600.0  # seconds
+FAILED_REFRESH_RETRY = 60.0  # seconds before retrying a failed background refresh
+SNAPSHOT_FILENAME = "spell_icon_caches.json"
+SNAPSHOT_VERSION = 1
+
+SpellFetcher = Callable[[], Awaitable[List[Dict]]]
+IconFetcher = Callable[[], Awaitable[List[str]]]
+
+
+def _content_hash(spells: List[Dict], icons: List[str]) -> str:
+    """Return an order-independent hash of the cache contents."""
+    payload = json.dumps(
+        {
+            "spells": sorted(spells, key=lambda s: (s.get("name", ""), s.get("uuid", ""))),
+            "icons": sorted(icons),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SharedCaches:
+    """One SpellCache/IconCache pair per process, snapshotted to disk and refreshed in the background."""
+
+    def __init__(
+        self,
+        fetch_spells: SpellFetcher,
+        fetch_icons: IconFetcher,
+        fingerprint: Optional[Callable[[], Optional[str]]] = None,
+        cache_dir: Optional[Path] = None,
+        persist: bool = True,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL
+    ):
+        """
+        Args:
+            fetch_spells: Coroutine function returning spell dicts (name, uuid, type, img, pack).
+                Should raise RuntimeError if the spells cannot be loaded.
+            fetch_icons: Coroutine function returning icon file paths
+            fingerprint: Returns the current world/system fingerprint, or None when unknown
+                (e.g. Foundry not connected yet). None accepts any snapshot.
+            cache_dir: Directory for the snapshot file (defaults to output/cache/foundry)
+            persist: If False, nothing is read from or written to disk
+            refresh_interval: Seconds after which get() triggers a background refresh
+        """
+        self._fetch_spells = fetch_spells
+        self._fetch_icons = fetch_icons
+        self._fingerprint = fingerprint or (lambda: None)
+        self.snapshot_path = Path(cache_dir or DEFAULT_CACHE_DIR) / SNAPSHOT_FILENAME
+        self.persist = persist
+        self.refresh_interval = refresh_interval
+
+        self._spell_cache: Optional[SpellCache] = None
+        self._icon_cache: Optional[IconCache] = None
+        self._loaded_fingerprint: Optional[str] = None
+        self._content_hash: Optional[str] = None
+        self._loaded_at = 0.0
+        self._stale = False
+        self._snapshot_checked = False
+
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.cold_fetches = 0
+        self.snapshot_loads = 0
+        self.refreshes = 0
+
+    @classmethod
+    def from_env(
+        cls,
+        fetch_spells: SpellFetcher,
+        fetch_icons: IconFetcher,
+        fingerprint: Optional[Callable[[], Optional[str]]] = None
+    ) -> "SharedCaches":
+        """
+        Create a SharedCaches configured from the environment:
+
+            FOUNDRY_CACHE                   "false"/"0"/"off"/"no" disables the disk snapshot
+            FOUNDRY_CACHE_DIR               snapshot directory (default: output/cache/foundry)
+            FOUNDRY_CACHE_REFRESH_SECONDS   background refresh interval (default: 600)
+        """
+        persist = os.getenv("FOUNDRY_CACHE", "true").strip().lower() not in ("false", "0", "off", "no")
+        cache_dir = os.getenv("FOUNDRY_CACHE_DIR")
+        refresh_interval = float(os.getenv("FOUNDRY_CACHE_REFRESH_SECONDS", DEFAULT_REFRESH_INTERVAL))
+        return cls(
+            fetch_spells,
+            fetch_icons,
+            fingerprint=fingerprint,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            persist=persist,
+            refresh_interval=refresh_interval,
+        )
+
+    @property
+    def loaded(self) -> bool:
+        """Check if a cache pair is available in memory."""
+        return self._spell_cache is not None and self._icon_cache is not None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Return a lock bound to the running loop (scripts may run several loops in turn)."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def get(self) -> Tuple[SpellCache, IconCache]:
+        """
+        Return the shared (SpellCache, IconCache) pair.
+
+        Returns immediately when a pair is in memory or on disk for the current
+        world; otherwise fetches one (blocking this call only).
+
+        Raises:
+            RuntimeError: If no pair is available and fetching fails
+        """
+        current = self._fingerprint()
+        if self.loaded and current and self._loaded_fingerprint and current != self._loaded_fingerprint:
+            logger.info(f"Foundry world changed ({self._loaded_fingerprint} -> {current}), dropping caches")
+            self._spell_cache = self._icon_cache = None
+
+        self.preload()
+
+        if not self.loaded:
+            async with self._get_lock():
+                if not self.loaded:
+                    self.cold_fetches += 1
+                    await self._refresh_locked()
+            return self._spell_cache, self._icon_cache
+
+        if self._stale or time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.refresh_in_background()
+        return self._spell_cache, self._icon_cache
+
+    def preload(self) -> bool:
+        """
+        Load the disk snapshot once, without fetching (e.g. at backend startup).
+
+        Returns:
+            True if a cache pair is in memory afterwards
+        """
+        if not self.loaded and not self._snapshot_checked:
+            self._snapshot_checked = True
+            self.load_snapshot()
+        return self.loaded
+
+    def load_snapshot(self) -> bool:
+        """
+        Load the pair from the disk snapshot if it matches the current fingerprint.
+
+        A loaded snapshot is marked stale, so the next get() revalidates it in
+        the background.
+
+        Returns:
+            True if the snapshot was loaded
+        """
+        if not self.persist or not self.snapshot_path.exists():
+            return False
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cache snapshot {self.snapshot_path}: {e}")
+            return False
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        current = self._fingerprint()
+        if current and snapshot.get("fingerprint") != current:
+            logger.info(f"Ignoring cache snapshot for {snapshot.get('fingerprint')} (connected: {current})")
+            return False
+
+        self._install(snapshot.get("spells", []), snapshot.get("icons", []), snapshot.get("fingerprint"))
+        # Always revalidate a disk snapshot once; the world may have changed while we were down
+        self._stale = True
+        self.snapshot_loads += 1
+        logger.info(f"Loaded cache snapshot: {self._spell_cache.spell_count} spells, "
+                    f"{self._icon_cache.icon_count} icons")
+        return True
+
+    def _install(self, spells: List[Dict], icons: List[str], fingerprint: Optional[str]):
+        """Swap in a new cache pair built from the given data."""
+        spell_cache = SpellCache()
+        spell_cache.load_from_data(spells)
+        icon_cache = IconCache()
+        icon_cache.load_from_data(icons)
+        self._spell_cache, self._icon_cache = spell_cache, icon_cache
+        self._loaded_fingerprint = fingerprint
+        self._content_hash = _content_hash(spells, icons)
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def _save_snapshot(self, spells: List[Dict], icons: List[str]):
+        """Atomically write the snapshot file."""
+        if not self.persist:
+            return
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self._loaded_fingerprint,
+            "saved_at": time.time(),
+            "spells": spells,
+            "icons": icons,
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not write cache snapshot {self.snapshot_path}: {e}")
+
+    async def refresh(self) -> bool:
+        """
+        Re-fetch spells and icons, swapping in new caches if the content changed.
+
+        Returns:
+            True if the caches changed
+        """
+        async with self._get_lock():
+            return await self._refresh_locked()
+
+    async def _refresh_locked(self) -> bool:
+        fingerprint = self._fingerprint()
+        tasks = [asyncio.ensure_future(self._fetch_spells()), asyncio.ensure_future(self._fetch_icons())]
+        try:
+            spells, icons = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        self.refreshes += 1
+
+        new_hash = _content_hash(spells, icons)
+        if self.loaded and new_hash == self._content_hash and fingerprint == self._loaded_fingerprint:
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            logger.info("Spell/icon caches unchanged")
+            return False
+
+        self._install(spells, icons, fingerprint)
+        self._save_snapshot(spells, icons)
+        logger.info(f"Spell/icon caches refreshed: {self._spell_cache.spell_count} spells, "
+                    f"{self._icon_cache.icon_count} icons")
+        return True
+
+    def refresh_in_background(self) -> Optional[asyncio.Task]:
+        """Schedule refresh() on the running loop unless one is already in flight."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return self._refresh_task
+        self._refresh_task = asyncio.get_running_loop().create_task(self._background_refresh())
+        return self._refresh_task
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Keep serving the current pair and retry shortly
+            self._stale = False
+            self._loaded_at = time.monotonic() - self.refresh_interval + FAILED_REFRESH_RETRY
+            logger.warning(f"Background spell/icon cache refresh failed: {e}")
+
+    def invalidate(self):
+        """Mark the pair stale so the next get() refreshes it in the background."""
+        self._stale = True
+
+    def stats(self) -> dict:
+        """Return load counters and current sizes."""
+        return {
+            "loaded": self.loaded,
+            "fingerprint": self._loaded_fingerprint,
+            "spells": self._spell_cache.spell_count if self._spell_cache else 0,
+            "icons": self._icon_cache.icon_count if self._icon_cache else 0,
+            "cold_fetches": self.cold_fetches,
+            "snapshot_loads": self.snapshot_loads,
+            "refreshes": self.refreshes,
+        }
+
+
+async def _fetch_spells_via_backend() -> List[Dict]:
+    from foundry.items.websocket_fetch import fetch_all_spells_ws_sync
+    return await asyncio.to_thread(fetch_all_spells_ws_sync)
+
+
+async def _fetch_icons_via_backend() -> List[str]:
+    return await asyncio.to_thread(IconCache()._load_via_websocket, ['.webp', '.png', '.jpg', '.svg'])
+
+
+_shared_caches: Optional[SharedCaches] = None
+
+
+def get_shared_caches() -> SharedCaches:
+    """
+    Return the process-wide SharedCaches.
+
+    The backend installs one backed by its own WebSocket connection via
+    set_shared_caches(); elsewhere (scripts) the default fetches through the
+    backend's HTTP API, like SpellCache.load() and IconCache.load().
+    """
+    global _shared_caches
+    if _shared_caches is None:
+        _shared_caches = SharedCaches.from_env(_fetch_spells_via_backend, _fetch_icons_via_backend)
+    return _shared_caches
+
+
+def set_shared_caches(shared: Optional[SharedCaches]):
+    """Replace the process-wide SharedCaches (None re-reads the environment on next use)."""
+    global _shared_caches
+    _shared_caches = shared
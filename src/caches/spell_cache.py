@@ -73,6 +73,10 @@ class SpellCache:
         self._loaded = True
         logger.info(f"Loaded {len(self._spell_by_name)} spells into cache")
 
+    def to_data(self) -> List[Dict]:
+        """Return the cached spell dicts, suitable for load_from_data()."""
+        return list(self._spell_by_name.values())
+
     def get_spell_uuid(self, spell_name: str) -> Optional[str]:
         """
         Get FoundryVTT compendium UUID for a spell by name.
@@ -6,6 +6,7 @@ re-exports common functions from foundry_converters for backwards compatibility.
 """
 
 from .client import FoundryClient
+from .async_client import AsyncFoundryClient
 
 # Re-export journal converters from foundry_converters for backwards compatibility
 from foundry_converters.journals.converter import (
@@ -15,6 +16,7 @@ from foundry_converters.journals.converter import (
 
 __all__ = [
     "FoundryClient",
+    "AsyncFoundryClient",
     # Re-exported from foundry_converters
     "convert_xml_to_journal_data",
     "convert_xml_directory_to_journals",
@@ -2,24 +2,39 @@
 
 import asyncio
 import logging
+import threading
 import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+# Long-lived loop for running coroutines from sync code called inside async code
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting its thread on first use."""
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="foundry-run-async", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
 def _run_async(coro):
     """Run async coroutine from sync context."""
     try:
         asyncio.get_running_loop()  # Check if there's a running loop
-        # We're in an async context, use nest_asyncio or run in thread
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, coro)
-            return future.result()
     except RuntimeError:
         # No running loop, we can use asyncio.run directly
         return asyncio.run(coro)
+    # We're in an async context: run on the shared background loop instead of
+    # starting a new thread and event loop for every call
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
 
 
 class ActorManager:
@@ -132,6 +147,33 @@ class ActorManager:
         Returns:
             Actor UUID
         """
+        actor_data, spell_uuids = self.build_npc_actor(
+            npc, stat_block_uuid=stat_block_uuid, stat_block=stat_block, spell_cache=spell_cache
+        )
+        return self.create_actor(actor_data, spell_uuids=spell_uuids or None, folder=folder)
+
+    def build_npc_actor(
+        self,
+        npc,
+        stat_block_uuid: Optional[str] = None,
+        stat_block: Optional[Any] = None,
+        spell_cache: Optional[Any] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Build the FoundryVTT data for an NPC Actor without creating it.
+
+        See create_npc_actor for how stats are chosen; use create_actors to
+        create many built NPCs in one batch.
+
+        Args:
+            npc: NPC object with description and plot info
+            stat_block_uuid: Optional UUID of creature stat block actor (for linking)
+            stat_block: Optional StatBlock object to use for full stats
+            spell_cache: Optional SpellCache for spell UUID resolution
+
+        Returns:
+            Tuple of (actor_data, spell_uuids)
+        """
         # Build biography HTML
         bio_parts = []
 
@@ -186,8 +228,8 @@ class ActorManager:
                     actor_data.pop("_id", None)
                     actor_data.pop("folder", None)  # Will be set by create_actor
 
-                    logger.info(f"Creating NPC '{npc.name}' with stats copied from '{creature_data.get('name', 'unknown')}'")
-                    return self.create_actor(actor_data, folder=folder)
+                    logger.info(f"Building NPC '{npc.name}' with stats copied from '{creature_data.get('name', 'unknown')}'")
+                    return actor_data, []
             except Exception as e:
                 logger.warning(f"Failed to fetch creature stats for {npc.name}: {e}")
                 logger.warning("Falling back to stat_block conversion or minimal creation")
@@ -218,7 +260,7 @@ class ActorManager:
                     actor_data["system"]["details"] = {}
                 actor_data["system"]["details"]["biography"] = {"value": biography_html}
 
-                return self.create_actor(actor_data, spell_uuids=spell_uuids, folder=folder)
+                return actor_data, list(spell_uuids or [])
 
             except Exception as e:
                 logger.warning(f"Failed to convert stat block for {npc.name}: {e}")
@@ -246,8 +288,8 @@ class ActorManager:
             "items": []
         }
 
-        logger.info(f"Creating minimal NPC actor: {npc.name}")
-        return self.create_actor(actor_data, folder=folder)
+        logger.info(f"Building minimal NPC actor: {npc.name}")
+        return actor_data, []
 
     def create_actor(
         self,
@@ -325,6 +367,56 @@ class ActorManager:
             logger.error(f"Actor creation request failed: {e}")
             raise RuntimeError(f"Failed to create actor: {e}") from e
 
+    def create_actors(
+        self,
+        actors: List[Tuple[Dict[str, Any], List[str]]],
+        folder: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several Actors in one batched request.
+
+        Foundry creates the actors with a single createDocuments call and
+        attaches each actor's spells, so this costs one round trip instead of
+        one (or two, with spells) per actor.
+
+        Args:
+            actors: (actor_data, spell_uuids) pairs, as returned by build_npc_actor
+            folder: Optional folder ID to place every actor in
+
+        Returns:
+            One dict per input actor, in input order, with 'success' and either
+            'uuid'/'name' or 'error'
+
+        Raises:
+            RuntimeError: If the batch request itself fails
+        """
+        if not actors:
+            return []
+
+        endpoint = f"{self.backend_url}/api/foundry/actors/batch"
+        payload: Dict[str, Any] = {
+            "actors": [
+                {"actor": actor_data, "spell_uuids": spell_uuids or []}
+                for actor_data, spell_uuids in actors
+            ]
+        }
+        if folder:
+            payload["folder"] = folder
+
+        try:
+            response = requests.post(endpoint, json=payload, timeout=60 + 2 * len(actors))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Batch actor creation request failed: {e}")
+            raise RuntimeError(f"Failed to create actors: {e}") from e
+
+        if response.status_code != 200:
+            logger.error(f"Failed to create actors: {response.status_code} - {response.text}")
+            raise RuntimeError(f"Failed to create actors: {response.status_code} - {response.text}")
+
+        results = response.json().get("results", [])
+        logger.info(f"Batch created {sum(1 for r in results if r.get('success'))}/{len(actors)} actors")
+        return results
+
     def get_actor(self, actor_uuid: str) -> Dict[str, Any]:
         """
         Retrieve an Actor by UUID.
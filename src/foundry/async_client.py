@@ -0,0 +1,310 @@
+"""Non-blocking FoundryVTT client for async code.
+
+FoundryClient and its managers use blocking requests calls, which stall the
+event loop when called from a coroutine. AsyncFoundryClient offers the same
+operations as coroutines:
+
+- Inside the backend process it calls the backend's routes in-process (no
+  HTTP socket to itself), on the backend's event loop, so requests reach
+  foundry_manager even from a worker thread running its own loop.
+- Elsewhere it uses one pooled httpx.AsyncClient per client instance.
+
+Scripts keep using the synchronous FoundryClient (see FoundryClient.async_client to
+get an async client for the same backend).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .journals import build_journal_payload
+from .scenes import build_scene_data
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND_URL = "http://localhost:8000"
+
+# Keep-alive connections per client (HTTP transport only)
+MAX_CONNECTIONS = 10
+
+
+class _BackendLoopTransport(httpx.AsyncBaseTransport):
+    """ASGI transport into the running backend app, always run on the backend's loop.
+
+    foundry_manager's futures and WebSockets belong to the backend's main loop,
+    so requests made from another loop (e.g. asyncio.run in a worker thread)
+    are handed over to it.
+    """
+
+    def __init__(self, app, push_module):
+        self._inner = httpx.ASGITransport(app=app)
+        self._push = push_module
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        main_loop = self._push.get_main_loop()
+        if main_loop is None or main_loop.is_closed() or main_loop is asyncio.get_running_loop():
+            return await self._inner.handle_async_request(request)
+        future = asyncio.run_coroutine_threadsafe(self._inner.handle_async_request(request), main_loop)
+        return await asyncio.wrap_future(future)
+
+
+def _in_process_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Return a transport into the backend app if this process is the backend."""
+    backend = sys.modules.get("app.main")
+    push_module = sys.modules.get("app.websocket.push")
+    if backend is None or push_module is None or not hasattr(backend, "app"):
+        return None
+    return _BackendLoopTransport(backend.app, push_module)
+
+
+def _error_detail(response: httpx.Response) -> str:
+    """Extract an error message from a non-200 backend response."""
+    try:
+        return response.json().get("detail", f"HTTP {response.status_code}")
+    except (ValueError, AttributeError):
+        return f"HTTP {response.status_code}: {response.text[:200]}"
+
+
+class AsyncFoundryClient:
+    """Async client for FoundryVTT via the WebSocket backend.
+
+    Use as an async context manager, or call aclose() when done, to release
+    pooled connections.
+    """
+
+    def __init__(
+        self,
+        backend_url: Optional[str] = None,
+        in_process: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            backend_url: URL of the FastAPI backend (default: BACKEND_URL env var
+                        or http://localhost:8000)
+            in_process: Call the backend in-process (default: when running
+                        inside the backend)
+            transport: Explicit httpx transport (overrides in_process; for tests)
+        """
+        self.backend_url = backend_url or os.getenv("BACKEND_URL", DEFAULT_BACKEND_URL)
+        backend_transport = _in_process_transport() if in_process is not False and transport is None else None
+        if in_process and backend_transport is None and transport is None:
+            raise RuntimeError("in_process=True requires running inside the backend")
+        self.in_process = backend_transport is not None
+
+        if backend_transport is not None:
+            self._http = httpx.AsyncClient(transport=backend_transport, base_url="http://backend")
+        else:
+            self._http = httpx.AsyncClient(
+                base_url=self.backend_url,
+                transport=transport,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+            )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncFoundryClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _call(
+        self,
+        method: str,
+        path: str,
+        not_found: Optional[str] = None,
+        timeout: float = 30.0,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a request and return the backend's JSON as a result dict.
+
+        Returns:
+            {"success": True, **data} on success
+            {"success": False, "error": "..."} on failure
+        """
+        try:
+            response = await self._http.request(method, path, timeout=timeout, **kwargs)
+        except httpx.HTTPError as e:
+            logger.error(f"{method} {path} failed: {e}")
+            return {"success": False, "error": str(e) or type(e).__name__}
+
+        if response.status_code == 404 and not_found:
+            return {"success": False, "error": not_found}
+        if response.status_code != 200:
+            return {"success": False, "error": _error_detail(response)}
+        try:
+            data = response.json()
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid JSON response: {e}"}
+        if not isinstance(data, dict):
+            return {"success": False, "error": f"Unexpected response type: {type(data).__name__}"}
+        return {"success": True, **data}
+
+    # Connection
+
+    async def is_connected(self) -> bool:
+        """Return True if the backend is running and connected to Foundry."""
+        result = await self._call("GET", "/api/foundry/status", timeout=5.0)
+        return result.get("success", False) and result.get("connected_clients", 0) > 0
+
+    # Files
+
+    async def upload_file(self, local_path: Path, destination: str = "uploaded-maps") -> Dict[str, Any]:
+        """
+        Upload a file to the FoundryVTT world folder.
+
+        Returns:
+            {"success": True, "path": "worlds/.../filename"} on success
+            {"success": False, "error": "..."} on failure
+        """
+        local_path = Path(local_path)
+        if not local_path.exists():
+            return {"success": False, "error": f"File not found: {local_path}"}
+
+        with open(local_path, "rb") as f:
+            logger.debug(f"Uploading {local_path.name} to {destination}")
+            result = await self._call(
+                "POST", "/api/foundry/files/upload",
+                files={"file": (local_path.name, f)},
+                data={"destination": destination},
+                timeout=120.0
+            )
+        if result.get("success"):
+            logger.info(f"Uploaded {local_path.name} to {result.get('path', 'unknown')}")
+        return result
+
+    # Scenes
+
+    async def create_scene(
+        self,
+        name: str,
+        background_image: Optional[str] = None,
+        width: int = 3000,
+        height: int = 2000,
+        grid_size: Optional[int] = 100,
+        walls: Optional[List[Dict[str, Any]]] = None,
+        folder: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a scene; same arguments and result as SceneManager.create_scene."""
+        scene_data = build_scene_data(name, background_image, width, height, grid_size, walls, folder)
+        result = await self._call("POST", "/api/foundry/scene", json={"scene": scene_data}, timeout=60.0)
+        if result.get("success"):
+            logger.info(f"Created scene: {result.get('uuid')}")
+        return result
+
+    async def get_scene(self, scene_uuid: str) -> Dict[str, Any]:
+        """Retrieve a scene by UUID."""
+        return await self._call(
+            "GET", f"/api/foundry/scene/{scene_uuid}", not_found=f"Scene not found: {scene_uuid}"
+        )
+
+    async def delete_scene(self, scene_uuid: str) -> Dict[str, Any]:
+        """Delete a scene by UUID."""
+        return await self._call(
+            "DELETE", f"/api/foundry/scene/{scene_uuid}", not_found=f"Scene not found: {scene_uuid}"
+        )
+
+    # Journals
+
+    async def create_journal_entry(
+        self,
+        name: str,
+        pages: list = None,
+        content: str = None,
+        folder: str = None
+    ) -> Dict[str, Any]:
+        """
+        Create a journal entry; same arguments as JournalManager.create_journal_entry.
+
+        Raises:
+            ValueError: If neither pages nor content is provided.
+            RuntimeError: If the request fails.
+        """
+        payload = build_journal_payload(name, pages, content, folder)
+        result = await self._call("POST", "/api/foundry/journal", json=payload)
+        if not result.get("success"):
+            raise RuntimeError(f"Failed to create journal entry: {result.get('error')}")
+        logger.info(f"Created journal entry: {name} (UUID: {result.get('uuid')})")
+        return result
+
+    async def get_journal(self, journal_uuid: str) -> Dict[str, Any]:
+        """Retrieve a journal entry by UUID."""
+        return await self._call(
+            "GET", f"/api/foundry/journal/{journal_uuid}", not_found=f"Journal not found: {journal_uuid}"
+        )
+
+    async def delete_journal_entry(self, journal_uuid: str) -> Dict[str, Any]:
+        """Delete a journal entry by UUID."""
+        return await self._call(
+            "DELETE", f"/api/foundry/journal/{journal_uuid}", not_found=f"Journal not found: {journal_uuid}"
+        )
+
+    # Actors
+
+    async def create_actor(self, actor_data: Dict[str, Any], folder: Optional[str] = None) -> str:
+        """
+        Create an actor from FoundryVTT actor JSON.
+
+        Returns:
+            Actor UUID
+
+        Raises:
+            RuntimeError: If creation fails
+        """
+        payload: Dict[str, Any] = {"actor": actor_data}
+        if folder:
+            payload["folder"] = folder
+        result = await self._call("POST", "/api/foundry/actor", json=payload, timeout=60.0)
+        if not result.get("success"):
+            raise RuntimeError(f"Failed to create actor: {result.get('error', 'Unknown error')}")
+        logger.info(f"Created actor: {actor_data.get('name', 'Unknown')} (UUID: {result.get('uuid')})")
+        return result["uuid"]
+
+    async def create_actors(
+        self,
+        actors: List[Tuple[Dict[str, Any], List[str]]],
+        folder: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several actors in one batched request; see ActorManager.create_actors.
+
+        Raises:
+            RuntimeError: If the batch request itself fails
+        """
+        if not actors:
+            return []
+        payload: Dict[str, Any] = {
+            "actors": [
+                {"actor": actor_data, "spell_uuids": spell_uuids or []}
+                for actor_data, spell_uuids in actors
+            ]
+        }
+        if folder:
+            payload["folder"] = folder
+        result = await self._call("POST", "/api/foundry/actors/batch", json=payload, timeout=60.0 + 2 * len(actors))
+        if not result.get("success"):
+            raise RuntimeError(f"Failed to create actors: {result.get('error')}")
+        return result.get("results", [])
+
+    async def get_actor(self, actor_uuid: str) -> Dict[str, Any]:
+        """Retrieve an actor by UUID."""
+        return await self._call(
+            "GET", f"/api/foundry/actor/{actor_uuid}", not_found=f"Actor not found: {actor_uuid}"
+        )
+
+    async def delete_actor(self, actor_uuid: str) -> Dict[str, Any]:
+        """Delete an actor by UUID."""
+        return await self._call(
+            "DELETE", f"/api/foundry/actor/{actor_uuid}", not_found=f"Actor not found: {actor_uuid}"
+        )
@@ -10,6 +10,7 @@ from .items.manager import ItemManager
 from .actors import ActorManager
 from .scenes import SceneManager
 from .files import FileManager
+from .async_client import AsyncFoundryClient
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ class FoundryClient:
 
     All operations go through the FastAPI backend which communicates with
     FoundryVTT via WebSocket. The relay server is no longer used.
+
+    Methods block; from async code use AsyncFoundryClient (see async_client()).
     """
 
     def __init__(self, backend_url: Optional[str] = None):
@@ -46,6 +49,15 @@ class FoundryClient:
 
         logger.info(f"Initialized FoundryClient with backend at {self.backend_url}")
 
+    def async_client(self) -> AsyncFoundryClient:
+        """
+        Create a non-blocking client for the same backend.
+
+        Returns:
+            AsyncFoundryClient (close it with aclose() or use it as an async context manager)
+        """
+        return AsyncFoundryClient(backend_url=self.backend_url)
+
     # Journal operations (delegated to JournalManager)
 
     def create_journal_entry(
@@ -210,3 +222,26 @@ class FoundryClient:
             spell_cache=spell_cache,
             folder=folder
         )
+
+    def build_npc_actor(
+        self,
+        npc,
+        stat_block_uuid: Optional[str] = None,
+        stat_block=None,
+        spell_cache=None
+    ) -> tuple[Dict[str, Any], list[str]]:
+        """Build NPC actor data (and spell UUIDs) without creating it."""
+        return self.actors.build_npc_actor(
+            npc,
+            stat_block_uuid=stat_block_uuid,
+            stat_block=stat_block,
+            spell_cache=spell_cache
+        )
+
+    def create_actors(
+        self,
+        actors: list[tuple[Dict[str, Any], list[str]]],
+        folder: Optional[str] = None
+    ) -> list[Dict[str, Any]]:
+        """Create several actors in one batched request."""
+        return self.actors.create_actors(actors, folder=folder)
@@ -7,6 +7,45 @@ from typing import Dict, Any, Optional
 logger = logging.getLogger(__name__)
 
 
+def build_journal_payload(
+    name: str,
+    pages: list = None,
+    content: str = None,
+    folder: str = None
+) -> Dict[str, Any]:
+    """
+    Build the backend request body for a journal entry.
+
+    See JournalManager.create_journal_entry for the arguments.
+
+    Raises:
+        ValueError: If neither pages nor content is provided.
+    """
+    # Build pages array
+    if pages:
+        pages_data = pages
+    elif content is not None:
+        pages_data = [
+            {
+                "name": name,
+                "type": "text",
+                "text": {"content": content}
+            }
+        ]
+    else:
+        raise ValueError("Must provide either 'pages' or 'content'")
+
+    payload = {
+        "name": name,
+        "pages": pages_data
+    }
+
+    if folder:
+        payload["folder"] = folder
+
+    return payload
+
+
 class JournalManager:
     """Manages journal entry operations for FoundryVTT via WebSocket backend.
 
@@ -48,29 +87,9 @@ class JournalManager:
         """
         endpoint = f"{self.backend_url}/api/foundry/journal"
 
-        # Build pages array
-        if pages:
-            pages_data = pages
-        elif content is not None:
-            pages_data = [
-                {
-                    "name": name,
-                    "type": "text",
-                    "text": {"content": content}
-                }
-            ]
-        else:
-            raise ValueError("Must provide either 'pages' or 'content'")
-
-        payload = {
-            "name": name,
-            "pages": pages_data
-        }
-
-        if folder:
-            payload["folder"] = folder
+        payload = build_journal_payload(name, pages, content, folder)
 
-        page_count = len(pages_data)
+        page_count = len(payload["pages"])
         logger.debug(f"Creating journal entry: {name} with {page_count} page(s)")
 
         try:
@@ -8,6 +8,45 @@ from typing import Optional, Dict, Any, List
 logger = logging.getLogger(__name__)
 
 
+def build_scene_data(
+    name: str,
+    background_image: Optional[str] = None,
+    width: int = 3000,
+    height: int = 2000,
+    grid_size: Optional[int] = 100,
+    walls: Optional[List[Dict[str, Any]]] = None,
+    folder: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build FoundryVTT scene data for a battle map.
+
+    See SceneManager.create_scene for the arguments.
+    """
+    scene_data: Dict[str, Any] = {
+        "name": name,
+        "width": width,
+        "height": height,
+        "padding": 0,  # No padding so walls align with (0,0) origin
+        "tokenVision": True,  # Enable token vision for battle maps
+        "globalLight": True,  # Global illumination so tokens can see without light sources
+    }
+
+    if background_image:
+        scene_data["background"] = {"src": background_image}
+        scene_data["thumb"] = background_image  # Use background as thumbnail
+
+    if grid_size is not None:
+        scene_data["grid"] = {"size": grid_size, "type": 1}
+
+    if walls:
+        scene_data["walls"] = walls
+
+    if folder:
+        scene_data["folder"] = folder
+
+    return scene_data
+
+
 class SceneManager:
     """Manages scene operations for FoundryVTT via WebSocket backend.
 
@@ -52,28 +91,7 @@ class SceneManager:
         """
         endpoint = f"{self.backend_url}/api/foundry/scene"
 
-        scene_data: Dict[str, Any] = {
-            "name": name,
-            "width": width,
-            "height": height,
-            "padding": 0,  # No padding so walls align with (0,0) origin
-            "tokenVision": True,  # Enable token vision for battle maps
-            "globalLight": True,  # Global illumination so tokens can see without light sources
-        }
-
-        if background_image:
-            scene_data["background"] = {"src": background_image}
-            scene_data["thumb"] = background_image  # Use background as thumbnail
-
-        if grid_size is not None:
-            scene_data["grid"] = {"size": grid_size, "type": 1}
-
-        if walls:
-            scene_data["walls"] = walls
-
-        if folder:
-            scene_data["folder"] = folder
-
+        scene_data = build_scene_data(name, background_image, width, height, grid_size, walls, folder)
         payload = {"scene": scene_data}
 
         logger.debug(f"Creating scene: {name}")
@@ -7,13 +7,11 @@ depend on SpellCache or any FoundryVTT connection.
 import asyncio
 import json
 import logging
-import os
 import re
 from pathlib import Path
 from typing import Any, Optional, Union
 
 from dotenv import load_dotenv
-from google import genai
 
 from actor_pipeline.models import StatBlock
 from foundry_converters.actors.models import (
@@ -29,7 +27,7 @@ from foundry_converters.actors.models import (
     Spell,
     Trait,
 )
-from util.gemini import generate_content_async
+from util.gemini import generate_content_async, get_client
 
 # Load environment
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -227,7 +225,7 @@ OUTPUT ONLY VALID JSON. No explanations.
 """
 
     # Call Gemini
-    client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+    client = get_client()
     response = await generate_content_async(
         client=client,
         model=model_name,
@@ -335,7 +333,7 @@ Most traits are "passive" unless the description mentions an action type.
 OUTPUT ONLY VALID JSON. No explanations.
 """
 
-        client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+        client = get_client()
         response = await generate_content_async(
             client=client,
             model=model_name,
@@ -415,7 +413,7 @@ PARSING RULES:
 OUTPUT ONLY VALID JSON. No explanations.
 """
 
-    client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+    client = get_client()
     response = await generate_content_async(
         client=client,
         model=model_name,
@@ -515,7 +513,7 @@ PARSING RULES:
 OUTPUT ONLY VALID JSON. No explanations.
 """
 
-    client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
+    client = get_client()
     response = await generate_content_async(
         client=client,
         model=model_name,
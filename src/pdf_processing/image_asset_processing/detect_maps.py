@@ -5,15 +5,17 @@ import fitz
 import io
 from google import genai
 from google.genai import types
-from typing import List
+from typing import List, Optional
 from pdf_processing.image_asset_processing.models import MapDetectionResult
-from util.gemini import create_client
+from pdf_processing.page_store import PdfPageStore
+from util.gemini import create_client, generate_content_async
 
 logger = logging.getLogger(__name__)
 
 GEMINI_MODEL = "gemini-2.0-flash"
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+MAP_DETECTION_DPI = 150  # Render resolution for detection and segmentation
 
 
 async def detect_single_page(client: genai.Client, page_image: bytes, page_num: int) -> MapDetectionResult:
@@ -53,14 +55,11 @@ If no map, respond with JSON:
 
     for attempt in range(MAX_RETRIES):
         try:
-            # Wrap blocking Gemini call in asyncio.to_thread() for true parallelization
-            response = await asyncio.to_thread(
-                client.models.generate_content,
-                model=GEMINI_MODEL,
-                contents=[
-                    types.Part.from_bytes(data=page_image, mime_type="image/png"),
-                    prompt
-                ]
+            response = await generate_content_async(
+                client,
+                GEMINI_MODEL,
+                [types.Part.from_bytes(data=page_image, mime_type="image/png"), prompt],
+                use_cache=False
             )
 
             # Parse JSON response
@@ -118,14 +117,11 @@ NOT A MAP:
 Respond with JSON: {"is_map": true} or {"is_map": false}"""
 
     try:
-        # Wrap blocking Gemini call in asyncio.to_thread() for true parallelization
-        response = await asyncio.to_thread(
-            client.models.generate_content,
-            model=GEMINI_MODEL,
-            contents=[
-                types.Part.from_bytes(data=image_bytes, mime_type="image/png"),
-                prompt
-            ]
+        response = await generate_content_async(
+            client,
+            GEMINI_MODEL,
+            [types.Part.from_bytes(data=image_bytes, mime_type="image/png"), prompt],
+            use_cache=False
         )
 
         import json
@@ -159,31 +155,41 @@ def _render_single_page(pdf_path: str, page_num: int) -> tuple[int, bytes]:
     return (page_num + 1, img_bytes)  # Return 1-indexed page number
 
 
-async def detect_maps_async(pdf_path: str) -> List[MapDetectionResult]:
+async def detect_maps_async(pdf_path: str, page_store: Optional[PdfPageStore] = None) -> List[MapDetectionResult]:
     """
     Detect maps on every page of the given PDF and return per-page detection results.
     
     Parameters:
         pdf_path (str): Filesystem path to the PDF to analyze.
+        page_store (PdfPageStore, optional): Shared page store for pdf_path. Page renders
+            are memoized there so later extraction stages reuse them.
     
     Returns:
         results (List[MapDetectionResult]): A list of MapDetectionResult objects, one entry per PDF page in page order.
     """
     client = create_client()  # 60s timeout for text detection
 
-    # Get page count
-    doc = await asyncio.to_thread(fitz.open, pdf_path)
-    page_count = len(doc)
-    await asyncio.to_thread(doc.close)
-
-    # Render all pages in parallel using thread pool
-    logger.debug(f"Rendering {page_count} pages in parallel...")
+    # Render all pages using thread pool
     import time
     start_render = time.time()
-    render_tasks = [
-        asyncio.to_thread(_render_single_page, pdf_path, page_num)
-        for page_num in range(page_count)
-    ]
+    if page_store is not None:
+        page_count = page_store.page_count
+        logger.debug(f"Rendering {page_count} pages from page store...")
+        render_tasks = [
+            asyncio.to_thread(lambda n=page_num: (n, page_store.render_png(n, dpi=MAP_DETECTION_DPI)))
+            for page_num in range(1, page_count + 1)
+        ]
+    else:
+        # Get page count
+        doc = await asyncio.to_thread(fitz.open, pdf_path)
+        page_count = len(doc)
+        await asyncio.to_thread(doc.close)
+
+        logger.debug(f"Rendering {page_count} pages in parallel...")
+        render_tasks = [
+            asyncio.to_thread(_render_single_page, pdf_path, page_num)
+            for page_num in range(page_count)
+        ]
     page_images = await asyncio.gather(*render_tasks)
     render_time = time.time() - start_render
     logger.debug(f"Rendered {page_count} pages in {render_time:.1f}s")
@@ -201,4 +207,4 @@ async def detect_maps_async(pdf_path: str) -> List[MapDetectionResult]:
     maps_found = sum(1 for r in results if r.has_map)
     logger.info(f"Detection complete: {maps_found}/{len(results)} pages have maps")
 
-    return results
\ No newline at end of file
+    return results
@@ -15,14 +15,19 @@ import logging
 import os
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 import fitz
 
 from config import PROJECT_ROOT
 from logging_config import setup_logging
-from pdf_processing.image_asset_processing.detect_maps import detect_maps_async
-from pdf_processing.image_asset_processing.extract_maps import extract_image_with_pymupdf_async
+from pdf_processing.image_asset_processing.detect_maps import detect_maps_async, MAP_DETECTION_DPI
+from pdf_processing.image_asset_processing.extract_maps import (
+    extract_image_with_pymupdf_async,
+    extract_image_from_page_store_async,
+)
 from pdf_processing.image_asset_processing.segment_maps import segment_with_imagen
 from pdf_processing.image_asset_processing.models import MapMetadata
+from pdf_processing.page_store import PdfPageStore
 
 logger = setup_logging(__name__)
 
@@ -56,6 +61,23 @@ def _check_if_flattened(pdf_path: str, page_num: int) -> tuple[bool, str]:
     return is_flattened, log_msg
 
 
+def _check_if_flattened_in_store(page_store: PdfPageStore, page_num: int) -> tuple[bool, str]:
+    """Same as _check_if_flattened, reading the page from a shared PdfPageStore."""
+    images = page_store.image_xrefs(page_num)
+    page_area = page_store.page_area(page_num)
+
+    if len(images) == 1:
+        try:
+            img_info = page_store.extract_image(images[0][0])
+            img_area = img_info['width'] * img_info['height']
+            if img_area / page_area > 0.8:
+                return True, f"Detected flattened page (single image {img_info['width']}x{img_info['height']} covers {100*img_area/page_area:.0f}% of page)"
+        except Exception:
+            pass
+
+    return False, ""
+
+
 def _render_page_to_image(pdf_path: str, page_num: int) -> bytes:
     """Render PDF page to PNG image (blocking operation, run in thread pool)."""
     doc = fitz.open(pdf_path)
@@ -66,7 +88,8 @@ def _render_page_to_image(pdf_path: str, page_num: int) -> bytes:
     return page_image
 
 
-async def extract_single_page(pdf_path: str, page_num: int, detection, output_dir: str, chapter_name: str = None) -> MapMetadata | None:
+async def extract_single_page(pdf_path: str, page_num: int, detection, output_dir: str, chapter_name: str = None,
+                              page_store: Optional[PdfPageStore] = None) -> MapMetadata | None:
     """Extract map from a single PDF page.
 
     Args:
@@ -75,6 +98,7 @@ async def extract_single_page(pdf_path: str, page_num: int, detection, output_di
         detection: MapDetectionResult for this page
         output_dir: Directory to save extracted map
         chapter_name: Optional chapter name for metadata
+        page_store: Optional shared PdfPageStore for pdf_path (reuses detection renders)
 
     Returns:
         MapMetadata if extraction succeeded, None otherwise
@@ -87,7 +111,10 @@ async def extract_single_page(pdf_path: str, page_num: int, detection, output_di
     )
 
     # Check if page is flattened (run in thread pool to avoid blocking)
-    is_flattened, log_msg = await asyncio.to_thread(_check_if_flattened, pdf_path, page_num)
+    if page_store is not None:
+        is_flattened, log_msg = await asyncio.to_thread(_check_if_flattened_in_store, page_store, page_num)
+    else:
+        is_flattened, log_msg = await asyncio.to_thread(_check_if_flattened, pdf_path, page_num)
     if log_msg:
         logger.info(f"  Page {page_num}: {log_msg}")
 
@@ -96,16 +123,21 @@ async def extract_single_page(pdf_path: str, page_num: int, detection, output_di
     if not is_flattened:
         logger.info(f"  Page {page_num}: Attempting PyMuPDF extraction...")
 
-        # Open PDF in thread pool (blocking operation)
-        doc = await asyncio.to_thread(fitz.open, pdf_path)
-        page = doc[page_num - 1]
+        if page_store is not None:
+            success = await extract_image_from_page_store_async(
+                page_store, page_num, output_path, use_ai_classification=True
+            )
+        else:
+            # Open PDF in thread pool (blocking operation)
+            doc = await asyncio.to_thread(fitz.open, pdf_path)
+            page = doc[page_num - 1]
 
-        success = await extract_image_with_pymupdf_async(
-            page, output_path, use_ai_classification=True
-        )
+            success = await extract_image_with_pymupdf_async(
+                page, output_path, use_ai_classification=True
+            )
 
-        # Close in thread pool
-        await asyncio.to_thread(doc.close)
+            # Close in thread pool
+            await asyncio.to_thread(doc.close)
     else:
         logger.info(f"  Page {page_num}: Skipping PyMuPDF (flattened page), using Imagen segmentation...")
         success = False
@@ -126,7 +158,10 @@ async def extract_single_page(pdf_path: str, page_num: int, detection, output_di
         logger.info(f"  Page {page_num}: PyMuPDF failed, attempting Imagen segmentation...")
 
         # Render page to image (run in thread pool to avoid blocking)
-        page_image = await asyncio.to_thread(_render_page_to_image, pdf_path, page_num)
+        if page_store is not None:
+            page_image = await asyncio.to_thread(page_store.render_png, page_num, MAP_DETECTION_DPI)
+        else:
+            page_image = await asyncio.to_thread(_render_page_to_image, pdf_path, page_num)
 
         try:
             # segment_with_imagen is synchronous, run in thread pool
@@ -145,7 +180,8 @@ async def extract_single_page(pdf_path: str, page_num: int, detection, output_di
     return metadata
 
 
-async def extract_maps_from_pdf(pdf_path: str, output_dir: str, chapter_name: str = None) -> list[MapMetadata]:
+async def extract_maps_from_pdf(pdf_path: str, output_dir: str, chapter_name: str = None,
+                                page_store: Optional[PdfPageStore] = None) -> list[MapMetadata]:
     """
     Extract maps from the given PDF into the output directory using a hybrid extraction pipeline.
     
@@ -153,13 +189,19 @@ async def extract_maps_from_pdf(pdf_path: str, output_dir: str, chapter_name: st
         pdf_path (str): Path to the source PDF file.
         output_dir (str): Directory where extracted map images and metadata will be saved.
         chapter_name (str, optional): Optional chapter identifier to attach to each map's metadata.
+        page_store (PdfPageStore, optional): Shared page store for pdf_path. If omitted, one is
+            opened for the duration of the extraction.
     
     Returns:
         list[MapMetadata]: List of MapMetadata objects for maps that were successfully extracted.
     """
+    if page_store is None:
+        with PdfPageStore(pdf_path) as run_store:
+            return await extract_maps_from_pdf(pdf_path, output_dir, chapter_name, run_store)
+
     # Step 1: Detect which pages have maps
     logger.info(f"Step 1: Detecting maps in {pdf_path}...")
-    detection_results = await detect_maps_async(pdf_path)
+    detection_results = await detect_maps_async(pdf_path, page_store=page_store)
 
     pages_with_maps = [
         (i + 1, result) for i, result in enumerate(detection_results)
@@ -176,7 +218,7 @@ async def extract_maps_from_pdf(pdf_path: str, output_dir: str, chapter_name: st
     logger.info(f"Step 2: Extracting maps from {len(pages_with_maps)} pages in parallel...")
 
     extraction_tasks = [
-        extract_single_page(pdf_path, page_num, detection, output_dir, chapter_name)
+        extract_single_page(pdf_path, page_num, detection, output_dir, chapter_name, page_store=page_store)
         for page_num, detection in pages_with_maps
     ]
 
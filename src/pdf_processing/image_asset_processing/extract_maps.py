@@ -2,7 +2,8 @@
 import logging
 import fitz
 import asyncio
-from src.util.gemini import create_client
+from util.gemini import create_client
+from pdf_processing.page_store import PdfPageStore
 
 logger = logging.getLogger(__name__)
 
@@ -25,27 +26,70 @@ async def extract_image_with_pymupdf_async(page: fitz.Page, output_path: str, us
     Returns:
         bool: `true` if an image was written to output_path (and, when AI classification was enabled, it was classified as a map), `false` otherwise.
     """
-    # Import here to avoid circular dependency
-    from src.pdf_processing.image_asset_processing.detect_maps import is_map_image_async
-
     try:
         images = page.get_images()
         if not images:
             logger.debug(f"No images found on page")
             return False
 
-        # Calculate page area threshold
+        doc = page.parent
         page_area = page.rect.width * page.rect.height
+        return await _save_map_image(
+            [(img_ref[0], lambda xref=img_ref[0]: doc.extract_image(xref)) for img_ref in images],
+            page_area, output_path, use_ai_classification
+        )
+    except Exception as e:
+        logger.error(f"Image extraction failed: {e}")
+        return False
+
+
+async def extract_image_from_page_store_async(page_store: PdfPageStore, page_num: int, output_path: str,
+                                              use_ai_classification: bool = True) -> bool:
+    """
+    Same as extract_image_with_pymupdf_async, but reads page page_num (1-indexed) from a
+    shared PdfPageStore so image xrefs and image bytes are extracted once per run.
+    """
+    try:
+        images = await asyncio.to_thread(page_store.image_xrefs, page_num)
+        if not images:
+            logger.debug(f"No images found on page")
+            return False
+
+        page_area = page_store.page_area(page_num)
+        return await _save_map_image(
+            [(img_ref[0], lambda xref=img_ref[0]: page_store.extract_image(xref)) for img_ref in images],
+            page_area, output_path, use_ai_classification, extract_in_thread=True
+        )
+    except Exception as e:
+        logger.error(f"Image extraction failed: {e}")
+        return False
+
+
+async def _save_map_image(image_refs: list, page_area: float, output_path: str,
+                          use_ai_classification: bool, extract_in_thread: bool = False) -> bool:
+    """
+    Filter a page's images by size, optionally classify them, and save the chosen one.
+
+    Args:
+        image_refs: List of (xref, extract) pairs, where extract() returns an extract_image() dict
+        page_area: Page area in PDF points
+        output_path: File path to write the chosen image to
+        use_ai_classification: Whether to classify candidates with Gemini Vision
+        extract_in_thread: Run extract() in a worker thread (for blocking page-store reads)
+    """
+    # Import here to avoid circular dependency
+    from src.pdf_processing.image_asset_processing.detect_maps import is_map_image_async
+
+    try:
+        # Calculate page area threshold
         area_threshold = page_area * PAGE_AREA_THRESHOLD
 
         # Extract all images meeting size thresholds
-        doc = page.parent
         candidates = []
 
-        for img_ref in images:
-            xref = img_ref[0]
+        for xref, extract in image_refs:
             try:
-                img_info = doc.extract_image(xref)
+                img_info = await asyncio.to_thread(extract) if extract_in_thread else extract()
                 img_width = img_info['width']
                 img_height = img_info['height']
                 img_area = img_width * img_height
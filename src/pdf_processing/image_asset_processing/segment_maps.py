@@ -7,7 +7,7 @@ import io
 from google import genai
 from google.genai import types
 import pytesseract
-from src.util.gemini import create_client, IMAGE_TIMEOUT_MS
+from util.gemini import create_client, get_scheduler, IMAGE_TIMEOUT_MS
 
 logger = logging.getLogger(__name__)
 
@@ -229,10 +229,15 @@ def segment_with_imagen(page_image: bytes, map_type: str, output_path: str, temp
                 response_modalities=["IMAGE"]
             )
 
-            response = client.models.generate_content(
-                model=IMAGEN_MODEL,
-                contents=[preprocessed_pil, prompt],
-                config=config
+            contents = [preprocessed_pil, prompt]
+            response = get_scheduler().call(
+                lambda: client.models.generate_content(
+                    model=IMAGEN_MODEL,
+                    contents=contents,
+                    config=config
+                ),
+                IMAGEN_MODEL,
+                contents=contents
             )
 
             # Extract generated image from response
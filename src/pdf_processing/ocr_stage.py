@@ -0,0 +1,312 @@
+"""
+Batched OCR stage for pages whose embedded text is not legible.
+
+Pages are rasterized once through the shared PdfPageStore, looked up in a
+persistent OCR cache keyed by the sha256 of the rendered page, and the
+remaining pages are sent to Tesseract in batches on one process-wide
+ProcessPoolExecutor sized to the core count (PIL decoding and the tesseract
+subprocess calls do not parallelize under the GIL). Chapters converted
+concurrently share that pool, and its workers are started with forkserver (or
+spawn) rather than forked from the multithreaded caller. Results are written
+back into the store, so later get_legible_text_from_store() calls reuse them.
+
+Usage:
+    ocr_texts = run_ocr_stage(page_store, illegible_pages)
+"""
+
+import concurrent.futures
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pdf_processing.page_store import DEFAULT_OCR_DPI, PdfPageStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_CACHE_DIR = Path(__file__).parent.parent.parent / "output" / "cache" / "ocr"
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_OCR_CACHE_MAX_MB = 256
+DEFAULT_OCR_CACHE_MAX_AGE_DAYS = 30
+# Writes between scans of the cache directory for eviction
+PRUNE_INTERVAL = 64
+
+
+def _ocr_png_batch(png_batch: List[bytes]) -> List[str]:
+    """Run Tesseract on a batch of PNG page renders (executed in a worker process)."""
+    import pytesseract
+    from PIL import Image
+
+    texts = []
+    for png in png_batch:
+        with Image.open(io.BytesIO(png)) as image:
+            texts.append(pytesseract.image_to_string(image))
+    return texts
+
+
+def default_ocr_workers() -> int:
+    """Return the OCR process pool size (OCR_WORKERS env var, else the core count)."""
+    configured = os.getenv("OCR_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the process-wide OCR pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=default_ocr_workers(), mp_context=multiprocessing.get_context(start_method)
+            )
+        return _pool
+
+
+def shutdown_ocr_pool():
+    """Shut down the process-wide OCR pool (a new one is created on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+class OcrCache:
+    """
+    On-disk OCR results keyed by the sha256 of the rendered page PNG.
+
+    Entries older than max_age_seconds are treated as misses, and every
+    PRUNE_INTERVAL writes the directory is pruned: expired entries are deleted,
+    then the least recently used ones until the total is under max_bytes.
+    clear() deletes every entry.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        enabled: bool = True,
+        max_bytes: int = DEFAULT_OCR_CACHE_MAX_MB * 1024 * 1024,
+        max_age_seconds: float = DEFAULT_OCR_CACHE_MAX_AGE_DAYS * 86400
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached text files (defaults to output/cache/ocr)
+            enabled: If False, get() always misses and put() is a no-op
+            max_bytes: Maximum total size of cached text files
+            max_age_seconds: Maximum age of an entry before it is treated as a miss
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_OCR_CACHE_DIR
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._puts_since_prune = PRUNE_INTERVAL  # Prune on the first write
+
+    @staticmethod
+    def make_key(png: bytes) -> str:
+        return hashlib.sha256(png).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached OCR text for key, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_seconds:
+                return None
+            text = path.read_text(encoding="utf-8")
+            # Mark as recently used for eviction
+            os.utime(path)
+            return text
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read OCR cache entry {key[:12]}: {e}")
+            return None
+
+    def put(self, key: str, text: str):
+        """Store OCR text for key."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry {key[:12]}: {e}")
+            return
+
+        with self._lock:
+            self._puts_since_prune += 1
+            if self._puts_since_prune < PRUNE_INTERVAL:
+                return
+            self._puts_since_prune = 0
+        self.prune()
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.cache_dir.glob("*/*.txt"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def prune(self) -> int:
+        """Delete expired entries, then least recently used ones until under max_bytes. Returns the count deleted."""
+        now = time.time()
+        entries = []
+        removed = 0
+        for path, stat in self._entries():
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug(f"OCR cache evicted {removed} entries")
+        return removed
+
+    def clear(self):
+        """Delete every cached entry."""
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+
+
+_ocr_cache: Optional[OcrCache] = None
+
+
+def get_ocr_cache() -> OcrCache:
+    """
+    Return the process-wide OCR cache, configured from the environment:
+
+        OCR_CACHE               "false"/"0"/"off"/"no" disables the cache (default: enabled)
+        OCR_CACHE_DIR           cache directory (default: output/cache/ocr)
+        OCR_CACHE_MAX_MB        maximum cache size in MB (default: 256)
+        OCR_CACHE_MAX_AGE_DAYS  maximum entry age in days (default: 30)
+    """
+    global _ocr_cache
+    if _ocr_cache is None:
+        enabled = os.getenv("OCR_CACHE", "true").strip().lower() not in ("false", "0", "off", "no")
+        cache_dir = os.getenv("OCR_CACHE_DIR")
+        _ocr_cache = OcrCache(
+            Path(cache_dir) if cache_dir else None,
+            enabled=enabled,
+            max_bytes=int(float(os.getenv("OCR_CACHE_MAX_MB", DEFAULT_OCR_CACHE_MAX_MB)) * 1024 * 1024),
+            max_age_seconds=float(os.getenv("OCR_CACHE_MAX_AGE_DAYS", DEFAULT_OCR_CACHE_MAX_AGE_DAYS)) * 86400
+        )
+    return _ocr_cache
+
+
+def set_ocr_cache(cache: Optional[OcrCache]):
+    """Replace the process-wide OCR cache (None re-reads the environment on next use)."""
+    global _ocr_cache
+    _ocr_cache = cache
+
+
+def run_ocr_stage(
+    page_store: PdfPageStore,
+    page_numbers: Iterable[int],
+    dpi: int = DEFAULT_OCR_DPI,
+    max_workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: Optional[OcrCache] = None
+) -> Dict[int, str]:
+    """
+    OCR the given pages in batches on the process-wide OCR pool.
+
+    Args:
+        page_store: Store for the PDF being processed; OCR results are written back into it
+        page_numbers: 1-indexed pages to OCR
+        dpi: Render resolution for OCR
+        max_workers: Maximum batches in flight for this call (defaults to
+            default_ocr_workers()); 1 runs inline
+        batch_size: Pages per worker task
+        cache: OCR cache to use (defaults to get_ocr_cache())
+
+    Returns:
+        Dict mapping page number to OCR text. Pages whose batch failed are omitted,
+        so callers fall back to their own handling for them.
+    """
+    cache = cache or get_ocr_cache()
+    results: Dict[int, str] = {}
+    pending = []  # (page_num, cache_key, png)
+
+    for page_num in sorted(set(page_numbers)):
+        png = page_store.render_png(page_num, dpi=dpi)
+        key = cache.make_key(png)
+        cached = cache.get(key)
+        if cached is not None:
+            results[page_num] = cached
+            page_store.set_ocr_text(page_num, cached, dpi=dpi)
+        else:
+            pending.append((page_num, key, png))
+
+    if not pending:
+        return results
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    workers = min(max_workers or default_ocr_workers(), len(batches))
+    logger.info(f"OCR stage: {len(pending)} page(s) in {len(batches)} batch(es) on {workers} worker(s), "
+                f"{len(results)} from cache")
+
+    def record(batch, texts):
+        for (page_num, key, _), text in zip(batch, texts):
+            results[page_num] = text
+            cache.put(key, text)
+            page_store.set_ocr_text(page_num, text, dpi=dpi)
+
+    if workers <= 1:
+        for batch in batches:
+            try:
+                record(batch, _ocr_png_batch([png for _, _, png in batch]))
+            except Exception as e:
+                logger.error(f"OCR failed for pages {[p for p, _, _ in batch]}: {e}")
+        return results
+
+    executor = _get_ocr_pool()
+    remaining = iter(batches)
+    future_to_batch = {}
+
+    def submit_next():
+        batch = next(remaining, None)
+        if batch is not None:
+            future_to_batch[executor.submit(_ocr_png_batch, [png for _, _, png in batch])] = batch
+
+    for _ in range(workers):
+        submit_next()
+    while future_to_batch:
+        done, _ = concurrent.futures.wait(future_to_batch, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            batch = future_to_batch.pop(future)
+            try:
+                record(batch, future.result())
+            except Exception as e:
+                logger.error(f"OCR failed for pages {[p for p, _, _ in batch]}: {e}")
+            submit_next()
+
+    return results
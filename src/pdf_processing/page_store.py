@@ -0,0 +1,263 @@
+"""
+Shared per-run cache of PDF page data.
+
+A PdfPageStore opens a PDF once and lazily memoizes everything the pipeline
+stages ask for: single-page PDF bytes, embedded text, OCR text, PNG renders at
+a requested DPI and embedded images. Values live in a memory-bounded LRU;
+entries evicted from memory spill to disk and are read back on the next
+request instead of being recomputed.
+
+Usage:
+    with PdfPageStore(pdf_path, cache_dir=run_dir / "page_cache") as store:
+        text = store.embedded_text(1)
+        png = store.render_png(1, dpi=150)
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_OCR_DPI = 72  # Matches fitz's default get_pixmap() resolution
+
+
+class PdfPageStore:
+    """Opened-once PDF with lazily memoized per-page text, renders and images.
+
+    Page numbers are 1-indexed throughout. All PyMuPDF access is serialized with
+    a lock (fitz documents are not thread-safe), so one store can be shared by
+    thread pools and asyncio.to_thread workers.
+    """
+
+    def __init__(
+        self,
+        pdf: Union[str, Path, bytes],
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES
+    ):
+        """
+        Open a PDF for the duration of a run.
+
+        Args:
+            pdf: Path to the PDF, or the PDF as bytes
+            cache_dir: Directory for spilled entries. Spills are kept under a
+                subdirectory named after the PDF hash, so the directory can be
+                reused across runs. If None, a temporary directory is used and
+                removed on close().
+            max_memory_bytes: Memory budget for the in-memory LRU
+        """
+        if isinstance(pdf, (bytes, bytearray)):
+            self.pdf_path = None
+            self.pdf_hash = hashlib.sha256(pdf).hexdigest()
+            self._doc = fitz.open("pdf", pdf)
+        else:
+            self.pdf_path = str(pdf)
+            self.pdf_hash = _hash_file(self.pdf_path)
+            self._doc = fitz.open(self.pdf_path)
+
+        self.page_count = len(self._doc)
+        self.max_memory_bytes = max_memory_bytes
+        self._owns_cache_dir = cache_dir is None
+        base_dir = Path(cache_dir) if cache_dir else Path(tempfile.mkdtemp(prefix="pdf_page_store_"))
+        self._base_dir = base_dir
+        self.spill_dir = base_dir / self.pdf_hash[:16]
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._image_xrefs: Dict[int, List[tuple]] = {}
+        self._image_meta: Dict[int, dict] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.spill_reads = 0
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __enter__(self) -> "PdfPageStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the PDF and drop in-memory entries (temporary spill directories are removed)."""
+        with self._lock:
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self._owns_cache_dir:
+            shutil.rmtree(self._base_dir, ignore_errors=True)
+
+    def _check_page(self, page_num: int) -> int:
+        if not 1 <= page_num <= self.page_count:
+            raise IndexError(f"Page {page_num} out of range (1-{self.page_count})")
+        return page_num - 1
+
+    def _spill_path(self, key: Tuple) -> Path:
+        return self.spill_dir / ("_".join(str(part) for part in key) + ".bin")
+
+    def _get(self, key: Tuple, compute) -> bytes:
+        """Return the value for key from memory, then spill, computing it on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        spill_path = self._spill_path(key)
+        if spill_path.exists():
+            value = spill_path.read_bytes()
+            with self._lock:
+                self.spill_reads += 1
+        else:
+            value = compute()
+            with self._lock:
+                self.misses += 1
+
+        self._remember(key, value)
+        return value
+
+    def _remember(self, key: Tuple, value: bytes):
+        """Insert into the LRU, spilling least recently used entries over the memory budget."""
+        evicted = []
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = value
+            self._memory_bytes += len(value)
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                old_key, old_value = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old_value)
+                evicted.append((old_key, old_value))
+
+        for old_key, old_value in evicted:
+            path = self._spill_path(old_key)
+            if path.exists():
+                continue
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(old_value)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not spill {old_key} to disk: {e}")
+
+    def page_pdf_bytes(self, page_num: int) -> bytes:
+        """Return a single-page PDF containing only the given page."""
+        index = self._check_page(page_num)
+
+        def compute():
+            with self._lock:
+                single = fitz.open()
+                single.insert_pdf(self._doc, from_page=index, to_page=index)
+                data = single.write()
+                single.close()
+            return data
+
+        return self._get(("pdf", page_num), compute)
+
+    def embedded_text(self, page_num: int) -> str:
+        """Return the page's embedded (text layer) text."""
+        index = self._check_page(page_num)
+
+        def compute():
+            with self._lock:
+                return self._doc[index].get_text().encode("utf-8")
+
+        return self._get(("text", page_num), compute).decode("utf-8")
+
+    def render_png(self, page_num: int, dpi: int = 150) -> bytes:
+        """Return the page rendered as PNG bytes at the given DPI."""
+        index = self._check_page(page_num)
+
+        def compute():
+            with self._lock:
+                pix = self._doc[index].get_pixmap(dpi=dpi)
+                return pix.tobytes("png")
+
+        return self._get(("png", page_num, dpi), compute)
+
+    def ocr_text(self, page_num: int, dpi: int = DEFAULT_OCR_DPI) -> str:
+        """Return Tesseract OCR text for the page rendered at the given DPI."""
+        def compute():
+            import pytesseract
+            from PIL import Image
+            image = Image.open(io.BytesIO(self.render_png(page_num, dpi=dpi)))
+            return pytesseract.image_to_string(image).encode("utf-8")
+
+        self._check_page(page_num)
+        return self._get(("ocr", page_num, dpi), compute).decode("utf-8")
+
+    def set_ocr_text(self, page_num: int, text: str, dpi: int = DEFAULT_OCR_DPI):
+        """Record OCR text computed elsewhere (e.g. by the OCR stage) for the page."""
+        self._check_page(page_num)
+        self._remember(("ocr", page_num, dpi), text.encode("utf-8"))
+
+    def page_area(self, page_num: int) -> float:
+        """Return the page area in PDF points."""
+        index = self._check_page(page_num)
+        with self._lock:
+            rect = self._doc[index].rect
+            return rect.width * rect.height
+
+    def image_xrefs(self, page_num: int) -> List[tuple]:
+        """Return the page's image references (as from fitz.Page.get_images())."""
+        index = self._check_page(page_num)
+        with self._lock:
+            if page_num not in self._image_xrefs:
+                self._image_xrefs[page_num] = self._doc[index].get_images()
+            return self._image_xrefs[page_num]
+
+    def extract_image(self, xref: int) -> dict:
+        """Return an embedded image as a fitz.Document.extract_image()-style dict."""
+        def compute():
+            with self._lock:
+                info = self._doc.extract_image(xref)
+                self._image_meta[xref] = {k: v for k, v in info.items() if k != "image"}
+            return info["image"]
+
+        image = self._get(("image", xref), compute)
+        with self._lock:
+            meta = self._image_meta.get(xref)
+        if meta is None:
+            # Image bytes came from a previous run's spill; metadata is cheap to re-read
+            with self._lock:
+                info = self._doc.extract_image(xref)
+                meta = {k: v for k, v in info.items() if k != "image"}
+                self._image_meta[xref] = meta
+        return {**meta, "image": image}
+
+    def stats(self) -> dict:
+        """Return cache counters and current memory usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "spill_reads": self.spill_reads,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+
+def _hash_file(path: str) -> str:
+    """Return the sha256 hex digest of a file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -1,23 +1,23 @@
 import os
 from datetime import datetime
 import concurrent.futures
-import fitz  # PyMuPDF
+import contextvars
 import xml.etree.ElementTree as ET
 import re
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import tempfile
 import time
-import io
-from PIL import Image
-import pytesseract
+import hashlib
 import json
 from collections import Counter
 
 from config import PROJECT_ROOT
 from logging_config import setup_logging, get_run_logger
-from util.gemini import GeminiAPI, GeminiFileContext
+from util.gemini import GeminiAPI, GeminiFileContext, Priority, request_priority
 from pdf_processing.valid_xml_tags import APPROVED_XML_TAGS, get_approved_tags_text
 from models.xml_document import XMLDocument
+from pdf_processing.page_store import PdfPageStore
+from pdf_processing.ocr_stage import run_ocr_stage
 
 # Initialize logger (will be reconfigured in main() with run directory)
 logger = setup_logging(__name__)
@@ -25,6 +25,11 @@ logger = setup_logging(__name__)
 # Global Gemini API instance
 gemini_api = None
 
+# Bump when the page conversion prompt in get_xml_for_page changes, so that
+# resumed runs do not reuse pages produced by an older prompt.
+PAGE_PROMPT_VERSION = "1"
+MANIFEST_FILENAME = "manifest.json"
+
 def validate_xml_tags(xml_content: str, page_number: int = None) -> Tuple[bool, List[str]]:
     """
     Validates that all tags in the XML content are in the approved list.
@@ -212,59 +217,152 @@ def is_text_legible(text: str) -> bool:
 
 def get_legible_text_from_page(page_bytes: bytes, page_number: int, log_dir: str) -> Tuple[str, str]:
     """
-    Tries to extract legible text from a PDF page, first from embedded text,
+    Tries to extract legible text from a single-page PDF, first from embedded text,
     then falling back to local OCR if the embedded text seems corrupted.
     """
+    with PdfPageStore(page_bytes) as page_store:
+        return _extract_legible_text(page_store, 1, page_number, log_dir)
+
+def get_legible_text_from_store(page_store: PdfPageStore, page_number: int, log_dir: str) -> Tuple[str, str]:
+    """
+    Same as get_legible_text_from_page, but reads page_number from a shared PdfPageStore
+    so embedded and OCR text are only extracted once per run.
+    """
+    return _extract_legible_text(page_store, page_number, page_number, log_dir)
+
+def _extract_legible_text(page_store: PdfPageStore, store_page: int, page_number: int, log_dir: str) -> Tuple[str, str]:
+    """Legible-text extraction for store_page, logging under page_number."""
     embedded_text = ""
     # 1. Try embedded text
     try:
-        with fitz.open("pdf", page_bytes) as pdf_page_doc:
-            embedded_text = pdf_page_doc[0].get_text()
-            embedded_output_path = os.path.join(log_dir, "pages", f"page_{page_number}_embedded.txt")
-            with open(embedded_output_path, "w") as f:
-                f.write(embedded_text)
-
-            if is_text_legible(embedded_text):
-                logger.debug(f"Page {page_number}: Using embedded text.")
-                return embedded_text, "embedded"
-            else:
-                logger.warning(f"Page {page_number}: Embedded text seems corrupted. Falling back to OCR.")
+        embedded_text = page_store.embedded_text(store_page)
+        embedded_output_path = os.path.join(log_dir, "pages", f"page_{page_number}_embedded.txt")
+        with open(embedded_output_path, "w") as f:
+            f.write(embedded_text)
+
+        if is_text_legible(embedded_text):
+            logger.debug(f"Page {page_number}: Using embedded text.")
+            return embedded_text, "embedded"
+        else:
+            logger.warning(f"Page {page_number}: Embedded text seems corrupted. Falling back to OCR.")
     except Exception as e:
         logger.warning(f"Could not extract embedded text from page {page_number}: {e}. Falling back to OCR.")
 
     # 2. Fallback to local OCR
     try:
-        with fitz.open("pdf", page_bytes) as pdf_page_doc:
-            pix = pdf_page_doc[0].get_pixmap()
-            img_bytes = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_bytes))
-            ocr_text = pytesseract.image_to_string(image)
-            ocr_output_path = os.path.join(log_dir, "pages", f"page_{page_number}_ocr.txt")
-            os.makedirs(os.path.dirname(ocr_output_path), exist_ok=True)
-            with open(ocr_output_path, "w") as f:
-                f.write(ocr_text)
-            
-            logger.debug(f"Page {page_number}: Using OCR text.")
-            return ocr_text, "ocr"
+        ocr_text = page_store.ocr_text(store_page)
+        ocr_output_path = os.path.join(log_dir, "pages", f"page_{page_number}_ocr.txt")
+        os.makedirs(os.path.dirname(ocr_output_path), exist_ok=True)
+        with open(ocr_output_path, "w") as f:
+            f.write(ocr_text)
+
+        logger.debug(f"Page {page_number}: Using OCR text.")
+        return ocr_text, "ocr"
     except Exception as e:
         logger.error(f"Local OCR failed for page {page_number}: {e}")
         return embedded_text, "ocr_failed"
 
+def ocr_illegible_pages(page_store: PdfPageStore, page_numbers: Optional[Iterable[int]] = None) -> List[int]:
+    """
+    Pre-screens the embedded text of page_numbers (default: every page) and OCRs the
+    illegible ones in a single batched process-pool stage. Results are stored in
+    page_store, so the per-page legible-text extraction that follows does not run
+    Tesseract inline. Returns the page numbers that were sent to OCR.
+    """
+    if page_numbers is None:
+        page_numbers = range(1, page_store.page_count + 1)
+
+    illegible_pages = []
+    for page_num in page_numbers:
+        try:
+            if not is_text_legible(page_store.embedded_text(page_num)):
+                illegible_pages.append(page_num)
+        except Exception as e:
+            logger.warning(f"Could not extract embedded text from page {page_num}: {e}")
+            illegible_pages.append(page_num)
+
+    if illegible_pages:
+        logger.info(f"{len(illegible_pages)} page(s) need OCR: {illegible_pages}")
+        run_ocr_stage(page_store, illegible_pages)
+    return illegible_pages
+
+def get_prompt_version() -> str:
+    """Returns the page prompt version, including a digest of the approved tag list."""
+    tags_digest = hashlib.sha256(get_approved_tags_text().encode("utf-8")).hexdigest()[:12]
+    return f"{PAGE_PROMPT_VERSION}-{tags_digest}"
+
+def load_chapter_manifest(log_dir: str) -> dict:
+    """Loads the chapter manifest from log_dir, or returns an empty dict if missing or unreadable."""
+    manifest_path = os.path.join(log_dir, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def write_chapter_manifest(log_dir: str, manifest: dict):
+    """Atomically writes the chapter manifest to log_dir."""
+    manifest_path = os.path.join(log_dir, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def load_completed_pages(log_dir: str, pdf_hash: str, prompt_version: str) -> Dict[int, str]:
+    """
+    Returns validated page XML from a previous run of the same chapter, keyed by page number.
+
+    Pages are only reused when the manifest records the same source PDF hash and
+    prompt version, the page is marked "ok", and its page_N.xml still parses and
+    passes tag validation.
+    """
+    manifest = load_chapter_manifest(log_dir)
+    if manifest.get("source_pdf_sha256") != pdf_hash or manifest.get("prompt_version") != prompt_version:
+        if manifest:
+            logger.info("Manifest does not match source PDF or prompt version; reprocessing all pages.")
+        return {}
+
+    completed = {}
+    for page_key, entry in manifest.get("pages", {}).items():
+        if entry.get("status") != "ok":
+            continue
+        page_xml_path = os.path.join(log_dir, "pages", f"page_{page_key}.xml")
+        try:
+            with open(page_xml_path) as f:
+                page_xml = f.read()
+            page_root = ET.fromstring(page_xml)
+        except (OSError, ET.ParseError) as e:
+            logger.warning(f"Cannot reuse page {page_key}: {e}")
+            continue
+        if page_root.find('error') is not None or not validate_xml_tags(page_xml, int(page_key))[0]:
+            continue
+        completed[int(page_key)] = page_xml
+    return completed
+
 def get_xml_for_page(page_info: tuple) -> str:
     """
     Converts a single PDF page to XML, using a robust text extraction method.
     Now uses a pre-uploaded PDF file to avoid repeated uploads.
+
+    page_info is (page_source, page_number, log_dir, uploaded_pdf_file), where
+    page_source is either the single-page PDF bytes or a PdfPageStore for the chapter.
     """
-    page_bytes, page_number, log_dir, uploaded_pdf_file = page_info
+    page_source, page_number, log_dir, uploaded_pdf_file = page_info
     display_name = f"page_{page_number}"
     max_retries = 3
     backoff_factor = 2
 
+    if isinstance(page_source, PdfPageStore):
+        page_bytes = page_source.page_pdf_bytes(page_number)
+        legible_text, text_source = get_legible_text_from_store(page_source, page_number, log_dir)
+    else:
+        page_bytes = page_source
+        legible_text, text_source = get_legible_text_from_page(page_bytes, page_number, log_dir)
+
     page_pdf_path = os.path.join(log_dir, "pages", f"{display_name}.pdf")
     with open(page_pdf_path, "wb") as f:
         f.write(page_bytes)
 
-    legible_text, text_source = get_legible_text_from_page(page_bytes, page_number, log_dir)
     pdf_word_count = count_words(legible_text)
 
     for attempt in range(max_retries):
@@ -384,8 +482,11 @@ def get_xml_for_page(page_info: tuple) -> str:
             """
 
             logger.debug(f"Generating XML for {display_name}")
-            # Use the pre-uploaded file
-            response = gemini_api.generate_content(prompt, uploaded_pdf_file)
+            # Use the pre-uploaded file. Retries skip the response cache so a
+            # rejected response is replaced instead of replayed.
+            response = gemini_api.generate_content(
+                prompt, uploaded_pdf_file, refresh_cache=attempt > 0
+            )
 
             cleaned_xml = ""
             if response and response.text:
@@ -466,40 +567,92 @@ def get_xml_for_page(page_info: tuple) -> str:
 
     return "<page><error>An unexpected error occurred in the processing loop.</error></page>"
 
-def process_chapter(pdf_path: str, output_xml_path: str, base_log_dir: str) -> List[str]:
+def _manifest_page_entry(page_xml_str: str) -> dict:
+    """Builds the manifest entry for a converted page."""
+    try:
+        error = ET.fromstring(page_xml_str).find('error')
+    except ET.ParseError as e:
+        return {"status": "failed", "error": f"Failed to parse XML: {e}"}
+    if error is not None:
+        return {"status": "failed", "error": error.text}
+    return {"status": "ok"}
+
+def process_chapter(
+    pdf_path: str,
+    output_xml_path: str,
+    base_log_dir: str,
+    resume: bool = False,
+    page_store: Optional[PdfPageStore] = None
+) -> List[str]:
     """
     Orchestrates the page-by-page conversion and merges them into a single XML file.
     If any page fails, the entire chapter is marked as failed.
     Now optimized to upload the PDF once and reuse it for all pages.
+
+    Page status is recorded in <log_dir>/manifest.json together with the source
+    PDF hash and prompt version. With resume=True, pages already converted by a
+    previous run of the same chapter are reused and only missing or failed pages
+    are sent to Gemini.
+
+    Page text, renders and single-page PDFs come from page_store (a PdfPageStore
+    for pdf_path); one is opened for the chapter if not provided.
     """
+    if page_store is None:
+        with PdfPageStore(pdf_path) as chapter_store:
+            return process_chapter(pdf_path, output_xml_path, base_log_dir, resume, chapter_store)
+
     chapter_name = os.path.splitext(os.path.basename(pdf_path))[0]
     log_dir = os.path.join(base_log_dir, chapter_name)
     os.makedirs(os.path.join(log_dir, "pages"), exist_ok=True)
     page_errors = []
 
     logger.info(f"Starting processing for chapter: {chapter_name} ---")
-    pdf_document = fitz.open(pdf_path)
-    page_infos = []
-    pdf_text = ""
-    for page_num in range(len(pdf_document)):
-        doc = fitz.open()
-        doc.insert_pdf(pdf_document, from_page=page_num, to_page=page_num)
-        page_bytes = doc.write()
-        page_text, _ = get_legible_text_from_page(page_bytes, page_num + 1, log_dir)
-        pdf_text += page_text
-        doc.close()
-        # Don't add uploaded_file yet - will add it after upload
-        page_infos.append((page_bytes, page_num + 1, log_dir, None))
-    pdf_document.close()
-
-    # Upload the full PDF once and reuse for all pages
-    logger.info(f"Uploading full PDF for chapter: {chapter_name}")
-    with GeminiFileContext(gemini_api, pdf_path, f"chapter_{chapter_name}") as uploaded_pdf:
-        # Update all page_infos with the uploaded file
-        page_infos = [(pb, pn, ld, uploaded_pdf) for pb, pn, ld, _ in page_infos]
+    pdf_hash = page_store.pdf_hash
+    prompt_version = get_prompt_version()
+    completed_pages = load_completed_pages(log_dir, pdf_hash, prompt_version) if resume else {}
+
+    # Don't add uploaded_file yet - will add it after upload
+    page_infos = [(page_store, page_num, log_dir, None) for page_num in range(1, page_store.page_count + 1)]
+    pending_infos = [info for info in page_infos if info[1] not in completed_pages]
+
+    # Only pages that still need converting are OCR'd up front
+    ocr_illegible_pages(page_store, [info[1] for info in pending_infos])
+
+    manifest = {
+        "source_pdf": os.path.basename(pdf_path),
+        "source_pdf_sha256": pdf_hash,
+        "prompt_version": prompt_version,
+        "model": getattr(gemini_api, "model_name", None),
+        "pages": {str(page_num): {"status": "ok"} for page_num in completed_pages},
+    }
+    write_chapter_manifest(log_dir, manifest)
+
+    page_xml_by_number = dict(completed_pages)
+    if completed_pages:
+        logger.info(f"Resuming chapter {chapter_name}: reusing {len(completed_pages)} page(s), "
+                    f"converting {len(pending_infos)} page(s)")
+
+    if pending_infos:
+        # Upload the full PDF once and reuse for all pages
+        logger.info(f"Uploading full PDF for chapter: {chapter_name}")
+        with GeminiFileContext(gemini_api, pdf_path, f"chapter_{chapter_name}") as uploaded_pdf:
+            # Update all page_infos with the uploaded file
+            pending_infos = [(pb, pn, ld, uploaded_pdf) for pb, pn, ld, _ in pending_infos]
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+                # Run pages in the caller's context so the Gemini request priority carries over
+                future_to_page = {
+                    executor.submit(contextvars.copy_context().run, get_xml_for_page, info): info[1]
+                    for info in pending_infos
+                }
+                for future in concurrent.futures.as_completed(future_to_page):
+                    page_num = future_to_page[future]
+                    page_xml_str = future.result()
+                    page_xml_by_number[page_num] = page_xml_str
+                    manifest["pages"][str(page_num)] = _manifest_page_entry(page_xml_str)
+                    write_chapter_manifest(log_dir, manifest)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            page_xmls = list(executor.map(get_xml_for_page, page_infos))
+    page_xmls = [page_xml_by_number[info[1]] for info in page_infos]
 
     # Sanitize chapter name for use as XML element name
     xml_element_name = sanitize_xml_element_name(chapter_name)
@@ -540,12 +693,20 @@ def process_chapter(pdf_path: str, output_xml_path: str, base_log_dir: str) -> L
     with open(os.path.join(log_dir, "final_unverified.xml"), "w") as f:
         f.write(final_xml_content)
 
+    if completed_pages:
+        # Word-count verification reads every page; resumed pages are OCR'd only now
+        # (usually OCR cache hits from the run that converted them)
+        ocr_illegible_pages(page_store, sorted(completed_pages))
+
     try:
-        verify_final_word_count(pdf_path, final_xml_content, log_dir)
+        verify_final_word_count(pdf_path, final_xml_content, log_dir, page_store=page_store)
     except ValueError as e:
         if "Final word count mismatch" in str(e):
+            pdf_text = "".join(
+                get_legible_text_from_store(page_store, info[1], log_dir)[0] for info in page_infos
+            )
             final_xml_content = verify_and_correct_xml(final_xml_content, pdf_text, xml_element_name, log_dir)
-            verify_final_word_count(pdf_path, final_xml_content, log_dir)
+            verify_final_word_count(pdf_path, final_xml_content, log_dir, page_store=page_store)
 
     # Validate XML with XMLDocument model before saving
     logger.info(f"Validating final XML with XMLDocument model for chapter: {xml_element_name}")
@@ -564,24 +725,27 @@ def process_chapter(pdf_path: str, output_xml_path: str, base_log_dir: str) -> L
     logger.info(f"Successfully created final merged XML file: {output_xml_path}")
     return page_errors
 
-def verify_final_word_count(pdf_path: str, final_xml_content: str, log_dir: str):
+def verify_final_word_count(pdf_path: str, final_xml_content: str, log_dir: str,
+                            page_store: Optional[PdfPageStore] = None):
     """
     Compares the word count of the source PDF and the generated XML content.
+    Page text is read from page_store when provided (already extracted and OCR'd during
+    conversion); otherwise illegible pages are OCR'd in one batched stage first.
     """
     logger.info("Verifying final word count...")
-    # This function now uses the more robust get_legible_text_from_page for its source
-    pdf_document = fitz.open(pdf_path)
+    if page_store is None:
+        with PdfPageStore(pdf_path) as chapter_store:
+            ocr_illegible_pages(chapter_store)
+            return verify_final_word_count(pdf_path, final_xml_content, log_dir, chapter_store)
+
+    # This function now uses the more robust legible-text extraction for its source
     pdf_text = ""
     page_log_dir = os.path.join(log_dir, "final_verification_pages")
-    os.makedirs(page_log_dir, exist_ok=True)
+    os.makedirs(os.path.join(page_log_dir, "pages"), exist_ok=True)
 
-    for page_num in range(len(pdf_document)):
-        doc = fitz.open()
-        doc.insert_pdf(pdf_document, from_page=page_num, to_page=page_num)
-        page_text, _ = get_legible_text_from_page(doc.write(), page_num + 1, page_log_dir)
+    for page_num in range(1, page_store.page_count + 1):
+        page_text, _ = get_legible_text_from_store(page_store, page_num, page_log_dir)
         pdf_text += page_text
-        doc.close()
-    pdf_document.close()
     pdf_word_count = count_words(pdf_text)
 
     xml_word_count = count_words(final_xml_content)
@@ -644,12 +808,18 @@ def write_error_report(run_dir: str, all_errors: dict):
 
 import argparse
 
-def main(input_dir: str, base_output_dir: str, single_file: str = None):
+def main(input_dir: str, base_output_dir: str, single_file: str = None, resume_run_dir: str = None):
     """
     Main function to convert all PDF files in a directory to XML in parallel.
+
+    If resume_run_dir is given, that existing run directory is reused and each
+    chapter only converts the pages that are missing or failed there.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    run_dir = os.path.join(base_output_dir, timestamp)
+    if resume_run_dir:
+        run_dir = resume_run_dir
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_dir = os.path.join(base_output_dir, timestamp)
     output_dir = os.path.join(run_dir, "documents")
     log_dir = os.path.join(run_dir, "intermediate_logs")
     os.makedirs(output_dir, exist_ok=True)
@@ -666,14 +836,19 @@ def main(input_dir: str, base_output_dir: str, single_file: str = None):
     else:
         pdf_files = sorted([f for f in os.listdir(input_dir) if f.endswith(".pdf")])
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    # Chapter conversion is batch work: its Gemini calls queue behind interactive requests.
+    # The scheduler in util.gemini bounds in-flight requests across all chapters and pages.
+    with request_priority(Priority.BATCH), concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
         future_to_pdf = {}
         for pdf_file in pdf_files:
             pdf_path = os.path.join(input_dir, pdf_file)
             pdf_basename = os.path.splitext(pdf_file)[0]
             xml_output_path = os.path.join(output_dir, f"{pdf_basename}.xml")
             
-            future = executor.submit(process_chapter, pdf_path, xml_output_path, log_dir)
+            future = executor.submit(
+                contextvars.copy_context().run,
+                process_chapter, pdf_path, xml_output_path, log_dir, resume=bool(resume_run_dir)
+            )
             future_to_pdf[future] = pdf_basename
 
         for future in concurrent.futures.as_completed(future_to_pdf):
@@ -701,9 +876,11 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Convert D&D module PDFs to XML.")
     parser.add_argument("--file", type=str, help="The name of a single PDF file to process.")
+    parser.add_argument("--resume", type=str, metavar="RUN_DIR",
+                        help="Resume a previous run directory, reusing pages that already converted.")
     args = parser.parse_args()
 
     pdf_sections_dir = os.path.join(PROJECT_ROOT, "data", "pdf_sections", "Lost_Mine_of_Phandelver")
     runs_output_dir = os.path.join(PROJECT_ROOT, "output", "runs")
 
-    main(pdf_sections_dir, runs_output_dir, single_file=args.file)
+    main(pdf_sections_dir, runs_output_dir, single_file=args.file, resume_run_dir=args.resume)
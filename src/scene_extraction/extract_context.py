@@ -2,11 +2,10 @@
 
 import logging
 import json
-import os
 from dotenv import load_dotenv
-from google import genai
 
 from .models import ChapterContext
+from util.gemini import generate_content_cached, get_client
 
 # Load environment variables
 load_dotenv()
@@ -52,8 +51,9 @@ Return ONLY valid JSON, no markdown formatting:
 """
 
     try:
-        client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
-        response = client.models.generate_content(
+        client = get_client()
+        response = generate_content_cached(
+            client,
             model=GEMINI_MODEL_NAME,
             contents=prompt
         )
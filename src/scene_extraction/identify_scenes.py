@@ -2,12 +2,11 @@
 
 import logging
 import json
-import os
 from typing import List
 from dotenv import load_dotenv
-from google import genai
 
 from .models import Scene, ChapterContext
+from util.gemini import generate_content_cached, get_client
 
 # Load environment variables
 load_dotenv()
@@ -79,8 +78,9 @@ Return ONLY valid JSON array, no markdown formatting:
 """
 
     try:
-        client = genai.Client(api_key=os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY"))
-        response = client.models.generate_content(
+        client = get_client()
+        response = generate_content_cached(
+            client,
             model=GEMINI_MODEL_NAME,
             contents=prompt
         )
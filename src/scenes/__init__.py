@@ -3,7 +3,7 @@
 from .models import GridDetectionResult, SceneCreationResult
 from .detect_gridlines import detect_gridlines
 from .estimate_scene_size import estimate_scene_size
-from .orchestrate import create_scene_from_map, create_scene_from_map_sync
+from .orchestrate import create_scene_from_map, create_scene_from_map_sync, create_scenes_from_maps
 
 __all__ = [
     "GridDetectionResult",
@@ -12,4 +12,5 @@ __all__ = [
     "estimate_scene_size",
     "create_scene_from_map",
     "create_scene_from_map_sync",
+    "create_scenes_from_maps",
 ]
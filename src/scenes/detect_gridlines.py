@@ -1,13 +1,12 @@
 """AI-powered grid detection for battle map images using Gemini Vision."""
 
-import asyncio
 import json
 import logging
 from pathlib import Path
 
 from PIL import Image
 
-from util.gemini import create_client
+from util.gemini import create_client, generate_content_async
 from scenes.models import GridDetectionResult
 
 logger = logging.getLogger(__name__)
@@ -84,11 +83,9 @@ async def detect_gridlines(
 
     # Load image and call API (context manager ensures proper cleanup)
     with Image.open(image_path) as image:
-        # Call Gemini Vision API (synchronous call wrapped in thread)
-        response = await asyncio.to_thread(
-            client.models.generate_content,
-            model=model_name,
-            contents=[image, GRID_DETECTION_PROMPT]
+        # Call Gemini Vision API
+        response = await generate_content_async(
+            client, model_name, [image, GRID_DETECTION_PROMPT], use_cache=False
         )
 
     # Parse response
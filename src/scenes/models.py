@@ -30,6 +30,7 @@ class SceneCreationResult(BaseModel):
     foundry_image_path: str  # "worlds/myworld/uploaded-maps/castle.webp"
     grid_size: Optional[int] = None  # Side length in pixels, None if gridless
     wall_count: int = 0  # Number of walls created
+    wall_count_before_merge: int = 0  # Wall segments before merge_walls snapped and merged them
     image_dimensions: Dict[str, int]  # {"width": 1380, "height": 940}
 
     # Debug artifacts (paths to intermediate files)
@@ -8,6 +8,8 @@ Orchestrates the full pipeline for creating a FoundryVTT scene from a battle map
 5. Upload image to Foundry
 6. Create scene with walls
 7. Return SceneCreationResult
+
+create_scenes_from_maps runs that pipeline for many maps at once.
 """
 
 import asyncio
@@ -15,18 +17,25 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional, Sequence, Union
 
 from PIL import Image
 
 from scenes.models import SceneCreationResult
 from scenes.detect_grid import detect_grid
 from scenes.estimate_scene_size import estimate_scene_size
+from wall_detection.merge_walls import merge_foundry_walls
 from wall_detection.redline_walls import redline_walls
+from wall_detection.tiling import needs_tiling
 from foundry.client import FoundryClient
+from foundry.async_client import AsyncFoundryClient
 
 logger = logging.getLogger(__name__)
 
+# Maps processed at the same time by create_scenes_from_maps. Each one holds a
+# wall detection (Gemini) call, a grid detection thread and an upload.
+DEFAULT_SCENE_CONCURRENCY = 4
+
 
 def _derive_scene_name(image_path: Path) -> str:
     """
@@ -51,15 +60,66 @@ def _derive_scene_name(image_path: Path) -> str:
     return name.title()
 
 
+def _safe_dir_name(scene_name: str) -> str:
+    """Sanitize a scene name for use as a directory name (lowercase, underscores)."""
+    return scene_name.lower().replace(' ', '_').replace("'", "")
+
+
+async def _upload_and_create_scene(
+    client: Union[AsyncFoundryClient, FoundryClient],
+    image_path: Path,
+    **scene_kwargs
+) -> tuple[str, Dict]:
+    """
+    Upload the map image and create the scene using it as background.
+
+    Blocking FoundryClient calls run in a worker thread so they do not stall
+    the event loop.
+
+    Returns:
+        (Foundry image path, scene creation result)
+
+    Raises:
+        RuntimeError: If upload or scene creation fails
+    """
+    logger.info("Step 5: Uploading image to Foundry...")
+    if isinstance(client, AsyncFoundryClient):
+        upload_result = await client.upload_file(image_path, destination="uploaded-maps")
+    else:
+        upload_result = await asyncio.to_thread(client.files.upload_file, image_path, destination="uploaded-maps")
+
+    if not upload_result.get('success'):
+        error_msg = upload_result.get('error', 'Unknown error')
+        raise RuntimeError(f"Failed to upload image: {error_msg}")
+
+    foundry_image_path = upload_result['path']
+    logger.info(f"Image uploaded to: {foundry_image_path}")
+
+    logger.info("Step 6: Creating scene in Foundry...")
+    if isinstance(client, AsyncFoundryClient):
+        scene_result = await client.create_scene(background_image=foundry_image_path, **scene_kwargs)
+    else:
+        scene_result = await asyncio.to_thread(
+            client.scenes.create_scene, background_image=foundry_image_path, **scene_kwargs
+        )
+
+    if not scene_result.get('success'):
+        error_msg = scene_result.get('error', 'Unknown error')
+        raise RuntimeError(f"Failed to create scene: {error_msg}")
+
+    return foundry_image_path, scene_result
+
+
 async def create_scene_from_map(
     image_path: Path,
     name: Optional[str] = None,
     output_dir_base: Path = Path("output/runs"),
-    foundry_client: Optional[FoundryClient] = None,
+    foundry_client: Optional[Union[AsyncFoundryClient, FoundryClient]] = None,
     skip_wall_detection: bool = False,
     skip_grid_detection: bool = False,
     grid_size_override: Optional[int] = None,
-    folder: Optional[str] = None
+    folder: Optional[str] = None,
+    output_dir: Optional[Path] = None
 ) -> SceneCreationResult:
     """
     Create a FoundryVTT scene from a battle map image.
@@ -77,10 +137,14 @@ async def create_scene_from_map(
         image_path: Path to the battle map image
         name: Optional custom scene name (defaults to filename-derived name)
         output_dir_base: Base directory for output (default: output/runs)
-        foundry_client: Optional FoundryClient instance (creates new one if not provided)
+        foundry_client: Optional AsyncFoundryClient or FoundryClient (creates an
+                        AsyncFoundryClient if not provided; a blocking FoundryClient
+                        is run in a worker thread)
         skip_wall_detection: Skip wall detection step (default: False)
         skip_grid_detection: Skip grid detection, use estimate instead (default: False)
         grid_size_override: Use this grid size instead of detection/estimation
+        output_dir: Directory for this scene's artifacts (default:
+                    output_dir_base/<timestamp>/scenes/<scene name>)
 
     Returns:
         SceneCreationResult with scene UUID, name, output paths, and metadata
@@ -99,9 +163,9 @@ async def create_scene_from_map(
 
     # Step 2: Create timestamped output directory
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # Sanitize scene name for directory (replace spaces with underscores, lowercase)
-    safe_name = scene_name.lower().replace(' ', '_').replace("'", "")
-    output_dir = output_dir_base / timestamp / "scenes" / safe_name
+    if output_dir is None:
+        output_dir = output_dir_base / timestamp / "scenes" / _safe_dir_name(scene_name)
+    output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Output directory: {output_dir}")
 
@@ -114,28 +178,42 @@ async def create_scene_from_map(
     walls = []
     debug_artifacts: Dict[str, Path] = {}
     wall_count = 0
+    wall_count_before_merge = 0
     grid_size: Optional[int] = None
 
     # Determine what tasks to run
     run_wall_detection = not skip_wall_detection
     run_grid_detection = not skip_grid_detection and grid_size_override is None
 
-    # Build list of parallel tasks
+    # Large maps are red-lined in tiles whose seams follow the grid, so wall
+    # detection waits for grid detection on those (or uses the override)
+    tiled_walls = run_wall_detection and needs_tiling(image_width, image_height)
+
+    async def grid_detection_task():
+        """Run grid detection and return result."""
+        logger.info("Running grid detection...")
+        # Run CPU-bound grid detection in thread pool
+        return await asyncio.to_thread(detect_grid, image_path)
+
+    grid_task = asyncio.ensure_future(grid_detection_task()) if run_grid_detection else None
+
     async def wall_detection_task():
         """Run wall detection and return result."""
+        grid = None
+        if tiled_walls:
+            if grid_task is not None:
+                logger.info("Large map: waiting for grid detection to align wall tiles...")
+                grid = await grid_task
+            else:
+                grid = {"grid_size": grid_size_override, "x_offset": 0, "y_offset": 0}
         logger.info("Running wall detection...")
         return await redline_walls(
             input_image=image_path,
             save_dir=output_dir / "walls",
-            make_run=False
+            make_run=False,
+            grid=grid
         )
 
-    async def grid_detection_task():
-        """Run grid detection and return result."""
-        logger.info("Running grid detection...")
-        # Run CPU-bound grid detection in thread pool
-        return await asyncio.to_thread(detect_grid, image_path)
-
     # Run tasks in parallel
     tasks = []
     task_names = []
@@ -144,7 +222,7 @@ async def create_scene_from_map(
         tasks.append(wall_detection_task())
         task_names.append('walls')
     if run_grid_detection:
-        tasks.append(grid_detection_task())
+        tasks.append(grid_task)
         task_names.append('grid')
 
     if tasks:
@@ -164,6 +242,7 @@ async def create_scene_from_map(
                     walls_data = json.load(f)
                 walls = walls_data.get('walls', [])
                 wall_count = len(walls)
+                wall_count_before_merge = walls_data.get('total_walls_before_merge', wall_count)
                 # Update image dimensions from walls data if available
                 if 'image_dimensions' in walls_data:
                     image_dimensions = walls_data['image_dimensions']
@@ -182,6 +261,11 @@ async def create_scene_from_map(
                 grid_size = grid_result['grid_size']
                 snr = grid_result.get('snr', 0)
                 logger.info(f"Grid detected: {grid_size}px (SNR: {snr:.3f})")
+                # Tiled wall detection already snapped to the grid it waited for
+                if walls and not tiled_walls:
+                    walls = merge_foundry_walls(walls, grid=grid_result)
+                    wall_count = len(walls)
+                    logger.info(f"Walls snapped to detected grid: {wall_count} walls")
             else:
                 # Fallback to estimation
                 grid_size = estimate_scene_size(image_path)
@@ -198,34 +282,23 @@ async def create_scene_from_map(
         grid_size = estimate_scene_size(image_path)
         logger.info(f"Grid detection: skipped, estimated {grid_size}px")
 
-    # Step 5: Upload image to Foundry
-    logger.info("Step 5: Uploading image to Foundry...")
-    client = foundry_client if foundry_client else FoundryClient()
-
-    upload_result = client.files.upload_file(image_path, destination="uploaded-maps")
-
-    if not upload_result.get('success'):
-        error_msg = upload_result.get('error', 'Unknown error')
-        raise RuntimeError(f"Failed to upload image: {error_msg}")
-
-    foundry_image_path = upload_result['path']
-    logger.info(f"Image uploaded to: {foundry_image_path}")
-
-    # Step 6: Create scene with walls
-    logger.info("Step 6: Creating scene in Foundry...")
-    scene_result = client.scenes.create_scene(
-        name=scene_name,
-        background_image=foundry_image_path,
-        width=image_dimensions['width'],
-        height=image_dimensions['height'],
-        grid_size=grid_size,
-        walls=walls if walls else None,
-        folder=folder
-    )
-
-    if not scene_result.get('success'):
-        error_msg = scene_result.get('error', 'Unknown error')
-        raise RuntimeError(f"Failed to create scene: {error_msg}")
+    # Steps 5 & 6: Upload image and create scene with walls
+    owns_client = foundry_client is None
+    client = foundry_client if foundry_client else AsyncFoundryClient()
+    try:
+        foundry_image_path, scene_result = await _upload_and_create_scene(
+            client,
+            image_path,
+            name=scene_name,
+            width=image_dimensions['width'],
+            height=image_dimensions['height'],
+            grid_size=grid_size,
+            walls=walls if walls else None,
+            folder=folder
+        )
+    finally:
+        if owns_client:
+            await client.aclose()
 
     scene_uuid = scene_result['uuid']
     logger.info(f"Scene created: {scene_uuid}")
@@ -239,6 +312,7 @@ async def create_scene_from_map(
         foundry_image_path=foundry_image_path,
         grid_size=grid_size,
         wall_count=wall_count,
+        wall_count_before_merge=wall_count_before_merge,
         image_dimensions=image_dimensions,
         debug_artifacts=debug_artifacts
     )
@@ -247,11 +321,107 @@ async def create_scene_from_map(
     return result
 
 
+async def create_scenes_from_maps(
+    image_paths: Sequence[Path],
+    names: Optional[Sequence[Optional[str]]] = None,
+    output_dir_base: Path = Path("output/runs"),
+    foundry_client: Optional[Union[AsyncFoundryClient, FoundryClient]] = None,
+    skip_wall_detection: bool = False,
+    skip_grid_detection: bool = False,
+    grid_size_override: Optional[int] = None,
+    folder: Optional[str] = None,
+    max_concurrency: int = DEFAULT_SCENE_CONCURRENCY,
+    on_progress: Optional[Callable[[int, int, str, Optional[BaseException]], None]] = None
+) -> List[Union[SceneCreationResult, BaseException]]:
+    """
+    Create a FoundryVTT scene for each of several battle map images, concurrently.
+
+    Runs create_scene_from_map for up to max_concurrency maps at a time, all
+    sharing one Foundry client. A map that fails does not affect the others.
+    Each map writes to its own directory,
+    output_dir_base/<timestamp>/scenes/<NN>_<scene name>, so maps with the
+    same name do not overwrite each other's wall files.
+
+    Args:
+        image_paths: Battle map images
+        names: Optional scene name per image (None entries use the filename)
+        output_dir_base: Base directory for output (default: output/runs)
+        foundry_client: Optional client shared by all maps (creates one
+                        AsyncFoundryClient if not provided)
+        skip_wall_detection: Skip wall detection for every map
+        skip_grid_detection: Skip grid detection, use estimate instead
+        grid_size_override: Use this grid size for every map
+        folder: Folder ID for the created scenes
+        max_concurrency: Maps processed at the same time
+        on_progress: Called as on_progress(done, total, scene_name, error) after
+                     each map finishes (error is None on success)
+
+    Returns:
+        One entry per image, in input order: the SceneCreationResult, or the
+        exception that map failed with
+    """
+    image_paths = [Path(p) for p in image_paths]
+    names = list(names) if names is not None else [None] * len(image_paths)
+    if len(names) != len(image_paths):
+        raise ValueError(f"Got {len(names)} names for {len(image_paths)} images")
+    if not image_paths:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    total = len(image_paths)
+    done = 0
+
+    owns_client = foundry_client is None
+    client = foundry_client if foundry_client else AsyncFoundryClient()
+    scenes_dir = Path(output_dir_base) / datetime.now().strftime("%Y%m%d_%H%M%S") / "scenes"
+
+    async def create_one(index: int, image_path: Path, name: Optional[str]) -> SceneCreationResult:
+        nonlocal done
+        error: Optional[BaseException] = None
+        # Index prefix keeps maps with the same (sanitized) name apart
+        output_dir = scenes_dir / f"{index + 1:02d}_{_safe_dir_name(name or _derive_scene_name(image_path))}"
+        try:
+            async with semaphore:
+                return await create_scene_from_map(
+                    image_path=image_path,
+                    name=name,
+                    output_dir_base=output_dir_base,
+                    foundry_client=client,
+                    skip_wall_detection=skip_wall_detection,
+                    skip_grid_detection=skip_grid_detection,
+                    grid_size_override=grid_size_override,
+                    folder=folder,
+                    output_dir=output_dir
+                )
+        except Exception as e:
+            error = e
+            logger.warning(f"Failed to create scene from {image_path.name}: {e}")
+            raise
+        finally:
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total, name or _derive_scene_name(image_path), error)
+
+    logger.info(f"Creating {total} scene(s), up to {max_concurrency} at a time")
+    try:
+        results = await asyncio.gather(
+            *(create_one(i, path, name) for i, (path, name) in enumerate(zip(image_paths, names))),
+            return_exceptions=True
+        )
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    created = sum(1 for r in results if isinstance(r, SceneCreationResult))
+    logger.info(f"Created {created}/{total} scene(s)")
+    return results
+
+
 def create_scene_from_map_sync(
     image_path: Path,
     name: Optional[str] = None,
     output_dir_base: Path = Path("output/runs"),
-    foundry_client: Optional[FoundryClient] = None,
+    foundry_client: Optional[Union[AsyncFoundryClient, FoundryClient]] = None,
     skip_wall_detection: bool = False,
     skip_grid_detection: bool = False,
     grid_size_override: Optional[int] = None,
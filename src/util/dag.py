@@ -0,0 +1,332 @@
+"""Run pipeline stages as a dependency graph on a thread pool.
+
+Stages start as soon as the stages they depend on are done, so independent
+work (e.g. map extraction and XML conversion) runs concurrently. A stage can
+stream: if its function is a generator, every yielded item is handed to the
+stages declared ``for_each`` of it right away, instead of after the whole
+stage finishes.
+
+Example:
+    pipeline = DagPipeline([
+        Stage("xml", convert_chapters),                        # generator: yields XML paths
+        Stage("maps", extract_maps),                           # runs alongside "xml"
+        Stage("artwork", make_art, for_each="xml", fatal=False),
+        Stage("journal", upload, depends_on=("xml", "maps", "artwork")),
+    ])
+    result = pipeline.run()
+"""
+
+import contextvars
+import inspect
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# How often a cancellable run checks its cancel event while waiting on stages
+CANCEL_POLL_SECONDS = 0.5
+
+
+@dataclass
+class Stage:
+    """
+    One step of a DagPipeline.
+
+    func is called as func(inputs), or func(item, inputs) for for_each stages,
+    where inputs maps each dependency's name to its result.
+
+    Attributes:
+        name: Unique stage name
+        func: Work to run in a worker thread; may be a generator to stream items
+        depends_on: Stages that must be done before this stage starts
+        for_each: Stage whose items (yielded, or elements of its result) this
+            stage processes one by one as they arrive; its result is the list
+            of per-item results in arrival order
+        fatal: If False, a failure is recorded and dependents still run (a
+            failed stage's result is None; a failed item is left out)
+    """
+    name: str
+    func: Callable[..., Any]
+    depends_on: Sequence[str] = ()
+    for_each: Optional[str] = None
+    fatal: bool = True
+
+    @property
+    def upstream(self) -> List[str]:
+        """Every stage this one waits on or takes items from."""
+        return list(self.depends_on) + ([self.for_each] if self.for_each else [])
+
+
+@dataclass
+class StageEvent:
+    """Progress notification passed to a DagPipeline's on_progress callback."""
+    stage: str
+    # "started", "item" (one for_each item finished), "done" or "failed"
+    status: str
+    items_done: int = 0
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class DagResult:
+    """Outcome of DagPipeline.run()."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    # Non-fatal failures: stage name -> errors (one per failed item for for_each stages)
+    errors: Dict[str, List[BaseException]] = field(default_factory=dict)
+    # First fatal failure, if any; stages not yet started were skipped
+    failed_stage: Optional[str] = None
+    error: Optional[BaseException] = None
+    # The run was cancelled; stages not yet started were skipped
+    cancelled: bool = False
+    # Seconds from a stage's start to its completion
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        return self.failed_stage is None and not self.cancelled
+
+
+class _StageState:
+    def __init__(self):
+        self.status = "pending"  # pending | running | done | failed
+        self.started_at = 0.0
+        self.items: List[Any] = []  # items produced (for stages others run for_each of)
+        self.dispatched = 0  # for_each: items of the source handed to workers
+        self.outstanding = 0  # for_each: items in flight
+        self.item_results: Dict[int, Any] = {}
+        self.main_done = False  # the stage's own function (or the source, for for_each) finished
+        self.result: Any = None
+
+
+class DagPipeline:
+    """Run stages in dependency order, concurrently where possible."""
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[StageEvent], None]] = None
+    ):
+        """
+        Args:
+            stages: Pipeline stages (any order)
+            max_workers: Worker threads shared by all stages and items
+            on_progress: Called on the calling thread for every StageEvent
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dep in stage.upstream:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+        self._check_acyclic()
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+
+    def _check_acyclic(self) -> None:
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name}")
+            visiting.add(name)
+            for dep in self.stages[name].upstream:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _emit(self, event: StageEvent) -> None:
+        if self.on_progress is not None:
+            try:
+                self.on_progress(event)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    def run(self, cancel: Optional[threading.Event] = None) -> DagResult:
+        """
+        Run every stage and wait for all work to finish.
+
+        Context variables (e.g. the Gemini request priority) of the calling
+        thread are visible inside every stage.
+
+        Args:
+            cancel: When set, no further stages or items start, streaming
+                stages stop after their current item, and the result is
+                marked cancelled once running work finishes
+
+        Returns:
+            DagResult with each finished stage's result
+        """
+        result = DagResult()
+        states = {name: _StageState() for name in self.stages}
+        streamed_to = {name: [s.name for s in self.stages.values() if s.for_each == name] for name in self.stages}
+        events: "queue.Queue[tuple]" = queue.Queue()
+        stop = threading.Event()
+        in_flight = 0
+
+        def settled(name: str) -> bool:
+            state = states[name]
+            return state.status == "done" or (state.status == "failed" and not self.stages[name].fatal)
+
+        def inputs_for(stage: Stage) -> Dict[str, Any]:
+            return {dep: result.results.get(dep) for dep in stage.depends_on}
+
+        def run_stage(stage: Stage, inputs: Dict[str, Any]) -> None:
+            try:
+                value = stage.func(inputs)
+                if inspect.isgenerator(value):
+                    items = []
+                    for item in value:
+                        if stop.is_set() or (cancel is not None and cancel.is_set()):
+                            value.close()
+                            break
+                        items.append(item)
+                        events.put(("item", stage.name, item))
+                    value = items
+                    events.put(("done", stage.name, value, True))
+                else:
+                    events.put(("done", stage.name, value, False))
+            except BaseException as e:
+                events.put(("error", stage.name, e))
+
+        def run_item(stage: Stage, index: int, item: Any, inputs: Dict[str, Any]) -> None:
+            try:
+                events.put(("item_done", stage.name, index, stage.func(item, inputs)))
+            except BaseException as e:
+                events.put(("item_error", stage.name, index, e))
+
+        if cancel is not None and cancel.is_set():
+            result.cancelled = True
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag") as pool:
+
+            def submit(fn, *args) -> None:
+                nonlocal in_flight
+                in_flight += 1
+                pool.submit(contextvars.copy_context().run, fn, *args)
+
+            def fail(name: str, error: BaseException) -> None:
+                state = states[name]
+                state.status = "failed"
+                result.timings[name] = time.monotonic() - state.started_at
+                if self.stages[name].fatal:
+                    if result.failed_stage is None:
+                        result.failed_stage, result.error = name, error
+                        stop.set()
+                    logger.error(f"Stage {name} failed: {error}")
+                else:
+                    result.errors.setdefault(name, []).append(error)
+                    result.results[name] = None
+                    logger.warning(f"Stage {name} failed (non-fatal): {error}")
+                self._emit(StageEvent(name, "failed", len(state.item_results), error))
+
+            def finish(name: str, value: Any) -> None:
+                state = states[name]
+                state.status = "done"
+                state.result = value
+                result.results[name] = value
+                result.timings[name] = time.monotonic() - state.started_at
+                self._emit(StageEvent(name, "done", len(state.item_results)))
+
+            def dispatch_items(name: str) -> None:
+                """Hand the source's new items to a running for_each stage; finish it when drained."""
+                stage, state = self.stages[name], states[name]
+                source = states[stage.for_each]
+                if not stop.is_set():
+                    while state.dispatched < len(source.items):
+                        index = state.dispatched
+                        state.dispatched += 1
+                        state.outstanding += 1
+                        submit(run_item, stage, index, source.items[index], inputs_for(stage))
+                source_finished = source.main_done or source.status == "failed"
+                if state.outstanding == 0 and (source_finished or stop.is_set()) and state.status == "running":
+                    finish(name, [state.item_results[i] for i in sorted(state.item_results)])
+                    schedule()
+
+            def schedule() -> None:
+                if stop.is_set():
+                    return
+                for name, stage in self.stages.items():
+                    state = states[name]
+                    if state.status != "pending" or not all(settled(dep) for dep in stage.depends_on):
+                        continue
+                    if stage.for_each and states[stage.for_each].status == "pending":
+                        continue
+                    state.status = "running"
+                    state.started_at = time.monotonic()
+                    self._emit(StageEvent(name, "started"))
+                    if stage.for_each:
+                        dispatch_items(name)
+                    else:
+                        submit(run_stage, stage, inputs_for(stage))
+
+            schedule()
+            while in_flight:
+                try:
+                    event = events.get(timeout=CANCEL_POLL_SECONDS if cancel is not None else None)
+                except queue.Empty:
+                    event = None
+                if cancel is not None and cancel.is_set() and not result.cancelled:
+                    logger.info("Pipeline cancelled; waiting for running stages to finish")
+                    result.cancelled = True
+                    stop.set()
+                if event is None:
+                    continue
+                kind, name = event[0], event[1]
+                state = states[name]
+                if kind == "item":
+                    state.items.append(event[2])
+                    for child in streamed_to[name]:
+                        if states[child].status == "running":
+                            dispatch_items(child)
+                    continue
+
+                in_flight -= 1
+                if kind == "done":
+                    value, streamed = event[2], event[3]
+                    if not streamed and streamed_to[name]:
+                        state.items.extend(value or [])
+                    state.main_done = True
+                    finish(name, value)
+                    for child in streamed_to[name]:
+                        if states[child].status == "running":
+                            dispatch_items(child)
+                    schedule()
+                elif kind == "error":
+                    state.main_done = True
+                    fail(name, event[2])
+                    for child in streamed_to[name]:
+                        if states[child].status == "running":
+                            dispatch_items(child)
+                    schedule()
+                elif kind in ("item_done", "item_error"):
+                    state.outstanding -= 1
+                    if kind == "item_done":
+                        state.item_results[event[2]] = event[3]
+                        self._emit(StageEvent(name, "item", len(state.item_results)))
+                    elif self.stages[name].fatal:
+                        fail(name, event[3])
+                    else:
+                        result.errors.setdefault(name, []).append(event[3])
+                        logger.warning(f"Stage {name} item failed (non-fatal): {event[3]}")
+                    if state.status == "running":
+                        dispatch_items(name)
+
+        return result
@@ -5,9 +5,24 @@ Centralized module for all Google Generative AI (Gemini) interactions.
 """
 
 import asyncio
+import contextvars
+import hashlib
+import heapq
+import itertools
+import logging
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
 import concurrent.futures
-from typing import Optional, Any
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Optional, Any, Callable, Dict, Tuple
+import httpx
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
@@ -20,6 +35,27 @@ DEFAULT_MODEL_NAME = "gemini-2.5-pro"
 DEFAULT_TIMEOUT_MS = 60000  # 60 seconds
 IMAGE_TIMEOUT_MS = 180000   # 180 seconds for image generation
 
+# Response cache defaults (override with GEMINI_CACHE_* environment variables)
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "output" / "cache" / "gemini"
+DEFAULT_CACHE_MAX_MB = 512
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+
+# Scheduler defaults (override with GEMINI_RPM / GEMINI_TPM / GEMINI_MAX_CONCURRENCY /
+# GEMINI_THROTTLE_RETRIES environment variables). 0 means no rate limit.
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_THROTTLE_RETRIES = 3
+
+# Keep-alive pool for each shared client's HTTP transport
+HTTP_POOL_MAX_CONNECTIONS = 64
+HTTP_POOL_MAX_KEEPALIVE = 32
+HTTP_POOL_KEEPALIVE_EXPIRY = 60.0  # seconds
+
+# Threads shared by all blocking Gemini calls made from async code
+# (override with GEMINI_EXECUTOR_WORKERS)
+DEFAULT_EXECUTOR_WORKERS = 32
+
+logger = logging.getLogger(__name__)
+
 
 def create_client(timeout_ms: int = DEFAULT_TIMEOUT_MS) -> genai.Client:
     """
@@ -41,18 +77,1037 @@ def create_client(timeout_ms: int = DEFAULT_TIMEOUT_MS) -> genai.Client:
         # Extended timeout for image generation (180s)
         client = create_client(timeout_ms=180000)
     """
-    api_key = os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY")
+    api_key = _resolve_api_key()
     if not api_key:
         raise ValueError(
             "Gemini API key not found. Set GeminiImageAPI or GEMINI_API_KEY in environment."
         )
 
+    return get_client(timeout_ms=timeout_ms, api_key=api_key)
+
+
+_ClientProfile = Tuple[Optional[str], Optional[int]]
+
+_clients: Dict[_ClientProfile, genai.Client] = {}
+_client_profiles: Dict[int, _ClientProfile] = {}
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientProfile, genai.Client]]" = \
+    weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Load the project .env file once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv(dotenv_path=Path(__file__).parent.parent.parent / ".env")
+        _env_loaded = True
+
+
+def _resolve_api_key(api_key: Optional[str] = None) -> Optional[str]:
+    """Return api_key, or the key from GeminiImageAPI / GEMINI_API_KEY."""
+    if api_key:
+        return api_key
+    _load_env()
+    return os.getenv("GeminiImageAPI") or os.getenv("GEMINI_API_KEY")
+
+
+def _new_client(profile: _ClientProfile) -> genai.Client:
+    api_key, timeout_ms = profile
+    limits = httpx.Limits(
+        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY
+    )
     return genai.Client(
         api_key=api_key,
-        http_options=types.HttpOptions(timeout=timeout_ms)
+        http_options=types.HttpOptions(
+            timeout=timeout_ms,
+            client_args={"limits": limits},
+            async_client_args={"limits": limits}
+        )
     )
 
 
+def get_client(timeout_ms: Optional[int] = None, api_key: Optional[str] = None) -> genai.Client:
+    """
+    Return a long-lived, shared Gemini client for a timeout profile.
+
+    Clients are created once per (API key, timeout) and keep their HTTP
+    connections alive, so repeated calls skip .env loading, client setup and
+    TLS handshakes.
+
+    Args:
+        timeout_ms: Request timeout in milliseconds (None = SDK default, no timeout)
+        api_key: API key (default: GeminiImageAPI or GEMINI_API_KEY from the environment)
+
+    Returns:
+        Shared genai.Client instance
+
+    Example:
+        client = get_client()                    # text generation
+        client = get_client(IMAGE_TIMEOUT_MS)    # image generation
+    """
+    profile = (_resolve_api_key(api_key), timeout_ms)
+    with _clients_lock:
+        client = _clients.get(profile)
+        if client is None:
+            client = _new_client(profile)
+            _clients[profile] = client
+            _client_profiles[id(client)] = profile
+        return client
+
+
+def get_async_client(timeout_ms: Optional[int] = None, api_key: Optional[str] = None) -> Any:
+    """
+    Return the async API (client.aio) of a shared client for the running event loop.
+
+    Async HTTP connections belong to the event loop that opened them, so each
+    loop gets its own pooled client per timeout profile. Must be called from a
+    coroutine.
+
+    Args:
+        timeout_ms: Request timeout in milliseconds (None = SDK default, no timeout)
+        api_key: API key (default: GeminiImageAPI or GEMINI_API_KEY from the environment)
+
+    Returns:
+        genai AsyncClient (use .models.generate_content etc. with await)
+    """
+    loop = asyncio.get_running_loop()
+    profile = (_resolve_api_key(api_key), timeout_ms)
+    with _clients_lock:
+        loop_clients = _loop_clients.setdefault(loop, {})
+        client = loop_clients.get(profile)
+        if client is None:
+            client = _new_client(profile)
+            loop_clients[profile] = client
+        return client.aio
+
+
+def _async_models(client: Any) -> Optional[Any]:
+    """Return the loop-local async models API matching a shared client, or None."""
+    with _clients_lock:
+        profile = _client_profiles.get(id(client))
+    if profile is None or _clients.get(profile) is not client:
+        return None
+    return get_async_client(timeout_ms=profile[1], api_key=profile[0]).models
+
+
+def reset_clients() -> None:
+    """Drop all shared clients (new ones are created on next use)."""
+    with _clients_lock:
+        _clients.clear()
+        _client_profiles.clear()
+        _loop_clients.clear()
+
+
+class _Uncacheable(Exception):
+    """Raised while hashing contents that have no stable digest."""
+
+
+# sha256 of local file bytes, keyed by uploaded file name and URI.
+# Uploaded file names are random per upload, so the cache keys on content instead.
+_file_digests: dict = {}
+
+
+def _file_sha256(file_path: str) -> str:
+    """Return the hex sha256 of a local file."""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _update_digest(hasher: Any, obj: Any) -> None:
+    """
+    Feed a stable representation of request contents/config into hasher.
+
+    Raises:
+        _Uncacheable: If obj has no stable representation (e.g. an unknown object)
+    """
+    if obj is None:
+        hasher.update(b"N")
+    elif isinstance(obj, (bool, int, float)):
+        hasher.update(b"V" + repr(obj).encode())
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        hasher.update(b"S%d:" % len(data) + data)
+    elif isinstance(obj, (bytes, bytearray)):
+        hasher.update(b"B" + hashlib.sha256(obj).digest())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b"[")
+        for item in obj:
+            _update_digest(hasher, item)
+        hasher.update(b"]")
+    elif isinstance(obj, dict):
+        hasher.update(b"{")
+        for key in sorted(obj, key=str):
+            _update_digest(hasher, str(key))
+            _update_digest(hasher, obj[key])
+        hasher.update(b"}")
+    elif isinstance(obj, types.File):
+        digest = (
+            _file_digests.get(obj.name)
+            or _file_digests.get(obj.uri)
+            or obj.sha256_hash
+        )
+        if not digest:
+            raise _Uncacheable(f"No digest known for uploaded file {obj.name}")
+        hasher.update(b"F" + digest.encode())
+    elif hasattr(obj, "model_dump_json"):
+        # Pydantic SDK types (Part, Content, GenerateContentConfig, ...)
+        hasher.update(b"P" + type(obj).__name__.encode())
+        hasher.update(obj.model_dump_json(exclude_none=True).encode())
+    elif hasattr(obj, "tobytes") and hasattr(obj, "mode") and hasattr(obj, "size"):
+        # PIL images
+        hasher.update(f"I{obj.mode}{obj.size}".encode())
+        hasher.update(hashlib.sha256(obj.tobytes()).digest())
+    else:
+        raise _Uncacheable(f"Cannot hash object of type {type(obj).__name__}")
+
+
+class GeminiResponseCache:
+    """
+    Content-addressed on-disk cache for generate_content responses.
+
+    Entries are keyed on a sha256 of model + contents (including attached file
+    digests) + config and stored in a SQLite database. Entries older than
+    max_age_seconds are dropped, and the least recently used entries are
+    evicted once the total payload exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        max_age_seconds: float = DEFAULT_CACHE_MAX_AGE_DAYS * 86400,
+        enabled: bool = True
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory for the SQLite database (default: output/cache/gemini)
+            max_bytes: Maximum total size of stored responses
+            max_age_seconds: Maximum age of an entry before it is treated as a miss
+            enabled: If False, every call bypasses the cache
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.db_path = self.cache_dir / "responses.sqlite3"
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection, creating the database on first use. Caller holds _lock."""
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, created_at REAL, "
+                "accessed_at REAL, size INTEGER, payload BLOB)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def make_key(self, model: str, contents: Any, config: Any = None) -> Optional[str]:
+        """
+        Compute the cache key for a request.
+
+        Returns:
+            Hex digest, or None if the contents cannot be hashed stably
+        """
+        hasher = hashlib.sha256()
+        try:
+            _update_digest(hasher, model)
+            _update_digest(hasher, contents)
+            _update_digest(hasher, config)
+        except _Uncacheable as e:
+            logger.debug(f"Gemini cache bypassed: {e}")
+            return None
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[types.GenerateContentResponse]:
+        """Return the cached response for key, or None on a miss."""
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT created_at, payload FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and time.time() - row[0] > self.max_age_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row:
+                    conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+            if row:
+                response = types.GenerateContentResponse.model_validate_json(
+                    zlib.decompress(row[1])
+                )
+                self._count("hits")
+                return response
+        except (sqlite3.Error, OSError, zlib.error, ValueError) as e:
+            logger.warning(f"Gemini cache read failed: {e}")
+            self._count("errors")
+        self._count("misses")
+        return None
+
+    def put(self, key: str, model: str, response: Any) -> bool:
+        """
+        Store a response. Only complete SDK responses with content are stored,
+        so blocked or empty responses are retried on the next run.
+
+        Returns:
+            True if the response was stored
+        """
+        if not isinstance(response, types.GenerateContentResponse):
+            return False
+        if not response.candidates or not response.candidates[0].content \
+                or not response.candidates[0].content.parts:
+            return False
+
+        try:
+            payload = zlib.compress(response.model_dump_json(exclude_none=True).encode("utf-8"))
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, model, created_at, accessed_at, size, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, now, now, len(payload), payload)
+                )
+                self._evict(conn, now)
+            self._count("stores")
+            return True
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"Gemini cache write failed: {e}")
+            self._count("errors")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evict = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+        logger.debug(f"Gemini cache evicted {len(evict)} entries")
+
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "stores": self.stores,
+                "errors": self.errors,
+            }
+
+
+_response_cache: Optional[GeminiResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> GeminiResponseCache:
+    """
+    Return the process-wide response cache, configured from the environment.
+
+    Environment:
+        GEMINI_CACHE: Set to "false" to disable caching (default: enabled)
+        GEMINI_CACHE_DIR: Cache directory (default: output/cache/gemini)
+        GEMINI_CACHE_MAX_MB: Maximum cache size in MB (default: 512)
+        GEMINI_CACHE_MAX_AGE_DAYS: Maximum entry age in days (default: 30)
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            enabled = os.getenv("GEMINI_CACHE", "true").lower() not in ("0", "false", "off", "no")
+            _response_cache = GeminiResponseCache(
+                cache_dir=os.getenv("GEMINI_CACHE_DIR") or None,
+                max_bytes=int(float(os.getenv("GEMINI_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024),
+                max_age_seconds=float(os.getenv("GEMINI_CACHE_MAX_AGE_DAYS", DEFAULT_CACHE_MAX_AGE_DAYS)) * 86400,
+                enabled=enabled
+            )
+        return _response_cache
+
+
+def set_response_cache(cache: Optional[GeminiResponseCache]) -> None:
+    """Replace the process-wide response cache (None re-reads the environment)."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = cache
+
+
+class Priority(IntEnum):
+    """Scheduling priority for Gemini requests (lower values are served first)."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+_request_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "gemini_request_priority", default=Priority.NORMAL
+)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Run the enclosed Gemini calls at the given priority.
+
+    The priority is stored in a context variable, so it follows asyncio tasks and
+    asyncio.to_thread() calls started inside the block (but not plain thread pools).
+
+    Example:
+        with request_priority(Priority.INTERACTIVE):
+            response = await service.generate_chat_response(message)
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+_THROTTLE_PATTERN = re.compile(r"\b(429|503)\b|RESOURCE_EXHAUSTED|UNAVAILABLE")
+
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    """Return True for rate-limit (429) and overload (503) errors."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code in (429, 503):
+        return True
+    return bool(_THROTTLE_PATTERN.search(str(exc)))
+
+
+def _estimate_tokens(contents: Any) -> int:
+    """Rough input token estimate: ~4 characters per token, 258 per image or file."""
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return len(contents) // 4 + 1
+    if isinstance(contents, (list, tuple)):
+        return sum(_estimate_tokens(item) for item in contents)
+    text = getattr(contents, "text", None)
+    if isinstance(text, str):
+        return len(text) // 4 + 1
+    return 258
+
+
+def _response_tokens(response: Any) -> Optional[int]:
+    """Return the total token count reported by a response, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    return total if isinstance(total, int) else None
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at per_minute / 60 per second."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount can be taken (amounts above capacity wait for a full bucket)."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def consume(self, amount: float, now: float) -> None:
+        """Take amount (may go negative when correcting an underestimate)."""
+        self._refill(now)
+        self.level -= amount
+
+
+class _Ticket:
+    """A queued request waiting for a slot."""
+
+    __slots__ = ("priority", "seq", "estimated_tokens", "enqueued_at", "granted")
+
+    def __init__(self, priority: int, seq: int, estimated_tokens: int):
+        self.priority = priority
+        self.seq = seq
+        self.estimated_tokens = estimated_tokens
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _ModelState:
+    """Rate-limit, concurrency and metrics state for one model."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_concurrency: int):
+        self.requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.waiting: list = []
+
+        self.completed = 0
+        self.throttled = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_queue_depth = 0
+
+
+class GeminiScheduler:
+    """
+    Process-wide governor for Gemini traffic.
+
+    Every request waits for a slot on its model before it is sent:
+    - per-model token buckets enforce requests/min and tokens/min quotas
+    - an AIMD concurrency limit grows by ~1 per window of successful calls and
+      halves on 429/503 responses, which also pause the model for a jittered,
+      exponentially growing cooldown (so throttled callers do not retry in lockstep)
+    - waiting requests are served by priority (Priority.INTERACTIVE first), FIFO
+      within a priority
+
+    Throttled calls are retried through the queue up to max_retries times; all
+    other errors are raised to the caller unchanged.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_THROTTLE_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0
+    ):
+        """
+        Args:
+            requests_per_minute: Default per-model request quota (0 = unlimited)
+            tokens_per_minute: Default per-model token quota (0 = unlimited)
+            max_concurrency: Default per-model ceiling for in-flight requests
+            max_retries: Retries for throttled (429/503) calls
+            backoff_base: First cooldown after a throttle, in seconds
+            backoff_max: Cooldown ceiling, in seconds
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._cond = threading.Condition()
+        self._models: Dict[str, _ModelState] = {}
+        self._seq = itertools.count()
+        # (loop, asyncio.Event) of each coroutine waiting in acquire_async
+        self._async_waiters: set = set()
+
+    def _notify_all(self) -> None:
+        """Wake every waiter, threads and coroutines alike (call with _cond held)."""
+        self._cond.notify_all()
+        for loop, event in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop is closed; it will never wait again
+                pass
+
+    def configure_model(
+        self,
+        model: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None
+    ) -> None:
+        """Set quotas for one model (unspecified values use the scheduler defaults)."""
+        with self._cond:
+            self._models[model] = _ModelState(
+                requests_per_minute if requests_per_minute is not None else self.requests_per_minute,
+                tokens_per_minute if tokens_per_minute is not None else self.tokens_per_minute,
+                max(1, max_concurrency or self.max_concurrency)
+            )
+            self._notify_all()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelState(self.requests_per_minute, self.tokens_per_minute, self.max_concurrency)
+            self._models[model] = state
+        return state
+
+    def _enqueue(self, model: str, priority: Optional[Priority], estimated_tokens: int) -> _Ticket:
+        if priority is None:
+            priority = _request_priority.get()
+        ticket = _Ticket(int(priority), next(self._seq), estimated_tokens)
+        state = self._state(model)
+        heapq.heappush(state.waiting, ticket)
+        state.max_queue_depth = max(state.max_queue_depth, len(state.waiting))
+        return ticket
+
+    def _try_grant(self, model: str, ticket: _Ticket) -> Optional[float]:
+        """
+        Grant the ticket if it is at the head of the queue and limits allow.
+
+        Returns 0.0 when granted, seconds to wait for a rate or cooldown limit,
+        or None when the ticket must wait for another request to finish.
+        """
+        state = self._state(model)
+        if state.waiting[0] is not ticket or state.in_flight >= int(state.limit):
+            return None
+
+        now = time.monotonic()
+        wait = state.blocked_until - now
+        if state.requests is not None:
+            wait = max(wait, state.requests.wait_time(1, now))
+        if state.tokens is not None:
+            wait = max(wait, state.tokens.wait_time(ticket.estimated_tokens, now))
+        if wait > 0:
+            return wait
+
+        heapq.heappop(state.waiting)
+        if state.requests is not None:
+            state.requests.consume(1, now)
+        if state.tokens is not None:
+            state.tokens.consume(ticket.estimated_tokens, now)
+        state.in_flight += 1
+        state.total_wait += now - ticket.enqueued_at
+        ticket.granted = True
+        # The next ticket in line may be grantable too
+        self._notify_all()
+        return 0.0
+
+    def _abandon(self, model: str, ticket: _Ticket) -> None:
+        state = self._state(model)
+        if ticket in state.waiting:
+            state.waiting.remove(ticket)
+            heapq.heapify(state.waiting)
+            self._notify_all()
+
+    def acquire(self, model: str, priority: Optional[Priority] = None, estimated_tokens: int = 0) -> _Ticket:
+        """Block until a slot for model is available; pair with release()."""
+        with self._cond:
+            ticket = self._enqueue(model, priority, estimated_tokens)
+            try:
+                while True:
+                    wait = self._try_grant(model, ticket)
+                    if wait == 0.0:
+                        return ticket
+                    self._cond.wait(timeout=min(wait, 1.0) if wait else 1.0)
+            except BaseException:
+                if not ticket.granted:
+                    self._abandon(model, ticket)
+                raise
+
+    async def acquire_async(
+        self, model: str, priority: Optional[Priority] = None, estimated_tokens: int = 0
+    ) -> _Ticket:
+        """
+        Wait (without blocking the event loop) for a slot for model; pair with release().
+
+        The coroutine sleeps until release() or another grant wakes it, or until
+        a rate or cooldown limit it is waiting on expires.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        event = waiter[1]
+        with self._cond:
+            ticket = self._enqueue(model, priority, estimated_tokens)
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                with self._cond:
+                    # Cleared under the lock, so a wake-up sent after this check is not lost
+                    event.clear()
+                    wait = self._try_grant(model, ticket)
+                if wait == 0.0:
+                    return ticket
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._cond:
+                if not ticket.granted:
+                    self._abandon(model, ticket)
+            raise
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+    def release(self, model: str, ticket: _Ticket, outcome: str = "success", response: Any = None) -> None:
+        """
+        Return a slot and feed the outcome into the AIMD controller.
+
+        Args:
+            model: Model the ticket was acquired for
+            ticket: Ticket returned by acquire()/acquire_async()
+            outcome: "success", "throttled" or "error"
+            response: Successful response, used to correct the token estimate
+        """
+        with self._cond:
+            state = self._state(model)
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+
+            if outcome == "throttled":
+                state.throttled += 1
+                state.consecutive_throttles += 1
+                state.limit = max(1.0, state.limit / 2)
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** (state.consecutive_throttles - 1))
+                state.blocked_until = max(state.blocked_until, now + backoff * random.uniform(0.5, 1.0))
+            elif outcome == "success":
+                state.completed += 1
+                state.consecutive_throttles = 0
+                state.limit = min(float(state.max_concurrency), state.limit + 1.0 / state.limit)
+                actual = _response_tokens(response)
+                if actual is not None and state.tokens is not None:
+                    state.tokens.consume(actual - ticket.estimated_tokens, now)
+            else:
+                state.failed += 1
+
+            self._notify_all()
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        model: str,
+        priority: Optional[Priority] = None,
+        contents: Any = None
+    ) -> Any:
+        """
+        Run a blocking Gemini call once a slot is available.
+
+        Args:
+            fn: Zero-argument callable performing the request
+            model: Model name the request is billed against
+            priority: Request priority (defaults to the request_priority() context)
+            contents: Request contents, used to estimate tokens
+
+        Returns:
+            Whatever fn returns
+        """
+        estimated_tokens = _estimate_tokens(contents)
+        for attempt in range(self.max_retries + 1):
+            ticket = self.acquire(model, priority, estimated_tokens)
+            try:
+                response = fn()
+            except Exception as e:
+                throttled = _is_throttle_error(e)
+                self.release(model, ticket, "throttled" if throttled else "error")
+                if throttled and attempt < self.max_retries:
+                    logger.warning(f"Gemini {model} throttled ({e}); retry {attempt + 1}/{self.max_retries}")
+                    continue
+                raise
+            self.release(model, ticket, "success", response)
+            return response
+
+    async def call_async(
+        self,
+        fn: Callable[[], Any],
+        model: str,
+        priority: Optional[Priority] = None,
+        contents: Any = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Async version of call(). fn may be a coroutine function (cancelled on
+        timeout); otherwise it runs on the shared Gemini executor once a slot is
+        available (see run_blocking).
+
+        Raises:
+            TimeoutError: If timeout (seconds) elapses before fn completes
+        """
+        estimated_tokens = _estimate_tokens(contents)
+        for attempt in range(self.max_retries + 1):
+            ticket = await self.acquire_async(model, priority, estimated_tokens)
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    response = await asyncio.wait_for(fn(), timeout)
+                else:
+                    response = await run_blocking(fn, timeout)
+            except asyncio.CancelledError:
+                self.release(model, ticket, "error")
+                raise
+            except Exception as e:
+                throttled = _is_throttle_error(e)
+                self.release(model, ticket, "throttled" if throttled else "error")
+                if throttled and attempt < self.max_retries:
+                    logger.warning(f"Gemini {model} throttled ({e}); retry {attempt + 1}/{self.max_retries}")
+                    continue
+                raise
+            self.release(model, ticket, "success", response)
+            return response
+
+    def stats(self) -> Dict[str, dict]:
+        """Return per-model queue depth, concurrency and outcome counters."""
+        with self._cond:
+            now = time.monotonic()
+            return {
+                model: {
+                    "queue_depth": len(state.waiting),
+                    "max_queue_depth": state.max_queue_depth,
+                    "in_flight": state.in_flight,
+                    "concurrency_limit": int(state.limit),
+                    "cooldown_seconds": max(0.0, state.blocked_until - now),
+                    "completed": state.completed,
+                    "throttled": state.throttled,
+                    "failed": state.failed,
+                    "avg_wait_seconds": state.total_wait / max(1, state.completed + state.failed + state.throttled),
+                }
+                for model, state in self._models.items()
+            }
+
+
+_scheduler: Optional[GeminiScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> GeminiScheduler:
+    """
+    Return the process-wide Gemini scheduler, configured from the environment.
+
+    Environment:
+        GEMINI_RPM: Requests per minute per model (default: 0 = unlimited)
+        GEMINI_TPM: Tokens per minute per model (default: 0 = unlimited)
+        GEMINI_MAX_CONCURRENCY: In-flight requests per model (default: 16)
+        GEMINI_THROTTLE_RETRIES: Retries for 429/503 responses (default: 3)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = GeminiScheduler(
+                requests_per_minute=float(os.getenv("GEMINI_RPM", 0)),
+                tokens_per_minute=float(os.getenv("GEMINI_TPM", 0)),
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+                max_retries=int(os.getenv("GEMINI_THROTTLE_RETRIES", DEFAULT_THROTTLE_RETRIES))
+            )
+        return _scheduler
+
+
+def set_scheduler(scheduler: Optional[GeminiScheduler]) -> None:
+    """Replace the process-wide scheduler (None re-reads the environment)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+class _ExecutorMetrics:
+    """Counters for blocking calls on the shared Gemini executor."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.abandoned = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.total_abandoned = 0
+
+
+class _BlockingCall:
+    """A blocking call that keeps the executor metrics current when it finishes."""
+
+    def __init__(self, fn: Callable[[], Any], metrics: _ExecutorMetrics):
+        self.fn = fn
+        self.metrics = metrics
+        self.abandoned = False
+
+    def __call__(self) -> Any:
+        try:
+            return self.fn()
+        finally:
+            with self.metrics.lock:
+                self.metrics.in_flight -= 1
+                self.metrics.completed += 1
+                if self.abandoned:
+                    self.metrics.abandoned -= 1
+
+    def abandon(self) -> None:
+        """Mark the call as no longer awaited (it keeps running until it returns)."""
+        with self.metrics.lock:
+            if not self.abandoned:
+                self.abandoned = True
+                self.metrics.abandoned += 1
+                self.metrics.total_abandoned += 1
+
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_metrics = _ExecutorMetrics()
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("GEMINI_EXECUTOR_WORKERS", DEFAULT_EXECUTOR_WORKERS))
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="gemini"
+            )
+        return _executor
+
+
+async def run_blocking(fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a blocking Gemini call on the shared, bounded executor.
+
+    The caller's context (e.g. request_priority) is carried into the worker. If
+    timeout elapses, the caller gets TimeoutError immediately; the worker thread
+    cannot be interrupted, so the call is counted as abandoned until it returns.
+
+    Args:
+        fn: Zero-argument blocking callable
+        timeout: Seconds to wait (None = no limit)
+
+    Returns:
+        Whatever fn returns
+    """
+    call = _BlockingCall(fn, _executor_metrics)
+    with _executor_metrics.lock:
+        _executor_metrics.in_flight += 1
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    try:
+        future = loop.run_in_executor(_get_executor(), context.run, call)
+    except BaseException:
+        with _executor_metrics.lock:
+            _executor_metrics.in_flight -= 1
+        raise
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        call.abandon()
+        with _executor_metrics.lock:
+            _executor_metrics.timed_out += 1
+        raise TimeoutError(f"Gemini API call exceeded timeout of {timeout} seconds")
+    except asyncio.CancelledError:
+        if not future.done():
+            call.abandon()
+        raise
+
+
+def executor_stats() -> dict:
+    """Return in-flight, abandoned and timed-out counts for blocking Gemini calls."""
+    with _executor_metrics.lock:
+        return {
+            "in_flight": _executor_metrics.in_flight,
+            "abandoned": _executor_metrics.abandoned,
+            "total_abandoned": _executor_metrics.total_abandoned,
+            "completed": _executor_metrics.completed,
+            "timed_out": _executor_metrics.timed_out,
+        }
+
+
+def _cached_call(
+    model: str,
+    contents: Any,
+    config: Any,
+    fetch: Callable[[], Any],
+    use_cache: bool = True,
+    refresh_cache: bool = False
+) -> Any:
+    """
+    Serve a request from the response cache; on a miss, run fetch() through the
+    scheduler and store the response.
+    """
+    cache = get_response_cache()
+    key = _cache_key(cache, model, contents, config, use_cache)
+    if key is not None and not refresh_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Gemini cache hit for {model} ({key[:12]})")
+            return cached
+
+    response = get_scheduler().call(fetch, model, contents=contents)
+    if key is not None:
+        cache.put(key, model, response)
+    return response
+
+
+def _cache_key(cache: GeminiResponseCache, model: str, contents: Any, config: Any, use_cache: bool) -> Optional[str]:
+    """Return the cache key for a request, or None (counted as bypassed) if it is not cached."""
+    key = cache.make_key(model, contents, config) if use_cache and cache.enabled else None
+    if key is None:
+        cache._count("bypassed")
+    return key
+
+
+def generate_content_cached(
+    client: genai.Client,
+    model: str,
+    contents: Any,
+    config: Optional[Any] = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False
+) -> Any:
+    """
+    Call client.models.generate_content through the response cache.
+
+    Args:
+        client: genai.Client instance
+        model: Model name (e.g., "gemini-2.0-flash")
+        contents: Content to send to the model
+        config: Optional generation config
+        use_cache: If False, bypass the cache entirely
+        refresh_cache: If True, skip the lookup but store the fresh response
+
+    Returns:
+        Response object with .text attribute
+    """
+    def fetch():
+        if config is None:
+            return client.models.generate_content(model=model, contents=contents)
+        return client.models.generate_content(model=model, contents=contents, config=config)
+
+    return _cached_call(model, contents, config, fetch, use_cache, refresh_cache)
+
+
 class GeminiAPI:
     """Wrapper for Gemini API operations."""
 
@@ -75,12 +1130,7 @@ class GeminiAPI:
 
     def _configure_from_env(self):
         """Load API key from .env file and configure Gemini."""
-        # Try to find .env file (search up to project root)
-        current_dir = Path(__file__).parent
-        project_root = current_dir.parent.parent
-        dotenv_path = project_root / ".env"
-
-        load_dotenv(dotenv_path=dotenv_path)
+        _load_env()
 
         api_key = os.getenv("GeminiImageAPI")
         if not api_key:
@@ -88,12 +1138,12 @@ class GeminiAPI:
                 "Gemini API key not found. Set GeminiImageAPI in .env file or pass api_key parameter."
             )
 
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key=api_key)
         self._configured = True
 
     def _configure_with_key(self, api_key: str):
         """Configure Gemini with provided API key."""
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key=api_key)
         self._configured = True
 
     def create_model(self) -> Any:
@@ -122,7 +1172,14 @@ class GeminiAPI:
         if not self._configured:
             raise RuntimeError("Gemini API not configured.")
 
-        return self.client.files.upload(file=file_path)
+        uploaded = self.client.files.upload(file=file_path)
+        try:
+            digest = _file_sha256(file_path)
+            _file_digests[uploaded.name] = digest
+            _file_digests[uploaded.uri] = digest
+        except (OSError, TypeError, AttributeError):
+            pass
+        return uploaded
 
     def delete_file(self, file_name: str):
         """
@@ -136,14 +1193,26 @@ class GeminiAPI:
 
         self.client.files.delete(name=file_name)
 
-    def generate_content(self, prompt: str, file_obj: Optional[Any] = None, timeout: float = 120.0) -> Any:
+    def generate_content(
+        self,
+        prompt: str,
+        file_obj: Optional[Any] = None,
+        timeout: float = 120.0,
+        use_cache: bool = True,
+        refresh_cache: bool = False
+    ) -> Any:
         """
         Generate content using Gemini.
 
+        Responses are served from the persistent response cache when the
+        model, prompt and attached file are identical to a previous call.
+
         Args:
             prompt: Text prompt
             file_obj: Optional file object (from upload_file)
             timeout: Timeout in seconds (default: 120 seconds / 2 minutes)
+            use_cache: If False, bypass the response cache
+            refresh_cache: If True, skip the cache lookup but store the new response
 
         Returns:
             Response object with .text attribute
@@ -159,20 +1228,27 @@ class GeminiAPI:
         else:
             contents = [prompt]
 
-        # Wrap the synchronous API call with a timeout
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(
-                self.client.models.generate_content,
-                model=self.model_name,
-                contents=contents
-            )
+        # The SDK enforces the timeout on the HTTP request itself, so a slow call
+        # is aborted rather than left running in a background thread
+        config = types.GenerateContentConfig(
+            http_options=types.HttpOptions(timeout=int(timeout * 1000))
+        )
+
+        def fetch():
             try:
-                return future.result(timeout=timeout)
-            except concurrent.futures.TimeoutError:
-                future.cancel()
+                return self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=config
+                )
+            except httpx.TimeoutException as e:
+                with _executor_metrics.lock:
+                    _executor_metrics.timed_out += 1
                 raise TimeoutError(
                     f"Gemini API call exceeded timeout of {timeout} seconds"
-                )
+                ) from e
+
+        return _cached_call(self.model_name, contents, None, fetch, use_cache, refresh_cache)
 
 
 class GeminiFileContext:
@@ -225,25 +1301,35 @@ async def generate_content_async(
     client: genai.Client,
     model: str,
     contents: Any,
-    config: Optional[dict] = None
+    config: Optional[dict] = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+    timeout: Optional[float] = None
 ) -> Any:
     """
-    Async wrapper for generate_content using asyncio.to_thread.
+    Async generate_content through the response cache and scheduler.
 
-    The google.genai library only provides synchronous generate_content().
-    This wrapper allows async code to call it without blocking the event loop.
+    For shared clients (from get_client/create_client) the request is sent with
+    the SDK's native async API on a pooled client for the running event loop.
+    Other clients fall back to running the synchronous call on the shared Gemini
+    executor (see run_blocking), which also handles the response cache I/O.
+    Responses go through the persistent response cache (see generate_content_cached),
+    and requests wait for a scheduler slot on the event loop rather than in a thread.
 
     Args:
         client: genai.Client instance
         model: Model name (e.g., "gemini-2.5-pro")
         contents: Content to send to the model
         config: Optional generation config dict
+        use_cache: If False, bypass the response cache
+        refresh_cache: If True, skip the cache lookup but store the new response
+        timeout: Seconds before the request is cancelled with TimeoutError (None = no limit)
 
     Returns:
         Response object with .text attribute
 
     Example:
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        client = get_client()
         response = await generate_content_async(
             client=client,
             model="gemini-2.5-pro",
@@ -251,9 +1337,23 @@ async def generate_content_async(
             config={'temperature': 0.7}
         )
     """
-    return await asyncio.to_thread(
-        client.models.generate_content,
-        model=model,
-        contents=contents,
-        config=config
-    )
+    aio_models = _async_models(client)
+    if aio_models is not None:
+        async def fetch():
+            return await aio_models.generate_content(model=model, contents=contents, config=config)
+    else:
+        def fetch():
+            return client.models.generate_content(model=model, contents=contents, config=config)
+
+    cache = get_response_cache()
+    key = await run_blocking(lambda: _cache_key(cache, model, contents, config, use_cache))
+    if key is not None and not refresh_cache:
+        cached = await run_blocking(lambda: cache.get(key))
+        if cached is not None:
+            logger.debug(f"Gemini cache hit for {model} ({key[:12]})")
+            return cached
+
+    response = await get_scheduler().call_async(fetch, model, contents=contents, timeout=timeout)
+    if key is not None:
+        await run_blocking(lambda: cache.put(key, model, response))
+    return response
@@ -0,0 +1,158 @@
+"""Vectorized polyline simplification.
+
+Polylines are sequences of (x, y) points. Each function has a batch variant
+that simplifies many polylines in one call: their points are concatenated
+into one array and every round of work is a handful of numpy operations over
+all of them, so the Python overhead does not grow with the number of points.
+
+Simplified polylines are made of the input point objects (a subset, in order),
+so integer pixel coordinates stay integers.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+Point = Tuple[float, float]
+
+# Neighbours closer than this (squared distance) count as coincident in simplify_collinear
+COINCIDENT_SQ = 1e-10
+
+
+def point_segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Distances from points to segments (not infinite lines).
+
+    Args:
+        points: (N, 2) points
+        a: (N, 2) or (2,) segment starts
+        b: (N, 2) or (2,) segment ends; a segment with a == b is its start point
+
+    Returns:
+        (N,) distances
+    """
+    d = b - a
+    den = (d ** 2).sum(-1)
+    t = np.clip(((points - a) * d).sum(-1) / np.where(den > 0, den, 1), 0, 1)
+    t = np.where(den > 0, t, 0)
+    return np.hypot(*np.moveaxis(points - (a + t[..., None] * d), -1, 0))
+
+
+def _concat(polylines: Sequence[Sequence[Point]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack all points into one array; return it with each polyline's start offset."""
+    lengths = np.fromiter((len(p) for p in polylines), np.int64, len(polylines))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(lengths) else lengths
+    points = np.array([pt for p in polylines for pt in p], float).reshape(-1, 2)
+    return points, starts
+
+
+def _split_kept(polylines: Sequence[Sequence[Point]], starts: np.ndarray, keep: np.ndarray) -> List[list]:
+    out = []
+    for p, s in zip(polylines, starts.tolist()):
+        out.append([p[i] for i in np.flatnonzero(keep[s:s + len(p)]).tolist()])
+    return out
+
+
+def rdp_batch(polylines: Sequence[Sequence[Point]], eps: float) -> List[list]:
+    """
+    Ramer–Douglas–Peucker simplification of many polylines at once.
+
+    Instead of recursing, a stack of (start, end) index ranges is processed a
+    whole level at a time: the distances of every interior point of every
+    pending range to its range's chord are computed together, and each range
+    whose farthest point is more than eps away is split there. Results equal
+    the recursive algorithm (the first farthest point wins ties).
+
+    Args:
+        polylines: Polylines to simplify
+        eps: Maximum distance of a dropped point from the simplified line
+
+    Returns:
+        Simplified polylines; polylines with fewer than 3 points are returned as is
+    """
+    polylines = list(polylines)
+    points, starts = _concat(polylines)
+    keep = np.zeros(len(points), bool)
+    stack_s, stack_e = [], []
+    for p, s in zip(polylines, starts.tolist()):
+        if len(p) < 3:
+            keep[s:s + len(p)] = True
+        else:
+            keep[s] = keep[s + len(p) - 1] = True
+            stack_s.append(s); stack_e.append(s + len(p) - 1)
+    rs, re = np.array(stack_s, np.int64), np.array(stack_e, np.int64)
+
+    while len(rs):
+        # Interior point indices of every range, range by range
+        counts = re - rs - 1
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        local = np.arange(counts.sum()) - np.repeat(offsets, counts)
+        idx = np.repeat(rs, counts) + 1 + local
+        dist = point_segment_distances(points[idx], points[np.repeat(rs, counts)], points[np.repeat(re, counts)])
+
+        dmax = np.maximum.reduceat(dist, offsets)
+        first = np.minimum.reduceat(np.where(dist == np.repeat(dmax, counts), local, counts.max()), offsets)
+        split = dmax > eps
+        mid = rs[split] + 1 + first[split]
+        keep[mid] = True
+        # Both halves go back on the stack if they still have interior points
+        rs, re = np.concatenate([rs[split], mid]), np.concatenate([mid, re[split]])
+        pending = re - rs >= 2
+        rs, re = rs[pending], re[pending]
+
+    return _split_kept(polylines, starts, keep)
+
+
+def rdp(points: Sequence[Point], eps: float) -> list:
+    """Ramer–Douglas–Peucker on one polyline; see rdp_batch."""
+    if len(points) < 3:
+        return points
+    return rdp_batch([points], eps)[0]
+
+
+def simplify_collinear_batch(polylines: Sequence[Sequence[Point]], tolerance: float = 1.0) -> List[list]:
+    """
+    Remove points that lie within tolerance of the segment joining their neighbours.
+
+    Each round measures every remaining interior point of every polyline
+    against its current neighbours at once. In a run of consecutive removable
+    points every other one is removed (so no removed point's neighbour also
+    disappears), until no point is removable. Points whose neighbours coincide
+    are removed too. First and last points are always kept.
+
+    Args:
+        polylines: Polylines to simplify
+        tolerance: Maximum distance (px) of a removed point from its neighbours' segment
+
+    Returns:
+        Simplified polylines
+    """
+    polylines = list(polylines)
+    points, starts = _concat(polylines)
+    line_id = np.repeat(np.arange(len(polylines)), [len(p) for p in polylines])
+    keep = np.ones(len(points), bool)
+
+    while True:
+        alive = np.flatnonzero(keep)
+        if len(alive) < 3:
+            break
+        prev, cur, nxt = alive[:-2], alive[1:-1], alive[2:]
+        interior = (line_id[prev] == line_id[cur]) & (line_id[nxt] == line_id[cur])
+        a, p, b = points[prev], points[cur], points[nxt]
+        coincident = ((b - a) ** 2).sum(1) < COINCIDENT_SQ
+        removable = interior & (coincident | (point_segment_distances(p, a, b) <= tolerance))
+        if not removable.any():
+            break
+        # Position of each removable point within its run of consecutive removable points
+        pos = np.arange(len(removable))
+        run_start = np.maximum.accumulate(np.where(removable & ~np.r_[False, removable[:-1]], pos, 0))
+        keep[cur[removable & ((pos - run_start) % 2 == 0)]] = False
+
+    return _split_kept(polylines, starts, keep)
+
+
+def simplify_collinear(points: Sequence[Point], tolerance: float = 1.0) -> list:
+    """Remove nearly collinear points from one polyline; see simplify_collinear_batch."""
+    if len(points) <= 2:
+        return points
+    return simplify_collinear_batch([points], tolerance)[0]
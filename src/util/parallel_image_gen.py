@@ -8,10 +8,11 @@ from pathlib import Path
 from datetime import datetime
 import os
 from PIL import Image
-from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from util.gemini import get_client, get_scheduler, IMAGE_TIMEOUT_MS
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,8 @@ async def generate_images_parallel(
 
     Args:
         prompts: List of image generation prompts
-        max_concurrent: Maximum concurrent API calls (default 15)
+        max_concurrent: Maximum concurrent calls from this batch (default 15); the shared
+            Gemini scheduler (util.gemini.get_scheduler) also bounds in-flight requests per model
         save_dir: Optional directory to save images (with auto-generated names)
         make_run: If True, create a timestamped subfolder inside save_dir (default False)
         reference_image: Optional reference image (file path, Path, or PIL Image) to condition generation
@@ -93,9 +95,8 @@ async def generate_images_parallel(
     async def generate_one(prompt: str, index: int) -> Optional[bytes]:
         async with semaphore:
             try:
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(
-                    None,
+                # to_thread (unlike run_in_executor) carries the Gemini request priority
+                return await asyncio.to_thread(
                     _generate_image_sync,
                     prompt,
                     model,
@@ -144,7 +145,7 @@ def _generate_image_sync(
     if not api_key:
         raise ValueError("GeminiImageAPI environment variable not set")
 
-    client = genai.Client(api_key=api_key)
+    client = get_client(IMAGE_TIMEOUT_MS, api_key=api_key)
 
     # Detect which API to use based on model name
     use_generate_images_api = model.startswith("imagen-")
@@ -157,12 +158,16 @@ def _generate_image_sync(
         if temperature != 1.0:
             logger.warning(f"Temperature not supported with {model}, ignoring temperature={temperature}")
 
-        response = client.models.generate_images(
-            model=model,
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-            )
+        response = get_scheduler().call(
+            lambda: client.models.generate_images(
+                model=model,
+                prompt=prompt,
+                config=types.GenerateImagesConfig(
+                    number_of_images=1,
+                )
+            ),
+            model,
+            contents=prompt
         )
 
         if not response.generated_images:
@@ -183,13 +188,17 @@ def _generate_image_sync(
             ref_image = Image.open(reference_image_path)
             contents.append(ref_image)
 
-        response = client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=types.GenerateContentConfig(
-                temperature=temperature,
-                response_modalities=["IMAGE"]
-            )
+        response = get_scheduler().call(
+            lambda: client.models.generate_content(
+                model=model,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    temperature=temperature,
+                    response_modalities=["IMAGE"]
+                )
+            ),
+            model,
+            contents=contents
         )
 
         # Extract image bytes from response
@@ -0,0 +1 @@
+"""Wall detection: AI red-lining, polygonizing and tiling of battle maps."""
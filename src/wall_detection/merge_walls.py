@@ -0,0 +1,206 @@
+"""Merge and snap wall segments before Foundry export.
+
+Polygonize yields polylines; Foundry gets one wall per polyline segment. Left
+alone that is many short, often collinear or overlapping walls, and Foundry's
+vision and lighting cost grows with the wall count. merge_segments:
+
+1. Snaps endpoints closer than `snap` to one shared vertex (their mean)
+2. Optionally snaps vertices to grid lines within `grid_snap` of a cell
+3. Drops walls shorter than `min_length` (zero-length after snapping)
+4. Merges collinear walls (within `angle` and `offset`) that overlap or
+   meet (gap at most `gap`) into one wall between their outermost endpoints
+"""
+
+import itertools
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from wall_detection.polygonize import GRID_CELL, SegmentGrid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MERGE_PARAMS = {
+    "snap": 6.0,        # endpoints closer than this share one vertex (px)
+    "grid_snap": 0.15,  # snap vertices to grid lines within this fraction of a cell, 0 = disable
+    "angle": 2.0,       # collinear angle tolerance (degrees)
+    "offset": 2.0,      # collinear offset tolerance (px)
+    "gap": 1.0,         # largest gap between collinear walls that are merged (px)
+    "min_length": 0.5,  # shorter walls are dropped (px)
+}
+
+
+def _components(pairs: np.ndarray, n: int) -> np.ndarray:
+    """Connected component label of each of n nodes, given edge pairs."""
+    graph = csr_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    return connected_components(graph, directed=False)[1]
+
+
+def snap_vertices(segments: np.ndarray, snap: float, grid: Optional[Dict[str, Any]] = None, grid_snap: float = 0.0) -> np.ndarray:
+    """
+    Replace each cluster of endpoints within snap of each other by its mean.
+
+    Args:
+        segments: (N, 4) walls as x1, y1, x2, y2
+        snap: Endpoint cluster distance (px)
+        grid: Grid detection result (grid_size, x_offset, y_offset), or None
+        grid_snap: Snap vertex coordinates to grid lines within this fraction of a cell
+
+    Returns:
+        (N, 4) walls with snapped endpoints
+    """
+    points = segments.reshape(-1, 2)
+    if len(points) and snap > 0:
+        pairs = cKDTree(points).query_pairs(snap, output_type='ndarray')
+        labels = _components(pairs.reshape(-1, 2), len(points))
+        vertices = np.zeros((labels.max() + 1, 2))
+        np.add.at(vertices, labels, points)
+        vertices /= np.bincount(labels)[:, None]
+    else:
+        labels, vertices = np.arange(len(points)), points.copy()
+
+    step = (grid or {}).get('grid_size')
+    if step and grid_snap > 0:
+        for axis, key in ((0, 'x_offset'), (1, 'y_offset')):
+            offset = grid.get(key, 0) or 0
+            lines = offset + np.round((vertices[:, axis] - offset) / step) * step
+            near = np.abs(vertices[:, axis] - lines) <= grid_snap * step
+            vertices[near, axis] = lines[near]
+    return vertices[labels].reshape(-1, 4)
+
+
+def _collinear_pairs(segments: np.ndarray, lengths: np.ndarray, p: Dict[str, Any]) -> np.ndarray:
+    """Pairs of walls that are collinear and overlap or meet."""
+    grid = SegmentGrid(GRID_CELL)
+    for k, (x1, y1, x2, y2) in enumerate(segments.tolist()):
+        grid.add_segment(k, (x1, y1), (x2, y2), p["offset"] + p["gap"])
+    candidates = set()
+    for keys in grid.cells.values():
+        candidates.update(itertools.combinations(keys, 2))
+    if not candidates:
+        return np.zeros((0, 2), np.int64)
+    pairs = np.array(sorted(candidates), np.int64)
+
+    # Measure the shorter wall of each pair against the longer one's line
+    i, j = pairs.T
+    ref = np.where(lengths[i] >= lengths[j], i, j)
+    other = np.where(ref == i, j, i)
+    start = segments[:, :2]
+    u = (segments[:, 2:] - start) / lengths[:, None]
+    u_ref = u[ref]
+    cross = np.abs(u_ref[:, 0] * u[other, 1] - u_ref[:, 1] * u[other, 0])
+    rel = np.stack([segments[other, :2], segments[other, 2:]], 1) - start[ref][:, None]
+    perp = np.abs(u_ref[:, None, 0] * rel[..., 1] - u_ref[:, None, 1] * rel[..., 0]).max(1)
+    t = (rel * u_ref[:, None]).sum(-1)
+    gap = np.maximum(t.min(1) - lengths[ref], -t.max(1))
+    keep = (cross <= math.sin(math.radians(p["angle"]))) & (perp <= p["offset"]) & (gap <= p["gap"])
+    return pairs[keep]
+
+
+def merge_collinear(segments: np.ndarray, params: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Merge groups of collinear, overlapping or touching walls.
+
+    Each group becomes one wall between the two endpoints of its members that
+    lie farthest apart along the group's longest wall, so merged walls keep
+    vertices from the shared vertex set.
+
+    Args:
+        segments: (N, 4) walls as x1, y1, x2, y2, none of zero length
+        params: Overrides for DEFAULT_MERGE_PARAMS
+
+    Returns:
+        (M, 4) walls, M <= N, in order of each group's first wall
+    """
+    p = {**DEFAULT_MERGE_PARAMS, **(params or {})}
+    if len(segments) < 2:
+        return segments
+    lengths = np.hypot(segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1])
+    labels = _components(_collinear_pairs(segments, lengths, p), len(segments))
+    if labels.max() + 1 == len(segments):
+        return segments
+
+    # Longest wall of each group defines its direction
+    order = np.lexsort((-lengths, labels))
+    first = np.r_[True, labels[order][1:] != labels[order][:-1]]
+    ref = np.empty(labels.max() + 1, np.int64)
+    ref[labels[order][first]] = order[first]
+    u = (segments[ref, 2:] - segments[ref, :2]) / lengths[ref][:, None]
+
+    points = segments.reshape(-1, 2)
+    point_label = np.repeat(labels, 2)
+    t = ((points - segments[ref, :2][point_label]) * u[point_label]).sum(1)
+    lo = np.full(len(ref), np.inf); hi = np.full(len(ref), -np.inf)
+    np.minimum.at(lo, point_label, t); np.maximum.at(hi, point_label, t)
+    # First endpoint reaching each group's extremes
+    idx = np.arange(len(points))
+    start = np.full(len(ref), len(points)); end = np.full(len(ref), len(points))
+    np.minimum.at(start, point_label[t == lo[point_label]], idx[t == lo[point_label]])
+    np.minimum.at(end, point_label[t == hi[point_label]], idx[t == hi[point_label]])
+
+    _, group_order = np.unique(labels, return_index=True)
+    groups = labels[np.sort(group_order)]
+    return np.hstack([points[start[groups]], points[end[groups]]])
+
+
+def merge_segments(
+    segments: np.ndarray,
+    grid: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Snap, clean and merge walls (see module docstring).
+
+    Args:
+        segments: (N, 4) walls as x1, y1, x2, y2
+        grid: Grid detection result to snap vertices to, or None
+        params: Overrides for DEFAULT_MERGE_PARAMS
+        stats: Optional dict that receives walls_before, zero_length and walls_after
+
+    Returns:
+        (M, 4) merged walls
+    """
+    p = {**DEFAULT_MERGE_PARAMS, **(params or {})}
+    segments = np.asarray(segments, float).reshape(-1, 4)
+    walls_before = len(segments)
+    segments = snap_vertices(segments, p["snap"], grid, p["grid_snap"])
+    long_enough = np.hypot(segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1]) >= max(p["min_length"], 1e-9)
+    segments = merge_collinear(segments[long_enough], p)
+    if stats is not None:
+        stats.update(walls_before=walls_before, zero_length=int((~long_enough).sum()), walls_after=len(segments))
+    return segments
+
+
+def merge_foundry_walls(
+    walls: List[Dict[str, Any]],
+    grid: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    merge_segments for Foundry wall dicts ({"c": [x1, y1, x2, y2], ...}).
+
+    Only walls with the same other properties (movement, sense, door, ...)
+    are merged; merged walls keep those properties.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for wall in walls:
+        key = tuple(sorted((k, repr(v)) for k, v in wall.items() if k != "c"))
+        groups.setdefault(key, []).append(wall)
+
+    merged = []
+    for members in groups.values():
+        segments = merge_segments([w["c"] for w in members], grid, params)
+        properties = {k: v for k, v in members[0].items() if k != "c"}
+        merged.extend({"c": [round(float(v), 2) for v in seg], **properties} for seg in segments)
+
+    if stats is not None:
+        stats.update(walls_before=len(walls), walls_after=len(merged))
+    logger.info(f"Merged walls: {len(walls)} → {len(merged)}")
+    return merged
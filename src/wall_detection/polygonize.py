@@ -12,13 +12,26 @@ Pipeline (grid-agnostic):
 7) Save: overlays (blue on original) + "blue-only" (transparent & white).
 8) Optional: export polylines as JSON (pixels).
 
+Import polygonize() to run the same pipeline on numpy arrays in memory
+(debug images optional); main() is the command line wrapper.
+
 Requires: opencv-python, numpy, scikit-image
 """
-import argparse, json, math, os
+import argparse, json, math, os, sys, time
 from pathlib import Path
 import cv2, numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, depth_first_order
+from scipy.spatial import cKDTree
 from skimage.morphology import thin
 
+# Add src to path for direct execution (bypasses pytest's pythonpath config)
+_src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from util.geometry import rdp_batch, simplify_collinear_batch  # noqa: E402
+
 # ---------- Utilities ----------
 def red_mask_hsv(img_rgb, s_min=110, v_min=60):
     hsv = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2HSV)
@@ -39,76 +52,6 @@ def clean_mask(mask, close_k=5, open_k=3):
     if open_k:  mask = cv2.morphologyEx(mask,  cv2.MORPH_OPEN,  np.ones((open_k,open_k),np.uint8))
     return mask
 
-def rdp(points, eps):
-    """Ramer–Douglas–Peucker on list[(x,y)]."""
-    if len(points) < 3: return points
-    def dpt(p,a,b):
-        ax,ay=a; bx,by=b; px,py=p
-        if ax==bx and ay==by: return math.hypot(px-ax, py-ay)
-        t=max(0,min(1,((px-ax)*(bx-ax)+(py-ay)*(by-ay))/((bx-ax)**2+(by-ay)**2)))
-        q=(ax+t*(bx-ax), ay+t*(by-ay)); return math.hypot(px-q[0], py-q[1])
-    imax, dmax = 0, 0.0
-    for i in range(1,len(points)-1):
-        d = dpt(points[i], points[0], points[-1])
-        if d>dmax: imax, dmax = i, d
-    if dmax>eps:
-        a = rdp(points[:imax+1], eps)
-        b = rdp(points[imax:],   eps)
-        return a[:-1]+b
-    return [points[0], points[-1]]
-
-def simplify_collinear(points, tolerance=1.0):
-    """Remove points that are nearly collinear with their neighbors.
-    
-    For each point, check if it lies on (or very close to) the line 
-    between its predecessor and successor. If so, remove it.
-    Iterates until no more points can be removed.
-    """
-    if len(points) <= 2:
-        return points
-    
-    changed = True
-    result = list(points)
-    
-    while changed:
-        changed = False
-        simplified = [result[0]]  # Always keep first point
-        
-        for i in range(1, len(result) - 1):
-            prev = simplified[-1]
-            curr = result[i]
-            next_pt = result[i + 1]
-            
-            # Calculate perpendicular distance from curr to line prev->next_pt
-            px, py = curr
-            ax, ay = prev
-            bx, by = next_pt
-            
-            # Vector from a to b
-            dx, dy = bx - ax, by - ay
-            len_sq = dx * dx + dy * dy
-            
-            if len_sq < 1e-10:  # prev and next are essentially the same point
-                continue
-            
-            # Perpendicular distance
-            t = ((px - ax) * dx + (py - ay) * dy) / len_sq
-            t = max(0, min(1, t))  # Clamp to segment
-            closest_x = ax + t * dx
-            closest_y = ay + t * dy
-            dist = math.hypot(px - closest_x, py - closest_y)
-            
-            # Only keep the point if it's far enough from the line
-            if dist > tolerance:
-                simplified.append(curr)
-            else:
-                changed = True  # We removed a point, so iterate again
-        
-        simplified.append(result[-1])  # Always keep last point
-        result = simplified
-    
-    return result
-
 def lines_only_rgba(polys, size, thick=2, color_bgr=(255,120,0), white_bg=False, vertices_only=False, lines_and_vertices=False):
     H,W = size; bgr = np.zeros((H,W,3), np.uint8)
     for p in polys:
@@ -136,47 +79,92 @@ def lines_only_rgba(polys, size, thick=2, color_bgr=(255,120,0), white_bg=False,
     return bgra
 
 # ---------- Skeleton → polylines ----------
+# 8-neighbour offsets (dr, dc), in the order ties between neighbours are resolved
+NBR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
 def skeleton_polylines(mask, dilate_px=2):
+    """
+    Trace the 1-px skeleton of a mask into pixel polylines [(x,y), ...].
+
+    Vectorized: the degree map is one convolution; pixels with 3+ neighbours are
+    junctions. Removing them splits the skeleton into simple paths and loops
+    (connected components), which are ordered by a depth-first walk from one end
+    of each. Touching junction pixels form one junction, whose vertex is the
+    member pixel nearest its centre; a branch that touches a junction gets that
+    vertex appended, so branches meeting there share the end point.
+    """
     if dilate_px>0:
         k = 2*dilate_px+1
         mask = cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_ELLIPSE,(k,k)), 1)
     skel = thin(mask>0).astype(np.uint8)  # 1-px strokes
+    H,W = skel.shape
 
-    idx = np.argwhere(skel>0)
-    pix = {(int(y),int(x)) for y,x in idx}       # store as (row,col)
-    
-    def nbrs(p):
-        r,c=p
-        # 8-connected neighborhood
-        return [(r+dr,c+dc) for dr in (-1,0,1) for dc in (-1,0,1)
-                if (dr or dc) and (r+dr,c+dc) in pix]
-    
-    deg = {p:len(nbrs(p)) for p in pix}
-    endpoints = [p for p,d in deg.items() if d==1]
-    vis=set()
-
-    def trace(start):
-        path=[start]; vis.add(start)
-        n=[q for q in nbrs(start) if q not in vis]
-        if not n: return path
-        cur=n[0]; prev=start; path.append(cur); vis.add(cur)
-        while True:
-            n=[q for q in nbrs(cur) if q!=prev and q not in vis]
-            if len(nbrs(cur))!=2 or not n: break
-            nxt=n[0]; path.append(nxt); vis.add(nxt); prev,cur=cur,nxt
-        return path
-
-    lines=[]
-    for ep in endpoints:
-        if ep in vis: continue
-        p=[(q[1],q[0]) for q in trace(ep)];  # (x,y)
+    # Degree map: number of 8-connected skeleton neighbours
+    kernel = np.ones((3,3), np.float32); kernel[1,1] = 0
+    deg = cv2.filter2D(skel, -1, kernel, borderType=cv2.BORDER_CONSTANT).astype(np.int32) * skel
+    junction = (deg>=3)
+    branch = (skel>0) & ~junction
+
+    # Index images (padded by 1 so neighbour lookups never go out of bounds; -1 = none)
+    rows, cols = np.nonzero(branch)
+    n = len(rows)
+    if n == 0: return []
+    bidx = np.full((H+2,W+2), -1, np.int32); bidx[rows+1, cols+1] = np.arange(n)
+    _, jlabels, _, centroids = cv2.connectedComponentsWithStats(junction.astype(np.uint8), connectivity=8)
+    jidx = np.full((H+2,W+2), -1, np.int32); jidx[1:-1,1:-1] = jlabels-1
+    jr, jc = np.nonzero(junction); jl = jlabels[jr, jc]
+    centre_dist = (jc-centroids[jl,0])**2 + (jr-centroids[jl,1])**2
+    nearest = np.lexsort((centre_dist, jl))
+    first_of_label = np.ones(len(nearest), bool); first_of_label[1:] = jl[nearest][1:] != jl[nearest][:-1]
+    nearest = nearest[first_of_label]
+    jr, jc = jr[nearest], jc[nearest]  # vertex of each junction, indexed by label-1
+
+    # Branch-pixel adjacency with junctions removed, and each pixel's first junction neighbour
+    src, dst = [], []
+    bdeg = np.zeros(n, np.int64)
+    touch = np.full(n, -1, np.int64)
+    for dr,dc in NBR_OFFSETS:
+        nb = bidx[rows+1+dr, cols+1+dc]
+        has = nb>=0
+        bdeg += has
+        src.append(np.flatnonzero(has)); dst.append(nb[has])
+        nbj = jidx[rows+1+dr, cols+1+dc]
+        first = (touch<0) & (nbj>=0)
+        touch[first] = nbj[first]
+    src = np.concatenate(src); dst = np.concatenate(dst)
+    _, comp = connected_components(csr_matrix((np.ones(len(src), np.int8), (src, dst)), shape=(n, n)), directed=False)
+
+    # Start each component at an end: a true endpoint first, then a junction-side end,
+    # then (loops) any pixel; ties go to the first pixel in raster order
+    is_end = bdeg<=1
+    is_endpoint = deg[rows, cols]<=1
+    key = np.lexsort((np.arange(n), ~is_endpoint, ~is_end, comp))
+    first_of_comp = np.ones(n, bool); first_of_comp[1:] = comp[key][1:] != comp[key][:-1]
+    starts = key[first_of_comp]
+
+    # One depth-first walk from a virtual root (node n) linked to every start lists
+    # each component's pixels contiguously, in path order
+    src = np.concatenate([src, np.full(len(starts), n)]); dst = np.concatenate([dst, starts])
+    graph = csr_matrix((np.ones(len(src), np.int8), (src, dst)), shape=(n+1, n+1))
+    order = depth_first_order(graph, n, directed=False, return_predecessors=False)[1:]
+    bounds = np.flatnonzero(np.diff(comp[order])) + 1
+
+    ox = cols[order].tolist(); oy = rows[order].tolist(); oi = order.tolist()
+    jxs = jc.tolist(); jys = jr.tolist(); touch = touch.tolist()
+    edges = [0] + bounds.tolist() + [n]
+    lines = []
+    for s,e in zip(edges[:-1], edges[1:]):
+        p = list(zip(ox[s:e], oy[s:e]))
+        # Only path ends can touch junctions; a lone pixel may sit between two
+        if e-s == 1:
+            x,y = p[0]
+            js = list(dict.fromkeys(int(j) for j in (jidx[y+1+dr, x+1+dc] for dr,dc in NBR_OFFSETS) if j>=0))
+            head, tail = (js + [-1, -1])[:2]
+        else:
+            head, tail = touch[oi[s]], touch[oi[e-1]]
+        if head>=0: p.insert(0, (jxs[head], jys[head]))
+        if tail>=0: p.append((jxs[tail], jys[tail]))
         if len(p)>=2: lines.append(p)
-    # cycles
-    for p0 in list(pix):
-        if p0 in vis: continue
-        if deg.get(p0,0)==2:
-            p=[(q[1],q[0]) for q in trace(p0)]
-            if len(p)>=2: lines.append(p)
     return lines
 
 # ---------- Connect gaps (vector) ----------
@@ -190,137 +178,284 @@ def insert_point(poly, i, t):
     ax,ay=poly[i]; bx,by=poly[i+1]; q=(ax+t*(bx-ax), ay+t*(by-ay))
     return poly[:i+1]+[q]+poly[i+1:]
 
-def connect_polylines(polys, snap_dist=6.0, min_len=12.0):
+# ---------- Spatial index ----------
+# Cell size (px) of the grid hashes used by connect_polylines and remove_parallel_duplicates
+GRID_CELL = 32.0
+
+class SegmentGrid:
+    """Uniform grid hash: each key is listed in every cell its (padded) box touches."""
+    def __init__(self, cell=GRID_CELL):
+        self.cell = float(cell); self.cells = {}
+    def add_segment(self, key, a, b, pad=0.0):
+        c = self.cell
+        x0,x1 = sorted((a[0],b[0])); y0,y1 = sorted((a[1],b[1]))
+        for cx in range(math.floor((x0-pad)/c), math.floor((x1+pad)/c)+1):
+            for cy in range(math.floor((y0-pad)/c), math.floor((y1+pad)/c)+1):
+                self.cells.setdefault((cx,cy), []).append(key)
+    def query(self, x, y):
+        """Keys whose padded box may contain (x, y)."""
+        return self.cells.get((math.floor(x/self.cell), math.floor(y/self.cell)), ())
+
+def _timings(stats):
+    return stats.setdefault("timings", {}) if stats is not None else {}
+
+def merge_endpoints(polys, snap_dist=6.0):
+    """
+    Join polylines whose endpoints lie within snap_dist, closest pairs first.
+    A KD-tree finds the candidate pairs; union-find keeps chains from closing
+    into loops. Returns (merged polylines, number of joins).
+    """
+    n = len(polys)
+    if n < 2: return list(polys), 0
+    # Endpoint e belongs to polyline e//2: its start if e is even, else its end
+    ends = np.array([pt for p in polys for pt in (p[0], p[-1])], float)
+    pairs = cKDTree(ends).query_pairs(snap_dist, output_type='ndarray')
+    pairs = pairs[pairs[:,0]//2 != pairs[:,1]//2]
+    dist = np.hypot(*(ends[pairs[:,0]] - ends[pairs[:,1]]).T)
+    pairs = pairs[np.lexsort((pairs[:,1], pairs[:,0], dist))].tolist()
+
+    parent = list(range(n))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]; i = parent[i]
+        return i
+    partner = [-1]*(2*n); joins = 0
+    for u,v in pairs:
+        if partner[u]>=0 or partner[v]>=0: continue
+        ru, rv = find(u//2), find(v//2)
+        if ru == rv: continue  # would close the chain into a loop
+        parent[ru] = rv; partner[u] = v; partner[v] = u; joins += 1
+
+    # Walk each chain from a free end; the gap between joined ends becomes a bridge segment
+    merged = []; visited = [False]*n
+    for i in range(n):
+        if visited[i] or (partner[2*i]>=0 and partner[2*i+1]>=0): continue
+        chain = []; e = 2*i if partner[2*i]<0 else 2*i+1
+        while True:
+            k = e//2; visited[k] = True
+            seg = polys[k] if e%2==0 else polys[k][::-1]
+            chain.extend(seg[1:] if chain and seg[0]==chain[-1] else seg)
+            e = partner[e^1]
+            if e < 0: break
+        merged.append(chain)
+    return merged, joins
+
+def t_join(polys, snap_dist=6.0, cell=GRID_CELL):
+    """
+    Extend each endpoint to the nearest point on another polyline within
+    snap_dist, inserting that point as a shared vertex. Candidate segments come
+    from a grid hash of segment boxes; bridges added on the way are indexed too.
+    Returns (polylines, number of joins).
+    """
+    grid = SegmentGrid(cell)
+    segs = []                       # segment id -> (polyline, a, b)
+    inserts = {}                    # segment id -> [(t, point)] vertices to insert
+    seg_ids = []                    # polyline -> ids of its original segments
+    head = [None]*len(polys); tail = [None]*len(polys)  # bridge (point, segment id) at either end
+    def add(j, a, b):
+        grid.add_segment(len(segs), a, b, snap_dist); segs.append((j, a, b)); return len(segs)-1
+    for j,p in enumerate(polys):
+        seg_ids.append([add(j, p[k], p[k+1]) for k in range(len(p)-1)])
+
+    joins = 0
+    for i,p in enumerate(polys):
+        for end_idx in (0,-1):
+            pt = p[end_idx]; best = None
+            for sid in grid.query(*pt):
+                j,a,b = segs[sid]
+                if j == i: continue
+                q, dist, t = nearest_on_seg(pt, a, b)
+                if best is None or dist < best[1] or (dist == best[1] and sid < best[0]): best = (sid, dist, t, q)
+            if best is None or best[1] > snap_dist: continue
+            sid, dist, t, q = best
+            if 0.0 < t < 1.0: inserts.setdefault(sid, []).append((t, q))
+            q = segs[sid][1] if t <= 0.0 else segs[sid][2] if t >= 1.0 else q
+            if dist == 0.0: continue  # already touching
+            joins += 1
+            if end_idx == 0: head[i] = (q, add(i, q, pt))
+            else:            tail[i] = (q, add(i, pt, q))
+
+    def with_inserts(sid):
+        return [q for _,q in sorted(inserts.get(sid, ()), key=lambda tq: tq[0])]
+    out = []
+    for j,p in enumerate(polys):
+        pts = []
+        if head[j]: pts += [head[j][0]] + with_inserts(head[j][1])
+        for k,sid in enumerate(seg_ids[j]): pts += [p[k]] + with_inserts(sid)
+        pts.append(p[-1])
+        if tail[j]: pts += with_inserts(tail[j][1]) + [tail[j][0]]
+        out.append(pts)
+    return out, joins
+
+def connect_polylines(polys, snap_dist=6.0, min_len=12.0, stats=None):
+    """Bridge small gaps between polylines and drop short stubs; optional stats get counts and timings."""
+    timings = _timings(stats)
     # 1) endpoint↔endpoint snap/merge
-    changed=True
-    while changed:
-        changed=False; n=len(polys); used=[False]*n
-        for i in range(n):
-            if used[i]: continue
-            e1=(polys[i][0], polys[i][-1])
-            for j in range(i+1,n):
-                if used[j]: continue
-                e2=(polys[j][0], polys[j][-1])
-                for a in (0,1):
-                    for b in (0,1):
-                        d=math.hypot(e1[a][0]-e2[b][0], e1[a][1]-e2[b][1])
-                        if d<=snap_dist:
-                            s1 = polys[i] if a==1 else polys[i][::-1]
-                            s2 = polys[j] if b==0 else polys[j][::-1]
-                            if d>0.5: s1 = s1+[e2[b]]      # small bridge
-                            polys[j]=s1+s2; used[i]=True; changed=True; break
-                    if used[i]: break
-                if used[i]: break
-        polys=[polys[k] for k in range(n) if not used[k]]
+    t0 = time.perf_counter()
+    polys, merges = merge_endpoints(polys, snap_dist)
+    timings["connect_merge"] = time.perf_counter() - t0
 
     # 2) endpoint → nearest point on other poly (insert vertex; T-join)
-    for i in range(len(polys)):
-        for end_idx in (0,-1):
-            p = polys[i][end_idx]; best=(None,None,1e9,None)
-            for j in range(len(polys)):
-                if j==i: continue
-                for k in range(len(polys[j])-1):
-                    q, dist, t = nearest_on_seg(p, polys[j][k], polys[j][k+1])
-                    if dist<best[2]: best=(j,k,dist,t)
-            j,k,dist,t = best
-            if dist<=snap_dist:
-                polys[j] = insert_point(polys[j], k, t)
-                if end_idx==0: polys[i] = [polys[j][k+1]] + polys[i]
-                else:          polys[i] = polys[i] + [polys[j][k+1]]
+    t0 = time.perf_counter()
+    polys, joins = t_join(polys, snap_dist)
+    timings["connect_tjoin"] = time.perf_counter() - t0
 
     # 3) drop stubs
     polys=[p for p in polys if poly_length(p)>=min_len]
+    if stats is not None:
+        stats["endpoint_merges"] = merges; stats["t_joins"] = joins
     return polys
 
-def remove_parallel_duplicates(polys, parallel_dist=8.0):
-    """Remove polylines that run parallel and very close to other polylines."""
+def avg_dist_to_poly(p1, p2):
+    """Average minimum distance from the points of p1 to polyline p2 (vectorized)."""
+    if len(p1) < 2 or len(p2) < 2:
+        return float('inf')
+    P = np.asarray(p1, float)[:,None,:]
+    A = np.asarray(p2[:-1], float)[None]; D = np.asarray(p2[1:], float)[None] - A
+    den = (D**2).sum(2)
+    t = np.where(den>0, np.clip(((P-A)*D).sum(2) / np.where(den>0, den, 1), 0, 1), 0)
+    return float(np.hypot(*(P - A - t[...,None]*D).transpose(2,0,1)).min(1).mean())
+
+def remove_parallel_duplicates(polys, parallel_dist=8.0, stats=None, cell=GRID_CELL):
+    """Remove polylines that run parallel and very close to other polylines.
+
+    Longer polylines win. Only pairs with segments within parallel_dist of each
+    other (found with a grid hash) can average closer than that, so no other
+    pairs are measured.
+    """
     if not polys:
         return polys
-    
-    def avg_dist_to_poly(p1, p2):
-        """Average minimum distance from points on p1 to polyline p2"""
-        if len(p1) < 2 or len(p2) < 2:
-            return float('inf')
-        total_dist = 0
-        for pt in p1:
-            min_dist = float('inf')
-            for k in range(len(p2) - 1):
-                _, dist, _ = nearest_on_seg(pt, p2[k], p2[k+1])
-                min_dist = min(min_dist, dist)
-            total_dist += min_dist
-        return total_dist / len(p1)
-    
+    t0 = time.perf_counter()
+    grid = SegmentGrid(cell)
+    for j,p in enumerate(polys):
+        for k in range(len(p)-1): grid.add_segment(j, p[k], p[k+1], parallel_dist)
+    near = [set() for _ in polys]
+    for keys in grid.cells.values():
+        ids = set(keys)
+        if len(ids) > 1:
+            for j in ids: near[j] |= ids
+
     keep = [True] * len(polys)
     lengths = [poly_length(p) for p in polys]
     indices = sorted(range(len(polys)), key=lambda i: lengths[i], reverse=True)
-    
+    rank = {i:r for r,i in enumerate(indices)}
+    measured = 0
+
     for i in indices:
         if not keep[i]:
             continue
-        for j in indices:
+        for j in sorted(near[i], key=rank.get):
             if i == j or not keep[j]:
                 continue
-            dist_j_to_i = avg_dist_to_poly(polys[j], polys[i])
-            dist_i_to_j = avg_dist_to_poly(polys[i], polys[j])
-            avg_dist = (dist_j_to_i + dist_i_to_j) / 2
+            measured += 1
+            avg_dist = (avg_dist_to_poly(polys[j], polys[i]) + avg_dist_to_poly(polys[i], polys[j])) / 2
             if avg_dist < parallel_dist:
                 keep[j] = False
-    
+
+    _timings(stats)["parallel"] = time.perf_counter() - t0
+    if stats is not None: stats["parallel_pairs_measured"] = measured
     return [polys[i] for i in range(len(polys)) if keep[i]]
 
-# ---------- Main ----------
-def main():
-    ap = argparse.ArgumentParser(description="Red-traced map → simplified blue wall lines")
-    ap.add_argument("image", help="Input map image (PNG/JPG)")
-    ap.add_argument("--close", type=int, default=5, help="close kernel (px)")
-    ap.add_argument("--open",  type=int, default=3, help="open kernel (px)")
-    ap.add_argument("--dilate",type=int, default=6, help="skeleton dilation radius (px)")
-    ap.add_argument("--eps",   type=float, default=5.0, help="RDP epsilon (px)")
-    ap.add_argument("--snap",  type=float, default=6.0, help="snap/bridge distance (px)")
-    ap.add_argument("--minlen",type=float, default=12.0, help="min polyline length to keep (px)")
-    ap.add_argument("--collinear", type=float, default=0.5, help="collinear tolerance (px) - removes intermediate points on straight lines")
-    ap.add_argument("--parallel", type=float, default=0, help="remove parallel duplicate lines closer than this distance (0=disable)")
-    ap.add_argument("--outdir", default="out", help="output directory")
-    ap.add_argument("--json", action="store_true", help="export polylines as JSON")
-    args = ap.parse_args()
+# ---------- In-memory API ----------
+# Parameters of polygonize() (and defaults of the matching command line flags)
+DEFAULT_PARAMS = {
+    "close": 5,         # close kernel (px)
+    "open": 3,          # open kernel (px)
+    "dilate": 6,        # skeleton dilation radius (px)
+    "eps": 5.0,         # RDP epsilon (px)
+    "snap": 6.0,        # snap/bridge distance (px)
+    "minlen": 12.0,     # min polyline length to keep (px)
+    "collinear": 0.5,   # collinear tolerance (px), 0 = disable
+    "parallel": 0.0,    # parallel duplicate distance (px), 0 = disable
+}
 
-    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-    img = cv2.imread(str(args.image)); H,W = img.shape[:2]
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+def wall_mask(mask_or_image, close_k=5, open_k=3):
+    """Cleaned uint8 wall mask from a 2-D mask (nonzero = wall) or a BGR/BGRA red-traced image."""
+    arr = np.asarray(mask_or_image)
+    if arr.ndim == 2:
+        mask = (arr > 0).astype(np.uint8) * 255
+    elif arr.ndim == 3 and arr.shape[2] in (3, 4):
+        mask = red_mask_hsv(cv2.cvtColor(np.ascontiguousarray(arr[:, :, :3]), cv2.COLOR_BGR2RGB))
+    else:
+        raise ValueError(f"Expected a 2-D mask or a BGR(A) image, got array of shape {arr.shape}")
+    return clean_mask(mask, close_k, open_k)
+
+def polygonize(mask_or_image, params=None, debug_dir=None, stats=None):
+    """
+    Extract wall polylines from a red-traced map image or a wall mask, in memory.
+
+    Args:
+        mask_or_image: numpy array: a 2-D wall mask (nonzero = wall), or a BGR/BGRA
+            image (OpenCV channel order) with walls traced in red
+        params: Overrides for DEFAULT_PARAMS
+        debug_dir: If given, write the files the command line tool writes (mask,
+            overlays, line images, polylines.json) to this directory
+        stats: Optional dict that receives point/polyline counts of the passes
+            and, under "timings", the seconds each pass took
+
+    Returns:
+        List of polylines, each a list of (x, y) float pixel coordinates
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    stats = stats if stats is not None else {}
+    timings = _timings(stats)
 
     # 1) Red mask → clean
-    mask = red_mask_hsv(img_rgb); mask = clean_mask(mask, args.close, args.open)
-    cv2.imwrite(str(outdir/"mask_debug.png"), mask)
+    t0 = time.perf_counter()
+    mask = wall_mask(mask_or_image, p["close"], p["open"])
+    timings["mask"] = time.perf_counter() - t0
 
     # 2–3) Dilate → skeleton → polylines
-    polylines = skeleton_polylines(mask, args.dilate)
+    t0 = time.perf_counter()
+    polylines = skeleton_polylines(mask, p["dilate"])
+    timings["skeleton"] = time.perf_counter() - t0
 
     # 4) Simplify
-    polylines = [rdp(p, args.eps) for p in polylines if len(p)>=2]
+    t0 = time.perf_counter()
+    polylines = rdp_batch([pl for pl in polylines if len(pl)>=2], p["eps"])
+    timings["rdp"] = time.perf_counter() - t0
 
     # 5–6) Connect & prune
-    polylines = connect_polylines(polylines, args.snap, args.minlen)
-    points_before_collinear = sum(len(p) for p in polylines)
-    
+    polylines = connect_polylines(polylines, p["snap"], p["minlen"], stats)
+    stats["points_before_collinear"] = sum(len(pl) for pl in polylines)
+
     # 6b) Additional collinear simplification
-    if args.collinear > 0:
-        polylines = [simplify_collinear(p, args.collinear) for p in polylines]
-        polylines = [p for p in polylines if len(p) >= 2]  # Remove any that became too short
+    if p["collinear"] > 0:
+        t0 = time.perf_counter()
+        polylines = simplify_collinear_batch(polylines, p["collinear"])
+        polylines = [pl for pl in polylines if len(pl) >= 2]  # Remove any that became too short
+        timings["collinear"] = time.perf_counter() - t0
 
     # 6c) Remove parallel duplicates (for thick walls)
-    lines_before_parallel = len(polylines)
-    points_before_parallel = sum(len(p) for p in polylines)
-    if args.parallel > 0:
-        polylines = remove_parallel_duplicates(polylines, args.parallel)
+    stats["lines_before_parallel"] = len(polylines)
+    stats["points_before_parallel"] = sum(len(pl) for pl in polylines)
+    if p["parallel"] > 0:
+        polylines = remove_parallel_duplicates(polylines, p["parallel"], stats)
+
+    polylines = [[(float(x), float(y)) for x, y in pl] for pl in polylines]
+    stats["polylines"] = len(polylines)
+    stats["points"] = sum(len(pl) for pl in polylines)
+
+    if debug_dir is not None:
+        arr = np.asarray(mask_or_image)
+        img_bgr = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR) if arr.ndim == 2 else np.ascontiguousarray(arr[:, :, :3])
+        save_debug_outputs(img_bgr, mask, polylines, Path(debug_dir))
+    return polylines
+
+def save_debug_outputs(img_bgr, mask, polylines, outdir, write_json=True):
+    """Write the mask, overlay and line images (and optionally polylines.json) to outdir."""
+    outdir = Path(outdir); outdir.mkdir(parents=True, exist_ok=True)
+    H,W = img_bgr.shape[:2]
+    cv2.imwrite(str(outdir/"mask_debug.png"), mask)
 
     # 7) Save images
-    overlay = draw_overlay(img, polylines, color=(255,120,0), thick=2)
+    overlay = draw_overlay(img_bgr, polylines, color=(255,120,0), thick=2)
     cv2.imwrite(str(outdir/"overlay_blue.png"), overlay)
     cv2.imwrite(str(outdir/"lines_only_transparent.png"),
                 lines_only_rgba(polylines, (H,W), thick=2, color_bgr=(255,120,0), white_bg=False))
     cv2.imwrite(str(outdir/"lines_only_white.png"),
                 lines_only_rgba(polylines, (H,W), thick=2, color_bgr=(255,120,0), white_bg=True))
-    
+
     # 7b) Save lines + vertices versions (lines with vertex points marked)
     cv2.imwrite(str(outdir/"lines_and_vertices_transparent.png"),
                 lines_only_rgba(polylines, (H,W), thick=2, color_bgr=(255,120,0), white_bg=False, lines_and_vertices=True))
@@ -328,17 +463,41 @@ def main():
                 lines_only_rgba(polylines, (H,W), thick=2, color_bgr=(255,120,0), white_bg=True, lines_and_vertices=True))
 
     # 8) (Optional) JSON export
-    if args.json:
+    if write_json:
         data = {"width":W, "height":H, "polylines":[[(float(x),float(y)) for x,y in p] for p in polylines]}
         (outdir/"polylines.json").write_text(json.dumps(data, indent=2))
 
+# ---------- Main ----------
+def main():
+    d = DEFAULT_PARAMS
+    ap = argparse.ArgumentParser(description="Red-traced map → simplified blue wall lines")
+    ap.add_argument("image", help="Input map image (PNG/JPG)")
+    ap.add_argument("--close", type=int, default=d["close"], help="close kernel (px)")
+    ap.add_argument("--open",  type=int, default=d["open"], help="open kernel (px)")
+    ap.add_argument("--dilate",type=int, default=d["dilate"], help="skeleton dilation radius (px)")
+    ap.add_argument("--eps",   type=float, default=d["eps"], help="RDP epsilon (px)")
+    ap.add_argument("--snap",  type=float, default=d["snap"], help="snap/bridge distance (px)")
+    ap.add_argument("--minlen",type=float, default=d["minlen"], help="min polyline length to keep (px)")
+    ap.add_argument("--collinear", type=float, default=d["collinear"], help="collinear tolerance (px) - removes intermediate points on straight lines")
+    ap.add_argument("--parallel", type=float, default=d["parallel"], help="remove parallel duplicate lines closer than this distance (0=disable)")
+    ap.add_argument("--outdir", default="out", help="output directory")
+    ap.add_argument("--json", action="store_true", help="export polylines as JSON")
+    args = ap.parse_args()
+
+    outdir = Path(args.outdir)
+    img = cv2.imread(str(args.image))
+    params = {k: getattr(args, k) for k in DEFAULT_PARAMS}
+    stats = {}
+    polylines = polygonize(img, params, stats=stats)
+    save_debug_outputs(img, wall_mask(img, args.close, args.open), polylines, outdir, write_json=args.json)
+
     # Stats
-    npts = sum(len(p) for p in polylines)
+    npts = stats["points"]
     print(f"Done. Polylines={len(polylines)}, points={npts}")
     if args.collinear > 0:
-        print(f"Collinear simplification removed {points_before_collinear - npts} points ({points_before_collinear} → {npts})")
+        print(f"Collinear simplification removed {stats['points_before_collinear'] - npts} points ({stats['points_before_collinear']} → {npts})")
     if args.parallel > 0:
-        print(f"Parallel duplicate removal: {lines_before_parallel} → {len(polylines)} polylines, {points_before_parallel} → {npts} points")
+        print(f"Parallel duplicate removal: {stats['lines_before_parallel']} → {len(polylines)} polylines, {stats['points_before_parallel']} → {npts} points")
     print(f"Saved solid lines: {outdir/'overlay_blue.png'}, {outdir/'lines_only_transparent.png'}, {outdir/'lines_only_white.png'}")
     print(f"Saved lines+vertices: {outdir/'lines_and_vertices_transparent.png'}, {outdir/'lines_and_vertices_white.png'}")
     if args.json: print(f"Saved: {outdir/'polylines.json'}")
@@ -1,22 +1,32 @@
 """Complete wall detection pipeline: image → grayscale → AI redline → polygonize → overlay."""
 
-import subprocess
+import asyncio
 import logging
 import json
 import shutil
 from pathlib import Path
-from typing import Union, Dict, Any, List, Tuple
+from typing import Union, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from PIL import Image
 import cv2
 import numpy as np
 
 from util.parallel_image_gen import generate_images_parallel
+from wall_detection.merge_walls import merge_foundry_walls
+from wall_detection.polygonize import DEFAULT_PARAMS, lines_only_rgba, polygonize, save_debug_outputs, wall_mask
+from wall_detection.tiling import (
+    DEFAULT_TILE_OVERLAP, DEFAULT_TILE_SIZE, Tile, needs_tiling, plan_tiles, stitch_tiles,
+)
+
+Polyline = List[Tuple[float, float]]
 
 logger = logging.getLogger(__name__)
 
 REDLINE_PROMPT = "Draw red lines for walls in this battle map. Draw straight lines only. Avoid stairs. Do not outline the frame."
 
+# Tiles red-lined at the same time in tiled mode
+DEFAULT_TILE_CONCURRENCY = 4
+
 
 def convert_to_png(input_path: Path, output_path: Path) -> None:
     """Convert any image format to PNG with white background."""
@@ -47,8 +57,8 @@ async def generate_redlines(
     temp_dir: Path,
     temperature: float = 0.5,
     model: str = "gemini-2.5-flash-image"
-) -> None:
-    """Generate AI red-lined walls from grayscale image."""
+) -> bytes:
+    """Generate AI red-lined walls from grayscale image; returns the encoded image."""
     logger.info("Generating AI red-lined walls...")
 
     redline_results = await generate_images_parallel(
@@ -68,78 +78,122 @@ async def generate_redlines(
     with open(output_path, 'wb') as f:
         f.write(redline_results[0])
     logger.info(f"✓ Saved red-lined image: {output_path}")
+    return redline_results[0]
 
 
 def polygonize_redlines(
-    redlined_path: Path,
-    output_dir: Path,
+    redlined: np.ndarray,
+    output_dir: Optional[Path] = None,
     polygonize_params: Dict[str, Any] = None
-) -> None:
-    """Extract vector polylines from red-lined image using polygonize.py."""
+) -> List[Polyline]:
+    """
+    Extract vector polylines from a red-lined image (BGR array) in-process.
+
+    Args:
+        redlined: Red-lined image as returned by cv2.imread/imdecode
+        output_dir: If given, save polygonize debug images and polylines.json here
+        polygonize_params: Overrides for polygonize.DEFAULT_PARAMS
+
+    Returns:
+        Polylines in pixel coordinates of the red-lined image
+    """
     logger.info("Polygonizing to extract vector lines...")
-    output_dir.mkdir(exist_ok=True)
-
-    # Build polygonize.py command
-    polygonize_script = Path(__file__).parent / "polygonize.py"
-    params = polygonize_params or {}
-    cmd = [
-        "python", str(polygonize_script),
-        str(redlined_path),
-        "--outdir", str(output_dir),
-        "--close", str(params.get('close', 5)),
-        "--open", str(params.get('open', 3)),
-        "--dilate", str(params.get('dilate', 6)),
-        "--eps", str(params.get('eps', 5.0)),
-        "--snap", str(params.get('snap', 6.0)),
-        "--minlen", str(params.get('minlen', 12.0)),
-        "--json"
-    ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        logger.error(f"Polygonize failed: {result.stderr}")
-        raise RuntimeError(f"Polygonize failed: {result.stderr}")
-
-    logger.info(f"✓ Polygonize output:\n{result.stdout}")
+    stats: Dict[str, int] = {}
+    polylines = polygonize(redlined, polygonize_params, debug_dir=output_dir, stats=stats)
+    logger.info(f"✓ Polygonized: {stats['polylines']} polylines, {stats['points']} points")
+    return polylines
+
+
+async def redline_tiles(
+    grayscale_path: Path,
+    tiles: List[Tile],
+    tiles_dir: Path,
+    temp_dir: Path,
+    temperature: float = 0.5,
+    model: str = "gemini-2.5-flash-image",
+    polygonize_params: Dict[str, Any] = None,
+    max_concurrent: int = DEFAULT_TILE_CONCURRENCY
+) -> Tuple[List[Polyline], np.ndarray]:
+    """
+    Red-line and polygonize a map tile by tile, then stitch the walls.
+
+    Tiles are red-lined concurrently (at most max_concurrent Gemini requests at
+    a time); each result is resized to its tile and polygonized in a worker
+    thread as soon as it arrives.
+
+    Args:
+        grayscale_path: Grayscale map to cut tiles from
+        tiles: Tiles from tiling.plan_tiles
+        tiles_dir: Where to save each tile's grayscale and red-lined image
+        temp_dir: Scratch directory for the image generator
+        temperature: AI sampling temperature
+        model: Gemini model
+        polygonize_params: Overrides for polygonize.DEFAULT_PARAMS
+        max_concurrent: Maximum tiles red-lined at once
+
+    Returns:
+        (stitched polylines in map pixels, red-lined mosaic of the tile cores as BGR array)
+    """
+    tiles_dir.mkdir(parents=True, exist_ok=True)
+    grayscale = Image.open(grayscale_path)
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def process_tile(index: int, tile: Tile) -> Tuple[List[Polyline], np.ndarray]:
+        tile_gray = tiles_dir / f"tile_{index:03d}_grayscale.png"
+        grayscale.crop((tile.x0, tile.y0, tile.x1, tile.y1)).save(tile_gray, 'PNG')
+        async with semaphore:
+            redlined_bytes = await generate_redlines(
+                grayscale_path=tile_gray,
+                output_path=tiles_dir / f"tile_{index:03d}_redlined.png",
+                temp_dir=temp_dir / f"tile_{index:03d}",
+                temperature=temperature,
+                model=model
+            )
+        redlined = cv2.imdecode(np.frombuffer(redlined_bytes, np.uint8), cv2.IMREAD_COLOR)
+        if redlined is None:
+            raise RuntimeError(f"Failed to decode red-lined tile {index}")
+        if redlined.shape[:2] != (tile.height, tile.width):
+            redlined = cv2.resize(redlined, (tile.width, tile.height))
+        polylines = await asyncio.to_thread(polygonize, redlined, polygonize_params)
+        return polylines, redlined
+
+    logger.info(f"Red-lining {len(tiles)} tiles ({max_concurrent} at a time)...")
+    results = await asyncio.gather(*(process_tile(i, tile) for i, tile in enumerate(tiles)))
+
+    mosaic = np.zeros((grayscale.height, grayscale.width, 3), np.uint8)
+    for tile, (_, redlined) in zip(tiles, results):
+        mosaic[tile.core_y0:tile.core_y1, tile.core_x0:tile.core_x1] = redlined[
+            tile.core_y0 - tile.y0:tile.core_y1 - tile.y0, tile.core_x0 - tile.x0:tile.core_x1 - tile.x0
+        ]
+
+    polylines = await asyncio.to_thread(
+        stitch_tiles, [(tile, tile_polylines) for tile, (tile_polylines, _) in zip(tiles, results)], polygonize_params
+    )
+    logger.info(f"✓ Stitched {len(tiles)} tiles: {len(polylines)} polylines")
+    return polylines, mosaic
 
 
 def create_overlay(
-    original_path: Path,
-    polygonize_dir: Path,
+    original: np.ndarray,
+    polylines: List[Polyline],
     output_path: Path,
     alpha: float = 0.2
 ) -> None:
-    """Overlay extracted lines on original image with transparency."""
+    """Overlay extracted lines on the original image (BGR array) with transparency."""
     logger.info(f"Overlaying lines on original (alpha={alpha})...")
 
-    # Load original image with OpenCV
-    original_cv = cv2.imread(str(original_path))
-
-    # Load the lines-only transparent PNG from polygonize output
-    lines_transparent = cv2.imread(str(polygonize_dir / "lines_only_transparent.png"), cv2.IMREAD_UNCHANGED)
-
-    # Resize to match original if needed
-    if lines_transparent.shape[:2] != original_cv.shape[:2]:
-        logger.info(f"Resizing lines from {lines_transparent.shape[:2]} to {original_cv.shape[:2]}")
-        lines_transparent = cv2.resize(lines_transparent, (original_cv.shape[1], original_cv.shape[0]))
-
-    # Extract alpha channel as mask
-    if lines_transparent.shape[2] == 4:
-        lines_bgr = lines_transparent[:, :, :3]
-        lines_alpha = lines_transparent[:, :, 3]
-        mask = lines_alpha > 10
-    else:
-        # Fallback if no alpha channel
-        mask = cv2.cvtColor(lines_transparent, cv2.COLOR_BGR2GRAY) > 10
+    # Rasterize the lines the same way polygonize's transparent line image does
+    lines_transparent = lines_only_rgba(polylines, original.shape[:2], thick=2)
+    mask = lines_transparent[:, :, 3] > 10
 
     # Create final overlay
-    final_overlay = original_cv.copy().astype(float)
+    final_overlay = original.copy().astype(float)
 
     # Apply red color with alpha transparency only where lines exist
     red_color = np.array([0, 0, 255], dtype=float)  # Red in BGR
     for c in range(3):
         final_overlay[:, :, c][mask] = (
-            original_cv[:, :, c][mask] * (1 - alpha) +
+            original[:, :, c][mask] * (1 - alpha) +
             red_color[c] * alpha
         )
 
@@ -150,37 +204,42 @@ def create_overlay(
 
 
 def convert_to_foundry_format(
-    polylines_json_path: Path,
+    polylines: List[Polyline],
+    polyline_dims: Tuple[int, int],
     original_dims: Tuple[int, int],
-    output_path: Path
+    output_path: Path,
+    merge: bool = True,
+    merge_params: Dict[str, Any] = None,
+    grid: Optional[Dict[str, Any]] = None
 ) -> int:
     """
-    Convert polylines JSON to FoundryVTT wall format.
+    Convert polylines to FoundryVTT wall format.
 
     Args:
-        polylines_json_path: Path to polylines.json from polygonize
+        polylines: Polylines from polygonize
+        polyline_dims: (height, width) of the image the polylines were extracted from
         original_dims: (height, width) of original image
         output_path: Where to save FoundryVTT JSON
+        merge: Snap and merge the walls with merge_walls (default True); the
+            unmerged count is saved as total_walls_before_merge
+        merge_params: Overrides for merge_walls.DEFAULT_MERGE_PARAMS
+        grid: Grid detection result (original image pixels) to snap vertices to
 
     Returns:
         Number of walls created
     """
     logger.info("Converting to FoundryVTT wall format...")
 
-    # Load polylines from JSON
-    with open(polylines_json_path, 'r') as f:
-        poly_data = json.load(f)
-
     # Scale polylines back to original image dimensions if needed
     orig_h, orig_w = original_dims
-    poly_w, poly_h = poly_data['width'], poly_data['height']
+    poly_h, poly_w = polyline_dims
 
     scale_x = orig_w / poly_w
     scale_y = orig_h / poly_h
 
     # Convert to FoundryVTT wall format
     foundry_walls = []
-    for polyline in poly_data['polylines']:
+    for polyline in polylines:
         # Each polyline becomes multiple wall segments (point-to-point)
         for i in range(len(polyline) - 1):
             x1, y1 = polyline[i]
@@ -201,10 +260,15 @@ def convert_to_foundry_format(
             }
             foundry_walls.append(wall)
 
+    walls_before_merge = len(foundry_walls)
+    if merge:
+        foundry_walls = merge_foundry_walls(foundry_walls, grid, merge_params)
+
     foundry_json = {
         "walls": foundry_walls,
         "image_dimensions": {"width": orig_w, "height": orig_h},
-        "total_walls": len(foundry_walls)
+        "total_walls": len(foundry_walls),
+        "total_walls_before_merge": walls_before_merge
     }
 
     with open(output_path, 'w') as f:
@@ -221,7 +285,13 @@ async def redline_walls(
     temperature: float = 0.5,
     model: str = "gemini-2.5-flash-image",
     alpha: float = 0.8,
-    polygonize_params: Dict[str, Any] = None
+    polygonize_params: Dict[str, Any] = None,
+    debug_images: bool = False,
+    tiled: Optional[bool] = None,
+    grid: Optional[Dict[str, Any]] = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    tile_overlap: int = DEFAULT_TILE_OVERLAP,
+    max_concurrent_tiles: int = DEFAULT_TILE_CONCURRENCY
 ) -> Dict[str, Path]:
     """
     Complete wall detection pipeline.
@@ -230,9 +300,10 @@ async def redline_walls(
     1. Convert input to PNG
     2. Create grayscale version
     3. Generate AI red-lined walls
-    4. Polygonize to extract vector lines
+    4. Polygonize to extract vector lines (in-process, on the decoded image)
+       Tiled mode does 3-4 per overlapping tile and stitches the walls at the seams
     5. Overlay lines on original
-    6. Convert to FoundryVTT format
+    6. Convert to FoundryVTT format (merging collinear walls, see merge_walls)
 
     Args:
         input_image: Path to battle map (any image format)
@@ -241,7 +312,16 @@ async def redline_walls(
         temperature: AI sampling temperature (default 0.5 for consistency)
         model: Gemini model (default gemini-2.5-flash-image)
         alpha: Transparency for overlay lines (0.0-1.0, default 0.2)
-        polygonize_params: Custom params for polygonize.py
+        polygonize_params: Overrides for polygonize.DEFAULT_PARAMS
+        debug_images: Also save polygonize's debug images and polylines.json
+            (returned as 'polygonized_dir' and 'polylines_json')
+        tiled: Red-line in tiles; None (default) tiles maps larger than
+            tiling.TILED_MIN_SIZE on a side
+        grid: Grid detection result used to align tile seams and snap wall
+            vertices; detected here if tiling and not given
+        tile_size: Target tile side including overlap (px)
+        tile_overlap: Context margin around each tile's core (px)
+        max_concurrent_tiles: Maximum tiles red-lined at once
 
     Returns:
         Dict with paths to all output files
@@ -279,67 +359,110 @@ async def redline_walls(
     temp_dir = output_dir / "redline_temp"
 
     # Step 1: Convert to PNG
+    # Image work runs in worker threads so concurrent maps on one loop overlap
     logger.info("Step 1: Converting to PNG...")
-    convert_to_png(input_path, original_png)
+    await asyncio.to_thread(convert_to_png, input_path, original_png)
 
     # Step 2: Create grayscale
     logger.info("Step 2: Creating grayscale...")
-    create_grayscale(original_png, grayscale_path)
-
-    # Step 3: Generate AI redlines
-    logger.info("Step 3: Generating AI red-lines...")
-    await generate_redlines(
-        grayscale_path=grayscale_path,
-        output_path=redlined_path,
-        temp_dir=temp_dir,
-        temperature=temperature,
-        model=model
-    )
+    await asyncio.to_thread(create_grayscale, original_png, grayscale_path)
+
+    original_cv = await asyncio.to_thread(cv2.imread, str(original_png))
+    if tiled is None:
+        tiled = needs_tiling(original_cv.shape[1], original_cv.shape[0])
+
+    if tiled:
+        # Steps 3-4: Red-line and polygonize overlapping tiles, then stitch
+        if grid is None:
+            # Imported here: the scenes package imports this module
+            from scenes.detect_grid import detect_grid
+            logger.info("Detecting grid to align tiles...")
+            grid = await asyncio.to_thread(detect_grid, original_png)
+        tiles = plan_tiles(original_cv.shape[1], original_cv.shape[0], tile_size, tile_overlap, grid)
+        logger.info(f"Steps 3-4: Red-lining and polygonizing {len(tiles)} tiles...")
+        polylines, redlined_cv = await redline_tiles(
+            grayscale_path=grayscale_path,
+            tiles=tiles,
+            tiles_dir=output_dir / "tiles",
+            temp_dir=temp_dir,
+            temperature=temperature,
+            model=model,
+            polygonize_params=polygonize_params,
+            max_concurrent=max_concurrent_tiles
+        )
+        await asyncio.to_thread(cv2.imwrite, str(redlined_path), redlined_cv)
+        if debug_images:
+            params = {**DEFAULT_PARAMS, **(polygonize_params or {})}
+            await asyncio.to_thread(
+                save_debug_outputs, redlined_cv, wall_mask(redlined_cv, params["close"], params["open"]),
+                polylines, polygonize_dir
+            )
+    else:
+        # Step 3: Generate AI redlines
+        logger.info("Step 3: Generating AI red-lines...")
+        redlined_bytes = await generate_redlines(
+            grayscale_path=grayscale_path,
+            output_path=redlined_path,
+            temp_dir=temp_dir,
+            temperature=temperature,
+            model=model
+        )
 
-    # Step 3.5: Resize redlined image to match original dimensions
-    # The AI may output at a different size/aspect ratio, causing coordinate shift
-    original_cv = cv2.imread(str(original_png))
-    redlined_cv = cv2.imread(str(redlined_path))
-    if redlined_cv.shape[:2] != original_cv.shape[:2]:
-        logger.info(f"Resizing redlined image from {redlined_cv.shape[:2]} to {original_cv.shape[:2]}")
-        redlined_cv = cv2.resize(redlined_cv, (original_cv.shape[1], original_cv.shape[0]))
-        cv2.imwrite(str(redlined_path), redlined_cv)
-
-    # Step 4: Polygonize
-    logger.info("Step 4: Extracting vector lines...")
-    polygonize_redlines(
-        redlined_path=redlined_path,
-        output_dir=polygonize_dir,
-        polygonize_params=polygonize_params
-    )
+        # Step 3.5: Resize redlined image to match original dimensions
+        # The AI may output at a different size/aspect ratio, causing coordinate shift
+        redlined_cv = await asyncio.to_thread(
+            cv2.imdecode, np.frombuffer(redlined_bytes, np.uint8), cv2.IMREAD_COLOR
+        )
+        if redlined_cv is None:
+            raise RuntimeError("Failed to decode red-lined image")
+        if redlined_cv.shape[:2] != original_cv.shape[:2]:
+            logger.info(f"Resizing redlined image from {redlined_cv.shape[:2]} to {original_cv.shape[:2]}")
+            redlined_cv = await asyncio.to_thread(
+                cv2.resize, redlined_cv, (original_cv.shape[1], original_cv.shape[0])
+            )
+            await asyncio.to_thread(cv2.imwrite, str(redlined_path), redlined_cv)
+
+        # Step 4: Polygonize
+        logger.info("Step 4: Extracting vector lines...")
+        polylines = await asyncio.to_thread(
+            polygonize_redlines,
+            redlined_cv,
+            polygonize_dir if debug_images else None,
+            polygonize_params
+        )
 
     # Step 5: Create overlay
     logger.info("Step 5: Creating overlay...")
-    create_overlay(
-        original_path=original_png,
-        polygonize_dir=polygonize_dir,
+    await asyncio.to_thread(
+        create_overlay,
+        original=original_cv,
+        polylines=polylines,
         output_path=overlay_path,
         alpha=alpha
     )
 
     # Step 6: Convert to FoundryVTT format
     logger.info("Step 6: Converting to FoundryVTT format...")
-    original_cv = cv2.imread(str(original_png))
-    convert_to_foundry_format(
-        polylines_json_path=polygonize_dir / "polylines.json",
+    await asyncio.to_thread(
+        convert_to_foundry_format,
+        polylines=polylines,
+        polyline_dims=redlined_cv.shape[:2],
         original_dims=original_cv.shape[:2],
-        output_path=foundry_path
+        output_path=foundry_path,
+        grid=grid
     )
 
     # Cleanup temp directory
     shutil.rmtree(temp_dir, ignore_errors=True)
 
-    return {
+    result = {
         'original_png': original_png,
         'grayscale': grayscale_path,
         'redlined': redlined_path,
-        'polygonized_dir': polygonize_dir,
         'overlay': overlay_path,
-        'polylines_json': polygonize_dir / "polylines.json",
         'foundry_walls_json': foundry_path
     }
+    if debug_images:
+        result['polygonized_dir'] = polygonize_dir
+        result['polylines_json'] = polygonize_dir / "polylines.json"
+    return result
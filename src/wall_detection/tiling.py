@@ -0,0 +1,191 @@
+"""Split large battle maps into overlapping tiles and stitch tile walls back together.
+
+Very large maps are red-lined tile by tile (see redline_walls) so each Gemini
+request sees the walls near full resolution. Each tile owns a core rectangle;
+the cores partition the map and every tile adds an overlap margin of context
+around its core. Seams (core edges) sit halfway between grid lines when the
+grid is known, so walls drawn on grid lines are not cut lengthwise.
+
+Stitching keeps each tile's polylines inside its core only and joins the
+pieces that meet at seams with polygonize's snapping logic.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from util.geometry import simplify_collinear_batch
+from wall_detection.polygonize import DEFAULT_PARAMS, connect_polylines
+
+logger = logging.getLogger(__name__)
+
+Polyline = List[Tuple[float, float]]
+
+# Maps with a side longer than this (px) are red-lined in tiles by default
+TILED_MIN_SIZE = 4096
+# Target tile side (px), overlap included
+DEFAULT_TILE_SIZE = 2048
+# Context added around each tile's core on every side (px)
+DEFAULT_TILE_OVERLAP = 128
+
+
+@dataclass(frozen=True)
+class Tile:
+    """A crop of the map: the full extent (with overlap) and the core it owns."""
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    core_x0: int
+    core_y0: int
+    core_x1: int
+    core_y1: int
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+
+def needs_tiling(width: int, height: int, min_size: int = TILED_MIN_SIZE) -> bool:
+    """True if a map is large enough to be red-lined in tiles."""
+    return max(width, height) > min_size
+
+
+def _seams(length: int, core: int, first_seam: float) -> List[int]:
+    """Seam positions along one axis: first_seam + k*core, leaving no sliver at the end."""
+    seams = []
+    pos = first_seam
+    while pos < length - core / 2:
+        if pos >= core / 2:
+            seams.append(int(round(pos)))
+        pos += core
+    return seams
+
+
+def plan_tiles(
+    width: int,
+    height: int,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    overlap: int = DEFAULT_TILE_OVERLAP,
+    grid: Optional[Dict[str, Any]] = None
+) -> List[Tile]:
+    """
+    Plan overlapping tiles covering a width x height map, row by row.
+
+    Args:
+        width: Map width (px)
+        height: Map height (px)
+        tile_size: Target tile side including overlap (px)
+        overlap: Context margin around each core (px); rounded up to whole grid cells
+        grid: Grid detection result (grid_size, x_offset, y_offset); when it has a
+            grid_size, core sizes are whole cells and seams sit at cell centres
+
+    Returns:
+        Tiles whose cores partition the map
+    """
+    core = max(tile_size - 2 * overlap, 1)
+    first_x = first_y = float(core)
+    step = (grid or {}).get('grid_size')
+    if step:
+        overlap = math.ceil(overlap / step) * step
+        core = max(step, (max(tile_size - 2 * overlap, step) // step) * step)
+        # First seam: the cell centre closest to one core from the origin
+        first_x = grid.get('x_offset', 0) % step + step / 2
+        first_y = grid.get('y_offset', 0) % step + step / 2
+        first_x += round((core - first_x) / step) * step
+        first_y += round((core - first_y) / step) * step
+
+    xs = [0] + _seams(width, core, first_x) + [width]
+    ys = [0] + _seams(height, core, first_y) + [height]
+    tiles = []
+    for cy0, cy1 in zip(ys, ys[1:]):
+        for cx0, cx1 in zip(xs, xs[1:]):
+            tiles.append(Tile(
+                max(0, cx0 - overlap), max(0, cy0 - overlap), min(width, cx1 + overlap), min(height, cy1 + overlap),
+                cx0, cy0, cx1, cy1
+            ))
+    return tiles
+
+
+def _clip_segment(a, b, x0, y0, x1, y1):
+    """Liang–Barsky: the part of segment a-b inside the rectangle, or None."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, a[0] - x0), (dx, x1 - a[0]), (-dy, a[1] - y0), (dy, y1 - a[1])):
+        if p == 0:
+            if q < 0:
+                return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 > t1:
+        return None
+    start = a if t0 == 0.0 else (a[0] + t0 * dx, a[1] + t0 * dy)
+    end = b if t1 == 1.0 else (a[0] + t1 * dx, a[1] + t1 * dy)
+    return start, end
+
+
+def clip_polyline(polyline: Sequence[Tuple[float, float]], x0: float, y0: float, x1: float, y1: float) -> List[Polyline]:
+    """Split a polyline into its pieces inside the rectangle [x0, x1] x [y0, y1]."""
+    pieces, current = [], []
+    for a, b in zip(polyline, polyline[1:]):
+        clipped = _clip_segment(a, b, x0, y0, x1, y1)
+        if clipped is None:
+            if len(current) >= 2:
+                pieces.append(current)
+            current = []
+            continue
+        start, end = clipped
+        if current and current[-1] == start:
+            current.append(end)
+        else:
+            if len(current) >= 2:
+                pieces.append(current)
+            current = [start, end]
+    if len(current) >= 2:
+        pieces.append(current)
+    return [p for p in pieces if any(q != p[0] for q in p[1:])]
+
+
+def stitch_tiles(
+    tile_polylines: Sequence[Tuple[Tile, Sequence[Polyline]]],
+    polygonize_params: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None
+) -> List[Polyline]:
+    """
+    Merge per-tile polylines (in tile pixel coordinates) into map polylines.
+
+    Each tile contributes only the parts of its polylines inside its core.
+    Pieces cut at seams are joined with connect_polylines (endpoint snapping
+    and T-joins, same snap and minimum length as polygonize), then the extra
+    vertices left at seams on straight walls are removed.
+
+    Args:
+        tile_polylines: (tile, polylines) for every tile
+        polygonize_params: Overrides for polygonize.DEFAULT_PARAMS
+        stats: Optional dict that receives piece counts and timings
+
+    Returns:
+        Polylines in map pixel coordinates
+    """
+    p = {**DEFAULT_PARAMS, **(polygonize_params or {})}
+    pieces = []
+    for tile, polylines in tile_polylines:
+        for polyline in polylines:
+            moved = [(x + tile.x0, y + tile.y0) for x, y in polyline]
+            pieces.extend(clip_polyline(moved, tile.core_x0, tile.core_y0, tile.core_x1, tile.core_y1))
+
+    stitched = connect_polylines(pieces, p["snap"], p["minlen"], stats)
+    if p["collinear"] > 0:
+        stitched = simplify_collinear_batch(stitched, p["collinear"])
+    if stats is not None:
+        stats["tile_pieces"] = len(pieces)
+        stats["polylines"] = len(stitched)
+    logger.info(f"Stitched {len(tile_polylines)} tiles: {len(pieces)} pieces → {len(stitched)} polylines")
+    return stitched
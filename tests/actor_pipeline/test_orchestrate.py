@@ -247,11 +247,11 @@ class TestBatchCreation:
 
         with patch('actor_pipeline.orchestrate.create_actor_from_description', new_callable=AsyncMock) as mock_create, \
              patch('actor_pipeline.orchestrate.asyncio.gather', new_callable=AsyncMock) as mock_gather, \
-             patch('actor_pipeline.orchestrate.SpellCache') as mock_cache_class, \
+             patch('actor_pipeline.orchestrate.get_shared_caches') as mock_shared, \
              patch('actor_pipeline.orchestrate.FoundryClient') as mock_client_class:
 
             mock_cache = MagicMock()
-            mock_cache_class.return_value = mock_cache
+            mock_shared.return_value.get = AsyncMock(return_value=(mock_cache, MagicMock()))
 
             mock_client = MagicMock()
             mock_client_class.return_value = mock_client
@@ -278,12 +278,12 @@ class TestBatchCreation:
         descriptions = ["Good", "Bad", "Ugly"]
 
         with patch('actor_pipeline.orchestrate.create_actor_from_description', new_callable=AsyncMock) as mock_create, \
-             patch('actor_pipeline.orchestrate.SpellCache') as mock_cache_class, \
+             patch('actor_pipeline.orchestrate.get_shared_caches') as mock_shared, \
              patch('actor_pipeline.orchestrate.FoundryClient') as mock_client_class:
 
             # Setup mocks
             mock_cache = MagicMock()
-            mock_cache_class.return_value = mock_cache
+            mock_shared.return_value.get = AsyncMock(return_value=(mock_cache, MagicMock()))
             mock_client = MagicMock()
             mock_client_class.return_value = mock_client
 
@@ -344,11 +344,11 @@ class TestBatchCreation:
 
         with patch('actor_pipeline.orchestrate.create_actor_from_description', new_callable=AsyncMock) as mock_create, \
              patch('actor_pipeline.orchestrate.asyncio.gather', new_callable=AsyncMock) as mock_gather, \
-             patch('actor_pipeline.orchestrate.SpellCache') as mock_cache_class, \
+             patch('actor_pipeline.orchestrate.get_shared_caches') as mock_shared, \
              patch('actor_pipeline.orchestrate.FoundryClient') as mock_client_class:
 
             mock_cache = MagicMock()
-            mock_cache_class.return_value = mock_cache
+            mock_shared.return_value.get = AsyncMock(return_value=(mock_cache, MagicMock()))
 
             mock_client = MagicMock()
             mock_client_class.return_value = mock_client
@@ -361,8 +361,7 @@ class TestBatchCreation:
             )
 
             # Verify resources were created
-            assert mock_cache_class.called
-            assert mock_cache.load.called
+            assert mock_shared.return_value.get.called
             assert mock_client_class.called
 
     @pytest.mark.integration
@@ -374,11 +373,11 @@ class TestBatchCreation:
 
         with patch('actor_pipeline.orchestrate.create_actor_from_description', new_callable=AsyncMock) as mock_create, \
              patch('actor_pipeline.orchestrate.asyncio.gather', new_callable=AsyncMock) as mock_gather, \
-             patch('actor_pipeline.orchestrate.SpellCache') as mock_cache_class, \
+             patch('actor_pipeline.orchestrate.get_shared_caches') as mock_shared, \
              patch('actor_pipeline.orchestrate.FoundryClient') as mock_client_class:
 
             mock_cache = MagicMock()
-            mock_cache_class.return_value = mock_cache
+            mock_shared.return_value.get = AsyncMock(return_value=(mock_cache, MagicMock()))
             mock_client = MagicMock()
             mock_client_class.return_value = mock_client
 
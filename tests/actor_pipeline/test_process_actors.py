@@ -64,7 +64,8 @@ class TestActorProcessingWorkflow:
             mock_client = MagicMock()
             mock_client.search_actor.return_value = None  # Not found in compendium
             mock_client.create_creature_actor.return_value = "Actor.creature123"
-            mock_client.create_npc_actor.return_value = "Actor.npc456"
+            mock_client.build_npc_actor.return_value = ({"name": "Klarg"}, [])
+            mock_client.create_actors.return_value = [{"success": True, "uuid": "Actor.npc456", "name": "Klarg"}]
             mock_client_class.return_value = mock_client
 
             # Run workflow
@@ -75,13 +76,15 @@ class TestActorProcessingWorkflow:
             mock_extract_npcs.assert_called_once()
             mock_client.search_actor.assert_called()
             mock_client.create_creature_actor.assert_called_once_with(mock_stat_block)
-            mock_client.create_npc_actor.assert_called_once()
+            mock_client.build_npc_actor.assert_called_once()
+            mock_client.create_actors.assert_called_once_with([({"name": "Klarg"}, [])], folder=None)
 
             # Verify result
             assert result["stat_blocks_found"] == 1
             assert result["stat_blocks_created"] == 1
             assert result["npcs_found"] == 1
             assert result["npcs_created"] == 1
+            assert result["created_actors"] == [{"uuid": "Actor.npc456", "name": "Klarg"}]
 
     def test_process_actors_reuses_compendium(self):
         """Test workflow reuses existing compendium actors."""
@@ -131,7 +134,8 @@ class TestActorProcessingWorkflow:
             # Mock client finds Goblin in compendium
             mock_client = MagicMock()
             mock_client.search_actor.return_value = "Actor.existing_goblin"
-            mock_client.create_npc_actor.return_value = "Actor.npc789"
+            mock_client.build_npc_actor.return_value = ({"name": "Snarf"}, [])
+            mock_client.create_actors.return_value = [{"success": True, "uuid": "Actor.npc789", "name": "Snarf"}]
             mock_client_class.return_value = mock_client
 
             result = process_actors_for_run(run_dir, target="local")
@@ -140,8 +144,60 @@ class TestActorProcessingWorkflow:
             mock_client.create_creature_actor.assert_not_called()
 
             # Verify NPC created with existing Goblin UUID
-            call_args = mock_client.create_npc_actor.call_args
+            call_args = mock_client.build_npc_actor.call_args
             # call_args is (args, kwargs) - we want kwargs['stat_block_uuid']
             assert call_args.kwargs['stat_block_uuid'] == "Actor.existing_goblin"
 
             assert result["stat_blocks_reused"] == 1
+
+    def test_process_actors_batches_npcs_and_reports_failures(self):
+        """Test all NPCs are created in one batch and per-actor failures are recorded."""
+
+        run_dir = "/tmp/test_run"
+        xml_file = f"{run_dir}/documents/chapter_01.xml"
+
+        with patch('actor_pipeline.process_actors.extract_and_parse_stat_blocks') as mock_extract_sb, \
+             patch('actor_pipeline.process_actors.identify_npcs_with_gemini') as mock_extract_npcs, \
+             patch('actor_pipeline.process_actors.FoundryClient') as mock_client_class, \
+             patch('actor_pipeline.process_actors.Path') as mock_path_class, \
+             patch('actor_pipeline.process_actors.GeminiAPI'), \
+             patch('builtins.open', create=True) as mock_open:
+
+            mock_run_path = MagicMock()
+            mock_run_path.exists.return_value = True
+            mock_documents_dir = MagicMock()
+            mock_documents_dir.exists.return_value = True
+            mock_documents_dir.glob.return_value = [Path(xml_file)]
+            mock_run_path.__truediv__.return_value = mock_documents_dir
+            mock_path_class.return_value = mock_run_path
+
+            mock_file = MagicMock()
+            mock_file.__enter__.return_value.read.return_value = "<xml>test</xml>"
+            mock_open.return_value = mock_file
+
+            from actor_pipeline.models import NPC
+            mock_extract_sb.return_value = []
+            mock_extract_npcs.return_value = [
+                NPC(name="Sildar", creature_stat_block_name="Knight", description="Ally",
+                    plot_relevance="Hostage"),
+                NPC(name="Gundren", creature_stat_block_name="Commoner", description="Patron",
+                    plot_relevance="Missing"),
+            ]
+
+            mock_client = MagicMock()
+            mock_client.search_actor.return_value = "Actor.compendium"
+            mock_client.build_npc_actor.side_effect = lambda npc, **kwargs: ({"name": npc.name}, [])
+            mock_client.create_actors.return_value = [
+                {"success": True, "uuid": "Actor.sildar", "name": "Sildar"},
+                {"success": False, "error": "validation failed"},
+            ]
+            mock_client_class.return_value = mock_client
+
+            result = process_actors_for_run(run_dir, target="local", folder_id="folder1")
+
+            mock_client.create_actors.assert_called_once_with(
+                [({"name": "Sildar"}, []), ({"name": "Gundren"}, [])], folder="folder1"
+            )
+            assert result["npcs_created"] == 1
+            assert result["created_actors"] == [{"uuid": "Actor.sildar", "name": "Sildar"}]
+            assert any("Gundren" in e and "validation failed" in e for e in result["errors"])
@@ -0,0 +1,134 @@
+"""Tests for caches.shared (process-lifetime, persisted SpellCache/IconCache)."""
+
+import asyncio
+
+import pytest
+
+from caches import SharedCaches
+
+SPELLS = [{"name": "Fire Bolt", "uuid": "Compendium.dnd5e.spells.Item.abc", "type": "spell"}]
+ICONS = ["icons/magic/fire/flame-burning.webp", "icons/weapons/swords/scimitar.webp"]
+
+
+class FakeFoundry:
+    """Fetchers and fingerprint backed by mutable in-memory data."""
+
+    def __init__(self, spells=None, icons=None, fingerprint="world|dnd5e@4.1.2|12.331"):
+        self.spells = list(spells or SPELLS)
+        self.icons = list(icons or ICONS)
+        self.current_fingerprint = fingerprint
+        self.fetches = 0
+        self.fail = False
+
+    async def fetch_spells(self):
+        self.fetches += 1
+        if self.fail:
+            raise RuntimeError("SpellCache FAILED to load: No Foundry client connected")
+        return list(self.spells)
+
+    async def fetch_icons(self):
+        return list(self.icons)
+
+    def fingerprint(self):
+        return self.current_fingerprint
+
+    def shared(self, tmp_path, **kwargs):
+        return SharedCaches(self.fetch_spells, self.fetch_icons, fingerprint=self.fingerprint,
+                            cache_dir=tmp_path, **kwargs)
+
+
+@pytest.mark.unit
+class TestSharedCaches:
+    """Test snapshot loading, fingerprint checks and background refresh."""
+
+    @pytest.mark.asyncio
+    async def test_cold_fetch_then_memory(self, tmp_path):
+        foundry = FakeFoundry()
+        shared = foundry.shared(tmp_path)
+
+        spell_cache, icon_cache = await shared.get()
+        again = await shared.get()
+
+        assert spell_cache.get_spell_uuid("fire bolt") == "Compendium.dnd5e.spells.Item.abc"
+        assert icon_cache.icon_count == 2
+        assert again == (spell_cache, icon_cache)
+        assert foundry.fetches == 1
+        assert shared.snapshot_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_restart_loads_snapshot_without_blocking_fetch(self, tmp_path):
+        foundry = FakeFoundry()
+        await foundry.shared(tmp_path).get()
+
+        foundry.fail = True  # Any blocking fetch would raise
+        restarted = foundry.shared(tmp_path)
+        assert restarted.preload()
+        spell_cache, _ = await restarted.get()
+
+        assert spell_cache.get_spell_uuid("Fire Bolt") is not None
+        assert restarted.stats()["snapshot_loads"] == 1
+        # The snapshot is revalidated in the background; its failure is not raised
+        await restarted._refresh_task
+        assert restarted.loaded
+
+    @pytest.mark.asyncio
+    async def test_snapshot_for_other_world_is_ignored(self, tmp_path):
+        foundry = FakeFoundry()
+        await foundry.shared(tmp_path).get()
+
+        foundry.current_fingerprint = "other-world|dnd5e@4.1.2|12.331"
+        other = foundry.shared(tmp_path)
+        assert not other.preload()
+        await other.get()
+        assert other.stats()["cold_fetches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_world_change_drops_loaded_caches(self, tmp_path):
+        foundry = FakeFoundry()
+        shared = foundry.shared(tmp_path)
+        first, _ = await shared.get()
+
+        foundry.current_fingerprint = "other-world|dnd5e@4.1.2|12.331"
+        foundry.spells = [{"name": "Fire Bolt", "uuid": "Compendium.other.Item.xyz"}]
+        second, _ = await shared.get()
+
+        assert second is not first
+        assert second.get_spell_uuid("Fire Bolt") == "Compendium.other.Item.xyz"
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_swaps_only_on_change(self, tmp_path):
+        foundry = FakeFoundry()
+        shared = foundry.shared(tmp_path, refresh_interval=0)
+        first, _ = await shared.get()
+
+        # Unchanged content keeps the same objects
+        assert await shared.refresh() is False
+        assert (await shared.get())[0] is first
+        await shared._refresh_task
+
+        foundry.icons.append("icons/magic/light/orb.webp")
+        await shared.get()  # Serves the current pair, schedules a refresh
+        await shared._refresh_task
+        _, icon_cache = await shared.get()
+        assert icon_cache.icon_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cold_fetch_failure_raises(self, tmp_path):
+        foundry = FakeFoundry()
+        foundry.fail = True
+        shared = foundry.shared(tmp_path)
+
+        with pytest.raises(RuntimeError, match="SpellCache FAILED"):
+            await shared.get()
+        assert not shared.loaded
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_gets_fetch_once(self, tmp_path):
+        foundry = FakeFoundry()
+        shared = foundry.shared(tmp_path, persist=False)
+
+        results = await asyncio.gather(*(shared.get() for _ in range(5)))
+
+        assert foundry.fetches == 1
+        assert all(result == results[0] for result in results)
+        assert not shared.snapshot_path.exists()
@@ -13,6 +13,11 @@ import filelock
 
 from tests.foundry_init import ensure_foundry_ready as _ensure_foundry_ready
 
+# Tests must exercise real (or mocked) Gemini calls, not replay cached responses
+os.environ.setdefault("GEMINI_CACHE", "false")
+os.environ.setdefault("OCR_CACHE", "false")
+os.environ.setdefault("FOUNDRY_CACHE", "false")
+
 # Playwright user pool for parallel browser tests
 PLAYWRIGHT_USERS = ["Testing1", "Testing2", "Testing3", "Testing4", "Testing5"]
 PLAYWRIGHT_LOCK_DIR = Path(__file__).parent / ".playwright_locks"
@@ -585,3 +590,22 @@ def sample_malformed_xml():
             <item>First item
         </list>
     </page>"""
+
+
+@pytest.fixture(autouse=True)
+def reset_gemini_clients():
+    """Drop shared Gemini clients so tests that patch genai.Client get a fresh one."""
+    for module_name in ("util.gemini", "src.util.gemini"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.reset_clients()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    """Start each test without process-wide spell/icon caches from earlier tests."""
+    from caches import set_shared_caches
+    set_shared_caches(None)
+    yield
+    set_shared_caches(None)
@@ -0,0 +1,99 @@
+"""Tests for AsyncFoundryClient - non-blocking operations via the backend."""
+
+import json
+
+import httpx
+import pytest
+
+from foundry.async_client import AsyncFoundryClient
+
+
+def make_client(handler):
+    """Create an AsyncFoundryClient whose HTTP calls go to handler."""
+    return AsyncFoundryClient(backend_url="http://backend.test", transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.unit
+class TestAsyncFoundryClient:
+    """Tests for AsyncFoundryClient request/response handling."""
+
+    async def test_uses_http_outside_backend(self):
+        """Without the backend app loaded, the client talks HTTP."""
+        async with AsyncFoundryClient(backend_url="http://backend.test") as client:
+            assert client.in_process is False
+
+    async def test_create_scene_sends_scene_data(self):
+        """create_scene posts the same scene data as SceneManager."""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"success": True, "uuid": "Scene.abc", "name": "Cave"})
+
+        async with make_client(handler) as client:
+            result = await client.create_scene("Cave", background_image="worlds/w/cave.webp", grid_size=70)
+
+        assert result == {"success": True, "uuid": "Scene.abc", "name": "Cave"}
+        assert requests_seen[0].url.path == "/api/foundry/scene"
+        scene = json.loads(requests_seen[0].content)["scene"]
+        assert scene["grid"] == {"size": 70, "type": 1}
+        assert scene["background"] == {"src": "worlds/w/cave.webp"}
+
+    async def test_connection_pool_is_reused(self):
+        """Several calls go through one pooled client."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"success": True, "entity": {}})
+
+        async with make_client(handler) as client:
+            await client.get_scene("Scene.a")
+            await client.get_actor("Actor.b")
+
+        assert calls == ["/api/foundry/scene/Scene.a", "/api/foundry/actor/Actor.b"]
+
+    async def test_upload_file(self, tmp_path):
+        """upload_file sends the file as multipart form data."""
+        image = tmp_path / "map.webp"
+        image.write_bytes(b"image-bytes")
+
+        def handler(request):
+            assert b"image-bytes" in request.content
+            assert b'name="destination"' in request.content
+            return httpx.Response(200, json={"success": True, "path": "worlds/w/uploaded-maps/map.webp"})
+
+        async with make_client(handler) as client:
+            result = await client.upload_file(image)
+
+        assert result["path"] == "worlds/w/uploaded-maps/map.webp"
+
+    async def test_error_responses(self, tmp_path):
+        """HTTP errors and missing files become error results."""
+        def handler(request):
+            if request.method == "DELETE":
+                return httpx.Response(404, json={"detail": "missing"})
+            return httpx.Response(503, json={"detail": "No Foundry client connected"})
+
+        async with make_client(handler) as client:
+            assert (await client.delete_scene("Scene.x"))["error"] == "Scene not found: Scene.x"
+            assert (await client.get_journal("JournalEntry.j"))["error"] == "No Foundry client connected"
+            assert (await client.upload_file(tmp_path / "none.png"))["success"] is False
+
+    async def test_create_journal_entry_raises_on_failure(self):
+        """create_journal_entry raises RuntimeError like JournalManager."""
+        def handler(request):
+            return httpx.Response(500, json={"detail": "boom"})
+
+        async with make_client(handler) as client:
+            with pytest.raises(RuntimeError, match="boom"):
+                await client.create_journal_entry("Notes", content="<p>Hi</p>")
+
+    async def test_transport_errors(self):
+        """Connection failures become error results."""
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        async with make_client(handler) as client:
+            assert await client.is_connected() is False
+            assert (await client.get_scene("Scene.a"))["error"] == "refused"
@@ -1,5 +1,7 @@
 """Test suite for caches.icon_cache."""
 
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock
 from caches import IconCache
@@ -164,3 +166,124 @@ def test_get_icon_by_keywords():
     # Test no match
     icon = cache.get_icon_by_keywords(["axe", "hammer"], category="weapons")
     assert icon is None
+
+
+def test_index_rebuilt_when_icons_reloaded():
+    """Lookups use the new file list after load_from_data()."""
+    cache = IconCache()
+    cache.load_from_data(["icons/weapons/swords/sword-steel.webp"])
+    assert cache.get_icon("sword") == "icons/weapons/swords/sword-steel.webp"
+
+    cache.load_from_data(["icons/weapons/axes/axe-battle.webp"])
+    assert cache.get_icon("sword") is None
+    assert cache.get_icon("axe") == "icons/weapons/axes/axe-battle.webp"
+
+
+def test_get_icon_prefers_best_score_then_list_order():
+    """Fuzzy matching keeps the linear-scan semantics: best score, earliest icon on ties."""
+    cache = IconCache()
+    cache.load_from_data([
+        "icons/weapons/swords/swords-crossed.webp",
+        "icons/weapons/swords/sword-steel.webp",
+        "icons/weapons/swords/sword-iron.webp",
+    ])
+
+    assert cache.get_icon("sword") == "icons/weapons/swords/sword-steel.webp"
+    assert cache.get_icon("sword", threshold=1.01) is None
+
+
+@pytest.mark.asyncio
+async def test_perfect_match_searches_categories_in_order():
+    """Perfect word matches come from the first listed category that has one."""
+    cache = IconCache()
+    cache.load_from_data([
+        "icons/creatures/claws/claw-bear.webp",
+        "icons/weapons/fist/claw-gauntlet.webp",
+    ])
+
+    icon = await cache.get_icon_with_ai_fallback("Claw", category=["weapons", "creatures"])
+    assert icon == "icons/weapons/fist/claw-gauntlet.webp"
+
+    icon = await cache.get_icon_with_ai_fallback("Bear Claw", category=["weapons", "creatures"])
+    assert icon == "icons/creatures/claws/claw-bear.webp"
+
+
+@pytest.mark.asyncio
+async def test_ai_fallback_receives_ranked_candidates():
+    """Without a perfect match, Gemini is offered the most relevant icons first."""
+    filler = [f"icons/magic/light/orb-glow-{i}.webp" for i in range(300)]
+    relevant = [
+        "icons/magic/fire/flame-burning-hand.webp",
+        "icons/magic/fire/projectile-fireball-orange.webp",
+    ]
+    cache = IconCache()
+    cache.load_from_data(filler + relevant)
+
+    with patch.object(IconCache, '_select_icon_with_gemini', return_value=None) as mock_select:
+        icon = await cache.get_icon_with_ai_fallback("Fire Bolt", category="magic")
+
+    candidates = mock_select.call_args.args[1]
+    assert len(candidates) == 200
+    assert set(candidates[:2]) == set(relevant)
+    # Gemini failed, so the best-ranked candidate is the fallback
+    assert icon == candidates[0]
+
+
+class TestIconResolutionMemo:
+    """Tests for memoized and coalesced get_icon_with_ai_fallback lookups."""
+
+    @pytest.fixture
+    def cache(self):
+        cache = IconCache()
+        cache.load_from_data([
+            "icons/creatures/claws/claw-bear.webp",
+            "icons/magic/fire/flame-burning-hand.webp",
+        ])
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_resolve_once(self, cache):
+        """A batch of identical attack names triggers one Gemini selection."""
+        async def slow_select(item_name, icon_paths, model_name="gemini-2.0-flash"):
+            await asyncio.sleep(0.01)
+            return icon_paths[0]
+
+        with patch.object(IconCache, '_select_icon_with_gemini', side_effect=slow_select) as mock_select:
+            icons = await cache.get_icons_batch([("Multiattack", "creatures")] * 30)
+            again = await cache.get_icon_with_ai_fallback("multiattack", category="creatures")
+
+        assert mock_select.call_count == 1
+        assert len(set(icons)) == 1 and again == icons[0]
+        stats = cache.memo_stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 29
+        assert stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memo_invalidated_when_icons_change(self, cache):
+        """Reloading the icon list drops memoized resolutions."""
+        assert await cache.get_icon_with_ai_fallback("Claw", category="creatures") == \
+            "icons/creatures/claws/claw-bear.webp"
+
+        cache.load_from_data(["icons/creatures/claws/claw-wolf.webp"])
+        assert await cache.get_icon_with_ai_fallback("Claw", category="creatures") == \
+            "icons/creatures/claws/claw-wolf.webp"
+
+    @pytest.mark.asyncio
+    async def test_memo_evicts_least_recently_used(self, cache):
+        cache._memo_size = 2
+        await cache.get_icon_with_ai_fallback("Claw", category="creatures")
+        await cache.get_icon_with_ai_fallback("Bear", category="creatures")
+        await cache.get_icon_with_ai_fallback("Claw", category="creatures")  # refresh
+        await cache.get_icon_with_ai_fallback("Flame", category="magic")
+
+        keys = [key[0] for key in cache._memo]
+        assert keys == ["claw", "flame"]
+
+    @pytest.mark.asyncio
+    async def test_gemini_failure_is_not_memoized(self, cache):
+        with patch.object(IconCache, '_select_icon_with_gemini', return_value=None) as mock_select:
+            await cache.get_icon_with_ai_fallback("Lightning Breath", category="magic")
+            await cache.get_icon_with_ai_fallback("Lightning Breath", category="magic")
+
+        assert mock_select.call_count == 2
@@ -0,0 +1,126 @@
+"""
+Tests for src/pdf_processing/ocr_stage.py
+
+Tesseract is mocked; page renders come from small PDFs generated with PyMuPDF.
+"""
+
+import concurrent.futures
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from pdf_processing.ocr_stage import OcrCache, run_ocr_stage
+from pdf_processing.page_store import PdfPageStore
+
+
+def _fake_ocr(png_batch):
+    return [f"ocr text {len(png)}" for png in png_batch]
+
+
+@pytest.fixture
+def page_store(tmp_path):
+    """A 5-page PDF store with distinct content per page."""
+    doc = fitz.open()
+    for i in range(5):
+        page = doc.new_page(width=300, height=300)
+        page.insert_text((40, 40 + i * 30), f"Scanned page {i + 1}")
+    pdf_bytes = doc.write()
+    doc.close()
+    with PdfPageStore(pdf_bytes) as store:
+        yield store
+
+
+@pytest.mark.unit
+class TestRunOcrStage:
+    """Test batching, caching and store write-back."""
+
+    def test_results_are_written_back_to_store(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        with patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=_fake_ocr) as mock_ocr:
+            results = run_ocr_stage(page_store, [1, 3], max_workers=1, cache=cache)
+            assert set(results) == {1, 3}
+            # The legible-text path reads the stored result instead of running Tesseract
+            assert page_store.ocr_text(3) == results[3]
+            assert mock_ocr.call_count == 1
+
+    def test_pages_are_batched(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        with patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=_fake_ocr) as mock_ocr:
+            run_ocr_stage(page_store, [1, 2, 3, 4, 5], max_workers=1, batch_size=2, cache=cache)
+        assert [len(call.args[0]) for call in mock_ocr.call_args_list] == [2, 2, 1]
+
+    def test_cached_pages_skip_ocr(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        with patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=_fake_ocr):
+            first = run_ocr_stage(page_store, [1, 2], max_workers=1, cache=cache)
+
+        with PdfPageStore(page_store.page_pdf_bytes(1)) as other_store:
+            with patch("pdf_processing.ocr_stage._ocr_png_batch") as mock_ocr:
+                results = run_ocr_stage(other_store, [1], max_workers=1, cache=cache)
+                mock_ocr.assert_not_called()
+        assert results[1] == first[1]
+
+    def test_disabled_cache_always_runs_ocr(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr", enabled=False)
+        with patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=_fake_ocr) as mock_ocr:
+            run_ocr_stage(page_store, [1], max_workers=1, cache=cache)
+            run_ocr_stage(page_store, [1], max_workers=1, cache=cache)
+        assert mock_ocr.call_count == 2
+        assert not (tmp_path / "ocr").exists()
+
+    def test_failed_batch_is_omitted(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        with patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=RuntimeError("tesseract missing")):
+            results = run_ocr_stage(page_store, [1, 2], max_workers=1, cache=cache)
+        assert results == {}
+
+    def test_pool_path(self, page_store, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool, \
+             patch("pdf_processing.ocr_stage._ocr_png_batch", side_effect=_fake_ocr), \
+             patch("pdf_processing.ocr_stage._get_ocr_pool", return_value=pool):
+            results = run_ocr_stage(page_store, [1, 2, 3, 4, 5], max_workers=2, batch_size=2, cache=cache)
+        assert set(results) == {1, 2, 3, 4, 5}
+
+    def test_pool_is_shared_and_not_forked(self):
+        from pdf_processing import ocr_stage
+
+        ocr_stage.shutdown_ocr_pool()
+        try:
+            pool = ocr_stage._get_ocr_pool()
+            assert ocr_stage._get_ocr_pool() is pool
+            assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+        finally:
+            ocr_stage.shutdown_ocr_pool()
+
+
+@pytest.mark.unit
+class TestOcrCacheBounds:
+    """Test OCR cache expiry and size-based eviction."""
+
+    def test_expired_entries_miss(self, tmp_path):
+        cache = OcrCache(tmp_path / "ocr", max_age_seconds=0)
+        cache.put("ab" * 32, "text")
+        assert cache.get("ab" * 32) is None
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        import os
+
+        cache = OcrCache(tmp_path / "ocr", max_bytes=10)
+        keys = [c * 64 for c in "abc"]
+        for age, key in zip((300, 200, 100), keys):
+            cache.put(key, "x" * 5)
+            stamp = os.path.getmtime(cache._path(key)) - age
+            os.utime(cache._path(key), (stamp, stamp))
+
+        assert cache.prune() == 1
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[1]) == "x" * 5
+        assert cache.get(keys[2]) == "x" * 5
+
+    def test_clear(self, tmp_path):
+        cache = OcrCache(tmp_path / "ocr")
+        cache.put("ab" * 32, "text")
+        cache.clear()
+        assert cache.get("ab" * 32) is None
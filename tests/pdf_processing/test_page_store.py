@@ -0,0 +1,107 @@
+"""
+Tests for src/pdf_processing/page_store.py
+
+Uses small PDFs generated with PyMuPDF (no external files or API calls).
+"""
+
+import io
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_processing.page_store import PdfPageStore
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Create a 3-page PDF with text on every page and an image on page 2."""
+    pdf_path = tmp_path / "sample.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Page {i + 1} heading text")
+    image = Image.new("RGB", (400, 300), color=(120, 40, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    doc[1].insert_image(fitz.Rect(50, 100, 450, 400), stream=buffer.getvalue())
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+@pytest.mark.unit
+class TestPdfPageStore:
+    """Test lazy memoization, LRU eviction and disk spill."""
+
+    def test_page_count_and_text(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            assert len(store) == 3
+            assert "Page 2 heading text" in store.embedded_text(2)
+
+    def test_values_are_memoized(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            first = store.render_png(1, dpi=72)
+            second = store.render_png(1, dpi=72)
+            assert first == second
+            assert store.stats()["misses"] == 1
+            assert store.stats()["hits"] == 1
+
+    def test_renders_are_keyed_by_dpi(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            low = Image.open(io.BytesIO(store.render_png(1, dpi=72)))
+            high = Image.open(io.BytesIO(store.render_png(1, dpi=144)))
+            assert high.size[0] == pytest.approx(low.size[0] * 2, abs=2)
+
+    def test_page_pdf_bytes_contains_single_page(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            with fitz.open("pdf", store.page_pdf_bytes(3)) as single:
+                assert len(single) == 1
+                assert "Page 3" in single[0].get_text()
+
+    def test_image_extraction(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            assert store.image_xrefs(1) == []
+            xrefs = store.image_xrefs(2)
+            assert len(xrefs) == 1
+            info = store.extract_image(xrefs[0][0])
+            assert (info["width"], info["height"]) == (400, 300)
+            assert len(info["image"]) > 0
+
+    def test_evicted_entries_spill_to_disk(self, sample_pdf, tmp_path):
+        cache_dir = tmp_path / "page_cache"
+        with PdfPageStore(sample_pdf, cache_dir=cache_dir, max_memory_bytes=1) as store:
+            first = store.render_png(1)
+            store.render_png(2)  # Evicts page 1 to disk
+            assert store.stats()["memory_entries"] == 1
+            assert store.render_png(1) == first
+            assert store.stats()["spill_reads"] == 1
+            assert store.stats()["misses"] == 2
+
+    def test_spill_is_reused_across_stores(self, sample_pdf, tmp_path):
+        cache_dir = tmp_path / "page_cache"
+        with PdfPageStore(sample_pdf, cache_dir=cache_dir, max_memory_bytes=1) as store:
+            store.embedded_text(1)
+            store.embedded_text(2)
+        with PdfPageStore(sample_pdf, cache_dir=cache_dir) as store:
+            assert "Page 1" in store.embedded_text(1)
+            assert store.stats()["spill_reads"] == 1
+
+    def test_temporary_spill_dir_removed_on_close(self, sample_pdf):
+        store = PdfPageStore(sample_pdf, max_memory_bytes=1)
+        store.render_png(1)
+        store.render_png(2)
+        spill_dir = store.spill_dir
+        assert spill_dir.exists()
+        store.close()
+        assert not spill_dir.exists()
+
+    def test_out_of_range_page(self, sample_pdf):
+        with PdfPageStore(sample_pdf) as store:
+            with pytest.raises(IndexError):
+                store.embedded_text(4)
+
+    def test_open_from_bytes(self, sample_pdf):
+        with PdfPageStore(sample_pdf.read_bytes()) as store:
+            assert store.pdf_path is None
+            assert len(store) == 3
@@ -18,6 +18,7 @@ import xml.etree.ElementTree as ET
 import fitz
 from pathlib import Path
 import os
+from unittest.mock import patch
 
 from pdf_processing.pdf_to_xml import (
     sanitize_xml_element_name,
@@ -26,9 +27,12 @@ from pdf_processing.pdf_to_xml import (
     is_text_legible,
     configure_gemini,
     get_legible_text_from_page,
+    get_legible_text_from_store,
+    ocr_illegible_pages,
     get_xml_for_page,
     validate_xml_with_model
 )
+from pdf_processing.page_store import PdfPageStore
 from models.xml_document import XMLDocument
 
 
@@ -163,6 +167,29 @@ class TestTextExtraction:
 
         doc.close()
 
+    def test_only_illegible_pages_are_ocrd(self, tmp_path):
+        """Test that the OCR stage only receives pages whose embedded text is corrupted."""
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "A perfectly normal page of text.")
+        garbled = doc.new_page()
+        for i in range(12):
+            garbled.insert_text((72, 72 + i * 14), "x" * 25)
+        pdf_bytes = doc.write()
+        doc.close()
+
+        def fake_stage(store, pages):
+            for page_num in pages:
+                store.set_ocr_text(page_num, "recovered text")
+
+        os.makedirs(tmp_path / "pages", exist_ok=True)
+        with PdfPageStore(pdf_bytes) as store:
+            with patch("pdf_processing.pdf_to_xml.run_ocr_stage", side_effect=fake_stage) as mock_stage:
+                assert ocr_illegible_pages(store) == [2]
+                mock_stage.assert_called_once_with(store, [2])
+
+            assert get_legible_text_from_store(store, 1, str(tmp_path))[1] == "embedded"
+            assert get_legible_text_from_store(store, 2, str(tmp_path)) == ("recovered text", "ocr")
+
 
 @pytest.mark.gemini
 @pytest.mark.slow
@@ -381,3 +408,120 @@ Challenge 1/4 (50 XP)
         is_valid, error_msg = validate_xml_with_model(xml_missing_page_num)
         assert is_valid == True
         assert error_msg is None
+
+
+class TestChapterResume:
+    """Test per-page checkpoint/resume in process_chapter (Gemini mocked)."""
+
+    @pytest.fixture
+    def chapter_pdf(self, tmp_path):
+        """Create a small 3-page chapter PDF."""
+        pdf_path = tmp_path / "01_Test_Chapter.pdf"
+        doc = fitz.open()
+        for i in range(3):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {i + 1} text")
+        doc.save(str(pdf_path))
+        doc.close()
+        return pdf_path
+
+    def _run_chapter(self, chapter_pdf, tmp_path, page_results, resume):
+        from unittest.mock import patch, MagicMock
+        from pdf_processing import pdf_to_xml
+
+        calls = []
+
+        def fake_get_xml_for_page(page_info):
+            page_number = page_info[1]
+            calls.append(page_number)
+            return page_results(page_number)
+
+        with patch.object(pdf_to_xml, "get_xml_for_page", side_effect=fake_get_xml_for_page), \
+             patch.object(pdf_to_xml, "GeminiFileContext", MagicMock()), \
+             patch.object(pdf_to_xml, "verify_final_word_count"):
+            try:
+                pdf_to_xml.process_chapter(
+                    str(chapter_pdf), str(tmp_path / "chapter.xml"), str(tmp_path / "logs"), resume=resume
+                )
+            except Exception:
+                pass
+        return calls
+
+    def test_resume_only_dispatches_failed_pages(self, chapter_pdf, tmp_path):
+        from pdf_processing.pdf_to_xml import load_chapter_manifest
+
+        pages_dir = tmp_path / "logs" / "01_Test_Chapter" / "pages"
+
+        def convert(failing_pages):
+            # Mirrors get_xml_for_page: page_N.xml is only written on success
+            def page_result(page_number):
+                if page_number in failing_pages:
+                    return "<page><error>Failed to process after multiple retries.</error></page>"
+                xml = f"<page><p>Page {page_number} text</p></page>"
+                (pages_dir / f"page_{page_number}.xml").write_text(xml)
+                return xml
+            return page_result
+
+        calls = self._run_chapter(chapter_pdf, tmp_path, convert({2}), resume=False)
+        assert sorted(calls) == [1, 2, 3]
+        assert not (tmp_path / "chapter.xml").exists()
+
+        manifest = load_chapter_manifest(str(pages_dir.parent))
+        assert manifest["pages"]["1"]["status"] == "ok"
+        assert manifest["pages"]["2"]["status"] == "failed"
+
+        calls = self._run_chapter(chapter_pdf, tmp_path, convert(set()), resume=True)
+        assert calls == [2]
+        assert (tmp_path / "chapter.xml").exists()
+
+    def test_resume_only_ocrs_pending_pages_before_conversion(self, chapter_pdf, tmp_path):
+        from unittest.mock import patch
+        from pdf_processing import pdf_to_xml
+
+        pages_dir = tmp_path / "logs" / "01_Test_Chapter" / "pages"
+
+        def page_result(page_number):
+            if page_number == 3:
+                return "<page><error>Failed to process after multiple retries.</error></page>"
+            xml = f"<page><p>Page {page_number} text</p></page>"
+            (pages_dir / f"page_{page_number}.xml").write_text(xml)
+            return xml
+
+        self._run_chapter(chapter_pdf, tmp_path, page_result, resume=False)
+
+        with patch.object(pdf_to_xml, "ocr_illegible_pages", return_value=[]) as mock_ocr:
+            self._run_chapter(chapter_pdf, tmp_path, page_result, resume=True)
+        assert list(mock_ocr.call_args_list[0].args[1]) == [3]
+
+    def test_resume_ignores_manifest_for_changed_pdf(self, chapter_pdf, tmp_path):
+        from pdf_processing.pdf_to_xml import load_completed_pages, get_prompt_version, write_chapter_manifest
+
+        log_dir = tmp_path / "logs" / "01_Test_Chapter"
+        (log_dir / "pages").mkdir(parents=True)
+        (log_dir / "pages" / "page_1.xml").write_text("<page><p>Text</p></page>")
+        write_chapter_manifest(str(log_dir), {
+            "source_pdf_sha256": "old-hash",
+            "prompt_version": get_prompt_version(),
+            "pages": {"1": {"status": "ok"}},
+        })
+
+        assert load_completed_pages(str(log_dir), "new-hash", get_prompt_version()) == {}
+        assert load_completed_pages(str(log_dir), "old-hash", get_prompt_version()) == {
+            1: "<page><p>Text</p></page>"
+        }
+        assert load_completed_pages(str(log_dir), "old-hash", "0-stale") == {}
+
+    def test_resume_skips_invalid_page_xml(self, tmp_path):
+        from pdf_processing.pdf_to_xml import load_completed_pages, get_prompt_version, write_chapter_manifest
+
+        log_dir = tmp_path / "chapter"
+        (log_dir / "pages").mkdir(parents=True)
+        (log_dir / "pages" / "page_1.xml").write_text("<page><unknown_tag>x</unknown_tag></page>")
+        (log_dir / "pages" / "page_2.xml").write_text("<page><p>unclosed</page>")
+        write_chapter_manifest(str(log_dir), {
+            "source_pdf_sha256": "hash",
+            "prompt_version": get_prompt_version(),
+            "pages": {"1": {"status": "ok"}, "2": {"status": "ok"}, "3": {"status": "ok"}},
+        })
+
+        assert load_completed_pages(str(log_dir), "hash", get_prompt_version()) == {}
@@ -27,7 +27,7 @@ class TestExtractChapterContext:
     @pytest.mark.integration
     def test_extract_context_calls_gemini(self, sample_xml_content):
         """Test that extract_chapter_context calls Gemini API with correct prompt."""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             # Mock Gemini response
             mock_response = MagicMock()
             mock_response.text = """
@@ -57,7 +57,7 @@ class TestExtractChapterContext:
 
     def test_extract_context_handles_json_parsing(self):
         """Test that extract_context properly parses Gemini JSON response."""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '{"environment_type": "forest", "lighting": "dappled sunlight"}'
             mock_client = MagicMock()
@@ -71,7 +71,7 @@ class TestExtractChapterContext:
 
     def test_extract_context_raises_on_invalid_json(self):
         """Test that extract_context raises error on malformed JSON."""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = "Not valid JSON at all"
             mock_client = MagicMock()
@@ -83,7 +83,7 @@ class TestExtractChapterContext:
 
     def test_extract_context_handles_markdown_json_same_line(self):
         """Test parsing when json identifier is on same line as backticks: ```json"""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```json
 {"environment_type": "forest", "lighting": "dappled sunlight"}
@@ -99,7 +99,7 @@ class TestExtractChapterContext:
 
     def test_extract_context_handles_markdown_json_separate_line(self):
         """Test parsing when json identifier is on separate line after backticks."""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```
 json
@@ -116,7 +116,7 @@ json
 
     def test_extract_context_handles_markdown_no_json_identifier(self):
         """Test parsing when markdown blocks have no json identifier."""
-        with patch('src.scene_extraction.extract_context.genai.Client') as mock_client_class:
+        with patch('scene_extraction.extract_context.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```
 {"environment_type": "coastal", "weather": "foggy"}
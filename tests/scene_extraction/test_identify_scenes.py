@@ -34,7 +34,7 @@ class TestIdentifySceneLocations:
     @pytest.mark.integration
     def test_identify_scenes_calls_gemini(self, sample_xml_content, sample_context):
         """Test that identify_scene_locations calls Gemini with XML and context."""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = """
             [
@@ -63,7 +63,7 @@ class TestIdentifySceneLocations:
 
     def test_identify_scenes_parses_json_array(self, sample_context):
         """Test parsing of JSON array response."""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '[{"section_path": "Ch1", "name": "Room", "description": "A room", "location_type": "interior"}]'
             mock_client = MagicMock()
@@ -77,7 +77,7 @@ class TestIdentifySceneLocations:
 
     def test_identify_scenes_returns_empty_list_on_no_scenes(self, sample_context):
         """Test that function returns empty list when no scenes found."""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = "[]"
             mock_client = MagicMock()
@@ -90,7 +90,7 @@ class TestIdentifySceneLocations:
 
     def test_identify_scenes_handles_markdown_json_same_line(self, sample_context):
         """Test parsing when json identifier is on same line as backticks: ```json"""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```json
 [{"section_path": "Ch1", "name": "Forest Clearing", "description": "A sunlit clearing", "location_type": "outdoor"}]
@@ -107,7 +107,7 @@ class TestIdentifySceneLocations:
 
     def test_identify_scenes_handles_markdown_json_separate_line(self, sample_context):
         """Test parsing when json identifier is on separate line after backticks."""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```
 json
@@ -125,7 +125,7 @@ json
 
     def test_identify_scenes_handles_markdown_no_json_identifier(self, sample_context):
         """Test parsing when there's no json identifier, just backticks."""
-        with patch('src.scene_extraction.identify_scenes.genai.Client') as mock_client_class:
+        with patch('scene_extraction.identify_scenes.get_client') as mock_client_class:
             mock_response = MagicMock()
             mock_response.text = '''```
 [{"section_path": "Ch3", "name": "City Street", "description": "Cobblestone street", "location_type": "outdoor"}]
@@ -482,6 +482,41 @@ class TestCreateSceneFromMap:
             # Should use estimate's value
             assert result.grid_size == 90
 
+    async def test_reports_wall_counts_before_and_after_merge(self, tmp_path):
+        """Walls are re-merged with the detected grid; both counts are reported."""
+        from scenes.orchestrate import create_scene_from_map
+
+        test_image = tmp_path / "merge_map.png"
+        test_image.write_bytes(create_minimal_png(200, 200))
+        wall = {"move": 20, "sense": 20, "door": 0, "ds": 0}
+        walls_json = tmp_path / "walls.json"
+        walls_json.write_text(json.dumps({
+            "walls": [{"c": [1, 2, 50, 0], **wall}, {"c": [50, 0, 139, 1], **wall}],
+            "image_dimensions": {"width": 200, "height": 200},
+            "total_walls": 2,
+            "total_walls_before_merge": 9
+        }))
+
+        mock_client = MagicMock()
+        mock_client.files.upload_file = MagicMock(return_value={"success": True, "path": "worlds/test/merge_map.png"})
+        mock_client.scenes.create_scene = MagicMock(return_value={"success": True, "uuid": "Scene.merge", "name": "Merge Map"})
+
+        with patch("scenes.orchestrate.redline_walls", new_callable=AsyncMock) as mock_redline, \
+             patch("scenes.orchestrate.detect_grid") as mock_detect_grid:
+            mock_redline.return_value = {'foundry_walls_json': walls_json}
+            mock_detect_grid.return_value = {'grid_size': 70, 'x_offset': 0, 'y_offset': 0, 'snr': 0.9}
+
+            result = await create_scene_from_map(
+                image_path=test_image,
+                output_dir_base=tmp_path,
+                foundry_client=mock_client
+            )
+
+        assert result.wall_count == 1
+        assert result.wall_count_before_merge == 9
+        walls = mock_client.scenes.create_scene.call_args.kwargs["walls"]
+        assert walls == [{"c": [0.0, 0.0, 140.0, 0.0], **wall}]
+
 
 @pytest.mark.unit
 @pytest.mark.asyncio
@@ -573,6 +608,63 @@ class TestParallelDetection:
         assert result.grid_size == 70
         assert result.wall_count == 1
 
+    async def test_large_map_passes_detected_grid_to_tiled_walls(self, tmp_path):
+        """Large maps are red-lined in tiles aligned to the detected grid."""
+        from scenes.orchestrate import create_scene_from_map
+
+        test_image = tmp_path / "large_map.png"
+        test_image.write_bytes(create_minimal_png(100, 100))
+        walls_json = tmp_path / "walls.json"
+        walls_json.write_text(json.dumps({"walls": [], "image_dimensions": {"width": 100, "height": 100}}))
+        grid_result = {'grid_size': 70, 'x_offset': 5, 'y_offset': 9, 'snr': 0.95}
+
+        mock_client = MagicMock()
+        mock_client.files.upload_file = MagicMock(return_value={"success": True, "path": "worlds/test/large_map.png"})
+        mock_client.scenes.create_scene = MagicMock(return_value={"success": True, "uuid": "Scene.large", "name": "Large Map"})
+
+        with patch("scenes.orchestrate.needs_tiling", return_value=True), \
+             patch("scenes.orchestrate.redline_walls", new_callable=AsyncMock) as mock_redline, \
+             patch("scenes.orchestrate.detect_grid", return_value=grid_result) as mock_detect_grid:
+            mock_redline.return_value = {'foundry_walls_json': walls_json}
+
+            result = await create_scene_from_map(
+                image_path=test_image,
+                output_dir_base=tmp_path,
+                foundry_client=mock_client
+            )
+
+        mock_detect_grid.assert_called_once()
+        assert mock_redline.call_args.kwargs['grid'] == grid_result
+        assert result.grid_size == 70
+
+    async def test_large_map_uses_grid_size_override_for_tiles(self, tmp_path):
+        """With a grid size override, tiles follow the override and grid detection is not run."""
+        from scenes.orchestrate import create_scene_from_map
+
+        test_image = tmp_path / "large_map.png"
+        test_image.write_bytes(create_minimal_png(100, 100))
+        walls_json = tmp_path / "walls.json"
+        walls_json.write_text(json.dumps({"walls": [], "image_dimensions": {"width": 100, "height": 100}}))
+
+        mock_client = MagicMock()
+        mock_client.files.upload_file = MagicMock(return_value={"success": True, "path": "worlds/test/large_map.png"})
+        mock_client.scenes.create_scene = MagicMock(return_value={"success": True, "uuid": "Scene.large", "name": "Large Map"})
+
+        with patch("scenes.orchestrate.needs_tiling", return_value=True), \
+             patch("scenes.orchestrate.redline_walls", new_callable=AsyncMock) as mock_redline, \
+             patch("scenes.orchestrate.detect_grid") as mock_detect_grid:
+            mock_redline.return_value = {'foundry_walls_json': walls_json}
+
+            await create_scene_from_map(
+                image_path=test_image,
+                output_dir_base=tmp_path,
+                foundry_client=mock_client,
+                grid_size_override=50
+            )
+
+        mock_detect_grid.assert_not_called()
+        assert mock_redline.call_args.kwargs['grid'] == {"grid_size": 50, "x_offset": 0, "y_offset": 0}
+
 
 @pytest.mark.unit
 class TestCreateSceneFromMapSync:
@@ -616,3 +708,107 @@ class TestCreateSceneFromMapSync:
             assert isinstance(result, SceneCreationResult)
             assert result.uuid == "Scene.sync"
             assert result.name == "Sync Test"
+
+
+@pytest.mark.unit
+class TestCreateScenesFromMaps:
+    """Test the batched scene creation orchestrator."""
+
+    def _images(self, tmp_path, count):
+        images = []
+        for i in range(count):
+            image = tmp_path / f"map_{i}.png"
+            image.write_bytes(create_minimal_png(100, 100))
+            images.append(image)
+        return images
+
+    async def test_runs_maps_concurrently_within_budget(self, tmp_path):
+        """At most max_concurrency maps are in flight, and they share one client."""
+        import asyncio
+        from scenes.orchestrate import create_scenes_from_maps
+        from scenes.models import SceneCreationResult
+
+        running = 0
+        peak = 0
+        clients = set()
+
+        async def fake_create(image_path, name, foundry_client, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            clients.add(id(foundry_client))
+            await asyncio.sleep(0.01)
+            running -= 1
+            return SceneCreationResult(
+                uuid=f"Scene.{image_path.stem}", name=name or image_path.stem, output_dir=tmp_path,
+                timestamp="t", foundry_image_path="p", image_dimensions={"width": 100, "height": 100}
+            )
+
+        mock_client = MagicMock()
+        with patch("scenes.orchestrate.create_scene_from_map", side_effect=fake_create):
+            results = await create_scenes_from_maps(
+                self._images(tmp_path, 6), foundry_client=mock_client, max_concurrency=2
+            )
+
+        assert [r.uuid for r in results] == [f"Scene.map_{i}" for i in range(6)]
+        assert peak == 2
+        assert clients == {id(mock_client)}
+
+    async def test_failures_are_isolated_and_reported(self, tmp_path):
+        """A failing map is returned as its exception; the others still succeed."""
+        from scenes.orchestrate import create_scenes_from_maps
+        from scenes.models import SceneCreationResult
+
+        async def fake_create(image_path, name, **kwargs):
+            if name == "Broken":
+                raise RuntimeError("upload failed")
+            return SceneCreationResult(
+                uuid=f"Scene.{image_path.stem}", name=name or image_path.stem, output_dir=tmp_path, timestamp="t",
+                foundry_image_path="p", image_dimensions={"width": 100, "height": 100}
+            )
+
+        progress = []
+        with patch("scenes.orchestrate.create_scene_from_map", side_effect=fake_create):
+            results = await create_scenes_from_maps(
+                self._images(tmp_path, 3),
+                names=["Good", "Broken", None],
+                foundry_client=MagicMock(),
+                on_progress=lambda done, total, name, error: progress.append((done, total, name, error is None))
+            )
+
+        assert results[0].uuid == "Scene.map_0"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2].uuid == "Scene.map_2"
+        assert sorted(p[0] for p in progress) == [1, 2, 3]
+        assert {p[2:] for p in progress} == {("Good", True), ("Broken", False), ("Map 2", True)}
+
+    async def test_same_named_maps_get_separate_output_dirs(self, tmp_path):
+        """Maps sharing a scene name must not share a wall-detection output directory."""
+        from scenes.orchestrate import create_scenes_from_maps
+        from scenes.models import SceneCreationResult
+
+        output_dirs = []
+
+        async def fake_create(image_path, name, output_dir, **kwargs):
+            output_dirs.append(output_dir)
+            return SceneCreationResult(
+                uuid=f"Scene.{image_path.stem}", name=name, output_dir=output_dir, timestamp="t",
+                foundry_image_path="p", image_dimensions={"width": 100, "height": 100}
+            )
+
+        with patch("scenes.orchestrate.create_scene_from_map", side_effect=fake_create):
+            await create_scenes_from_maps(
+                self._images(tmp_path, 3),
+                names=["Cave", "Cave", "cave"],
+                output_dir_base=tmp_path / "runs",
+                foundry_client=MagicMock()
+            )
+
+        assert len(set(output_dirs)) == 3
+        assert all(d.parent.parent.parent == tmp_path / "runs" for d in output_dirs)
+
+    async def test_names_must_match_images(self, tmp_path):
+        from scenes.orchestrate import create_scenes_from_maps
+
+        with pytest.raises(ValueError):
+            await create_scenes_from_maps(self._images(tmp_path, 2), names=["Only One"], foundry_client=MagicMock())
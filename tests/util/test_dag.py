@@ -0,0 +1,184 @@
+"""
+Tests for src/util/dag.py
+"""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from util.dag import DagPipeline, Stage
+
+
+class TestDagPipeline:
+    """Test dependency scheduling, streaming and failure handling."""
+
+    def test_dependencies_receive_upstream_results(self):
+        pipeline = DagPipeline([
+            Stage("sum", lambda inputs: inputs["a"] + inputs["b"], depends_on=("a", "b")),
+            Stage("a", lambda inputs: 1),
+            Stage("b", lambda inputs: 2),
+        ])
+        result = pipeline.run()
+        assert result.success
+        assert result.results == {"a": 1, "b": 2, "sum": 3}
+        assert set(result.timings) == {"a", "b", "sum"}
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        pipeline = DagPipeline([
+            Stage("a", lambda inputs: barrier.wait()),
+            Stage("b", lambda inputs: barrier.wait()),
+        ])
+        assert pipeline.run().success
+
+    def test_for_each_starts_before_producer_finishes(self):
+        first_item_done = threading.Event()
+
+        def produce(inputs):
+            yield 1
+            # The consumer must handle item 1 while the producer is still running
+            assert first_item_done.wait(timeout=5)
+            yield 2
+
+        def consume(item, inputs):
+            if item == 1:
+                first_item_done.set()
+            return item * 10
+
+        result = DagPipeline([
+            Stage("produce", produce),
+            Stage("consume", consume, for_each="produce"),
+        ]).run()
+        assert result.success
+        assert result.results["produce"] == [1, 2]
+        assert result.results["consume"] == [10, 20]
+
+    def test_for_each_over_list_result(self):
+        result = DagPipeline([
+            Stage("items", lambda inputs: [1, 2, 3]),
+            Stage("offset", lambda inputs: 100),
+            Stage("add", lambda item, inputs: item + inputs["offset"], for_each="items", depends_on=("offset",)),
+            Stage("total", lambda inputs: sum(inputs["add"]), depends_on=("add",)),
+        ]).run()
+        assert result.results["add"] == [101, 102, 103]
+        assert result.results["total"] == 306
+
+    def test_non_fatal_item_failure_is_recorded_and_skipped(self):
+        def consume(item, inputs):
+            if item == 2:
+                raise ValueError("bad item")
+            return item
+
+        result = DagPipeline([
+            Stage("items", lambda inputs: [1, 2, 3]),
+            Stage("consume", consume, for_each="items", fatal=False),
+            Stage("after", lambda inputs: inputs["consume"], depends_on=("consume",)),
+        ]).run()
+        assert result.success
+        assert result.results["after"] == [1, 3]
+        assert [str(e) for e in result.errors["consume"]] == ["bad item"]
+
+    def test_non_fatal_stage_failure_lets_dependents_run(self):
+        def broken(inputs):
+            raise RuntimeError("boom")
+
+        result = DagPipeline([
+            Stage("optional", broken, fatal=False),
+            Stage("after", lambda inputs: inputs["optional"], depends_on=("optional",)),
+        ]).run()
+        assert result.success
+        assert result.results["after"] is None
+        assert "optional" in result.errors
+
+    def test_fatal_failure_skips_dependents(self):
+        ran = []
+
+        def broken(inputs):
+            raise RuntimeError("boom")
+
+        result = DagPipeline([
+            Stage("broken", broken),
+            Stage("after", lambda inputs: ran.append(True), depends_on=("broken",)),
+        ]).run()
+        assert not result.success
+        assert result.failed_stage == "broken"
+        assert str(result.error) == "boom"
+        assert ran == []
+        assert "after" not in result.results
+
+    def test_fatal_failure_stops_streaming_producer(self):
+        produced = []
+
+        def produce(inputs):
+            for i in range(100):
+                produced.append(i)
+                yield i
+                time.sleep(0.01)
+
+        def consume(item, inputs):
+            raise RuntimeError("stop")
+
+        result = DagPipeline([
+            Stage("produce", produce),
+            Stage("consume", consume, for_each="produce"),
+        ]).run()
+        assert result.failed_stage == "consume"
+        assert len(produced) < 100
+
+    def test_cancel_stops_scheduling(self):
+        cancel = threading.Event()
+        ran = []
+
+        def produce(inputs):
+            for i in range(100):
+                if i == 2:
+                    cancel.set()
+                yield i
+                time.sleep(0.01)
+
+        result = DagPipeline([
+            Stage("produce", produce),
+            Stage("after", lambda inputs: ran.append(True), depends_on=("produce",)),
+        ]).run(cancel=cancel)
+        assert result.cancelled
+        assert not result.success
+        assert len(result.results["produce"]) < 100
+        assert ran == []
+
+    def test_context_variables_reach_stages(self):
+        var = contextvars.ContextVar("var", default="unset")
+        token = var.set("caller")
+        try:
+            result = DagPipeline([
+                Stage("items", lambda inputs: [1]),
+                Stage("read", lambda inputs: var.get()),
+                Stage("read_each", lambda item, inputs: var.get(), for_each="items"),
+            ]).run()
+        finally:
+            var.reset(token)
+        assert result.results["read"] == "caller"
+        assert result.results["read_each"] == ["caller"]
+
+    def test_progress_events(self):
+        events = []
+        DagPipeline(
+            [
+                Stage("items", lambda inputs: [1, 2]),
+                Stage("each", lambda item, inputs: item, for_each="items"),
+            ],
+            on_progress=lambda event: events.append((event.stage, event.status, event.items_done)),
+        ).run()
+        assert events[0] == ("items", "started", 0)
+        assert ("each", "item", 2) in events
+        assert events[-1] == ("each", "done", 2)
+
+    @pytest.mark.parametrize("stages, message", [
+        ([Stage("a", print), Stage("a", print)], "Duplicate"),
+        ([Stage("a", print, depends_on=("missing",))], "unknown stage"),
+        ([Stage("a", print, depends_on=("b",)), Stage("b", print, for_each="a")], "cycle"),
+    ])
+    def test_invalid_graphs_rejected(self, stages, message):
+        with pytest.raises(ValueError, match=message):
+            DagPipeline(stages)
@@ -133,3 +133,389 @@ class TestGeminiAPIIntegration:
 
         assert response.text
         assert isinstance(response.text, str)
+
+
+def _text_response(text: str):
+    """Build a minimal SDK response containing a single text part."""
+    from google.genai import types
+    return types.GenerateContentResponse(candidates=[
+        types.Candidate(content=types.Content(role="model", parts=[types.Part(text=text)]))
+    ])
+
+
+class TestGeminiResponseCache:
+    """Unit tests for the persistent response cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from util.gemini import GeminiResponseCache, set_response_cache
+        cache = GeminiResponseCache(cache_dir=tmp_path / "gemini_cache")
+        set_response_cache(cache)
+        yield cache
+        cache.close()
+        set_response_cache(None)
+
+    def test_key_is_stable_and_sensitive(self, cache):
+        key = cache.make_key("gemini-2.0-flash", ["hello"], {"temperature": 0.0})
+        assert key == cache.make_key("gemini-2.0-flash", ["hello"], {"temperature": 0.0})
+        assert key != cache.make_key("gemini-2.5-pro", ["hello"], {"temperature": 0.0})
+        assert key != cache.make_key("gemini-2.0-flash", ["hello!"], {"temperature": 0.0})
+        assert key != cache.make_key("gemini-2.0-flash", ["hello"], {"temperature": 0.5})
+
+    def test_key_uses_uploaded_file_digest(self, cache):
+        from google.genai import types
+        from util.gemini import _file_digests
+
+        _file_digests["files/run1"] = "abc"
+        _file_digests["files/run2"] = "abc"
+        key1 = cache.make_key("m", [types.File(name="files/run1"), "prompt"])
+        key2 = cache.make_key("m", [types.File(name="files/run2"), "prompt"])
+        assert key1 == key2
+
+    def test_unknown_objects_are_uncacheable(self, cache):
+        assert cache.make_key("m", [object()]) is None
+
+    def test_round_trip(self, cache):
+        key = cache.make_key("m", "prompt")
+        assert cache.get(key) is None
+        assert cache.put(key, "m", _text_response("cached text"))
+        assert cache.get(key).text == "cached text"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_non_sdk_responses_are_not_stored(self, cache):
+        from unittest.mock import MagicMock
+        assert cache.put("key", "m", MagicMock(text="mock")) is False
+
+    def test_expired_entries_are_misses(self, cache):
+        key = cache.make_key("m", "prompt")
+        cache.put(key, "m", _text_response("old"))
+        cache.max_age_seconds = -1
+        assert cache.get(key) is None
+
+    def test_size_eviction_drops_least_recently_used(self, cache):
+        keys = [cache.make_key("m", f"prompt {i}") for i in range(3)]
+        cache.put(keys[0], "m", _text_response("a" * 1000))
+        entry_size = cache._conn.execute("SELECT size FROM responses").fetchone()[0]
+        cache.max_bytes = entry_size * 2
+        cache.put(keys[1], "m", _text_response("a" * 1000))
+        cache.get(keys[0])  # keys[1] becomes least recently used
+        cache.put(keys[2], "m", _text_response("a" * 1000))
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+
+    def test_generate_content_cached_hits_and_bypass(self, cache):
+        from unittest.mock import MagicMock
+        from util.gemini import generate_content_cached
+
+        client = MagicMock()
+        client.models.generate_content.return_value = _text_response("fresh")
+
+        assert generate_content_cached(client, "m", "prompt").text == "fresh"
+        assert generate_content_cached(client, "m", "prompt").text == "fresh"
+        assert client.models.generate_content.call_count == 1
+
+        generate_content_cached(client, "m", "prompt", use_cache=False)
+        generate_content_cached(client, "m", "prompt", refresh_cache=True)
+        assert client.models.generate_content.call_count == 3
+        assert cache.stats()["bypassed"] == 1
+
+    def test_disabled_cache_always_calls_api(self, cache):
+        from unittest.mock import MagicMock
+        from util.gemini import generate_content_cached
+
+        cache.enabled = False
+        client = MagicMock()
+        client.models.generate_content.return_value = _text_response("fresh")
+        generate_content_cached(client, "m", "prompt")
+        generate_content_cached(client, "m", "prompt")
+        assert client.models.generate_content.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_content_async_uses_cache(self, cache):
+        from unittest.mock import MagicMock
+        from util.gemini import generate_content_async
+
+        client = MagicMock()
+        client.models.generate_content.return_value = _text_response("async")
+        first = await generate_content_async(client, "m", "prompt", config={"temperature": 0.0})
+        second = await generate_content_async(client, "m", "prompt", config={"temperature": 0.0})
+        assert first.text == second.text == "async"
+        assert client.models.generate_content.call_count == 1
+
+
+class _ThrottleError(Exception):
+    """Stand-in for google.genai.errors.ClientError with a status code."""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} RESOURCE_EXHAUSTED")
+        self.code = code
+
+
+class TestGeminiScheduler:
+    """Unit tests for the process-wide rate limiter / concurrency governor."""
+
+    @pytest.fixture
+    def scheduler(self):
+        from util.gemini import GeminiScheduler
+        return GeminiScheduler(max_concurrency=4, max_retries=2, backoff_base=0.01, backoff_max=0.05)
+
+    def test_call_returns_result_and_counts(self, scheduler):
+        assert scheduler.call(lambda: "ok", "m", contents="prompt") == "ok"
+        stats = scheduler.stats()["m"]
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["queue_depth"] == 0
+
+    def test_throttle_halves_limit_and_retries(self, scheduler):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise _ThrottleError(429)
+            return "ok"
+
+        assert scheduler.call(flaky, "m") == "ok"
+        stats = scheduler.stats()["m"]
+        assert len(attempts) == 2
+        assert stats["throttled"] == 1
+        assert stats["concurrency_limit"] == 2
+
+    def test_throttle_retries_are_bounded(self, scheduler):
+        def always_throttled():
+            raise _ThrottleError(503)
+
+        with pytest.raises(_ThrottleError):
+            scheduler.call(always_throttled, "m")
+        assert scheduler.stats()["m"]["throttled"] == 3
+
+    def test_other_errors_are_not_retried(self, scheduler):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            scheduler.call(broken, "m")
+        assert len(calls) == 1
+        assert scheduler.stats()["m"]["failed"] == 1
+
+    def test_success_grows_limit_additively(self, scheduler):
+        scheduler.configure_model("m", max_concurrency=8)
+        state = scheduler._state("m")
+        state.limit = 2.0
+        scheduler.call(lambda: "ok", "m")
+        assert state.limit == pytest.approx(2.5)
+
+    def test_requests_per_minute_delays_calls(self, scheduler):
+        import time
+        scheduler.configure_model("m", requests_per_minute=600)  # 10/s, bucket of 600
+        scheduler._state("m").requests.level = 0
+        start = time.monotonic()
+        scheduler.call(lambda: "ok", "m")
+        assert time.monotonic() - start >= 0.08
+
+    def test_interactive_requests_are_served_first(self, scheduler):
+        import threading
+        from util.gemini import Priority
+
+        scheduler.configure_model("m", max_concurrency=1)
+        order = []
+        gate = threading.Event()
+        held = scheduler.acquire("m")
+
+        def run(name, priority):
+            scheduler.call(lambda: order.append(name), "m", priority=priority)
+
+        threads = [threading.Thread(target=run, args=("batch", Priority.BATCH))]
+        threads[0].start()
+        while scheduler.stats()["m"]["queue_depth"] < 1:
+            gate.wait(0.01)
+        threads.append(threading.Thread(target=run, args=("interactive", Priority.INTERACTIVE)))
+        threads[1].start()
+        while scheduler.stats()["m"]["queue_depth"] < 2:
+            gate.wait(0.01)
+
+        scheduler.release("m", held)
+        for thread in threads:
+            thread.join(timeout=5)
+        assert order == ["interactive", "batch"]
+
+    def test_request_priority_context(self, scheduler):
+        from util.gemini import Priority, request_priority
+
+        with request_priority(Priority.INTERACTIVE):
+            ticket = scheduler.acquire("m")
+        assert ticket.priority == Priority.INTERACTIVE
+        scheduler.release("m", ticket)
+
+    @pytest.mark.asyncio
+    async def test_call_async_limits_concurrency(self, scheduler):
+        import asyncio
+
+        scheduler.configure_model("m", max_concurrency=2)
+        active = []
+        peak = []
+
+        async def work():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.pop()
+            return "ok"
+
+        results = await asyncio.gather(*[scheduler.call_async(work, "m") for _ in range(6)])
+        assert results == ["ok"] * 6
+        assert max(peak) == 2
+        assert scheduler.stats()["m"]["max_queue_depth"] >= 4
+
+    @pytest.mark.asyncio
+    async def test_async_waiter_is_woken_by_release_from_another_thread(self, scheduler):
+        import asyncio
+        import threading
+        import time
+
+        scheduler.configure_model("m", max_concurrency=1)
+        first = await scheduler.acquire_async("m")
+        waiter = asyncio.create_task(scheduler.acquire_async("m"))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        released_at = time.monotonic()
+        threading.Thread(target=scheduler.release, args=("m", first)).start()
+        second = await asyncio.wait_for(waiter, timeout=1.0)
+        assert time.monotonic() - released_at < 0.04
+        scheduler.release("m", second)
+        assert scheduler._async_waiters == set()
+
+
+class TestGeminiClientRegistry:
+    """Unit tests for shared, pooled Gemini clients."""
+
+    @pytest.fixture
+    def client_class(self):
+        from unittest.mock import MagicMock, patch
+        with patch("util.gemini.genai.Client", side_effect=lambda **kwargs: MagicMock()) as client_class:
+            yield client_class
+
+    def test_clients_are_shared_per_timeout_profile(self, client_class):
+        from util.gemini import get_client, IMAGE_TIMEOUT_MS
+
+        assert get_client(api_key="k") is get_client(api_key="k")
+        assert get_client(IMAGE_TIMEOUT_MS, api_key="k") is not get_client(api_key="k")
+        assert get_client(api_key="other") is not get_client(api_key="k")
+        assert client_class.call_count == 3
+
+    def test_clients_use_pooled_transport(self, client_class):
+        from util.gemini import get_client, HTTP_POOL_MAX_KEEPALIVE
+
+        get_client(60000, api_key="k")
+        http_options = client_class.call_args.kwargs["http_options"]
+        assert http_options.timeout == 60000
+        assert http_options.client_args["limits"].max_keepalive_connections == HTTP_POOL_MAX_KEEPALIVE
+
+    def test_gemini_api_reuses_shared_client(self, client_class):
+        assert GeminiAPI(api_key="k").client is GeminiAPI(api_key="k").client
+
+    def test_async_clients_are_per_event_loop(self, client_class):
+        import asyncio
+        from util.gemini import get_async_client
+
+        async def get_twice():
+            return get_async_client(api_key="k"), get_async_client(api_key="k")
+
+        first_a, first_b = asyncio.run(get_twice())
+        second_a, _ = asyncio.run(get_twice())
+        assert first_a is first_b
+        assert first_a is not second_a
+
+    @pytest.mark.asyncio
+    async def test_generate_content_async_uses_native_async_api(self, client_class):
+        from unittest.mock import AsyncMock
+        from util.gemini import get_client, get_async_client, generate_content_async
+
+        client = get_client(api_key="k")
+        aio = get_async_client(api_key="k")
+        aio.models.generate_content = AsyncMock(return_value=_text_response("native"))
+
+        response = await generate_content_async(client, "m", "prompt", use_cache=False)
+        assert response.text == "native"
+        aio.models.generate_content.assert_awaited_once()
+        client.models.generate_content.assert_not_called()
+
+
+class TestGeminiCallTimeouts:
+    """Unit tests for request timeouts and the shared blocking-call executor."""
+
+    def test_generate_content_uses_sdk_http_timeout(self):
+        from unittest.mock import MagicMock
+
+        api = GeminiAPI.__new__(GeminiAPI)
+        api.model_name = "m"
+        api._configured = True
+        api.client = MagicMock()
+        api.client.models.generate_content.return_value = _text_response("ok")
+
+        assert api.generate_content("prompt", timeout=30, use_cache=False).text == "ok"
+        config = api.client.models.generate_content.call_args.kwargs["config"]
+        assert config.http_options.timeout == 30000
+
+    def test_http_timeout_raises_timeout_error(self):
+        import httpx
+        from unittest.mock import MagicMock
+
+        api = GeminiAPI.__new__(GeminiAPI)
+        api.model_name = "m"
+        api._configured = True
+        api.client = MagicMock()
+        api.client.models.generate_content.side_effect = httpx.ReadTimeout("slow")
+
+        with pytest.raises(TimeoutError, match="exceeded timeout of 5"):
+            api.generate_content("prompt", timeout=5, use_cache=False)
+
+    @pytest.mark.asyncio
+    async def test_run_blocking_tracks_abandoned_calls(self):
+        import asyncio
+        import threading
+        from util.gemini import executor_stats, run_blocking
+
+        release = threading.Event()
+        before = executor_stats()
+
+        with pytest.raises(TimeoutError):
+            await run_blocking(lambda: release.wait(5), timeout=0.05)
+        stats = executor_stats()
+        assert stats["abandoned"] == before["abandoned"] + 1
+        assert stats["timed_out"] == before["timed_out"] + 1
+
+        release.set()
+        for _ in range(100):
+            if executor_stats()["abandoned"] == before["abandoned"]:
+                break
+            await asyncio.sleep(0.01)
+        stats = executor_stats()
+        assert stats["abandoned"] == before["abandoned"]
+        assert stats["in_flight"] == before["in_flight"]
+        assert stats["total_abandoned"] == before["total_abandoned"] + 1
+
+    @pytest.mark.asyncio
+    async def test_run_blocking_carries_request_priority(self):
+        from util.gemini import Priority, request_priority, run_blocking, _request_priority
+
+        with request_priority(Priority.BATCH):
+            assert await run_blocking(_request_priority.get) == Priority.BATCH
+
+    @pytest.mark.asyncio
+    async def test_async_timeout_cancels_native_call(self):
+        import asyncio
+        from util.gemini import GeminiScheduler
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        scheduler = GeminiScheduler()
+        with pytest.raises(TimeoutError):
+            await scheduler.call_async(slow, "m", timeout=0.05)
+        assert scheduler.stats()["m"]["in_flight"] == 0
@@ -0,0 +1,122 @@
+"""
+Tests for src/util/geometry.py
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from util.geometry import (
+    point_segment_distances, rdp, rdp_batch, simplify_collinear, simplify_collinear_batch,
+)
+
+
+def rdp_recursive(points, eps):
+    """Textbook recursive RDP with segment distances, for comparison."""
+    if len(points) < 3:
+        return list(points)
+    a, b = np.array(points[0], float), np.array(points[-1], float)
+    dist = point_segment_distances(np.array(points[1:-1], float), a, b)
+    i = int(np.argmax(dist)) + 1
+    if dist[i - 1] > eps:
+        return rdp_recursive(points[:i + 1], eps)[:-1] + rdp_recursive(points[i:], eps)
+    return [points[0], points[-1]]
+
+
+def noisy_paths(count, seed=0):
+    rnd = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        x, y, dx, dy = 0.0, 0.0, 1, 0
+        pts = [(x, y)]
+        for _ in range(rnd.randint(1, 120)):
+            if rnd.random() < 0.08:
+                dx, dy = rnd.choice([(1, 0), (0, 1), (1, 1), (-1, 1)])
+            x, y = x + dx, y + dy
+            pts.append((x + rnd.uniform(-0.6, 0.6), y + rnd.uniform(-0.6, 0.6)))
+        paths.append(pts)
+    return paths
+
+
+class TestPointSegmentDistances:
+    """Test the vectorized distance helper."""
+
+    def test_clamps_to_segment(self):
+        points = np.array([[5.0, 3.0], [-4.0, 3.0], [13.0, -4.0]])
+        dist = point_segment_distances(points, np.array([0.0, 0.0]), np.array([10.0, 0.0]))
+        assert dist == pytest.approx([3.0, 5.0, 5.0])
+
+    def test_degenerate_segment_is_a_point(self):
+        dist = point_segment_distances(np.array([[3.0, 4.0]]), np.array([0.0, 0.0]), np.array([0.0, 0.0]))
+        assert dist == pytest.approx([5.0])
+
+
+class TestRdp:
+    """Test Ramer–Douglas–Peucker simplification."""
+
+    def test_straight_line_keeps_endpoints(self):
+        assert rdp([(x, 0) for x in range(10)], 1.0) == [(0, 0), (9, 0)]
+
+    def test_keeps_corner(self):
+        points = [(x, 0) for x in range(10)] + [(9, y) for y in range(1, 10)]
+        assert rdp(points, 1.0) == [(0, 0), (9, 0), (9, 9)]
+
+    def test_short_polylines_unchanged(self):
+        assert rdp([(0, 0), (5, 5)], 1.0) == [(0, 0), (5, 5)]
+        assert rdp_batch([[(1, 1)], []], 1.0) == [[(1, 1)], []]
+
+    def test_matches_recursive_algorithm(self):
+        for eps in (0.5, 2.0, 5.0):
+            paths = noisy_paths(200, seed=int(eps * 10))
+            expected = [rdp_recursive(p, eps) for p in paths]
+            assert rdp_batch(paths, eps) == expected
+            assert [rdp(p, eps) for p in paths] == expected
+
+    def test_closed_polyline(self):
+        square = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+        assert rdp(square, 1.0) == square
+
+
+class TestSimplifyCollinear:
+    """Test collinear point removal."""
+
+    def test_removes_points_on_straight_run(self):
+        assert simplify_collinear([(0, 0), (1, 0.2), (2, 0), (3, -0.2), (4, 0)], 0.5) == [(0, 0), (4, 0)]
+
+    def test_keeps_points_beyond_tolerance(self):
+        zigzag = [(0, 0), (2, 3), (4, 0), (6, 3), (8, 0)]
+        assert simplify_collinear(zigzag, 0.5) == zigzag
+
+    def test_removes_point_between_coincident_neighbours(self):
+        assert simplify_collinear([(0, 0), (5, 5), (0, 0), (10, 0)], 0.5) == [(0, 0), (10, 0)]
+
+    def test_short_polylines_unchanged(self):
+        assert simplify_collinear([(0, 0), (1, 1)], 1.0) == [(0, 0), (1, 1)]
+        assert simplify_collinear_batch([], 1.0) == []
+
+    def test_batch_matches_single(self):
+        paths = noisy_paths(100, seed=7)
+        assert simplify_collinear_batch(paths, 0.5) == [simplify_collinear(p, 0.5) for p in paths]
+
+    def test_result_is_ordered_subset_with_endpoints(self):
+        for path, simplified in zip(noisy_paths(100, seed=3), simplify_collinear_batch(noisy_paths(100, seed=3), 0.5)):
+            assert simplified[0] == path[0] and simplified[-1] == path[-1]
+            positions = [path.index(p) for p in simplified]
+            assert positions == sorted(positions)
+
+    def test_does_not_change_rdp_output(self):
+        """After RDP nothing is left to remove at a tolerance well below eps."""
+        simplified = rdp_batch(noisy_paths(100, seed=5), 5.0)
+        assert simplify_collinear_batch(simplified, 0.5) == simplified
+
+    def test_removed_points_stay_near_result(self):
+        tolerance = 0.5
+        for path in noisy_paths(50, seed=11):
+            simplified = np.array(simplify_collinear(path, tolerance), float)
+            dist = np.min([
+                point_segment_distances(np.array(path, float), a, b)
+                for a, b in zip(simplified[:-1], simplified[1:])
+            ], axis=0)
+            assert dist.max() <= 4 * tolerance + math.ulp(1.0)
@@ -0,0 +1 @@
+"""Tests for wall detection modules."""
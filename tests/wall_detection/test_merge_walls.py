@@ -0,0 +1,135 @@
+"""Tests for merging and snapping walls before Foundry export."""
+
+import json
+
+import numpy as np
+
+from wall_detection.merge_walls import merge_collinear, merge_foundry_walls, merge_segments, snap_vertices
+from wall_detection.redline_walls import convert_to_foundry_format
+
+
+def as_set(segments):
+    """Walls as a set of endpoint pairs, independent of direction and order."""
+    return {tuple(sorted([tuple(np.round(s[:2], 6)), tuple(np.round(s[2:], 6))])) for s in np.asarray(segments, float)}
+
+
+class TestSnapVertices:
+    """Tests for snap_vertices()."""
+
+    def test_close_endpoints_share_their_mean(self):
+        segments = np.array([[0, 0, 100, 0], [102, 2, 102, 100]], float)
+
+        snapped = snap_vertices(segments, snap=6.0)
+
+        assert snapped.tolist() == [[0, 0, 101, 1], [101, 1, 102, 100]]
+
+    def test_snaps_to_grid_lines_near_vertices(self):
+        grid = {'grid_size': 50, 'x_offset': 10, 'y_offset': 0}
+        segments = np.array([[12, 3, 83, 49]], float)
+
+        snapped = snap_vertices(segments, snap=6.0, grid=grid, grid_snap=0.15)
+
+        # 12 → 10 and 3 → 0 and 49 → 50 are within 7.5px; 83 is 23px from the nearest line
+        assert snapped.tolist() == [[10, 0, 83, 50]]
+
+    def test_empty(self):
+        assert snap_vertices(np.zeros((0, 4)), snap=6.0).shape == (0, 4)
+
+
+class TestMergeCollinear:
+    """Tests for merge_collinear()."""
+
+    def test_chain_of_collinear_walls_becomes_one(self):
+        segments = np.array([[0, 0, 10, 0], [10, 0, 25, 0], [25, 0, 40, 0.5]], float)
+        assert as_set(merge_collinear(segments)) == {((0, 0), (40, 0.5))}
+
+    def test_overlapping_and_reversed_duplicates_merge(self):
+        segments = np.array([[0, 0, 50, 0], [60, 1, 20, 1], [50, 0, 0, 0]], float)
+        assert as_set(merge_collinear(segments)) == {((0, 0), (60, 1))}
+
+    def test_keeps_corners_gaps_and_parallel_walls(self):
+        segments = np.array([
+            [0, 0, 50, 0], [50, 0, 50, 50],   # corner
+            [0, 100, 40, 100], [60, 100, 100, 100],  # door gap
+            [0, 200, 100, 200], [0, 210, 100, 210],  # parallel, 10px apart
+        ], float)
+        assert as_set(merge_collinear(segments)) == as_set(segments)
+
+    def test_keeps_slightly_angled_walls_apart(self):
+        segments = np.array([[0, 0, 100, 0], [100, 0, 200, 10]], float)
+        assert len(merge_collinear(segments)) == 2
+
+
+class TestMergeSegments:
+    """Tests for merge_segments()."""
+
+    def test_polyline_fragments_reduce_to_room_outline(self):
+        # A 200x100 room traced as many short, jittered segments
+        rng = np.random.default_rng(0)
+        corners = [(0, 0), (200, 0), (200, 100), (0, 100), (0, 0)]
+        points = []
+        for (x0, y0), (x1, y1) in zip(corners, corners[1:]):
+            for t in np.linspace(0, 1, 11)[:-1]:
+                points.append((x0 + t * (x1 - x0), y0 + t * (y1 - y0)))
+        points.append(corners[-1])
+        points = np.array(points)
+        jittered = np.arange(len(points)) % 10 != 0  # corners stay exact
+        points[jittered] += rng.uniform(-0.15, 0.15, (jittered.sum(), 2))
+        segments = np.hstack([points[:-1], points[1:]])
+        stats = {}
+
+        merged = merge_segments(segments, stats=stats)
+
+        assert len(merged) == 4
+        assert stats == {"walls_before": 40, "zero_length": 0, "walls_after": 4}
+
+    def test_removes_zero_length_walls(self):
+        segments = np.array([[0, 0, 0, 0], [10, 10, 12, 11], [0, 0, 100, 0]], float)
+        stats = {}
+
+        merged = merge_segments(segments, stats=stats)
+
+        assert merged.tolist() == [[0, 0, 100, 0]]
+        assert stats["zero_length"] == 2
+
+    def test_walls_share_snapped_vertices(self):
+        segments = np.array([[0, 0, 100, 2], [101, 0, 101, 100], [100, 102, 0, 100]], float)
+
+        merged = merge_segments(segments)
+
+        ends = [tuple(p) for p in merged.reshape(-1, 2).tolist()]
+        assert len(set(ends)) == 4
+        assert all(ends.count(p) == 2 for p in ends if p not in [(0, 0), (0, 100)])
+
+
+class TestMergeFoundryWalls:
+    """Tests for merge_foundry_walls() and its use in convert_to_foundry_format."""
+
+    def test_merges_only_walls_with_same_properties(self):
+        wall = {"move": 20, "sense": 20, "door": 0, "ds": 0}
+        walls = [
+            {"c": [0, 0, 50, 0], **wall},
+            {"c": [50, 0, 100, 0], **wall},
+            {"c": [100, 0, 150, 0], **wall, "door": 1},
+        ]
+
+        merged = merge_foundry_walls(walls)
+
+        assert merged == [{"c": [0.0, 0.0, 100.0, 0.0], **wall}, {"c": [100.0, 0.0, 150.0, 0.0], **wall, "door": 1}]
+
+    def test_convert_to_foundry_format_reports_counts(self, tmp_path):
+        output = tmp_path / "walls.json"
+        polylines = [[(0.0, 0.0), (50.0, 0.5), (100.0, 0.0), (100.0, 80.0)], [(100.0, 80.0), (100.0, 100.0)]]
+
+        count = convert_to_foundry_format(polylines, (100, 200), (100, 200), output)
+
+        data = json.loads(output.read_text())
+        assert count == 2 == data["total_walls"] == len(data["walls"])
+        assert data["total_walls_before_merge"] == 4
+
+    def test_convert_to_foundry_format_without_merge(self, tmp_path):
+        output = tmp_path / "walls.json"
+        polylines = [[(0.0, 0.0), (50.0, 0.0), (100.0, 0.0)]]
+
+        assert convert_to_foundry_format(polylines, (100, 200), (100, 200), output, merge=False) == 2
+        assert json.loads(output.read_text())["total_walls_before_merge"] == 2
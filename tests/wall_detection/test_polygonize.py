@@ -0,0 +1,307 @@
+"""Tests for the in-memory polygonize API and its use by redline_walls."""
+
+import json
+import random
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from skimage.morphology import thin
+
+from wall_detection.polygonize import (
+    DEFAULT_PARAMS, connect_polylines, nearest_on_seg, polygonize, remove_parallel_duplicates,
+    skeleton_polylines, wall_mask,
+)
+from wall_detection.redline_walls import convert_to_foundry_format, create_overlay, polygonize_redlines
+
+RED = (0, 0, 255)  # BGR
+SCENE_FIXTURES = Path(__file__).parent.parent / "scenes" / "fixtures"
+# polygonize() output of the original per-pixel skeleton tracer on fixture_masks()
+BASELINE_POLYLINES = Path(__file__).parent / "fixtures" / "baseline_polylines.json"
+
+
+def red_lined_image() -> np.ndarray:
+    """White BGR image with a room traced in red (with a door gap) and an interior wall."""
+    img = np.full((300, 400, 3), 255, np.uint8)
+    for a, b in [
+        ((20, 20), (380, 20)), ((380, 20), (380, 280)), ((20, 20), (20, 280)),
+        ((20, 280), (200, 280)), ((230, 280), (380, 280)), ((200, 20), (200, 150)),
+    ]:
+        cv2.line(img, a, b, RED, 4)
+    return img
+
+
+def fixture_masks():
+    """Wall-like masks from the scene fixtures: Canny edges and dark pixels."""
+    for name in ["gridded_map.webp", "gridless_map.webp"]:
+        gray = cv2.cvtColor(cv2.imread(str(SCENE_FIXTURES / name)), cv2.COLOR_BGR2GRAY)
+        yield f"{name}:edges", cv2.Canny(gray, 50, 150)
+        yield f"{name}:dark", (gray < 100).astype(np.uint8) * 255
+
+
+def rasterize(polylines, shape) -> np.ndarray:
+    img = np.zeros(shape, np.uint8)
+    for p in polylines:
+        cv2.polylines(img, [np.int32(np.round(p)).reshape(-1, 1, 2)], False, 255, 1)
+    return img
+
+
+def max_deviation(a, b, shape) -> float:
+    """Largest distance from a drawn pixel of a to the nearest drawn pixel of b."""
+    ra, rb = rasterize(a, shape), rasterize(b, shape)
+    return float(cv2.distanceTransform(255 - rb, cv2.DIST_L2, 3)[ra > 0].max())
+
+
+class TestPolygonize:
+    """Tests for polygonize()."""
+
+    def test_extracts_polylines_from_bgr_image(self):
+        polylines = polygonize(red_lined_image())
+
+        assert polylines
+        for polyline in polylines:
+            assert len(polyline) >= 2
+            assert all(isinstance(x, float) and isinstance(y, float) for x, y in polyline)
+        xs = [x for p in polylines for x, _ in p]
+        ys = [y for p in polylines for _, y in p]
+        assert min(xs) == pytest.approx(20, abs=4) and max(xs) == pytest.approx(380, abs=4)
+        assert min(ys) == pytest.approx(20, abs=4) and max(ys) == pytest.approx(280, abs=4)
+
+    def test_mask_and_image_inputs_agree(self):
+        img = red_lined_image()
+        mask = np.all(img == RED, axis=2).astype(np.uint8)
+
+        assert polygonize(mask) == polygonize(img)
+
+    def test_accepts_bgra_image(self):
+        img = red_lined_image()
+        bgra = np.dstack([img, np.full(img.shape[:2], 255, np.uint8)])
+
+        assert polygonize(bgra) == polygonize(img)
+
+    def test_stats_include_pass_timings(self):
+        stats = {}
+        polygonize(red_lined_image(), {"parallel": 8.0}, stats=stats)
+
+        assert {"mask", "skeleton", "rdp", "connect_merge", "connect_tjoin", "collinear", "parallel"} <= set(stats["timings"])
+        assert all(t >= 0 for t in stats["timings"].values())
+
+    def test_empty_image_has_no_polylines(self):
+        stats = {}
+        assert polygonize(np.full((50, 50, 3), 255, np.uint8), stats=stats) == []
+        assert stats["polylines"] == 0
+
+    def test_params_override_defaults(self):
+        img = red_lined_image()
+        # A huge minimum length prunes every wall
+        assert polygonize(img, {"minlen": 10_000}) == []
+        assert polygonize(img, {"eps": DEFAULT_PARAMS["eps"]}) == polygonize(img)
+
+    def test_rejects_unsupported_shape(self):
+        with pytest.raises(ValueError):
+            wall_mask(np.zeros((4, 4, 2), np.uint8))
+
+    def test_debug_dir_writes_cli_outputs(self, tmp_path):
+        polylines = polygonize(red_lined_image(), debug_dir=tmp_path)
+
+        for name in ["mask_debug.png", "overlay_blue.png", "lines_only_transparent.png", "lines_only_white.png",
+                     "lines_and_vertices_transparent.png", "lines_and_vertices_white.png"]:
+            assert (tmp_path / name).exists()
+        data = json.loads((tmp_path / "polylines.json").read_text())
+        assert (data["width"], data["height"]) == (400, 300)
+        assert data["polylines"] == [[list(p) for p in pl] for pl in polylines]
+
+    def test_no_files_without_debug_dir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        polygonize(red_lined_image())
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSkeletonPolylines:
+    """Tests for the array-based skeleton tracer."""
+
+    def test_straight_line_is_one_ordered_polyline(self):
+        mask = np.zeros((20, 40), np.uint8)
+        mask[10, 5:35] = 255
+
+        polylines = skeleton_polylines(mask, dilate_px=0)
+
+        assert len(polylines) == 1
+        assert polylines[0] == [(x, 10) for x in range(5, 35)]
+
+    def test_branches_share_junction_pixel(self):
+        mask = np.zeros((40, 40), np.uint8)
+        mask[20, 5:35] = 255
+        mask[5:20, 20] = 255
+
+        polylines = skeleton_polylines(mask, dilate_px=0)
+
+        assert len(polylines) == 3
+        assert len({p[-1] for p in polylines}) == 1
+        assert polylines[0][-1] in {(19, 20), (20, 20), (21, 20), (20, 19)}
+        # Branches start at the free endpoints
+        assert {p[0] for p in polylines} == {(5, 20), (34, 20), (20, 5)}
+
+    def test_loop_is_traced_once(self):
+        mask = np.zeros((40, 40), np.uint8)
+        cv2.rectangle(mask, (5, 5), (30, 25), 255, 1)
+
+        polylines = skeleton_polylines(mask, dilate_px=0)
+
+        assert len(polylines) == 1
+        loop = polylines[0]
+        assert len(loop) == len(set(loop)) == int(thin(mask > 0).sum())
+        for (x1, y1), (x2, y2) in zip(loop, loop[1:]):
+            assert max(abs(x1 - x2), abs(y1 - y2)) == 1
+
+    def test_covers_every_skeleton_pixel(self):
+        for _, mask in fixture_masks():
+            skel = thin(cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (13, 13))) > 0)
+            padded = np.pad(skel, 1)
+            degree = {(int(x), int(y)): int(padded[y:y + 3, x:x + 3].sum()) - 1 for y, x in np.argwhere(skel)}
+            traced = {q for p in skeleton_polylines(mask, dilate_px=6) for q in p}
+            # Every path pixel is traced; junctions contribute one vertex each
+            assert traced <= set(degree)
+            assert {q for q, d in degree.items() if d in (1, 2)} <= traced
+
+    def test_matches_baseline_polylines(self):
+        """Same walls as the per-pixel tracer, up to how branches were split before simplification."""
+        baseline = json.loads(BASELINE_POLYLINES.read_text())
+        for name, mask in fixture_masks():
+            expected = baseline[name]
+            polylines = polygonize(mask)
+
+            assert max_deviation(polylines, expected, mask.shape) <= DEFAULT_PARAMS["eps"], name
+            assert max_deviation(expected, polylines, mask.shape) <= DEFAULT_PARAMS["eps"], name
+            drawn, expected_drawn = [(rasterize(p, mask.shape) > 0).sum() for p in (polylines, expected)]
+            assert drawn == pytest.approx(expected_drawn, rel=0.01), name
+
+
+def random_fragments(n, seed=0, size=500):
+    """Short, roughly axis-aligned wall fragments scattered over a size x size area."""
+    rnd = random.Random(seed)
+    polys = []
+    for _ in range(n):
+        x, y, length = rnd.uniform(0, size), rnd.uniform(0, size), rnd.uniform(10, 60)
+        end = (x + length, y + rnd.uniform(-1, 1)) if rnd.random() < 0.5 else (x + rnd.uniform(-1, 1), y + length)
+        polys.append([(x, y), end])
+    return polys
+
+
+class TestConnectPolylines:
+    """Tests for endpoint merging and T-joins."""
+
+    def test_merges_chain_in_any_order_and_direction(self):
+        polys = [[(40.0, 0.0), (60.0, 0.0)], [(38.0, 0.0), (20.0, 0.0)], [(0.0, 0.0), (18.0, 0.0)]]
+
+        merged = connect_polylines(polys, snap_dist=6.0, min_len=0)
+
+        assert len(merged) == 1
+        assert sorted(merged[0]) == sorted({q for p in polys for q in p})
+        assert merged[0][0] in {(0.0, 0.0), (60.0, 0.0)}
+
+    def test_shared_endpoint_is_not_duplicated(self):
+        merged = connect_polylines([[(0.0, 0.0), (20.0, 0.0)], [(20.0, 0.0), (20.0, 20.0)]], 6.0, 0)
+
+        assert len(merged) == 1
+        assert len(merged[0]) == 3
+
+    def test_chain_is_not_closed_into_loop(self):
+        square = [[(2.0, 0.0), (98.0, 0.0)], [(100.0, 2.0), (100.0, 98.0)],
+                  [(98.0, 100.0), (2.0, 100.0)], [(0.0, 98.0), (0.0, 2.0)]]
+
+        merged = connect_polylines(square, 6.0, 0)
+
+        assert len(merged) == 1
+        assert len(merged[0]) == 8
+
+    def test_t_join_inserts_shared_vertex(self):
+        wall = [(0.0, 0.0), (100.0, 0.0)]
+        stub = [(50.0, 4.0), (50.0, 40.0)]
+
+        merged = connect_polylines([wall, stub], 6.0, 0)
+
+        assert [(0.0, 0.0), (50.0, 0.0), (100.0, 0.0)] in merged
+        assert [(50.0, 0.0), (50.0, 4.0), (50.0, 40.0)] in merged
+
+    def test_drops_stubs_and_reports_counts(self):
+        stats = {}
+        merged = connect_polylines([[(0.0, 0.0), (5.0, 0.0)], [(50.0, 50.0), (90.0, 50.0)]], 6.0, 12.0, stats)
+
+        assert merged == [[(50.0, 50.0), (90.0, 50.0)]]
+        assert stats["endpoint_merges"] == 0 and stats["t_joins"] == 0
+        assert set(stats["timings"]) == {"connect_merge", "connect_tjoin"}
+
+    def test_handles_thousands_of_fragments(self):
+        merged = connect_polylines(random_fragments(3000, size=3000), 6.0, 12.0)
+        assert merged
+
+
+class TestRemoveParallelDuplicates:
+    """Tests for parallel duplicate removal."""
+
+    @staticmethod
+    def brute_force(polys, parallel_dist):
+        """Every pair measured, longest polylines first."""
+        def avg(p1, p2):
+            return sum(min(nearest_on_seg(pt, p2[k], p2[k + 1])[1] for k in range(len(p2) - 1)) for pt in p1) / len(p1)
+        length = [sum(((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) ** 0.5 for a, b in zip(p, p[1:])) for p in polys]
+        keep = [True] * len(polys)
+        for i in sorted(range(len(polys)), key=lambda i: length[i], reverse=True):
+            if keep[i]:
+                for j in range(len(polys)):
+                    if j != i and keep[j] and (avg(polys[i], polys[j]) + avg(polys[j], polys[i])) / 2 < parallel_dist:
+                        keep[j] = False
+        return [p for p, k in zip(polys, keep) if k]
+
+    def test_drops_shorter_parallel_line(self):
+        long_wall = [(0.0, 0.0), (100.0, 0.0)]
+        polys = [[(10.0, 3.0), (90.0, 3.0)], long_wall, [(0.0, 50.0), (100.0, 50.0)]]
+
+        assert remove_parallel_duplicates(polys, 8.0) == [long_wall, [(0.0, 50.0), (100.0, 50.0)]]
+
+    def test_matches_brute_force(self):
+        polys = random_fragments(400, seed=3, size=300)
+        stats = {}
+
+        result = remove_parallel_duplicates(polys, 8.0, stats)
+
+        assert result == self.brute_force(polys, 8.0)
+        assert len(result) < len(polys)
+        assert stats["parallel_pairs_measured"] < len(polys) * (len(polys) - 1)
+        assert "parallel" in stats["timings"]
+
+
+class TestRedlineHelpers:
+    """Tests for the array-based redline_walls steps."""
+
+    def test_polygonize_redlines_matches_polygonize(self, tmp_path):
+        img = red_lined_image()
+        assert polygonize_redlines(img) == polygonize(img)
+        assert not (tmp_path / "debug").exists()
+        polygonize_redlines(img, output_dir=tmp_path / "debug")
+        assert (tmp_path / "debug" / "polylines.json").exists()
+
+    def test_create_overlay_tints_lines(self, tmp_path):
+        original = np.full((300, 400, 3), 200, np.uint8)
+        polylines = [[(20.0, 20.0), (380.0, 20.0)]]
+        output = tmp_path / "overlay.png"
+
+        create_overlay(original, polylines, output, alpha=0.5)
+
+        overlay = cv2.imread(str(output))
+        assert tuple(overlay[20, 200]) == (100, 100, 227)
+        assert tuple(overlay[150, 200]) == (200, 200, 200)
+
+    def test_convert_to_foundry_format_scales(self, tmp_path):
+        output = tmp_path / "walls.json"
+        polylines = [[(10.0, 10.0), (20.0, 10.0), (20.0, 30.0)]]
+
+        count = convert_to_foundry_format(polylines, (100, 200), (200, 400), output)
+
+        data = json.loads(output.read_text())
+        assert count == 2 == data["total_walls"]
+        assert [w["c"] for w in data["walls"]] == [[20.0, 20.0, 40.0, 20.0], [40.0, 20.0, 40.0, 60.0]]
+        assert data["image_dimensions"] == {"width": 400, "height": 200}
@@ -0,0 +1,193 @@
+"""Tests for tiled wall detection: tile planning, seam stitching and tiled redline_walls."""
+
+import asyncio
+import json
+import math
+
+import cv2
+import numpy as np
+from unittest.mock import patch
+
+from wall_detection.polygonize import polygonize
+from wall_detection.redline_walls import redline_walls
+from wall_detection.tiling import Tile, clip_polyline, needs_tiling, plan_tiles, stitch_tiles
+
+from .test_polygonize import RED, max_deviation
+
+
+def core_area(tiles):
+    return sum((t.core_x1 - t.core_x0) * (t.core_y1 - t.core_y0) for t in tiles)
+
+
+def poly_length(polyline):
+    return sum(math.dist(a, b) for a, b in zip(polyline, polyline[1:]))
+
+
+class TestPlanTiles:
+    """Tests for plan_tiles()."""
+
+    def test_small_map_is_one_tile(self):
+        assert plan_tiles(800, 600, tile_size=2048) == [Tile(0, 0, 800, 600, 0, 0, 800, 600)]
+
+    def test_cores_partition_the_map(self):
+        tiles = plan_tiles(5000, 3100, tile_size=1024, overlap=64)
+
+        assert core_area(tiles) == 5000 * 3100
+        xs = sorted({t.core_x0 for t in tiles} | {t.core_x1 for t in tiles})
+        ys = sorted({t.core_y0 for t in tiles} | {t.core_y1 for t in tiles})
+        assert len(tiles) == (len(xs) - 1) * (len(ys) - 1)
+        assert xs[0] == ys[0] == 0 and xs[-1] == 5000 and ys[-1] == 3100
+
+    def test_tiles_add_overlap_inside_the_map(self):
+        for t in plan_tiles(5000, 3100, tile_size=1024, overlap=64):
+            assert t.x0 == max(0, t.core_x0 - 64) and t.x1 == min(5000, t.core_x1 + 64)
+            assert t.y0 == max(0, t.core_y0 - 64) and t.y1 == min(3100, t.core_y1 + 64)
+            assert t.width <= 1024 + 896 // 2
+
+    def test_no_sliver_tiles(self):
+        tiles = plan_tiles(2000, 2000, tile_size=1000, overlap=0)
+        assert min(t.core_x1 - t.core_x0 for t in tiles) >= 500
+
+    def test_seams_sit_at_grid_cell_centres(self):
+        grid = {'grid_size': 70, 'x_offset': 12, 'y_offset': 40}
+        tiles = plan_tiles(5000, 4000, tile_size=2048, overlap=100, grid=grid)
+
+        seams_x = {t.core_x0 for t in tiles} - {0}
+        seams_y = {t.core_y0 for t in tiles} - {0}
+        assert seams_x and seams_y
+        assert all((x - 12) % 70 == 35 for x in seams_x)
+        assert all((y - 40) % 70 == 35 for y in seams_y)
+        # Overlap rounded up to whole cells
+        inner = next(t for t in tiles if t.core_x0 > 0 and t.core_y0 > 0)
+        assert inner.core_x0 - inner.x0 == inner.core_y0 - inner.y0 == 140
+
+    def test_grid_without_size_is_ignored(self):
+        grid = {'grid_size': None, 'x_offset': 0, 'y_offset': 0}
+        assert plan_tiles(5000, 5000, 1024, 64, grid) == plan_tiles(5000, 5000, 1024, 64)
+
+    def test_needs_tiling(self):
+        assert not needs_tiling(4096, 4096)
+        assert needs_tiling(8192, 1000)
+
+
+class TestClipPolyline:
+    """Tests for clip_polyline()."""
+
+    def test_inside_is_unchanged(self):
+        assert clip_polyline([(1, 1), (5, 5), (9, 1)], 0, 0, 10, 10) == [[(1, 1), (5, 5), (9, 1)]]
+
+    def test_cuts_at_boundary(self):
+        assert clip_polyline([(-5, 5), (5, 5), (15, 5)], 0, 0, 10, 10) == [[(0.0, 5.0), (5, 5), (10.0, 5.0)]]
+
+    def test_reentering_polyline_gives_two_pieces(self):
+        pieces = clip_polyline([(2, 2), (2, 20), (8, 20), (8, 2)], 0, 0, 10, 10)
+        assert pieces == [[(2, 2), (2.0, 10.0)], [(8.0, 10.0), (8, 2)]]
+
+    def test_outside_and_touching_corner_are_dropped(self):
+        assert clip_polyline([(20, 0), (20, 10)], 0, 0, 10, 10) == []
+        assert clip_polyline([(10, 20), (20, 10)], 0, 0, 10, 10) == []
+
+
+class TestStitchTiles:
+    """Tests for stitch_tiles()."""
+
+    def test_joins_wall_cut_at_seam(self):
+        left = Tile(0, 0, 140, 100, 0, 0, 100, 100)
+        right = Tile(60, 0, 200, 100, 100, 0, 200, 100)
+        # The same wall traced by both tiles, 1px apart, running into each other's overlap
+        tile_polylines = [
+            (left, [[(10.0, 50.0), (140.0, 50.0)]]),
+            (right, [[(0.0, 51.0), (130.0, 51.0)]]),
+        ]
+        stats = {}
+
+        stitched = stitch_tiles(tile_polylines, stats=stats)
+
+        assert len(stitched) == 1
+        (x0, _), (x1, _) = stitched[0][0], stitched[0][-1]
+        assert sorted([x0, x1]) == [10.0, 190.0]
+        assert all(49 <= y <= 52 for _, y in stitched[0])
+        assert stats["tile_pieces"] == 2 and stats["endpoint_merges"] == 1
+
+    def test_duplicates_from_overlap_are_dropped(self):
+        left = Tile(0, 0, 140, 100, 0, 0, 100, 100)
+        right = Tile(60, 0, 200, 100, 100, 0, 200, 100)
+        # A vertical wall inside the left core, also seen in the right tile's overlap
+        tile_polylines = [(left, [[(80.0, 10.0), (80.0, 90.0)]]), (right, [[(20.0, 10.0), (20.0, 90.0)]])]
+
+        assert stitch_tiles(tile_polylines) == [[(80.0, 10.0), (80.0, 90.0)]]
+
+
+def red_lined_map() -> np.ndarray:
+    """A 900x700 red-lined map with walls crossing several tile seams."""
+    img = np.full((700, 900, 3), 255, np.uint8)
+    for a, b in [
+        ((40, 40), (860, 40)), ((860, 40), (860, 660)), ((40, 40), (40, 660)),
+        ((40, 660), (400, 660)), ((460, 660), (860, 660)), ((450, 40), (450, 500)), ((40, 350), (300, 350)),
+    ]:
+        cv2.line(img, a, b, RED, 6)
+    return img
+
+
+class TestTiledRedlineWalls:
+    """Tests for redline_walls in tiled mode, with a fake red-liner."""
+
+    async def test_stitched_walls_match_untiled_polygonize(self, tmp_path):
+        truth = red_lined_map()
+        input_image = tmp_path / "map.png"
+        cv2.imwrite(str(input_image), truth)
+        active, peak = [0], [0]
+
+        async def fake_generate(prompts, reference_image, **kwargs):
+            """Trace dark pixels of the grayscale tile in red, at half resolution like a resampling model."""
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            gray = cv2.imread(str(reference_image), cv2.IMREAD_GRAYSCALE)
+            out = np.full(gray.shape + (3,), 255, np.uint8)
+            out[gray < 128] = RED
+            out = cv2.resize(out, (gray.shape[1] // 2, gray.shape[0] // 2), interpolation=cv2.INTER_NEAREST)
+            return [cv2.imencode(".png", out)[1].tobytes()]
+
+        with patch("wall_detection.redline_walls.generate_images_parallel", side_effect=fake_generate), \
+             patch("scenes.detect_grid.detect_grid") as mock_detect_grid:
+            result = await redline_walls(
+                input_image, tmp_path / "out", make_run=False, tiled=True,
+                grid={'grid_size': 50, 'x_offset': 0, 'y_offset': 0},
+                tile_size=300, tile_overlap=50, max_concurrent_tiles=2, debug_images=True
+            )
+
+        mock_detect_grid.assert_not_called()
+        tiles = plan_tiles(900, 700, 300, 50, {'grid_size': 50, 'x_offset': 0, 'y_offset': 0})
+        assert len(tiles) > 4
+        assert peak[0] == 2
+        assert len(list((tmp_path / "out" / "tiles").glob("*_redlined.png"))) == len(tiles)
+        assert not (tmp_path / "out" / "redline_temp").exists()
+
+        stitched = [[tuple(pt) for pt in p] for p in json.loads(result['polylines_json'].read_text())["polylines"]]
+        expected = polygonize(truth)
+        # Both are RDP-simplified with eps 5 (and tiles were red-lined at half resolution)
+        assert max_deviation(stitched, expected, truth.shape[:2]) <= 6
+        assert max_deviation(expected, stitched, truth.shape[:2]) <= 6
+        # Seams do not add wall pieces: the long walls come back whole
+        assert len(stitched) <= len(expected) + 2
+        assert max(poly_length(p) for p in stitched) >= 820
+
+        mosaic = cv2.imread(str(result['redlined']))
+        assert mosaic.shape == truth.shape
+
+    async def test_small_maps_are_not_tiled_by_default(self, tmp_path):
+        input_image = tmp_path / "map.png"
+        cv2.imwrite(str(input_image), red_lined_map())
+        calls = []
+
+        async def fake_generate(prompts, reference_image, **kwargs):
+            calls.append(reference_image)
+            return [cv2.imencode(".png", red_lined_map())[1].tobytes()]
+
+        with patch("wall_detection.redline_walls.generate_images_parallel", side_effect=fake_generate):
+            await redline_walls(input_image, tmp_path / "out", make_run=False)
+
+        assert len(calls) == 1
+        assert not (tmp_path / "out" / "tiles").exists()
@@ -17,6 +17,9 @@ class Settings:
     # Image generation
     IMAGEN_CONCURRENT_LIMIT = 2  # Max parallel image generation
 
+    # Module processing jobs
+    MODULE_JOB_WORKERS = 1  # Modules processed at the same time (others wait in the queue)
+
 
 # Global settings instance
 settings = Settings()
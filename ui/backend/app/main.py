@@ -12,8 +12,9 @@ from dotenv import load_dotenv
 
 from app.routers import actors, chat, files, folders, health, journals, modules, scenes, search, tools
 from app.routers.scenes import scene_upload_router
-from app.websocket import foundry_websocket_endpoint
+from app.websocket import foundry_websocket_endpoint, foundry_manager
 from app.websocket.push import set_main_loop
+from app.tools.actor_creator import get_foundry_caches
 
 
 # Configure logging - show all INFO and above from app modules
@@ -78,5 +79,17 @@ async def websocket_foundry(websocket: WebSocket):
 
 @app.on_event("startup")
 async def startup_event():
-    """Store main event loop reference for cross-thread progress broadcasts."""
+    """Store main event loop reference and load persisted caches."""
     set_main_loop(asyncio.get_event_loop())
+    # Serve spell/icon lookups from the last snapshot until Foundry connects
+    get_foundry_caches().preload()
+    # Heartbeat pings feed per-client health scores used for request routing
+    foundry_manager.start_heartbeat()
+    # Requeue module jobs left queued by a previous run; mark running ones interrupted
+    modules.module_jobs.recover()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks."""
+    foundry_manager.stop_heartbeat()
@@ -14,12 +14,12 @@ from app.websocket import (
     list_scenes,
     push_actor,
     update_actor,
-    list_compendium_items,
-    list_files,
     give_items,
     list_folders,
     get_or_create_folder,
     remove_actor_items,
+    delete_documents_batch,
+    push_actors_batch,
 )
 
 router = APIRouter(prefix="/api", tags=["actors"])
@@ -160,6 +160,44 @@ async def create_actor_raw(request: dict):
         raise HTTPException(status_code=500, detail=result.error)
 
 
+@router.post("/foundry/actors/batch")
+async def create_actors_batch(request: dict):
+    """
+    Create several raw actors in Foundry in one batched WebSocket exchange.
+
+    Args:
+        request: Dict with 'actors' key (list of {"actor": {...}, "spell_uuids": [...]}),
+                 and optional 'folder' key for folder ID applied to every actor
+
+    Returns:
+        Per-actor results (uuid, id, name or error), in request order
+    """
+    entries = request.get("actors")
+    if not entries or not all(isinstance(e, dict) and e.get("actor") for e in entries):
+        raise HTTPException(status_code=400, detail="'actors' must be a non-empty list of {actor: {...}}")
+
+    folder = request.get("folder")
+    payload = []
+    for entry in entries:
+        actor_data = dict(entry["actor"])
+        if folder:
+            actor_data["folder"] = folder
+        payload.append({"actor": actor_data, "spell_uuids": entry.get("spell_uuids") or []})
+
+    result = await push_actors_batch(payload)
+    if not result.success:
+        raise HTTPException(status_code=500, detail=result.error)
+
+    return {
+        "success": True,
+        "created_count": len(result.succeeded),
+        "results": [
+            {"success": r.success, "uuid": r.uuid, "id": r.id, "name": r.name, "error": r.error}
+            for r in result.results
+        ],
+    }
+
+
 @router.get("/foundry/actors")
 async def get_all_actors():
     """
@@ -226,21 +264,20 @@ async def delete_duplicate_actors():
     for actor in actors:
         by_name[actor.name].append(actor)
 
-    # Find and delete duplicates
+    # Keep first of each name, delete the rest in one batch
+    duplicates = [actor for actor_list in by_name.values() for actor in actor_list[1:]]
     deleted = []
     failed = []
 
-    for name, actor_list in by_name.items():
-        if len(actor_list) > 1:
-            # Keep first, delete rest
-            for actor in actor_list[1:]:
-                del_result = await delete_actor(actor.uuid, timeout=10.0)
-                if del_result.success:
-                    deleted.append({"uuid": actor.uuid, "name": actor.name})
-                else:
-                    failed.append(
-                        {"uuid": actor.uuid, "name": actor.name, "error": del_result.error}
-                    )
+    if duplicates:
+        batch = await delete_documents_batch([actor.uuid for actor in duplicates])
+        for actor, del_result in zip(duplicates, batch.results):
+            if del_result.success:
+                deleted.append({"uuid": actor.uuid, "name": actor.name})
+            else:
+                failed.append(
+                    {"uuid": actor.uuid, "name": actor.name, "error": del_result.error}
+                )
 
     return {
         "success": True,
@@ -340,46 +377,11 @@ async def create_actor_endpoint(request: CreateActorRequest):
         sys.path.insert(0, src_path)
 
     from actor_pipeline.orchestrate import create_actor_from_description
-    from caches import SpellCache, IconCache
+    from app.tools.actor_creator import load_caches
 
     try:
-        # Pre-fetch spells and icons via direct WebSocket (avoids self-deadlock)
-        # When running inside FastAPI, we can't make HTTP requests to ourselves
-        spell_result = await list_compendium_items(
-            document_type="Item",
-            sub_type="spell",
-            timeout=60.0,
-        )
-        if not spell_result.success:
-            raise RuntimeError(f"Failed to fetch spells: {spell_result.error}")
-
-        icon_result = await list_files(
-            path="icons",
-            source="public",
-            recursive=True,
-            extensions=[".webp", ".png", ".jpg", ".svg"],
-            timeout=120.0,
-        )
-        if not icon_result.success:
-            raise RuntimeError(f"Failed to fetch icons: {icon_result.error}")
-
-        # Create pre-loaded caches
-        spell_cache = SpellCache()
-        spell_cache.load_from_data(
-            [
-                {
-                    "name": r.name,
-                    "uuid": r.uuid,
-                    "type": r.type,
-                    "img": r.img,
-                    "pack": r.pack,
-                }
-                for r in (spell_result.results or [])
-            ]
-        )
-
-        icon_cache = IconCache()
-        icon_cache.load_from_data(icon_result.files or [])
+        # Shared, persisted spell/icon caches (fetched via WebSocket only when missing or stale)
+        spell_cache, icon_cache = await load_caches()
 
         # WebSocket-based actor upload function (bypasses relay server)
         async def ws_actor_upload(actor_data: dict, spell_uuids: list) -> str:
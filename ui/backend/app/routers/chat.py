@@ -8,6 +8,7 @@ from app.services.gemini_service import GeminiService
 from app.tools import registry
 from app.tools.actor_creator import set_request_context
 from app.websocket import fetch_actor, fetch_journal
+from util.gemini import Priority, request_priority
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
@@ -148,8 +149,15 @@ async def chat(request: ChatRequest) -> ChatResponse:
     """
     Main chat endpoint.
 
-    Handles both regular chat messages and slash commands.
+    Handles both regular chat messages and slash commands. Gemini calls made while
+    handling the message are scheduled ahead of batch module processing.
     """
+    with request_priority(Priority.INTERACTIVE):
+        return await _handle_chat(request)
+
+
+async def _handle_chat(request: ChatRequest) -> ChatResponse:
+    """Handle a chat message or slash command."""
     try:
         # Parse command
         cmd = command_parser.parse(request.message)
@@ -194,10 +202,10 @@ async def chat(request: ChatRequest) -> ChatResponse:
             ]
 
             # Check if this is a rules question
-            if gemini_service.is_rules_question(cleaned_message):
+            if await gemini_service.is_rules_question(cleaned_message):
                 print("[DEBUG] Detected rules question, using thinking mode")
                 print(f"[DEBUG] Rules question context: {enhanced_context.get('gameSystem', {})}")
-                response_text = gemini_service.generate_with_thinking(
+                response_text = await gemini_service.generate_with_thinking(
                     message=cleaned_message,
                     conversation_history=history_dicts,
                     context=enhanced_context
@@ -279,7 +287,7 @@ async def _handle_generate_scene(args: str, context: dict) -> ChatResponse:
         )
 
     # Generate scene description
-    description = gemini_service.generate_scene_description(args)
+    description = await gemini_service.generate_scene_description(args)
 
     # Generate scene image using the image generator tool
     image_tool = registry.tools.get("generate_images")
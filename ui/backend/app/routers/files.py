@@ -1,6 +1,6 @@
 """File serving and upload router."""
 
-import base64
+import asyncio
 import logging
 import re
 
@@ -8,7 +8,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.responses import FileResponse
 
 from app.config import settings
-from app.websocket.push import upload_file
+from app.websocket.push import upload_file_stream
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +82,14 @@ def validate_destination(destination: str) -> str:
     return destination
 
 
+def _spooled_size(fileobj) -> int:
+    """Return the size of a seekable file and rewind it to the start."""
+    fileobj.seek(0, 2)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
 @router.get("/images/{filename}")
 async def serve_image(filename: str):
     """
@@ -120,8 +128,8 @@ async def upload_file_endpoint(
     """
     Upload a file to FoundryVTT world folder.
 
-    The file is sent to the connected Foundry client via WebSocket,
-    which saves it to: worlds/<current-world>/<destination>/<filename>
+    The file is streamed to the connected Foundry client via WebSocket in
+    binary chunks, which saves it to: worlds/<current-world>/<destination>/<filename>
 
     Args:
         file: The file to upload
@@ -138,7 +146,7 @@ async def upload_file_endpoint(
     # 1. Validate destination (whitelist check, path traversal)
     validated_destination = validate_destination(destination)
 
-    # 2. Check file size BEFORE reading entire content
+    # 2. Check file size without reading the content
     # First check Content-Length header if available
     if file.size is not None and file.size > MAX_FILE_SIZE:
         raise HTTPException(
@@ -146,27 +154,25 @@ async def upload_file_endpoint(
             detail=f"File too large: {file.size} bytes exceeds {MAX_FILE_SIZE} byte limit"
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Double-check actual size (in case header was spoofed or unavailable)
-    if len(content) > MAX_FILE_SIZE:
+    # Actual size from the spooled upload (in case header was spoofed or unavailable);
+    # the spool may be on disk, so seek off the event loop
+    size = await asyncio.to_thread(_spooled_size, file.file)
+    if size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=413,
-            detail=f"File too large: {len(content)} bytes exceeds {MAX_FILE_SIZE} byte limit"
+            detail=f"File too large: {size} bytes exceeds {MAX_FILE_SIZE} byte limit"
         )
 
     # 3. Sanitize filename
     safe_filename = sanitize_filename(file.filename)
 
-    # Encode content for WebSocket transmission
-    content_b64 = base64.b64encode(content).decode('utf-8')
-
-    logger.debug(f"Sending file upload: {safe_filename} to {validated_destination}")
+    logger.debug(f"Sending file upload: {safe_filename} ({size} bytes) to {validated_destination}")
 
-    result = await upload_file(
+    # Stream from the spool in binary chunks
+    result = await upload_file_stream(
+        file.file,
         filename=safe_filename,
-        content=content_b64,
+        size=size,
         destination=validated_destination
     )
 
@@ -1,7 +1,7 @@
 """Health and status endpoints."""
 
 from fastapi import APIRouter
-from app.websocket import foundry_manager
+from app.websocket import foundry_manager, world_index
 
 router = APIRouter(tags=["health"])
 
@@ -27,5 +27,7 @@ async def foundry_status():
     """Check Foundry WebSocket connection status."""
     return {
         "connected_clients": foundry_manager.connection_count,
-        "status": "connected" if foundry_manager.connection_count > 0 else "disconnected"
+        "status": "connected" if foundry_manager.connection_count > 0 else "disconnected",
+        "routing": foundry_manager.stats(),
+        "world_index": world_index.stats()
     }
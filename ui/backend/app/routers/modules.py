@@ -7,10 +7,10 @@ import asyncio
 import logging
 import shutil
 import sys
-import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
@@ -23,9 +23,14 @@ from config import PROJECT_ROOT
 from pdf_processing.pdf_to_xml import main as pdf_to_xml_main, configure_gemini
 from actor_pipeline.process_actors import process_actors_for_run
 from pdf_processing.image_asset_processing.extract_map_assets import extract_maps_from_pdf, save_metadata
+from pdf_processing.page_store import PdfPageStore
 from foundry.upload_journal_to_foundry import upload_run_to_foundry
-from scenes.orchestrate import create_scene_from_map
+from scenes.orchestrate import create_scenes_from_maps
+from util.dag import DagPipeline, Stage, StageEvent
+from util.gemini import Priority, request_priority
 
+from app.config import settings
+from app.services.module_jobs import ModuleJob, ModuleJobQueue
 from app.websocket.push import get_or_create_folder, broadcast_progress_sync
 
 
@@ -33,6 +38,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/modules", tags=["modules"])
 
+# Threads shared by the module pipeline's concurrent stages and per-item work
+MODULE_PIPELINE_WORKERS = 4
+
+# Battle maps turned into scenes at the same time
+MODULE_SCENE_CONCURRENCY = 4
+
 
 def _split_pdf_to_sections(pdf_path: Path, output_dir: Path) -> Path:
     """
@@ -62,12 +73,13 @@ def _split_pdf_to_sections(pdf_path: Path, output_dir: Path) -> Path:
     return sections_dir
 
 
-def _run_scene_artwork_generation(run_dir: Path) -> Dict[str, Any]:
+def _generate_chapter_artwork(xml_file: Path, output_dir: Path) -> Dict[str, Any]:
     """
-    Generate scene artwork from chapter XML files.
+    Generate scene artwork for one chapter XML file.
 
     Args:
-        run_dir: Run directory containing documents/ folder
+        xml_file: Chapter XML file
+        output_dir: Run's scene_artwork/ directory
 
     Returns:
         Dict with generation statistics
@@ -78,31 +90,11 @@ def _run_scene_artwork_generation(run_dir: Path) -> Dict[str, Any]:
         sys.path.insert(0, scripts_dir)
     from generate_scene_art import process_chapter
 
-    output_dir = run_dir / "scene_artwork"
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    xml_files = list((run_dir / "documents").glob("*.xml"))
-
-    if not xml_files:
-        logger.warning("No XML files found for scene artwork generation")
-        return {"scenes_found": 0, "images_generated": 0}
-
-    total_scenes = 0
-    total_images = 0
-
-    for xml_file in xml_files:
-        try:
-            stats = process_chapter(xml_file, output_dir, style_prompt=None)
-            total_scenes += stats.get("scenes_found", 0)
-            total_images += stats.get("images_generated", 0)
-        except Exception as e:
-            logger.error(f"Failed to process {xml_file.name} for scene artwork: {e}")
-            # Continue with other files
-
+    stats = process_chapter(xml_file, output_dir, style_prompt=None)
     return {
-        "scenes_found": total_scenes,
-        "images_generated": total_images,
-        "output_dir": str(output_dir)
+        "scenes_found": stats.get("scenes_found", 0),
+        "images_generated": stats.get("images_generated", 0)
     }
 
 
@@ -157,11 +149,16 @@ def process_module_sync(
     extract_battle_maps: bool = True,
     generate_scene_artwork: bool = True,
     folder_ids: Dict[str, str] = None,
+    resume_run_dir: Optional[Path] = None,
+    run_dir: Optional[Path] = None,
+    on_progress: Optional[Callable[[str, str, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
 ) -> Dict[str, Any]:
     """
     Process a D&D module PDF and create FoundryVTT content.
 
-    Orchestrates the full pipeline:
+    Orchestrates the full pipeline (steps after the split run concurrently
+    where their inputs allow, see _run_module_pipeline):
     1. Split PDF into chapters
     2. Convert chapters to XML using Gemini
     3. Extract actors if enabled
@@ -177,6 +174,14 @@ def process_module_sync(
         extract_battle_maps: Whether to extract battle maps
         generate_scene_artwork: Whether to generate scene artwork
         folder_ids: Dict mapping document type ("actors", "journals", "scenes") to folder IDs
+        resume_run_dir: Existing run directory to resume. XML conversion reuses pages
+            that already converted there and only sends missing or failed pages to Gemini.
+        run_dir: Run directory for a fresh run (default: new timestamped directory
+            under output/runs)
+        on_progress: Called with (stage, message, percent) for each progress update
+            (default: broadcast module_progress to Foundry)
+        cancel_event: When set, no further steps start and the result reports
+            {"stage": "cancelled"} with "cancelled": True
 
     Returns:
         Dict with success status, folders created, and resources created
@@ -205,205 +210,333 @@ def process_module_sync(
         }
     }
 
-    # Create timestamped run directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    runs_dir = PROJECT_ROOT / "output" / "runs"
-    run_dir = runs_dir / timestamp
+    # Create timestamped run directory (or reuse the one being resumed)
+    if resume_run_dir:
+        run_dir = Path(resume_run_dir)
+    elif run_dir:
+        run_dir = Path(run_dir)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        runs_dir = PROJECT_ROOT / "output" / "runs"
+        run_dir = runs_dir / timestamp
     run_dir.mkdir(parents=True, exist_ok=True)
     result["run_dir"] = str(run_dir)
 
-    logger.info(f"Created run directory: {run_dir}")
+    logger.info(f"{'Resuming' if resume_run_dir else 'Created'} run directory: {run_dir}")
+
+    if on_progress is None:
+        def on_progress(stage: str, message: str, progress: int) -> None:
+            broadcast_progress_sync(stage, message, progress, module_name)
 
+    # One page store for the source PDF, shared by XML conversion and map extraction
+    page_cache_dir = run_dir / "page_cache"
     try:
-        # Step 1: Split PDF into sections
-        broadcast_progress_sync("splitting_pdf", "Splitting PDF into sections...", 5, module_name)
-        logger.info("Step 1: Splitting PDF into sections...")
+        page_store = PdfPageStore(pdf_path, cache_dir=page_cache_dir)
+    except Exception as e:
+        logger.error(f"Failed to open PDF: {e}")
+        result["error"] = {"stage": "pdf_processing", "message": str(e)}
+        result["success"] = False
+        return result
+
+    # Module processing yields to interactive chat traffic in the Gemini scheduler
+    with page_store, request_priority(Priority.BATCH):
+        return _run_module_pipeline(
+            pdf_path, run_dir, result, page_store, page_cache_dir,
+            module_name=module_name,
+            extract_journal=extract_journal,
+            extract_actors=extract_actors,
+            extract_battle_maps=extract_battle_maps,
+            generate_scene_artwork=generate_scene_artwork,
+            folder_ids=folder_ids,
+            resume_run_dir=resume_run_dir,
+            progress=on_progress,
+            cancel_event=cancel_event,
+        )
+
+
+def _page_store_for(section_pdf: Path, page_store: PdfPageStore, page_cache_dir: Path) -> PdfPageStore:
+    """Reuse the module page store when a section is byte-identical to the source PDF."""
+    section_store = PdfPageStore(section_pdf, cache_dir=page_cache_dir)
+    if section_store.pdf_hash == page_store.pdf_hash:
+        section_store.close()
+        return page_store
+    return section_store
+
+
+# Progress reported when each pipeline stage starts: (stage, message, percent)
+_STAGE_PROGRESS = {
+    "xml": ("extracting_text", "Converting PDF to structured content...", 15),
+    "actors": ("extracting_actors", "Extracting actors and NPCs...", 45),
+    "maps": ("extracting_maps", "Detecting and extracting battle maps...", 55),
+    "scenes": ("creating_scenes", "Creating scenes with walls...", 60),
+    "artwork": ("generating_artwork", "Generating scene artwork...", 70),
+    "journal": ("uploading_to_foundry", "Uploading content to FoundryVTT...", 85),
+}
+
+# result["error"]["stage"] for a failure of each fatal pipeline stage
+_ERROR_STAGES = {
+    "xml": "pdf_to_xml",
+    "actors": "extract_actors",
+    "maps": "extract_battle_maps",
+    "journal": "upload_journal",
+}
+
+
+def _run_module_pipeline(
+    pdf_path: Path,
+    run_dir: Path,
+    result: Dict[str, Any],
+    page_store: PdfPageStore,
+    page_cache_dir: Path,
+    *,
+    module_name: str,
+    extract_journal: bool,
+    extract_actors: bool,
+    extract_battle_maps: bool,
+    generate_scene_artwork: bool,
+    folder_ids: Dict[str, str],
+    resume_run_dir: Optional[Path],
+    progress: Callable[[str, str, int], None],
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """
+    Pipeline steps of process_module_sync, run with the module's shared page store.
+
+    The steps run as a dependency graph: map extraction runs alongside XML
+    conversion, each chapter's XML goes to artwork generation as soon as it is
+    written, and once extraction is done the extracted maps become scenes
+    concurrently (create_scenes_from_maps). Actor extraction works over the whole run, so it waits for all
+    chapters; the journal upload waits for XML, maps and artwork.
+    """
+    try:
+        progress("splitting_pdf", "Splitting PDF into sections...", 5)
+        logger.info("Splitting PDF into sections...")
         sections_dir = _split_pdf_to_sections(pdf_path, run_dir)
         logger.info(f"PDF sections saved to: {sections_dir}")
 
-        # Step 2: Convert sections to XML using Gemini
-        broadcast_progress_sync("extracting_text", "Converting PDF to structured content...", 15, module_name)
-        logger.info("Step 2: Converting PDF sections to XML...")
         configure_gemini()  # Initialize the Gemini API
-
-        # The pdf_to_xml main function writes to output/runs/<timestamp>/documents/
-        # We need to pass the sections dir and the runs base dir
+        # The XML conversion writes to <run_dir>/documents/
         documents_dir = run_dir / "documents"
         documents_dir.mkdir(parents=True, exist_ok=True)
         logs_dir = run_dir / "intermediate_logs"
         logs_dir.mkdir(parents=True, exist_ok=True)
-
-        # Process each section PDF
-        from pdf_processing.pdf_to_xml import process_chapter
-
-        section_files = sorted(sections_dir.glob("*.pdf"))
-        for section_pdf in section_files:
-            section_name = section_pdf.stem
-            output_xml_path = documents_dir / f"{section_name}.xml"
-            try:
-                process_chapter(str(section_pdf), str(output_xml_path), str(logs_dir))
-                logger.info(f"Converted {section_pdf.name} to XML")
-            except Exception as e:
-                logger.error(f"Failed to convert {section_pdf.name}: {e}")
-                result["error"] = {"stage": "pdf_to_xml", "message": str(e)}
-                result["success"] = False
-                return result
-
-        logger.info(f"XML documents saved to: {documents_dir}")
-        broadcast_progress_sync("processing_journal", "Processing journal content...", 35, module_name)
-
     except Exception as e:
         logger.error(f"Failed during PDF processing: {e}")
         result["error"] = {"stage": "pdf_processing", "message": str(e)}
         result["success"] = False
         return result
 
-    # Step 3: Extract actors if enabled
-    if extract_actors:
-        broadcast_progress_sync("extracting_actors", "Extracting actors and NPCs...", 45, module_name)
-        logger.info("Step 3: Extracting actors...")
-        try:
-            # TODO: Make target configurable (currently hardcoded to "local", also supports "forge")
-            actor_stats = process_actors_for_run(
-                str(run_dir),
-                target="local",
-                folder_id=folder_ids.get("actors")
-            )
-            # Capture created actor UUIDs for frontend
-            created_actors = actor_stats.get("created_actors", [])
-            result["actors"] = created_actors
-            result["created"]["actors"] = [a["uuid"] for a in created_actors]
-            logger.info(f"Actors processed: {actor_stats.get('stat_blocks_created', 0)} stat blocks, "
-                       f"{actor_stats.get('npcs_created', 0)} NPCs created")
-        except Exception as e:
-            logger.error(f"Failed to extract actors: {e}")
-            result["error"] = {"stage": "extract_actors", "message": str(e)}
-            result["success"] = False
-            return result
-    else:
-        logger.info("Step 3: Skipping actor extraction (disabled)")
+    from pdf_processing.pdf_to_xml import process_chapter
 
-    # Step 4: Extract battle maps if enabled
-    if extract_battle_maps:
-        broadcast_progress_sync("extracting_maps", "Detecting and extracting battle maps...", 55, module_name)
-        logger.info("Step 4: Extracting battle maps...")
-        try:
-            map_output_dir = run_dir / "map_assets"
-            map_output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Run the async extraction in a new event loop
-            maps = asyncio.run(extract_maps_from_pdf(
-                str(pdf_path),
-                str(map_output_dir),
-                chapter_name=module_name
-            ))
-
-            if maps:
-                save_metadata(maps, str(map_output_dir))
-                logger.info(f"Extracted {len(maps)} map(s)")
-
-                # Create scenes from extracted maps
-                broadcast_progress_sync("creating_scenes", f"Creating {len(maps)} scene(s) with walls...", 60, module_name)
-                logger.info(f"Step 4b: Creating scenes from {len(maps)} extracted map(s)...")
-
-                scenes_folder_id = folder_ids.get("scenes")
-                created_scenes = []
-
-                for i, map_meta in enumerate(maps):
-                    map_filename = f"page_{map_meta.page_num:03d}_{map_meta.name.lower().replace(' ', '_')}.png"
-                    map_path = map_output_dir / map_filename
-
-                    if map_path.exists():
-                        try:
-                            broadcast_progress_sync(
-                                "creating_scenes",
-                                f"Creating scene {i+1}/{len(maps)}: {map_meta.name}...",
-                                60 + (i * 5 // len(maps)),
-                                module_name
-                            )
-
-                            scene_result = asyncio.run(create_scene_from_map(
-                                image_path=map_path,
-                                name=map_meta.name,
-                                folder=scenes_folder_id
-                            ))
-
-                            created_scenes.append({
-                                "uuid": scene_result.uuid,
-                                "name": scene_result.name,
-                                "wall_count": scene_result.wall_count,
-                                "grid_size": scene_result.grid_size
-                            })
-                            logger.info(f"Created scene: {scene_result.name} ({scene_result.uuid}) with {scene_result.wall_count} walls")
-
-                        except Exception as e:
-                            logger.warning(f"Failed to create scene from {map_path.name}: {e}")
-                    else:
-                        logger.warning(f"Map file not found: {map_path}")
-
-                result["created"]["scenes"] = [s["uuid"] for s in created_scenes]
-                logger.info(f"Created {len(created_scenes)} scene(s)")
-            else:
-                logger.info("No maps found in PDF")
+    map_output_dir = run_dir / "map_assets"
+    scenes_folder_id = folder_ids.get("scenes")
 
-        except Exception as e:
-            logger.error(f"Failed to extract battle maps: {e}")
-            result["error"] = {"stage": "extract_battle_maps", "message": str(e)}
-            result["success"] = False
-            return result
-    else:
-        logger.info("Step 4: Skipping battle map extraction (disabled)")
+    def convert_sections(inputs):
+        """Convert each section to XML, yielding each XML path as it is written."""
+        for section_pdf in sorted(sections_dir.glob("*.pdf")):
+            output_xml_path = documents_dir / f"{section_pdf.stem}.xml"
+            section_store = _page_store_for(section_pdf, page_store, page_cache_dir)
+            try:
+                process_chapter(
+                    str(section_pdf), str(output_xml_path), str(logs_dir),
+                    resume=resume_run_dir is not None,
+                    page_store=section_store
+                )
+            finally:
+                if section_store is not page_store:
+                    section_store.close()
+            logger.info(f"Converted {section_pdf.name} to XML")
+            yield output_xml_path
+
+    def extract_actors_stage(inputs):
+        # TODO: Make target configurable (currently hardcoded to "local", also supports "forge")
+        actor_stats = process_actors_for_run(
+            str(run_dir),
+            target="local",
+            folder_id=folder_ids.get("actors")
+        )
+        logger.info(f"Actors processed: {actor_stats.get('stat_blocks_created', 0)} stat blocks, "
+                    f"{actor_stats.get('npcs_created', 0)} NPCs created")
+        return actor_stats.get("created_actors", [])
+
+    def extract_maps_stage(inputs):
+        """Extract maps; returns (name, image path) for each saved map."""
+        map_output_dir.mkdir(parents=True, exist_ok=True)
+        # Run the async extraction in a new event loop
+        maps = asyncio.run(extract_maps_from_pdf(
+            str(pdf_path),
+            str(map_output_dir),
+            chapter_name=module_name,
+            page_store=page_store
+        ))
+        if not maps:
+            logger.info("No maps found in PDF")
+            return []
+
+        save_metadata(maps, str(map_output_dir))
+        logger.info(f"Extracted {len(maps)} map(s)")
+        map_files = []
+        for map_meta in maps:
+            map_filename = f"page_{map_meta.page_num:03d}_{map_meta.name.lower().replace(' ', '_')}.png"
+            map_path = map_output_dir / map_filename
+            if map_path.exists():
+                map_files.append((map_meta.name, map_path))
+            else:
+                logger.warning(f"Map file not found: {map_path}")
+        return map_files
+
+    def create_scenes_stage(inputs):
+        map_files = inputs["maps"] or []
+        if not map_files:
+            return []
+
+        def scene_progress(done: int, total: int, name: str, error: Optional[BaseException]) -> None:
+            verb = "Failed scene" if error else "Created scene"
+            progress("creating_scenes", f"{verb} {done}/{total}: {name}...", max(last_percent, 60 + done * 5 // total))
+
+        scene_results = asyncio.run(create_scenes_from_maps(
+            [map_path for _, map_path in map_files],
+            names=[name for name, _ in map_files],
+            folder=scenes_folder_id,
+            max_concurrency=MODULE_SCENE_CONCURRENCY,
+            on_progress=scene_progress
+        ))
+        created = []
+        for (_, map_path), scene_result in zip(map_files, scene_results):
+            # A scene that fails to build is skipped; the rest of the module continues
+            if isinstance(scene_result, BaseException):
+                logger.warning(f"Failed to create scene from {map_path.name}: {scene_result}")
+                continue
+            logger.info(f"Created scene: {scene_result.name} ({scene_result.uuid}) with {scene_result.wall_count} walls")
+            created.append({
+                "uuid": scene_result.uuid,
+                "name": scene_result.name,
+                "wall_count": scene_result.wall_count,
+                "grid_size": scene_result.grid_size
+            })
+        return created
+
+    def artwork_stage(xml_file, inputs):
+        stats = _generate_chapter_artwork(xml_file, run_dir / "scene_artwork")
+        logger.info(f"Scene artwork for {xml_file.name}: {stats['images_generated']} images generated")
+        return stats
+
+    def upload_journal_stage(inputs):
+        # TODO: Make target configurable (currently hardcoded to "local", also supports "forge")
+        upload_result = upload_run_to_foundry(
+            str(run_dir),
+            target="local",
+            journal_name=module_name,
+            folder_id=folder_ids.get("journals")
+        )
+        if upload_result.get("errors"):
+            logger.warning(f"Upload had errors: {upload_result['errors']}")
+        return upload_result
 
-    # Step 5: Generate scene artwork if enabled (non-fatal)
+    stages = [Stage("xml", convert_sections)]
+    if extract_actors:
+        stages.append(Stage("actors", extract_actors_stage, depends_on=("xml",)))
+    if extract_battle_maps:
+        stages.append(Stage("maps", extract_maps_stage))
+        stages.append(Stage("scenes", create_scenes_stage, depends_on=("maps",), fatal=False))
     if generate_scene_artwork:
-        broadcast_progress_sync("generating_artwork", "Generating scene artwork...", 70, module_name)
-        logger.info("Step 5: Generating scene artwork...")
-        try:
-            artwork_stats = _run_scene_artwork_generation(run_dir)
-            logger.info(f"Scene artwork: {artwork_stats.get('images_generated', 0)} images generated")
-        except Exception as e:
-            # Scene artwork is non-fatal - log and continue
-            logger.warning(f"Scene artwork generation failed (non-fatal): {e}")
-    else:
-        logger.info("Step 5: Skipping scene artwork generation (disabled)")
-
-    # Step 6: Upload journal if enabled
+        # Scene artwork is non-fatal
+        stages.append(Stage("artwork", artwork_stage, for_each="xml", fatal=False))
     if extract_journal:
-        broadcast_progress_sync("uploading_to_foundry", "Uploading content to FoundryVTT...", 85, module_name)
-        logger.info("Step 6: Uploading journal to FoundryVTT...")
-        try:
-            # TODO: Make target configurable (currently hardcoded to "local", also supports "forge")
-            upload_result = upload_run_to_foundry(
-                str(run_dir),
-                target="local",
-                journal_name=module_name,
-                folder_id=folder_ids.get("journals")
-            )
-
-            if upload_result.get("journal_uuid"):
-                result["journal_uuid"] = upload_result["journal_uuid"]
-                result["journal_name"] = module_name
-                result["created"]["journal"] = upload_result["journal_uuid"]
-                logger.info(f"Journal uploaded: {upload_result['journal_uuid']}")
-            else:
-                logger.warning("Journal upload completed but no UUID returned")
+        # The journal embeds extracted maps and generated artwork
+        journal_deps = [name for name in ("xml", "maps", "artwork") if any(s.name == name for s in stages)]
+        stages.append(Stage("journal", upload_journal_stage, depends_on=journal_deps))
+
+    logger.info(f"Running module pipeline stages: {', '.join(s.name for s in stages)}")
+    last_percent = 5
+
+    def report(event: StageEvent) -> None:
+        nonlocal last_percent
+        stage, message, percent = _STAGE_PROGRESS[event.stage]
+        if event.status == "started":
+            last_percent = max(last_percent, percent)
+        elif event.status == "item":
+            message = f"{event.items_done} chapter(s) illustrated..."
+        elif event.status == "done" and event.stage == "xml":
+            stage, message = "processing_journal", "Processing journal content..."
+            last_percent = max(last_percent, 35)
+        else:
+            return
+        progress(stage, message, last_percent)
+
+    outcome = DagPipeline(stages, max_workers=MODULE_PIPELINE_WORKERS, on_progress=report).run(cancel=cancel_event)
+    stage_results = outcome.results
+
+    created_actors = stage_results.get("actors") or []
+    result["actors"] = created_actors
+    result["created"]["actors"] = [a["uuid"] for a in created_actors]
+
+    created_scenes = stage_results.get("scenes") or []
+    result["created"]["scenes"] = [s["uuid"] for s in created_scenes]
+    for error in outcome.errors.get("scenes", []):
+        logger.warning(f"Scene creation failed (non-fatal): {error}")
+    if extract_battle_maps:
+        logger.info(f"Created {len(created_scenes)} scene(s)")
 
-            if upload_result.get("errors"):
-                logger.warning(f"Upload had errors: {upload_result['errors']}")
+    artwork_stats = stage_results.get("artwork") or []
+    for error in outcome.errors.get("artwork", []):
+        logger.warning(f"Scene artwork generation failed (non-fatal): {error}")
+    if generate_scene_artwork:
+        logger.info(f"Scene artwork: {sum(s['images_generated'] for s in artwork_stats)} images generated")
+
+    upload_result = stage_results.get("journal")
+    if upload_result:
+        if upload_result.get("journal_uuid"):
+            result["journal_uuid"] = upload_result["journal_uuid"]
+            result["journal_name"] = module_name
+            result["created"]["journal"] = upload_result["journal_uuid"]
+            logger.info(f"Journal uploaded: {upload_result['journal_uuid']}")
+        else:
+            logger.warning("Journal upload completed but no UUID returned")
+
+    if outcome.cancelled:
+        logger.info("Module processing cancelled")
+        result["error"] = {"stage": "cancelled", "message": "Processing was cancelled"}
+        result["success"] = False
+        result["cancelled"] = True
+        return result
 
-        except Exception as e:
-            logger.error(f"Failed to upload journal: {e}")
-            result["error"] = {"stage": "upload_journal", "message": str(e)}
-            result["success"] = False
-            return result
-    else:
-        logger.info("Step 6: Skipping journal upload (disabled)")
+    if not outcome.success:
+        logger.error(f"Module pipeline failed at {outcome.failed_stage}: {outcome.error}")
+        result["error"] = {"stage": _ERROR_STAGES[outcome.failed_stage], "message": str(outcome.error)}
+        result["success"] = False
+        return result
 
-    broadcast_progress_sync("complete", "Module processing complete!", 100, module_name)
+    logger.info("Stage timings: " + ", ".join(f"{k}={v:.1f}s" for k, v in outcome.timings.items()))
+    progress("complete", "Module processing complete!", 100)
     logger.info("Module processing complete!")
     return result
 
 
+def _run_module_job(job: ModuleJob, on_progress, cancel_event: threading.Event) -> Dict[str, Any]:
+    """Run process_module_sync for a queued job (see ModuleJobQueue)."""
+    run_dir = Path(job.run_dir)
+    return process_module_sync(
+        pdf_path=Path(job.pdf_path),
+        module_name=job.module_name,
+        folder_ids=job.folder_ids,
+        resume_run_dir=run_dir if job.resume else None,
+        run_dir=run_dir,
+        on_progress=on_progress,
+        cancel_event=cancel_event,
+        **job.options,
+    )
+
+
+# Module jobs run in the background, a bounded number at a time
+module_jobs = ModuleJobQueue(
+    _run_module_job,
+    jobs_dir=PROJECT_ROOT / "output" / "jobs",
+    runs_dir=PROJECT_ROOT / "output" / "runs",
+    max_workers=settings.MODULE_JOB_WORKERS,
+)
+
+
 @router.post("/process")
 async def process_module(
     file: UploadFile = File(...),
@@ -412,12 +545,14 @@ async def process_module(
     extract_actors: bool = Form(True),
     extract_battle_maps: bool = Form(True),
     generate_scene_artwork: bool = Form(True),
+    wait: bool = Form(True),
 ):
     """
     Process a D&D module PDF and create FoundryVTT content.
 
-    Accepts a PDF file and extraction options, runs the processing pipeline
-    in a background thread, and returns the created resources.
+    Accepts a PDF file and extraction options and queues a processing job.
+    Jobs run in the background a few at a time, oldest first; see the
+    /jobs endpoints to follow, cancel or resume them.
 
     Args:
         file: PDF file to process
@@ -426,10 +561,14 @@ async def process_module(
         extract_actors: Extract actors/NPCs (default: True)
         extract_battle_maps: Extract battle maps (default: True)
         generate_scene_artwork: Generate scene artwork (default: True)
+        wait: Wait for the job and return its result (default: True); if False,
+            return the queued job right away
 
     Returns:
+        With wait (the job's result plus its ID):
         {
             "success": True,
+            "job_id": "...",
             "folders": {"journal": "uuid", "actors": "uuid", ...},
             "created": {
                 "journal": "JournalEntry.uuid" or None,
@@ -438,6 +577,7 @@ async def process_module(
                 "artwork_journal": "JournalEntry.uuid" or None
             }
         }
+        Without wait: the job (see GET /jobs/{job_id})
 
     Raises:
         HTTPException 500: If processing fails
@@ -446,35 +586,34 @@ async def process_module(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
 
-    # Save uploaded file to temp location
-    temp_dir = Path(tempfile.mkdtemp())
-    temp_file = temp_dir / file.filename
-
     try:
         content = await file.read()
-        with open(temp_file, "wb") as f:
-            f.write(content)
-
-        logger.info(f"Saved uploaded PDF to {temp_file}")
 
-        # Create folder structure first (async, before entering thread pool)
+        # Create folder structure first (async, on the request's event loop)
         folder_ids = await create_folders_for_module(module_name)
         logger.info(f"Created folders: {folder_ids}")
 
-        # Run pipeline in thread pool (blocking operations)
-        result = await asyncio.to_thread(
-            process_module_sync,
-            pdf_path=temp_file,
-            module_name=module_name,
-            extract_journal=extract_journal,
-            extract_actors=extract_actors,
-            extract_battle_maps=extract_battle_maps,
-            generate_scene_artwork=generate_scene_artwork,
+        job = module_jobs.submit(
+            module_name,
+            file.filename,
+            content,
+            options={
+                "extract_journal": extract_journal,
+                "extract_actors": extract_actors,
+                "extract_battle_maps": extract_battle_maps,
+                "generate_scene_artwork": generate_scene_artwork,
+            },
             folder_ids=folder_ids,
         )
+        if not wait:
+            return module_jobs.describe(job)
+
+        job = await asyncio.wrap_future(module_jobs.wait(job.id))
+        result = dict(job.result or {"success": False, "error": job.error})
 
         # Include folder IDs in result
         result["folders"] = folder_ids
+        result["job_id"] = job.id
 
         return result
 
@@ -482,6 +621,61 @@ async def process_module(
         logger.exception(f"Failed to process module: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # Cleanup temp file
-        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def _get_job(job_id: str) -> ModuleJob:
+    job = module_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.get("/jobs")
+async def list_module_jobs(limit: int = 50):
+    """List module jobs, most recent first."""
+    return {"jobs": [module_jobs.describe(job) for job in module_jobs.store.list(limit)]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_module_job(job_id: str):
+    """Return a job's status, latest progress, stage history and (once finished) result."""
+    return module_jobs.describe(_get_job(job_id))
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_module_job(job_id: str):
+    """
+    Cancel a job.
+
+    A queued job is cancelled at once; a running job stops starting new steps
+    and is marked cancelled when its running steps finish.
+
+    Raises:
+        HTTPException 404: Unknown job
+        HTTPException 409: Job already finished
+    """
+    _get_job(job_id)
+    try:
+        job = module_jobs.cancel(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return module_jobs.describe(job)
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_module_job(job_id: str):
+    """
+    Queue a failed, cancelled or interrupted job again.
+
+    The job reuses its run directory, so XML conversion only redoes pages that
+    did not convert.
+
+    Raises:
+        HTTPException 404: Unknown job
+        HTTPException 409: Job cannot be resumed
+    """
+    _get_job(job_id)
+    try:
+        job = module_jobs.resume(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return module_jobs.describe(job)
@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional, List
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
-from util.gemini import GeminiAPI  # noqa: E402
+from util.gemini import GeminiAPI, generate_content_async, run_blocking  # noqa: E402
 
 
 class GeminiService:
@@ -66,16 +66,18 @@ class GeminiService:
 
         # Generate with function calling
         if gemini_functions:
-            response = self.api.client.models.generate_content(
-                model=self.api.model_name,
-                contents=prompt,
+            response = await generate_content_async(
+                self.api.client,
+                self.api.model_name,
+                prompt,
                 config={
                     "tools": [{"function_declarations": gemini_functions}]
-                }
+                },
+                use_cache=False
             )
         else:
-            # No tools available, regular generation
-            response = self.api.generate_content(prompt)
+            # No tools available, regular generation (off the event loop)
+            response = await run_blocking(lambda: self.api.generate_content(prompt, use_cache=False))
 
         # Check if response contains function call
         if hasattr(response, 'candidates') and response.candidates:
@@ -120,10 +122,10 @@ class GeminiService:
         prompt = self._build_chat_prompt(message, context, conversation_history)
 
         # Generate response
-        response = self.api.generate_content(prompt)
+        response = self.api.generate_content(prompt, use_cache=False)
         return response.text
 
-    def is_rules_question(self, message: str) -> bool:
+    async def is_rules_question(self, message: str) -> bool:
         """
         Detect if message is asking about D&D rules.
 
@@ -157,14 +159,14 @@ Message: "{message}"
 Answer (YES or NO):"""
 
         try:
-            response = self.api.generate_content(prompt)
+            response = await run_blocking(lambda: self.api.generate_content(prompt, use_cache=False))
             answer = response.text.strip().upper()
             return answer.startswith("YES")
         except Exception as e:
             print(f"[WARN] Rules detection failed: {e}, falling back to normal mode")
             return False
 
-    def generate_with_thinking(
+    async def generate_with_thinking(
         self,
         message: str,
         conversation_history: Optional[list] = None,
@@ -224,18 +226,22 @@ Do NOT include lengthy explanations, multiple examples, or edge cases unless spe
 
         try:
             # Use thinking model configuration (gemini-2.5-flash supports thinking)
-            response = self.api.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
+            response = await generate_content_async(
+                self.api.client,
+                "gemini-2.5-flash",
+                prompt,
+                use_cache=False
             )
 
             return response.text
         except Exception as e:
             print(f"[WARN] Thinking mode failed: {e}, falling back to regular generation")
             # Fallback to regular chat response
-            return self.generate_chat_response(message, {}, conversation_history)
+            return await run_blocking(
+                lambda: self.generate_chat_response(message, {}, conversation_history)
+            )
 
-    def generate_scene_description(self, scene_request: str) -> str:
+    async def generate_scene_description(self, scene_request: str) -> str:
         """
         Generate a detailed scene description.
 
@@ -257,7 +263,7 @@ Generate a vivid, atmospheric description of this scene/location. Include:
 
 Keep it concise (2-3 sentences) and evocative."""
 
-        response = self.api.generate_content(prompt)
+        response = await run_blocking(lambda: self.api.generate_content(prompt, use_cache=False))
         return response.text.strip()
 
     def _build_chat_prompt(
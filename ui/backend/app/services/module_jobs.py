@@ -0,0 +1,435 @@
+"""Background job queue for module processing.
+
+Module uploads become jobs that a bounded pool of worker threads runs in
+submission order, so several uploads queue up instead of running full
+pipelines side by side against the same Gemini quota. Jobs and the stages
+they reached are stored in SQLite: after a backend restart, queued jobs are
+picked up again and jobs that were running are marked interrupted, ready to
+be resumed from their run directory.
+"""
+
+import json
+import logging
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.websocket.push import broadcast_progress_sync
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"  # was running when the backend stopped
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED, INTERRUPTED)
+RESUMABLE_STATUSES = (FAILED, CANCELLED, INTERRUPTED)
+
+# (stage, message, progress) callback handed to the job runner
+ProgressCallback = Callable[[str, str, int], None]
+
+
+@dataclass
+class ModuleJob:
+    """One module processing job."""
+    id: str
+    module_name: str
+    pdf_path: str
+    # extract_journal / extract_actors / extract_battle_maps / generate_scene_artwork
+    options: Dict[str, bool] = field(default_factory=dict)
+    folder_ids: Dict[str, str] = field(default_factory=dict)
+    status: str = QUEUED
+    run_dir: Optional[str] = None
+    # Resume run_dir instead of starting fresh on the next run
+    resume: bool = False
+    # Latest progress report
+    stage: Optional[str] = None
+    message: Optional[str] = None
+    progress: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    created_at: float = 0.0
+    queued_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("pdf_path")
+        return data
+
+
+_JSON_FIELDS = ("options", "folder_ids", "result", "error")
+_COLUMNS = (
+    "id", "module_name", "pdf_path", "options", "folder_ids", "status", "run_dir", "resume",
+    "stage", "message", "progress", "result", "error", "created_at", "queued_at", "updated_at"
+)
+
+
+class JobStore:
+    """SQLite persistence for module jobs and the progress stages they reported."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection, creating the database on first use. Caller holds _lock."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, module_name TEXT, pdf_path TEXT, options TEXT, "
+                "folder_ids TEXT, status TEXT, run_dir TEXT, resume INTEGER, stage TEXT, "
+                "message TEXT, progress INTEGER, result TEXT, error TEXT, "
+                "created_at REAL, queued_at REAL, updated_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, queued_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_stages ("
+                "job_id TEXT, stage TEXT, message TEXT, progress INTEGER, "
+                "started_at REAL, updated_at REAL, PRIMARY KEY (job_id, stage))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _from_row(row) -> ModuleJob:
+        values = dict(zip(_COLUMNS, row))
+        for name in _JSON_FIELDS:
+            values[name] = json.loads(values[name]) if values[name] else None
+        values["options"] = values["options"] or {}
+        values["folder_ids"] = values["folder_ids"] or {}
+        values["resume"] = bool(values["resume"])
+        return ModuleJob(**values)
+
+    def add(self, job: ModuleJob) -> None:
+        values = asdict(job)
+        for name in _JSON_FIELDS:
+            values[name] = json.dumps(values[name]) if values[name] is not None else None
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [values[c] for c in _COLUMNS]
+            )
+
+    def get(self, job_id: str) -> Optional[ModuleJob]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        """Set job fields (JSON fields are serialized) and bump updated_at."""
+        fields["updated_at"] = time.time()
+        for name in _JSON_FIELDS:
+            if name in fields and fields[name] is not None:
+                fields[name] = json.dumps(fields[name])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def list(self, limit: int = 50) -> List[ModuleJob]:
+        """Most recently created jobs first."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def queued_ids(self) -> List[str]:
+        """IDs of queued jobs in the order they were queued."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY queued_at", (QUEUED,)).fetchall()
+        return [row[0] for row in rows]
+
+    def queue_position(self, job: ModuleJob) -> Optional[int]:
+        """1-based position among queued jobs, or None if the job is not queued."""
+        if job.status != QUEUED:
+            return None
+        with self._lock, self._connect() as conn:
+            ahead = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND queued_at < ?", (QUEUED, job.queued_at)
+            ).fetchone()[0]
+        return ahead + 1
+
+    def mark_interrupted(self) -> int:
+        """Mark jobs left running by a previous backend process as interrupted."""
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (INTERRUPTED, time.time(), RUNNING)
+            )
+        return cursor.rowcount
+
+    def record_stage(self, job_id: str, stage: str, message: str, progress: int) -> None:
+        """Store a progress report as the job's current stage and in its stage history."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, message = ?, progress = ?, updated_at = ? WHERE id = ?",
+                (stage, message, progress, now, job_id)
+            )
+            conn.execute(
+                "INSERT INTO job_stages (job_id, stage, message, progress, started_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (job_id, stage) DO UPDATE SET "
+                "message = excluded.message, progress = excluded.progress, updated_at = excluded.updated_at",
+                (job_id, stage, message, progress, now, now)
+            )
+
+    def stages(self, job_id: str) -> List[Dict[str, Any]]:
+        """Stage history of a job in the order stages started."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT stage, message, progress, started_at, updated_at FROM job_stages "
+                "WHERE job_id = ? ORDER BY started_at", (job_id,)
+            ).fetchall()
+        return [
+            {"stage": r[0], "message": r[1], "progress": r[2], "started_at": r[3], "updated_at": r[4]}
+            for r in rows
+        ]
+
+
+class ModuleJobQueue:
+    """
+    Run module jobs on a bounded pool of worker threads, oldest first.
+
+    The runner is called on a worker thread as runner(job, on_progress, cancel)
+    and returns the pipeline's result dict. It should report progress through
+    on_progress (which records the stage and broadcasts module_progress with
+    the job ID) and stop early once the cancel event is set, returning a
+    result with "cancelled": True.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[ModuleJob, ProgressCallback, threading.Event], Dict[str, Any]],
+        jobs_dir: Path,
+        runs_dir: Path,
+        max_workers: int = 1
+    ):
+        """
+        Args:
+            runner: Processes one job (see class docstring)
+            jobs_dir: Directory for the job database and uploaded PDFs
+            runs_dir: Directory new jobs create their run directories in
+            max_workers: Jobs processed at the same time
+        """
+        self.runner = runner
+        self.jobs_dir = Path(jobs_dir)
+        self.runs_dir = Path(runs_dir)
+        self.max_workers = max_workers
+        self.store = JobStore(self.jobs_dir / "jobs.sqlite3")
+        self._pending: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._waiters: Dict[str, List[Future]] = {}
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._work, name=f"module-job-{len(self._workers) + 1}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _enqueue(self, job_id: str) -> None:
+        self._ensure_workers()
+        self._pending.put(job_id)
+
+    def submit(
+        self,
+        module_name: str,
+        filename: str,
+        content: bytes,
+        options: Dict[str, bool],
+        folder_ids: Dict[str, str]
+    ) -> ModuleJob:
+        """
+        Store an uploaded PDF and queue a job for it.
+
+        Returns:
+            The queued job
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self.jobs_dir / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        pdf_path = job_dir / Path(filename).name
+        pdf_path.write_bytes(content)
+
+        now = time.time()
+        job = ModuleJob(
+            id=job_id,
+            module_name=module_name,
+            pdf_path=str(pdf_path),
+            options=dict(options),
+            folder_ids=dict(folder_ids),
+            created_at=now,
+            queued_at=now,
+            updated_at=now
+        )
+        self.store.add(job)
+        logger.info(f"Queued module job {job_id} for '{module_name}'")
+        self._enqueue(job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[ModuleJob]:
+        return self.store.get(job_id)
+
+    def describe(self, job: ModuleJob) -> Dict[str, Any]:
+        """Job fields plus queue position and stage history, for API responses."""
+        data = job.to_dict()
+        data["queue_position"] = self.store.queue_position(job)
+        data["stages"] = self.store.stages(job.id)
+        return data
+
+    def wait(self, job_id: str) -> Future:
+        """
+        Return a future resolved with the job once it finishes.
+
+        Raises:
+            KeyError: If the job does not exist
+        """
+        future: Future = Future()
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.finished:
+                future.set_result(job)
+            else:
+                self._waiters.setdefault(job_id, []).append(future)
+        return future
+
+    def cancel(self, job_id: str) -> ModuleJob:
+        """
+        Cancel a queued job, or ask a running job to stop after its current work.
+
+        Raises:
+            KeyError: If the job does not exist
+            ValueError: If the job already finished
+        """
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.finished:
+                raise ValueError(f"Job {job_id} already {job.status}")
+            if job.status == QUEUED:
+                self.store.update(job_id, status=CANCELLED)
+                self._resolve(job_id)
+            else:
+                event = self._cancel_events.get(job_id)
+                if event is not None:
+                    event.set()
+        logger.info(f"Cancel requested for module job {job_id}")
+        return self.store.get(job_id)
+
+    def resume(self, job_id: str) -> ModuleJob:
+        """
+        Queue a failed, cancelled or interrupted job again, reusing its run directory.
+
+        Raises:
+            KeyError: If the job does not exist
+            ValueError: If the job cannot be resumed
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if job.status not in RESUMABLE_STATUSES:
+            raise ValueError(f"Job {job_id} is {job.status}; only {', '.join(RESUMABLE_STATUSES)} jobs can be resumed")
+        if not Path(job.pdf_path).exists():
+            raise ValueError(f"Uploaded PDF for job {job_id} is no longer available")
+        self.store.update(
+            job_id, status=QUEUED, queued_at=time.time(), resume=job.run_dir is not None, error=None, result=None
+        )
+        logger.info(f"Resuming module job {job_id}")
+        self._enqueue(job_id)
+        return self.store.get(job_id)
+
+    def recover(self) -> None:
+        """Pick up jobs a previous backend process left behind (call once at startup)."""
+        interrupted = self.store.mark_interrupted()
+        if interrupted:
+            logger.warning(f"{interrupted} module job(s) were interrupted by a restart; resume them to continue")
+        for job_id in self.store.queued_ids():
+            self._enqueue(job_id)
+
+    def _resolve(self, job_id: str) -> None:
+        """Resolve wait() futures for a finished job. Caller holds _lock."""
+        job = self.store.get(job_id)
+        for future in self._waiters.pop(job_id, []):
+            future.set_result(job)
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._pending.get()
+            try:
+                with self._lock:
+                    job = self.store.get(job_id)
+                    if job is None or job.status != QUEUED:
+                        continue
+                    cancel = threading.Event()
+                    self._cancel_events[job_id] = cancel
+                    if not job.run_dir:
+                        run_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{job_id[:8]}"
+                        job.run_dir = str(self.runs_dir / run_name)
+                    self.store.update(job_id, status=RUNNING, run_dir=job.run_dir)
+                self._run(job, cancel)
+            except Exception as e:
+                logger.exception(f"Module job worker failed on {job_id}: {e}")
+
+    def _run(self, job: ModuleJob, cancel: threading.Event) -> None:
+        def on_progress(stage: str, message: str, progress: int) -> None:
+            self.store.record_stage(job.id, stage, message, progress)
+            broadcast_progress_sync(stage, message, progress, job.module_name, job_id=job.id)
+
+        logger.info(f"Running module job {job.id} ('{job.module_name}')")
+        try:
+            result = self.runner(job, on_progress, cancel)
+        except Exception as e:
+            logger.exception(f"Module job {job.id} failed: {e}")
+            result = {"success": False, "error": {"stage": "job", "message": str(e)}}
+
+        if result.get("success"):
+            status = SUCCEEDED
+        elif result.get("cancelled") or cancel.is_set():
+            status = CANCELLED
+        else:
+            status = FAILED
+
+        with self._lock:
+            self._cancel_events.pop(job.id, None)
+            self.store.update(job.id, status=status, result=result, error=result.get("error"), resume=False)
+            self._resolve(job.id)
+        if status == SUCCEEDED:
+            # The upload is only kept for resuming
+            shutil.rmtree(Path(job.pdf_path).parent, ignore_errors=True)
+        logger.info(f"Module job {job.id} {status}")
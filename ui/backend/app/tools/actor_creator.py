@@ -18,9 +18,9 @@ if str(_src_dir) not in sys.path:
 import config  # noqa: E402, F401
 
 from actor_pipeline.orchestrate import create_actor_from_description  # noqa: E402
-from caches import SpellCache, IconCache  # noqa: E402
-from app.websocket import push_actor, list_files, list_compendium_items, upload_file, get_or_create_folder  # noqa: E402
-from util.gemini import GeminiAPI  # noqa: E402
+from caches import SpellCache, IconCache, SharedCaches, set_shared_caches  # noqa: E402
+from app.websocket import push_actor, list_files, list_compendium_items, upload_file_stream, get_or_create_folder, foundry_manager  # noqa: E402
+from util.gemini import GeminiAPI, get_scheduler  # noqa: E402
 from app.config import settings  # noqa: E402
 
 logger = logging.getLogger(__name__)
@@ -68,7 +68,7 @@ and distinctive visual features. Keep it to 2-3 sentences.
 Description: {description}
 
 Visual description for image generation:"""
-        response = api.generate_content(prompt)
+        response = api.generate_content(prompt, use_cache=False)
         return response.text.strip()
 
     return await asyncio.to_thread(_generate)
@@ -92,7 +92,7 @@ async def generate_actor_image(
         - local_url: URL path for serving via backend (e.g., "/api/images/actor_xxx.png")
         - foundry_path: Foundry-relative path for actor profile (e.g., "worlds/test/actor-portraits/actor_xxx.png")
     """
-    import base64
+    import io
 
     try:
         # Get style prompt based on setting
@@ -109,7 +109,9 @@ async def generate_actor_image(
                 contents=styled_prompt
             )
 
-        response = await asyncio.to_thread(_generate_image)
+        response = await get_scheduler().call_async(
+            _generate_image, "gemini-2.5-flash-image", contents=styled_prompt
+        )
 
         # Extract image from Gemini response
         image_data = None
@@ -139,13 +141,11 @@ async def generate_actor_image(
             foundry_path = None
             if upload_to_foundry:
                 try:
-                    # Base64 encode the image data
-                    b64_content = base64.b64encode(image_data).decode('utf-8')
-
                     # Upload to Foundry's actor-portraits folder
-                    upload_result = await upload_file(
+                    upload_result = await upload_file_stream(
+                        io.BytesIO(image_data),
                         filename=filename,
-                        content=b64_content,
+                        size=len(image_data),
                         destination="actor-portraits"
                     )
 
@@ -249,18 +249,13 @@ async def list_files_with_retry(
     return last_result
 
 
-async def load_caches() -> tuple[SpellCache, IconCache]:
+async def _fetch_spell_dicts() -> list[dict]:
     """
-    Load SpellCache and IconCache via WebSocket.
-
-    Returns:
-        Tuple of (SpellCache, IconCache)
+    Fetch all compendium spells via WebSocket.
 
     Raises:
-        RuntimeError: If cache loading fails
+        RuntimeError: If the fetch fails, returns nothing, or lacks 'Fire Bolt'
     """
-    # HARD FAIL: SpellCache MUST load successfully
-    spell_cache = SpellCache()
     logger.info("Fetching spells from compendium via WebSocket (with retry)...")
     spells_result = await list_compendium_items_with_retry(
         document_type="Item",
@@ -290,19 +285,23 @@ async def load_caches() -> tuple[SpellCache, IconCache]:
         }
         for r in spells_result.results
     ]
-    spell_cache.load_from_data(spell_dicts)
-    logger.info(f"✓ SpellCache loaded with {spell_cache.spell_count} spells")
 
     # Verify critical spells exist
-    test_uuid = spell_cache.get_spell_uuid("Fire Bolt")
-    if not test_uuid:
+    if not any((s["name"] or "").lower() == "fire bolt" for s in spell_dicts):
         error_msg = "❌ SpellCache FAILED: 'Fire Bolt' not found - cache may be incomplete"
         logger.error(error_msg)
         raise RuntimeError(error_msg)
-    logger.info(f"✓ Test lookup 'Fire Bolt' -> {test_uuid}")
 
-    # HARD FAIL: IconCache MUST load successfully
-    icon_cache = IconCache()
+    return spell_dicts
+
+
+async def _fetch_icon_files() -> list[str]:
+    """
+    Fetch all icon file paths via WebSocket.
+
+    Raises:
+        RuntimeError: If the file listing fails
+    """
     logger.info("Fetching icons via WebSocket (with retry)...")
     files_result = await list_files_with_retry(
         path="icons",
@@ -318,9 +317,55 @@ async def load_caches() -> tuple[SpellCache, IconCache]:
         logger.error(error_msg)
         raise RuntimeError(error_msg)
 
-    icon_cache.load_from_data(files_result.files or [])
-    logger.info(f"✓ IconCache loaded with {icon_cache.icon_count} icons")
+    return files_result.files or []
+
+
+_foundry_caches: Optional[SharedCaches] = None
+
+
+def get_foundry_caches() -> SharedCaches:
+    """
+    Return the backend-lifetime spell/icon caches.
+
+    Fetches go over this process's own WebSocket connection (avoiding HTTP
+    self-deadlock) and the snapshot is keyed on the connected world. The same
+    instance is registered as the process-wide shared caches, so in-process
+    actor_pipeline calls reuse it.
+    """
+    global _foundry_caches
+    if _foundry_caches is None:
+        _foundry_caches = SharedCaches.from_env(
+            _fetch_spell_dicts,
+            _fetch_icon_files,
+            fingerprint=foundry_manager.world_fingerprint
+        )
+        set_shared_caches(_foundry_caches)
+    return _foundry_caches
+
 
+def reset_foundry_caches():
+    """Drop the backend caches (the next load_caches() starts from the disk snapshot)."""
+    global _foundry_caches
+    _foundry_caches = None
+    set_shared_caches(None)
+
+
+async def load_caches() -> tuple[SpellCache, IconCache]:
+    """
+    Return the shared SpellCache and IconCache.
+
+    Served from memory (or the disk snapshot after a restart) when available;
+    stale caches are refreshed in the background. Only a missing cache, or one
+    from a different world/system version, is fetched before returning.
+
+    Returns:
+        Tuple of (SpellCache, IconCache)
+
+    Raises:
+        RuntimeError: If cache loading fails
+    """
+    spell_cache, icon_cache = await get_foundry_caches().get()
+    logger.info(f"✓ Caches ready: {spell_cache.spell_count} spells, {icon_cache.icon_count} icons")
     return spell_cache, icon_cache
 
 
@@ -2,7 +2,7 @@
 import logging
 from typing import Optional, Dict, Any, List
 from .base import BaseTool, ToolSchema, ToolResponse
-from app.websocket import update_actor, fetch_actor, list_actors, add_custom_items, update_actor_item
+from app.websocket import update_actor, fetch_actor, list_actors, add_custom_items, update_actor_item, world_index
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,10 @@ async def find_actor_by_name(actor_name: str) -> Optional[str]:
     Returns:
         Actor UUID if found, None otherwise
     """
+    if world_index.is_loaded("Actor"):
+        doc = world_index.find_by_name("Actor", actor_name)
+        return doc.uuid if doc else None
+
     result = await list_actors()
     if not result.success or not result.actors:
         return None
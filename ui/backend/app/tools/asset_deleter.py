@@ -1,46 +1,59 @@
 """Asset deletion tool - delete Tablewrite assets via natural language."""
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from .base import BaseTool, ToolSchema, ToolResponse
 from app.websocket.push import (
     fetch_actor, fetch_scene, fetch_journal, list_folders,
     delete_actor, delete_scene, delete_journal, delete_folder,
-    list_actors, list_scenes, list_journals, remove_actor_items
+    list_actors, list_scenes, list_journals, remove_actor_items,
+    delete_documents_batch
 )
+from app.websocket.world_index import world_index
 
 logger = logging.getLogger(__name__)
 
 
-async def is_in_tablewrite_folder(entity_uuid: str, entity_type: str) -> bool:
-    """
-    Check if an entity is within a Tablewrite folder hierarchy.
+# Tool entity types -> Foundry document types
+_DOCUMENT_TYPES = {"actor": "Actor", "scene": "Scene", "journal": "JournalEntry"}
 
-    Args:
-        entity_uuid: UUID of the entity (e.g., "Actor.abc123")
-        entity_type: Type of entity ("actor", "journal", "scene")
 
-    Returns:
-        True if entity is in Tablewrite folder hierarchy, False otherwise
+async def _lookup_entity(entity_uuid: str, entity_type: str) -> Optional[Tuple[str, Optional[str]]]:
     """
-    # Fetch the entity to get its folder
+    Return (name, folder ID) of an entity, or None if it does not exist.
+
+    Answered from the world index when it holds the entity's type, otherwise
+    fetched from Foundry.
+    """
+    document_type = _DOCUMENT_TYPES.get(entity_type)
+    if document_type is None:
+        return None
+
+    if world_index.is_loaded(document_type):
+        doc = world_index.get(entity_uuid)
+        return (doc.name, doc.folder) if doc else None
+
     if entity_type == "actor":
         result = await fetch_actor(entity_uuid)
     elif entity_type == "scene":
         result = await fetch_scene(entity_uuid)
-    elif entity_type == "journal":
-        result = await fetch_journal(entity_uuid)
     else:
-        return False
+        result = await fetch_journal(entity_uuid)
 
     if not result.success or not result.entity:
-        return False
+        return None
+    return result.entity.get("name", "Unknown"), result.entity.get("folder")
 
-    # Get folder ID from entity
-    folder_id = result.entity.get("folder")
+
+async def _folder_in_tablewrite(folder_id: Optional[str]) -> bool:
+    """Check whether a folder is, or is nested inside, the Tablewrite folder."""
     if not folder_id:
         return False
 
+    path = world_index.folder_path(folder_id)
+    if path is not None:
+        return any(folder.name == "Tablewrite" for folder in path)
+
     # Get all folders and build hierarchy
     folders_result = await list_folders()
     if not folders_result.success or not folders_result.folders:
@@ -62,6 +75,23 @@ async def is_in_tablewrite_folder(entity_uuid: str, entity_type: str) -> bool:
     return False
 
 
+async def is_in_tablewrite_folder(entity_uuid: str, entity_type: str) -> bool:
+    """
+    Check if an entity is within a Tablewrite folder hierarchy.
+
+    Args:
+        entity_uuid: UUID of the entity (e.g., "Actor.abc123")
+        entity_type: Type of entity ("actor", "journal", "scene")
+
+    Returns:
+        True if entity is in Tablewrite folder hierarchy, False otherwise
+    """
+    entity = await _lookup_entity(entity_uuid, entity_type)
+    if entity is None:
+        return False
+    return await _folder_in_tablewrite(entity[1])
+
+
 @dataclass
 class EntityMatch:
     """A matched entity from search."""
@@ -151,47 +181,17 @@ async def find_entities(
     Returns:
         List of matching entities that are in Tablewrite hierarchy
     """
-    # If UUID provided, fetch entity once and validate Tablewrite membership
+    # If UUID provided, look the entity up once and validate Tablewrite membership
     if uuid:
-        # Fetch entity first (avoid duplicate fetch in is_in_tablewrite_folder)
-        if entity_type == "actor":
-            result = await fetch_actor(uuid)
-        elif entity_type == "scene":
-            result = await fetch_scene(uuid)
-        elif entity_type == "journal":
-            result = await fetch_journal(uuid)
-        else:
+        entity = await _lookup_entity(uuid, entity_type)
+        if entity is None:
             return []
 
-        if not result.success or not result.entity:
-            return []
-
-        # Validate Tablewrite membership using fetched data
-        folder_id = result.entity.get("folder")
-        if not folder_id:
-            return []
-
-        # Get folders and check hierarchy
-        folders_result = await list_folders()
-        if not folders_result.success or not folders_result.folders:
-            return []
-
-        folder_map = {f.id: f for f in folders_result.folders}
-        current = folder_id
-        in_tablewrite = False
-        while current:
-            folder = folder_map.get(current)
-            if not folder:
-                break
-            if folder.name == "Tablewrite":
-                in_tablewrite = True
-                break
-            current = folder.parent
-
-        if in_tablewrite:
+        name, folder_id = entity
+        if await _folder_in_tablewrite(folder_id):
             return [EntityMatch(
                 uuid=uuid,
-                name=result.entity.get("name", "Unknown"),
+                name=name,
                 entity_type=entity_type,
                 folder_id=folder_id
             )]
@@ -399,13 +399,7 @@ class AssetDeleterTool(BaseTool):
             )
 
         # Confirmed bulk delete
-        deleted = []
-        failed = []
-        for entity in entities:
-            if await self._delete_entity(entity):
-                deleted.append(entity)
-            else:
-                failed.append(entity)
+        deleted, failed = await self._delete_entities(entities)
 
         message = f"Deleted {len(deleted)} {entity_type}(s)"
         if failed:
@@ -441,6 +435,35 @@ class AssetDeleterTool(BaseTool):
             logger.error(f"Failed to delete {entity.entity_type} {entity.uuid}: {e}")
             return False
 
+    async def _delete_entities(self, entities: List[EntityMatch]) -> tuple[List[EntityMatch], List[EntityMatch]]:
+        """Delete many entities, returning (deleted, failed).
+
+        Actors, scenes and journals go to Foundry as one batch delete; folders
+        are deleted one at a time since each also removes its contents.
+        """
+        deleted: List[EntityMatch] = []
+        failed: List[EntityMatch] = []
+
+        documents = [e for e in entities if e.entity_type in ("actor", "scene", "journal")]
+        if documents:
+            try:
+                batch = await delete_documents_batch([e.uuid for e in documents])
+                for entity, item in zip(documents, batch.results):
+                    (deleted if item.success else failed).append(entity)
+                failed.extend(documents[len(batch.results):])
+            except Exception as e:
+                logger.error(f"Batch delete of {len(documents)} documents failed: {e}")
+                failed.extend(documents)
+
+        for entity in entities:
+            if entity.entity_type not in ("actor", "scene", "journal"):
+                if await self._delete_entity(entity):
+                    deleted.append(entity)
+                else:
+                    failed.append(entity)
+
+        return deleted, failed
+
     async def _delete_actor_items(
         self,
         actor_uuid: Optional[str],
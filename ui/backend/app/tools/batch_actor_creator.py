@@ -55,7 +55,7 @@ Examples:
 If no creatures are mentioned, return [].
 Return ONLY the JSON array, no other text."""
 
-        response = api.generate_content(f"{system_prompt}\n\nUser request: {prompt}")
+        response = api.generate_content(f"{system_prompt}\n\nUser request: {prompt}", use_cache=False)
         return response.text.strip()
 
     result_text = await asyncio.to_thread(_parse)
@@ -113,7 +113,7 @@ Return ONLY a JSON array of strings, no other text.
 
 Example: ["Bugbear Brute", "Bugbear Tracker"]"""
 
-        response = api.generate_content(prompt)
+        response = api.generate_content(prompt, use_cache=False)
         return response.text.strip()
 
     result_text = await asyncio.to_thread(_generate)
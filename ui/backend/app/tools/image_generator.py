@@ -16,7 +16,7 @@ if str(_src_dir) not in sys.path:
 
 # Import config module for automatic .env loading
 from config import PROJECT_ROOT  # noqa: E402
-from util.gemini import GeminiAPI  # noqa: E402
+from util.gemini import GeminiAPI, get_scheduler, run_blocking  # noqa: E402
 
 
 class ImageGeneratorTool(BaseTool):
@@ -122,14 +122,9 @@ class ImageGeneratorTool(BaseTool):
             filepath = self.output_dir / filename
 
             # Generate image using Gemini Imagen
-            # Run blocking API call in thread pool
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._generate_and_save_image,
-                prompt,
-                filepath
-            )
+            # Run blocking API call on the shared Gemini executor, keeping the
+            # caller's request priority
+            await run_blocking(lambda: self._generate_and_save_image(prompt, filepath))
 
             return filename
 
@@ -145,8 +140,12 @@ class ImageGeneratorTool(BaseTool):
         styled_prompt = f"{prompt}, {self.DEFAULT_STYLE}"
 
         # Generate image using Gemini API
-        response = self.api.client.models.generate_content(
-            model=self.MODEL_NAME,
+        response = get_scheduler().call(
+            lambda: self.api.client.models.generate_content(
+                model=self.MODEL_NAME,
+                contents=styled_prompt
+            ),
+            self.MODEL_NAME,
             contents=styled_prompt
         )
 
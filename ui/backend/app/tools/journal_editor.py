@@ -2,7 +2,7 @@
 import logging
 from typing import Optional, List, Dict, Any
 from .base import BaseTool, ToolSchema, ToolResponse
-from app.websocket import update_journal, fetch_journal, list_journals
+from app.websocket import update_journal, fetch_journal, list_journals, world_index
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,10 @@ async def find_journal_by_name(journal_name: str) -> Optional[str]:
     Returns:
         Journal UUID if found, None otherwise
     """
+    if world_index.is_loaded("JournalEntry"):
+        doc = world_index.find_by_name("JournalEntry", journal_name)
+        return doc.uuid if doc else None
+
     result = await list_journals()
     if not result.success or not result.journals:
         return None
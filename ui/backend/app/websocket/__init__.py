@@ -1,6 +1,7 @@
 """WebSocket connection management for Foundry module."""
 from .connection_manager import ConnectionManager
 from .foundry_endpoint import foundry_websocket_endpoint, foundry_manager
+from .world_index import WorldIndex, IndexedDocument, world_index
 from .push import (
     push_actor, push_journal, push_scene, PushResult,
     fetch_actor, fetch_journal, FetchResult,
@@ -15,17 +16,22 @@ from .push import (
     list_files, FileListResult,
     give_items, GiveItemsResult,
     remove_actor_items, RemoveItemsResult,
-    upload_file, FileUploadResult,
+    upload_file, upload_file_stream, FileUploadResult,
     add_custom_items, AddCustomItemsResult,
     get_or_create_folder, FolderResult,
     list_folders, ListFoldersResult, FolderInfo,
-    delete_folder, DeleteFolderResult
+    delete_folder, DeleteFolderResult,
+    push_actors_batch, delete_documents_batch, fetch_documents_batch,
+    BatchResult, BatchItemResult
 )
 
 __all__ = [
     'ConnectionManager',
     'foundry_websocket_endpoint',
     'foundry_manager',
+    'WorldIndex',
+    'IndexedDocument',
+    'world_index',
     'push_actor',
     'push_journal',
     'push_scene',
@@ -61,6 +67,7 @@ __all__ = [
     'remove_actor_items',
     'RemoveItemsResult',
     'upload_file',
+    'upload_file_stream',
     'FileUploadResult',
     'add_custom_items',
     'AddCustomItemsResult',
@@ -70,5 +77,10 @@ __all__ = [
     'ListFoldersResult',
     'FolderInfo',
     'delete_folder',
-    'DeleteFolderResult'
+    'DeleteFolderResult',
+    'push_actors_batch',
+    'delete_documents_batch',
+    'fetch_documents_batch',
+    'BatchResult',
+    'BatchItemResult'
 ]
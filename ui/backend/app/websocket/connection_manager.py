@@ -1,17 +1,199 @@
 """Manage WebSocket connections from Foundry modules."""
 import asyncio
+import gzip
+import json
+import logging
+import struct
+import time
 import uuid
-from typing import Dict, Any, Optional
-from fastapi import WebSocket
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+# Re-dispatches allowed when the client handling a request disconnects
+MAX_FAILOVERS = 2
+# Read-only request types that may be re-sent after a client dropped them mid-request.
+# Anything else (creates, updates, deletes, give_items, ...) may already have been
+# applied by the dropped client, so it is only re-sent if the send itself failed.
+FAILOVER_MESSAGE_TYPES = frozenset({
+    "get_actor",
+    "get_journal",
+    "get_scene",
+    "list_actors",
+    "list_journals",
+    "list_scenes",
+    "list_folders",
+    "list_files",
+    "list_compendium_items",
+    "search_items",
+    "documents_batch_fetch",
+})
+# Weight of the newest sample in the RTT and error-rate moving averages
+EWMA_ALPHA = 0.2
+# Clients above this error rate are only used when no healthy client is left
+UNHEALTHY_ERROR_RATE = 0.5
+# Seconds between heartbeat pings, and how long a pong may take
+HEARTBEAT_INTERVAL = 15.0
+HEARTBEAT_TIMEOUT = 5.0
+
+# JSON messages of at least this many bytes are gzip-compressed for clients that accept it
+COMPRESSION_THRESHOLD = 16 * 1024
+# Message encodings this backend sends and accepts, advertised in the "connected" message
+SUPPORTED_ENCODINGS = ("gzip",)
+# Header type of a binary frame that carries one whole encoded JSON message
+ENCODED_FRAME_TYPE = "encoded"
+
+# Resolves a pending request's future when its connection drops, triggering failover
+_CONNECTION_LOST = object()
+
+
+def encode_binary_frame(header: Dict[str, Any], payload: bytes) -> bytes:
+    """
+    Pack a JSON header and raw bytes into one binary WebSocket frame.
+
+    Layout: 4-byte big-endian header length, UTF-8 JSON header, payload.
+    """
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return struct.pack(">I", len(header_bytes)) + header_bytes + payload
+
+
+def decode_binary_frame(frame: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """Split a binary frame built by encode_binary_frame into its header and payload."""
+    (header_length,) = struct.unpack(">I", frame[:4])
+    return json.loads(frame[4:4 + header_length]), frame[4 + header_length:]
+
+
+def encode_message(
+    message: Dict[str, Any],
+    encodings: Tuple[str, ...] = (),
+    threshold: int = COMPRESSION_THRESHOLD
+) -> Tuple[Union[str, bytes], int]:
+    """
+    Serialize a message for sending.
+
+    Args:
+        message: JSON-serializable message
+        encodings: Encodings the receiving client accepts
+        threshold: Minimum JSON size in bytes worth compressing
+
+    Returns:
+        (frame, size of the message JSON in bytes). The frame is compact JSON
+        text, or for large messages to clients accepting gzip a binary frame
+        with header {"type": "encoded", "encoding": "gzip"} and the gzipped
+        JSON as payload.
+    """
+    # ASCII-only JSON, so len() is the byte size
+    text = json.dumps(message, separators=(",", ":"))
+    if "gzip" in encodings and len(text) >= threshold:
+        frame = encode_binary_frame(
+            {"type": ENCODED_FRAME_TYPE, "encoding": "gzip"},
+            gzip.compress(text.encode("ascii"), compresslevel=6)
+        )
+        return frame, len(text)
+    return text, len(text)
+
+
+def decode_message(frame: Union[str, bytes]) -> Tuple[Dict[str, Any], int]:
+    """
+    Parse a received text frame or encoded binary frame.
+
+    Returns:
+        (message, size of the message JSON in bytes)
+
+    Raises:
+        ValueError: If a binary frame is not an encoded message or uses an
+            unsupported encoding
+    """
+    if isinstance(frame, str):
+        return json.loads(frame), len(frame)
+    header, payload = decode_binary_frame(frame)
+    if header.get("type") != ENCODED_FRAME_TYPE:
+        raise ValueError(f"Unexpected binary frame type: {header.get('type')}")
+    if header.get("encoding") != "gzip":
+        raise ValueError(f"Unsupported encoding: {header.get('encoding')}")
+    data = gzip.decompress(payload)
+    return json.loads(data), len(data)
+
+
+class ClientStats:
+    """Routing and health counters for one Foundry connection."""
+
+    def __init__(self):
+        self.in_flight: Set[str] = set()
+        self.completed = 0
+        self.failures = 0
+        self.error_rate = 0.0
+        self.rtt: Optional[float] = None
+        self.connected_at = time.monotonic()
+        # Frame bytes on the socket, and the size of the JSON they carried
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.json_bytes_sent = 0
+        self.json_bytes_received = 0
+
+    def record(self, failed: bool) -> None:
+        """Fold one request/heartbeat outcome into the error rate."""
+        if failed:
+            self.failures += 1
+        else:
+            self.completed += 1
+        self.error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+
+    def record_rtt(self, seconds: float) -> None:
+        """Fold one heartbeat round-trip time into the moving average."""
+        self.rtt = seconds if self.rtt is None else self.rtt + EWMA_ALPHA * (seconds - self.rtt)
+
+    @property
+    def healthy(self) -> bool:
+        return self.error_rate < UNHEALTHY_ERROR_RATE
+
+    def routing_key(self) -> tuple:
+        """Sort key: healthy first, then fewest outstanding requests, lowest error rate and RTT."""
+        return (not self.healthy, len(self.in_flight), round(self.error_rate, 2), self.rtt or 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self.in_flight),
+            "completed": self.completed,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate, 3),
+            "rtt_ms": round(self.rtt * 1000, 1) if self.rtt is not None else None,
+            "healthy": self.healthy,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "json_bytes_sent": self.json_bytes_sent,
+            "json_bytes_received": self.json_bytes_received,
+        }
+
+
+class _PendingRequest:
+    """A request awaiting a response from the client it was dispatched to."""
+
+    def __init__(self, future: asyncio.Future, client_id: str):
+        self.future = future
+        self.client_id = client_id
+        self.sent_at = time.monotonic()
 
 
 class ConnectionManager:
-    """Manage active WebSocket connections from Foundry clients."""
+    """Manage active WebSocket connections from Foundry clients.
+
+    Requests are routed to the healthy client with the fewest outstanding
+    requests. Health comes from heartbeat RTT and the error rate of timeouts
+    and missed heartbeats. If a client disconnects while handling a request,
+    the request is re-sent to another client instead of returning None.
+    """
 
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         # Track pending requests waiting for responses
-        self._pending_requests: Dict[str, asyncio.Future] = {}
+        self._pending_requests: Dict[str, _PendingRequest] = {}
+        # World/system info reported by each client (see world_fingerprint)
+        self.client_info: Dict[str, Dict[str, Any]] = {}
+        self.client_stats: Dict[str, ClientStats] = {}
+        self.failovers = 0
+        self._heartbeat_task: Optional[asyncio.Task] = None
 
     def connect(self, websocket: WebSocket) -> str:
         """
@@ -25,22 +207,95 @@ class ConnectionManager:
         """
         client_id = str(uuid.uuid4())
         self.active_connections[client_id] = websocket
+        self.client_stats[client_id] = ClientStats()
         return client_id
 
     def disconnect(self, client_id: str) -> None:
         """
         Remove a WebSocket connection.
 
+        Requests in flight on the connection are handed back to their callers
+        for re-dispatch to another client.
+
         Args:
             client_id: The client to disconnect
         """
         self.active_connections.pop(client_id, None)
+        self.client_info.pop(client_id, None)
+        self.client_stats.pop(client_id, None)
+        for pending in list(self._pending_requests.values()):
+            if pending.client_id == client_id and not pending.future.done():
+                pending.future.set_result(_CONNECTION_LOST)
+
+    def set_client_info(self, client_id: str, info: Dict[str, Any]) -> None:
+        """
+        Record the world/system info a client reported after connecting.
+
+        Args:
+            client_id: The reporting client
+            info: Dict with world_id, system_id, system_version, foundry_version
+        """
+        if client_id in self.active_connections:
+            self.client_info[client_id] = dict(info)
+
+    def world_fingerprint(self) -> Optional[str]:
+        """
+        Return a fingerprint of the connected world and game system.
+
+        Caches of compendium and file data are only valid for the world and
+        system version they were fetched from. Uses the longest-connected
+        client that has reported its world info.
+
+        Returns:
+            "world|system@version|foundry_version", or None if no connected
+            client has reported its world info yet
+        """
+        for client_id in self.active_connections:
+            info = self.client_info.get(client_id)
+            if info and info.get("world_id"):
+                return (
+                    f"{info.get('world_id')}|{info.get('system_id')}@{info.get('system_version')}"
+                    f"|{info.get('foundry_version')}"
+                )
+        return None
 
     @property
     def connection_count(self) -> int:
         """Return number of active connections."""
         return len(self.active_connections)
 
+    def stats(self) -> Dict[str, Any]:
+        """Return per-client routing/health counters."""
+        return {
+            "failovers": self.failovers,
+            "clients": {client_id: stats.to_dict() for client_id, stats in self.client_stats.items()},
+        }
+
+    def pick_client(self, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Choose the client for the next request.
+
+        Args:
+            exclude: Client IDs not to use (e.g. already failed for this request)
+
+        Returns:
+            The healthy client with the fewest outstanding requests (ties go to
+            lower error rate, lower RTT, then connection order), or None
+        """
+        candidates = [
+            client_id for client_id in self.active_connections
+            if not exclude or client_id not in exclude
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda client_id: self._stats_for(client_id).routing_key())
+
+    def _stats_for(self, client_id: str) -> ClientStats:
+        stats = self.client_stats.get(client_id)
+        if stats is None:
+            stats = self.client_stats[client_id] = ClientStats()
+        return stats
+
     async def broadcast(self, message: Dict[str, Any]) -> None:
         """
         Send message to all connected clients.
@@ -52,9 +307,9 @@ class ConnectionManager:
         """
         disconnected = []
 
-        for client_id, websocket in self.active_connections.items():
+        for client_id, websocket in list(self.active_connections.items()):
             try:
-                await websocket.send_json(message)
+                await self._send_message(client_id, websocket, message)
             except Exception:
                 disconnected.append(client_id)
 
@@ -62,6 +317,66 @@ class ConnectionManager:
         for client_id in disconnected:
             self.disconnect(client_id)
 
+    async def _send(self, client_id: str, message: Dict[str, Any], payload: Optional[bytes] = None) -> bool:
+        """Send to a specific client, disconnecting it if the send fails.
+
+        With a payload, message and payload go out as one binary frame
+        (see encode_binary_frame) instead of a JSON text frame.
+        """
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            return False
+        try:
+            if payload is None:
+                await self._send_message(client_id, websocket, message)
+            else:
+                frame = encode_binary_frame(message, payload)
+                await websocket.send_bytes(frame)
+                stats = self._stats_for(client_id)
+                stats.bytes_sent += len(frame)
+                stats.json_bytes_sent += len(frame) - len(payload)
+            return True
+        except Exception:
+            self.disconnect(client_id)
+            return False
+
+    def accepted_encodings(self, client_id: str) -> Tuple[str, ...]:
+        """Return the message encodings a client announced in its world info."""
+        encodings = (self.client_info.get(client_id) or {}).get("encodings") or ()
+        return tuple(e for e in encodings if e in SUPPORTED_ENCODINGS)
+
+    async def _send_message(self, client_id: str, websocket: WebSocket, message: Dict[str, Any]) -> None:
+        """Encode a JSON message for one client (see encode_message) and send it."""
+        frame, json_size = encode_message(message, self.accepted_encodings(client_id))
+        if isinstance(frame, str):
+            await websocket.send_text(frame)
+        else:
+            await websocket.send_bytes(frame)
+        stats = self._stats_for(client_id)
+        stats.bytes_sent += len(frame)
+        stats.json_bytes_sent += json_size
+
+    async def receive(self, client_id: str, websocket: WebSocket) -> Dict[str, Any]:
+        """
+        Receive the next JSON message from a client, decoding encoded frames.
+
+        Raises:
+            WebSocketDisconnect: If the client disconnected
+            ValueError: If a frame cannot be decoded
+        """
+        event = await websocket.receive()
+        if event["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(event.get("code", 1000))
+        frame = event.get("text")
+        if frame is None:
+            frame = event.get("bytes") or b""
+        message, json_size = decode_message(frame)
+        stats = self.client_stats.get(client_id)
+        if stats is not None:
+            stats.bytes_received += len(frame)
+            stats.json_bytes_received += json_size
+        return message
+
     async def send_to_one(self, message: Dict[str, Any]) -> bool:
         """
         Send message to exactly one connected client.
@@ -72,18 +387,14 @@ class ConnectionManager:
         Returns:
             True if message was sent successfully, False if no clients
         """
-        if not self.active_connections:
-            return False
-
-        # Get first available client
-        client_id, websocket = next(iter(self.active_connections.items()))
-
-        try:
-            await websocket.send_json(message)
-            return True
-        except Exception:
-            self.disconnect(client_id)
-            return False
+        tried: Set[str] = set()
+        while True:
+            client_id = self.pick_client(exclude=tried)
+            if client_id is None:
+                return False
+            if await self._send(client_id, message):
+                return True
+            tried.add(client_id)
 
     async def broadcast_and_wait(
         self,
@@ -93,6 +404,13 @@ class ConnectionManager:
         """
         Send a message to one client and wait for a response.
 
+        The least-loaded healthy client is chosen. If the message cannot be
+        sent to it, another client is tried. If it disconnects after receiving
+        a read-only request (FAILOVER_MESSAGE_TYPES), the request is re-sent
+        (same request_id) to another client; other requests return None, since
+        the dropped client may already have applied them. At most
+        MAX_FAILOVERS re-dispatches happen within the overall timeout.
+
         Args:
             message: JSON-serializable message to send
             timeout: Maximum seconds to wait for response
@@ -107,27 +425,108 @@ class ConnectionManager:
         request_id = str(uuid.uuid4())
         message["request_id"] = request_id
 
-        # Create a future to wait for the response
-        loop = asyncio.get_event_loop()
-        future: asyncio.Future = loop.create_future()
-        self._pending_requests[request_id] = future
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        tried: Set[str] = set()
+        failovers = 0
 
         try:
-            # Send to ONE client only (not broadcast to all)
-            sent = await self.send_to_one(message)
-            if not sent:
-                return None
+            while True:
+                client_id = self.pick_client(exclude=tried)
+                if client_id is None:
+                    return None
 
-            # Wait for response with timeout
-            try:
-                response = await asyncio.wait_for(future, timeout=timeout)
-                return response
-            except asyncio.TimeoutError:
-                return None
+                # Create a future to wait for the response from this client
+                future: asyncio.Future = loop.create_future()
+                self._pending_requests[request_id] = _PendingRequest(future, client_id)
+                stats = self._stats_for(client_id)
+                stats.in_flight.add(request_id)
+
+                delivered = False
+                try:
+                    # Send to ONE client only (not broadcast to all)
+                    if not await self._send(client_id, message):
+                        response = _CONNECTION_LOST
+                    else:
+                        delivered = True
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError
+                        response = await asyncio.wait_for(future, timeout=remaining)
+                except asyncio.TimeoutError:
+                    stats.record(failed=True)
+                    logger.warning(f"Request {request_id} ({message.get('type')}) timed out on client {client_id}")
+                    return None
+                finally:
+                    stats.in_flight.discard(request_id)
+
+                if response is not _CONNECTION_LOST:
+                    stats.record(failed=False)
+                    return response
+
+                tried.add(client_id)
+                if delivered and message.get("type") not in FAILOVER_MESSAGE_TYPES:
+                    logger.warning(f"Client {client_id} dropped request {request_id} ({message.get('type')}); "
+                                   f"not re-dispatching a request that may already have been applied")
+                    return None
+                failovers += 1
+                if failovers > MAX_FAILOVERS or loop.time() >= deadline:
+                    return None
+                self.failovers += 1
+                logger.warning(f"Client {client_id} dropped request {request_id} ({message.get('type')}), "
+                               f"re-dispatching (attempt {failovers + 1})")
         finally:
             # Clean up pending request
             self._pending_requests.pop(request_id, None)
 
+    async def request(
+        self,
+        client_id: str,
+        message: Dict[str, Any],
+        timeout: float = 30.0,
+        payload: Optional[bytes] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send a request to one specific client and wait for its response.
+
+        Unlike broadcast_and_wait there is no routing or failover: this is for
+        exchanges that depend on state held by that client (e.g. a partially
+        received upload). Callers decide how to recover when it returns None.
+
+        Args:
+            client_id: Client to send to
+            message: JSON-serializable message (a request_id is added)
+            timeout: Maximum seconds to wait for the response
+            payload: Optional raw bytes, sent with message as a binary frame
+
+        Returns:
+            Response data, or None if the client is gone, disconnected or timed out
+        """
+        if client_id not in self.active_connections:
+            return None
+        request_id = str(uuid.uuid4())
+        message["request_id"] = request_id
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = _PendingRequest(future, client_id)
+        stats = self._stats_for(client_id)
+        stats.in_flight.add(request_id)
+        try:
+            if not await self._send(client_id, message, payload):
+                return None
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            stats.record(failed=True)
+            logger.warning(f"Request {request_id} ({message.get('type')}) timed out on client {client_id}")
+            return None
+        finally:
+            stats.in_flight.discard(request_id)
+            self._pending_requests.pop(request_id, None)
+
+        if response is _CONNECTION_LOST:
+            return None
+        stats.record(failed=False)
+        return response
+
     def handle_response(self, request_id: str, response_data: Dict[str, Any]) -> bool:
         """
         Handle a response from a Foundry client.
@@ -139,8 +538,62 @@ class ConnectionManager:
         Returns:
             True if a pending request was found and resolved
         """
-        future = self._pending_requests.get(request_id)
-        if future and not future.done():
-            future.set_result(response_data)
+        pending = self._pending_requests.get(request_id)
+        if pending and not pending.future.done():
+            pending.future.set_result(response_data)
             return True
         return False
+
+    async def ping(self, client_id: str, timeout: float = HEARTBEAT_TIMEOUT) -> Optional[float]:
+        """
+        Ping one client and fold the result into its health score.
+
+        Args:
+            client_id: Client to ping
+            timeout: Seconds to wait for the pong
+
+        Returns:
+            Round-trip time in seconds, or None if no pong arrived
+        """
+        loop = asyncio.get_running_loop()
+        request_id = str(uuid.uuid4())
+        future: asyncio.Future = loop.create_future()
+        self._pending_requests[request_id] = _PendingRequest(future, client_id)
+        start = time.monotonic()
+        try:
+            if not await self._send(client_id, {"type": "ping", "request_id": request_id}):
+                return None
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            response = None
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+        stats = self.client_stats.get(client_id)
+        if response is None or response is _CONNECTION_LOST:
+            if stats is not None:
+                stats.record(failed=True)
+            return None
+        rtt = time.monotonic() - start
+        if stats is not None:
+            stats.record(failed=False)
+            stats.record_rtt(rtt)
+        return rtt
+
+    async def _heartbeat(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            client_ids: List[str] = list(self.active_connections)
+            if client_ids:
+                await asyncio.gather(*(self.ping(client_id) for client_id in client_ids))
+
+    def start_heartbeat(self, interval: float = HEARTBEAT_INTERVAL) -> None:
+        """Start pinging all clients periodically on the running loop."""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat(interval))
+
+    def stop_heartbeat(self) -> None:
+        """Stop the heartbeat task."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
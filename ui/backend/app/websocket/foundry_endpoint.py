@@ -1,13 +1,20 @@
 """WebSocket endpoint for Foundry module connections."""
 import logging
 from fastapi import WebSocket, WebSocketDisconnect
-from .connection_manager import ConnectionManager
+from .connection_manager import ConnectionManager, COMPRESSION_THRESHOLD, SUPPORTED_ENCODINGS
+from .world_index import world_index
 
 logger = logging.getLogger(__name__)
 
 # Global connection manager instance
 foundry_manager = ConnectionManager()
 
+
+def _reset_world_index() -> None:
+    """Start the world index over; it is live while any client pushes world events."""
+    world_index.reset(live=any(info.get("world_events") for info in foundry_manager.client_info.values()))
+
+
 # Response message types from Foundry module
 RESPONSE_TYPES = {
     # Creation responses
@@ -47,6 +54,8 @@ RESPONSE_TYPES = {
     "files_error",
     "file_uploaded",
     "file_error",
+    "upload_ready",
+    "upload_chunk_ack",
     # Custom items responses
     "custom_items_added",
     "custom_items_error",
@@ -60,6 +69,11 @@ RESPONSE_TYPES = {
     "folder_deleted",
     "folder_error",
     "folders_list",
+    # Batch responses
+    "actors_batch_created",
+    "documents_batch_deleted",
+    "documents_batch_fetched",
+    "batch_error",
 }
 
 
@@ -70,8 +84,16 @@ async def foundry_websocket_endpoint(websocket: WebSocket):
     Protocol:
     - On connect: sends {"type": "connected", "client_id": "..."}
     - Client can send {"type": "ping"} -> receives {"type": "pong"}
+    - Server sends heartbeat {"type": "ping", "request_id": "..."} -> client replies {"type": "pong", "request_id": "..."}
+    - Client sends {"type": "world_info", "data": {"world_id", "system_id", ..., "world_events": true}} after connecting
+    - Client sends {"type": "world_event", "data": {"action", "document_type", "id", ...}} from document hooks
     - Server pushes content: {"type": "actor|journal|scene", "data": {...}, "request_id": "..."}
     - Client responds: {"type": "actor_created|journal_created|scene_created", "request_id": "...", "data": {...}}
+    - Chunked uploads: upload_begin -> upload_ready, binary upload_chunk frames
+      (see encode_binary_frame) -> upload_chunk_ack each, upload_finish -> file_uploaded
+    - Compression: the welcome message lists "encodings" and "compression_threshold";
+      a client listing "encodings" in world_info gets large messages as gzip binary
+      frames (see encode_message) and may send its own large messages the same way
     """
     await websocket.accept()
     client_id = foundry_manager.connect(websocket)
@@ -82,17 +104,39 @@ async def foundry_websocket_endpoint(websocket: WebSocket):
         # Send welcome message
         await websocket.send_json({
             "type": "connected",
-            "client_id": client_id
+            "client_id": client_id,
+            "encodings": list(SUPPORTED_ENCODINGS),
+            "compression_threshold": COMPRESSION_THRESHOLD
         })
 
         # Handle incoming messages
         while True:
-            data = await websocket.receive_json()
+            try:
+                data = await foundry_manager.receive(client_id, websocket)
+            except ValueError as e:
+                logger.warning(f"Dropping undecodable frame from {client_id}: {e}")
+                continue
             msg_type = data.get("type")
 
             if msg_type == "ping":
                 await websocket.send_json({"type": "pong"})
 
+            elif msg_type == "pong":
+                # Reply to a backend heartbeat ping
+                request_id = data.get("request_id")
+                if request_id:
+                    foundry_manager.handle_response(request_id, data)
+
+            elif msg_type == "world_info":
+                foundry_manager.set_client_info(client_id, data.get("data") or {})
+                logger.info(f"Foundry client {client_id} world: {foundry_manager.world_fingerprint()}")
+                # Repopulate the world index for this connection
+                _reset_world_index()
+
+            elif msg_type == "world_event":
+                # Document created/updated/deleted in Foundry
+                world_index.apply_event(data.get("data") or {})
+
             elif msg_type in RESPONSE_TYPES:
                 # This is a response to a request we sent
                 request_id = data.get("request_id")
@@ -109,3 +153,5 @@ async def foundry_websocket_endpoint(websocket: WebSocket):
         logger.info(f"Foundry client disconnected: {client_id}")
     finally:
         foundry_manager.disconnect(client_id)
+        # Events may be missed while disconnected
+        _reset_world_index()
@@ -1,8 +1,12 @@
 """Push notification helpers for broadcasting to Foundry clients."""
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import uuid
+from collections import deque
+from typing import BinaryIO, Deque, Dict, Any, Optional, List
+from dataclasses import dataclass, field
 from .foundry_endpoint import foundry_manager
+from .world_index import world_index, IndexedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -292,6 +296,14 @@ async def list_journals(timeout: float = 30.0) -> JournalListResult:
     Returns:
         JournalListResult with list of journals if successful
     """
+    indexed = world_index.documents("JournalEntry")
+    if indexed is not None:
+        return JournalListResult(
+            success=True,
+            journals=[JournalInfo(uuid=d.uuid, id=d.id, name=d.name, folder=d.folder) for d in indexed]
+        )
+
+    generation = world_index.generation("JournalEntry")
     response = await foundry_manager.broadcast_and_wait(
         {"type": "list_journals", "data": {}},
         timeout=timeout
@@ -316,6 +328,11 @@ async def list_journals(timeout: float = 30.0) -> JournalListResult:
             for j in journals_data
             if j.get("uuid") and j.get("id") and j.get("name")
         ]
+        world_index.load(
+            "JournalEntry",
+            (IndexedDocument(j.uuid, j.id, j.name, "JournalEntry", folder=j.folder) for j in journals),
+            generation
+        )
         return JournalListResult(success=True, journals=journals)
     elif response.get("type") == "journal_error":
         return JournalListResult(
@@ -590,6 +607,14 @@ async def list_actors(timeout: float = 30.0) -> ListResult:
     Returns:
         ListResult with list of actors if successful
     """
+    indexed = world_index.documents("Actor")
+    if indexed is not None:
+        return ListResult(
+            success=True,
+            actors=[ActorInfo(uuid=d.uuid, id=d.id, name=d.name, folder=d.folder) for d in indexed]
+        )
+
+    generation = world_index.generation("Actor")
     response = await foundry_manager.broadcast_and_wait(
         {"type": "list_actors", "data": {}},
         timeout=timeout
@@ -614,6 +639,11 @@ async def list_actors(timeout: float = 30.0) -> ListResult:
             for a in actors_data
             if a.get("uuid") and a.get("id") and a.get("name")
         ]
+        world_index.load(
+            "Actor",
+            (IndexedDocument(a.uuid, a.id, a.name, "Actor", folder=a.folder) for a in actors),
+            generation
+        )
         return ListResult(success=True, actors=actors)
     elif response.get("type") == "actor_error":
         return ListResult(
@@ -654,6 +684,14 @@ async def list_scenes(timeout: float = 30.0) -> SceneListResult:
     Returns:
         SceneListResult with list of scenes if successful
     """
+    indexed = world_index.documents("Scene")
+    if indexed is not None:
+        return SceneListResult(
+            success=True,
+            scenes=[SceneInfo(uuid=d.uuid, id=d.id, name=d.name, folder=d.folder) for d in indexed]
+        )
+
+    generation = world_index.generation("Scene")
     response = await foundry_manager.broadcast_and_wait(
         {"type": "list_scenes", "data": {}},
         timeout=timeout
@@ -678,6 +716,11 @@ async def list_scenes(timeout: float = 30.0) -> SceneListResult:
             for s in scenes_data
             if s.get("uuid") and s.get("id") and s.get("name")
         ]
+        world_index.load(
+            "Scene",
+            (IndexedDocument(sc.uuid, sc.id, sc.name, "Scene", folder=sc.folder) for sc in scenes),
+            generation
+        )
         return SceneListResult(success=True, scenes=scenes)
     elif response.get("type") == "scene_error":
         return SceneListResult(
@@ -1038,6 +1081,153 @@ async def upload_file(
         )
 
 
+# Chunked upload tuning: bytes per binary frame, unacknowledged chunks allowed
+# in flight, how often an interrupted upload is resumed, and how long to wait
+# for a (re)connected client before giving up
+UPLOAD_CHUNK_SIZE = 256 * 1024
+UPLOAD_WINDOW = 4
+UPLOAD_MAX_RESUMES = 3
+UPLOAD_RECONNECT_WAIT = 15.0
+
+
+async def _wait_for_client(wait: float) -> Optional[str]:
+    """Return a client to upload to, waiting up to wait seconds for one to (re)connect."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        client_id = foundry_manager.pick_client()
+        if client_id is not None or loop.time() >= deadline:
+            return client_id
+        await asyncio.sleep(0.25)
+
+
+def _read_chunk(fileobj: BinaryIO, offset: int, size: int) -> bytes:
+    fileobj.seek(offset)
+    return fileobj.read(size)
+
+
+async def _send_upload_chunks(
+    client_id: str,
+    fileobj: BinaryIO,
+    upload_id: str,
+    first_seq: int,
+    total_chunks: int,
+    chunk_size: int,
+    timeout: float
+) -> bool:
+    """
+    Send chunks first_seq.. as binary frames, keeping up to UPLOAD_WINDOW unacknowledged.
+
+    Returns:
+        True once every chunk is acknowledged, False on the first missing ack
+    """
+    in_flight: Deque[asyncio.Task] = deque()
+
+    async def acked(task: asyncio.Task) -> bool:
+        response = await task
+        return response is not None and response.get("type") == "upload_chunk_ack"
+
+    try:
+        for seq in range(first_seq, total_chunks):
+            if len(in_flight) >= UPLOAD_WINDOW and not await acked(in_flight.popleft()):
+                return False
+            # Spooled uploads may be on disk; read off the event loop
+            chunk = await asyncio.to_thread(_read_chunk, fileobj, seq * chunk_size, chunk_size)
+            in_flight.append(asyncio.ensure_future(foundry_manager.request(
+                client_id,
+                {"type": "upload_chunk", "data": {"upload_id": upload_id, "seq": seq}},
+                timeout=timeout,
+                payload=chunk
+            )))
+        while in_flight:
+            if not await acked(in_flight.popleft()):
+                return False
+        return True
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def upload_file_stream(
+    fileobj: BinaryIO,
+    filename: str,
+    size: int,
+    destination: str = "uploaded-maps",
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    timeout: float = 30.0
+) -> FileUploadResult:
+    """
+    Upload a file to FoundryVTT world folder in acknowledged binary chunks.
+
+    Chunks are read from fileobj as they are sent (e.g. straight from an
+    UploadFile's spool), so only UPLOAD_WINDOW chunks are in memory and
+    nothing is base64-encoded. If the client drops mid-upload, the upload is
+    resumed on the reconnected (or another) client from the first chunk it
+    is missing.
+
+    Args:
+        fileobj: Seekable binary file with the content (read from offset 0)
+        filename: Name of the file (e.g., "castle.webp")
+        size: File size in bytes
+        destination: Subdirectory in world folder (default: "uploaded-maps")
+        chunk_size: Bytes per chunk
+        timeout: Maximum seconds to wait for each acknowledgement
+
+    Returns:
+        FileUploadResult with Foundry-relative path if successful
+    """
+    upload_id = str(uuid.uuid4())
+    total_chunks = max(1, -(-size // chunk_size))
+    begin = {
+        "upload_id": upload_id,
+        "filename": filename,
+        "destination": destination,
+        "size": size,
+        "chunk_size": chunk_size,
+        "total_chunks": total_chunks
+    }
+
+    for attempt in range(UPLOAD_MAX_RESUMES + 1):
+        client_id = await _wait_for_client(UPLOAD_RECONNECT_WAIT if attempt else 0)
+        if client_id is None:
+            break
+        if attempt:
+            logger.warning(f"Resuming upload {upload_id} ({filename}) on client {client_id}")
+
+        response = await foundry_manager.request(
+            client_id, {"type": "upload_begin", "data": dict(begin)}, timeout=timeout
+        )
+        if response is None:
+            continue
+        if response.get("type") == "file_error":
+            return FileUploadResult(success=False, error=response.get("error", "Unknown upload error"))
+        if response.get("type") != "upload_ready":
+            return FileUploadResult(success=False, error=f"Unexpected response type: {response.get('type')}")
+
+        next_seq = response.get("data", {}).get("next_seq", 0)
+        if not await _send_upload_chunks(
+            client_id, fileobj, upload_id, next_seq, total_chunks, chunk_size, timeout
+        ):
+            continue
+
+        response = await foundry_manager.request(
+            client_id, {"type": "upload_finish", "data": {"upload_id": upload_id}}, timeout=max(timeout, 60.0)
+        )
+        if response is None:
+            continue
+        if response.get("type") == "file_uploaded":
+            return FileUploadResult(success=True, path=response.get("data", {}).get("path"))
+        elif response.get("type") == "file_error":
+            return FileUploadResult(success=False, error=response.get("error", "Unknown upload error"))
+        else:
+            return FileUploadResult(success=False, error=f"Unexpected response type: {response.get('type')}")
+
+    return FileUploadResult(
+        success=False,
+        error="No Foundry client connected or timeout waiting for response"
+    )
+
+
 async def list_files(
     path: str,
     source: str = "public",
@@ -1344,6 +1534,18 @@ async def list_folders(
     Returns:
         ListFoldersResult with list of folders
     """
+    indexed = world_index.documents("Folder")
+    if indexed is not None:
+        return ListFoldersResult(
+            success=True,
+            folders=[
+                FolderInfo(id=d.id, name=d.name, type=d.folder_type, parent=d.folder)
+                for d in indexed
+                if not folder_type or d.folder_type == folder_type
+            ]
+        )
+
+    generation = world_index.generation("Folder")
     data = {}
     if folder_type:
         data["type"] = folder_type
@@ -1373,6 +1575,13 @@ async def list_folders(
             )
             for f in resp_data.get("folders", [])
         ]
+        if not folder_type:
+            world_index.load(
+                "Folder",
+                (IndexedDocument(f"Folder.{f.id}", f.id, f.name, "Folder", folder=f.parent, folder_type=f.type)
+                 for f in folders),
+                generation
+            )
         return ListFoldersResult(
             success=True,
             folders=folders
@@ -1452,11 +1661,147 @@ async def delete_folder(
         )
 
 
+# Documents per batch message; larger lists are split into several round trips
+BATCH_CHUNK_SIZE = 100
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome for one document in a batch operation."""
+    success: bool
+    uuid: Optional[str] = None
+    id: Optional[str] = None
+    name: Optional[str] = None
+    entity: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Result of a batch operation, with one item result per input, in input order."""
+    success: bool
+    results: List[BatchItemResult] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> List[BatchItemResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        return [r for r in self.results if not r.success]
+
+
+async def _send_batch(
+    message_type: str,
+    key: str,
+    items: List[Any],
+    success_type: str,
+    timeout: float
+) -> BatchResult:
+    """
+    Send items to Foundry in BATCH_CHUNK_SIZE chunks and collect per-item results.
+
+    A chunk that gets no usable response marks each of its items as failed
+    with the chunk's error; other chunks are unaffected.
+    """
+    if not items:
+        return BatchResult(success=True)
+
+    results: List[BatchItemResult] = []
+    errors = []
+    starts = range(0, len(items), BATCH_CHUNK_SIZE)
+    for start in starts:
+        chunk = items[start:start + BATCH_CHUNK_SIZE]
+        response = await foundry_manager.broadcast_and_wait(
+            {"type": message_type, "data": {key: chunk}},
+            timeout=timeout
+        )
+
+        if response is None:
+            error = "No Foundry client connected or timeout waiting for response"
+        elif response.get("type") == success_type:
+            items_data = response.get("data", {}).get("results", [])
+            chunk_results = [
+                BatchItemResult(
+                    success=bool(item.get("success")),
+                    uuid=item.get("uuid"),
+                    id=item.get("id"),
+                    name=item.get("name"),
+                    entity=item.get("entity"),
+                    error=item.get("error")
+                )
+                for item in items_data
+            ]
+            # Pad if Foundry answered fewer items than it was sent
+            chunk_results.extend(
+                BatchItemResult(success=False, error="Missing from batch response")
+                for _ in range(len(chunk) - len(chunk_results))
+            )
+            results.extend(chunk_results[:len(chunk)])
+            continue
+        elif response.get("type") == "batch_error":
+            error = response.get("error", "Unknown error from Foundry")
+        else:
+            error = f"Unexpected response type: {response.get('type')}"
+
+        errors.append(error)
+        results.extend(BatchItemResult(success=False, error=error) for _ in chunk)
+
+    if len(errors) == len(starts):
+        # Every chunk failed outright
+        return BatchResult(success=False, results=results, error=errors[0])
+    return BatchResult(success=True, results=results)
+
+
+async def push_actors_batch(actors: List[Dict[str, Any]], timeout: float = 60.0) -> BatchResult:
+    """
+    Create several actors in Foundry with one createDocuments call per chunk.
+
+    Args:
+        actors: Entries in push_actor's format ({"actor": {...}, "spell_uuids": [...]})
+        timeout: Maximum seconds to wait for each chunk's response
+
+    Returns:
+        BatchResult with one BatchItemResult (uuid, id, name) per actor, in input order
+    """
+    return await _send_batch("actors_batch_create", "actors", actors, "actors_batch_created", timeout)
+
+
+async def delete_documents_batch(uuids: List[str], timeout: float = 30.0) -> BatchResult:
+    """
+    Delete documents of any type by UUID with one deleteDocuments call per type and chunk.
+
+    Args:
+        uuids: Document UUIDs (e.g. "Actor.abc", "Scene.def", "JournalEntry.ghi")
+        timeout: Maximum seconds to wait for each chunk's response
+
+    Returns:
+        BatchResult with one BatchItemResult (uuid, name) per UUID, in input order
+    """
+    return await _send_batch("documents_batch_delete", "uuids", uuids, "documents_batch_deleted", timeout)
+
+
+async def fetch_documents_batch(uuids: List[str], timeout: float = 30.0) -> BatchResult:
+    """
+    Fetch documents of any type by UUID in one round trip per chunk.
+
+    Args:
+        uuids: Document UUIDs
+        timeout: Maximum seconds to wait for each chunk's response
+
+    Returns:
+        BatchResult with one BatchItemResult (uuid, entity) per UUID, in input order
+    """
+    return await _send_batch("documents_batch_fetch", "uuids", uuids, "documents_batch_fetched", timeout)
+
+
 async def broadcast_progress(
     stage: str,
     message: str,
     progress: Optional[int] = None,
-    module_name: Optional[str] = None
+    module_name: Optional[str] = None,
+    job_id: Optional[str] = None
 ) -> None:
     """
     Broadcast a progress update to all connected Foundry clients.
@@ -1468,6 +1813,7 @@ async def broadcast_progress(
         message: Human-readable progress message
         progress: Optional progress percentage (0-100)
         module_name: Optional module name being processed
+        job_id: Optional module job the update belongs to
     """
     data: Dict[str, Any] = {
         "stage": stage,
@@ -1477,6 +1823,8 @@ async def broadcast_progress(
         data["progress"] = progress
     if module_name is not None:
         data["module_name"] = module_name
+    if job_id is not None:
+        data["job_id"] = job_id
 
     await foundry_manager.broadcast({
         "type": "module_progress",
@@ -1497,11 +1845,17 @@ def set_main_loop(loop: asyncio.AbstractEventLoop) -> None:
     _main_loop = loop
 
 
+def get_main_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the backend's main event loop, if the app has started."""
+    return _main_loop
+
+
 def broadcast_progress_sync(
     stage: str,
     message: str,
     progress: Optional[int] = None,
-    module_name: Optional[str] = None
+    module_name: Optional[str] = None,
+    job_id: Optional[str] = None
 ) -> None:
     """
     Synchronous version of broadcast_progress for use from thread pools.
@@ -1514,6 +1868,7 @@ def broadcast_progress_sync(
         message: Human-readable progress message
         progress: Optional progress percentage (0-100)
         module_name: Optional module name being processed
+        job_id: Optional module job the update belongs to
     """
     global _main_loop
     if _main_loop is None:
@@ -1522,7 +1877,7 @@ def broadcast_progress_sync(
 
     try:
         future = asyncio.run_coroutine_threadsafe(
-            broadcast_progress(stage, message, progress, module_name),
+            broadcast_progress(stage, message, progress, module_name, job_id),
             _main_loop
         )
         # Don't wait for result - fire and forget
@@ -0,0 +1,192 @@
+"""In-memory index of Foundry world documents, kept current by pushed hook events."""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Document types the index tracks (Foundry document names)
+DOCUMENT_TYPES = ("Actor", "JournalEntry", "Scene", "Folder")
+
+
+@dataclass
+class IndexedDocument:
+    """Name and placement of one world document."""
+    uuid: str
+    id: str
+    name: str
+    document_type: str
+    # Containing folder ID (for folders: the parent folder)
+    folder: Optional[str] = None
+    # For folders only: the document type the folder holds
+    folder_type: Optional[str] = None
+
+
+class WorldIndex:
+    """
+    Read-through index of world actors, journals, scenes and folders.
+
+    Each document type is loaded by the first list request after a client
+    connects (see the list_* functions in push.py) and is then kept current by
+    world_event messages the Foundry module sends from its create/update/delete
+    hooks. The index is only used while a connected client has announced that
+    it sends those events; any connect or disconnect drops the loaded types,
+    since events may have been missed.
+    """
+
+    def __init__(self):
+        self.live = False
+        self._docs: Dict[str, Dict[str, IndexedDocument]] = {t: {} for t in DOCUMENT_TYPES}
+        self._loaded: Set[str] = set()
+        # Bumped by every event, so a list that was in flight during an event is not trusted
+        self._generations: Dict[str, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.events = 0
+
+    def reset(self, live: bool) -> None:
+        """
+        Drop all loaded documents.
+
+        Args:
+            live: Whether a connected client pushes world events (enables the index)
+        """
+        self.live = live
+        for docs in self._docs.values():
+            docs.clear()
+        self._loaded.clear()
+        for document_type in DOCUMENT_TYPES:
+            self._generations[document_type] += 1
+
+    def generation(self, document_type: str) -> int:
+        """Return a token to pass to load() for a list request about to be sent."""
+        return self._generations[document_type]
+
+    def is_loaded(self, document_type: str) -> bool:
+        return self.live and document_type in self._loaded
+
+    def load(self, document_type: str, documents: Iterable[IndexedDocument], generation: int) -> bool:
+        """
+        Store a full list of one document type, as fetched from Foundry.
+
+        Args:
+            document_type: One of DOCUMENT_TYPES
+            documents: Every world document of that type
+            generation: generation() taken before the list was requested
+
+        Returns:
+            True if stored; False if the index is not live or events arrived
+            while the list was in flight (the list may be stale)
+        """
+        if not self.live or document_type not in self._docs or generation != self._generations[document_type]:
+            return False
+        self._docs[document_type] = {doc.id: doc for doc in documents}
+        self._loaded.add(document_type)
+        return True
+
+    def documents(self, document_type: str) -> Optional[List[IndexedDocument]]:
+        """Return all documents of a type in Foundry order, or None if the type is not loaded."""
+        if not self.is_loaded(document_type):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(self._docs[document_type].values())
+
+    def get(self, uuid: str) -> Optional[IndexedDocument]:
+        """Return a world document by UUID ("Actor.abc"), or None if unknown or not loaded."""
+        document_type, _, doc_id = uuid.partition(".")
+        if not self.is_loaded(document_type) or "." in doc_id:
+            return None
+        return self._docs[document_type].get(doc_id)
+
+    def find_by_name(self, document_type: str, name: str) -> Optional[IndexedDocument]:
+        """
+        Find a document by name: first case-insensitive exact match, then first partial match.
+
+        Returns:
+            The document, or None if there is no match or the type is not loaded
+        """
+        documents = self.documents(document_type)
+        if not documents or not name:
+            return None
+        search_lower = name.lower()
+        for doc in documents:
+            if doc.name.lower() == search_lower:
+                return doc
+        for doc in documents:
+            if search_lower in doc.name.lower():
+                return doc
+        return None
+
+    def folder_path(self, folder_id: Optional[str]) -> Optional[List[IndexedDocument]]:
+        """
+        Return the folder and its ancestors, innermost first.
+
+        Returns:
+            The chain of folders (stopping at an unknown folder), or None if
+            folders are not loaded
+        """
+        if not self.is_loaded("Folder"):
+            return None
+        folders = self._docs["Folder"]
+        path: List[IndexedDocument] = []
+        seen: Set[str] = set()
+        current = folder_id
+        while current and current not in seen:
+            seen.add(current)
+            folder = folders.get(current)
+            if folder is None:
+                break
+            path.append(folder)
+            current = folder.folder
+        return path
+
+    def apply_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Apply a create/update/delete event pushed by the Foundry module.
+
+        Args:
+            event: {"action": "create"|"update"|"delete", "document_type", "id",
+                    "uuid", "name", "folder", "folder_type"}
+
+        Returns:
+            True if the event was for a tracked document type
+        """
+        document_type = event.get("document_type")
+        doc_id = event.get("id")
+        action = event.get("action")
+        if document_type not in self._docs or not doc_id or action not in ("create", "update", "delete"):
+            return False
+
+        self.events += 1
+        self._generations[document_type] += 1
+        if document_type not in self._loaded:
+            return True
+
+        docs = self._docs[document_type]
+        if action == "delete":
+            docs.pop(doc_id, None)
+        else:
+            docs[doc_id] = IndexedDocument(
+                uuid=event.get("uuid") or f"{document_type}.{doc_id}",
+                id=doc_id,
+                name=event.get("name") or "",
+                document_type=document_type,
+                folder=event.get("folder"),
+                folder_type=event.get("folder_type")
+            )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "live": self.live,
+            "loaded": {t: len(self._docs[t]) for t in DOCUMENT_TYPES if t in self._loaded},
+            "hits": self.hits,
+            "misses": self.misses,
+            "events": self.events,
+        }
+
+
+# Global index instance
+world_index = WorldIndex()
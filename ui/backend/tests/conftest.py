@@ -13,9 +13,15 @@ sys.path.insert(0, str(backend_root))
 project_root = backend_root.parent.parent
 load_dotenv(project_root / ".env")
 
-# Add tests directory to path for foundry_init import
+# Tests must exercise real (or mocked) Gemini calls, not replay cached responses
+os.environ.setdefault("GEMINI_CACHE", "false")
+os.environ.setdefault("OCR_CACHE", "false")
+os.environ.setdefault("FOUNDRY_CACHE", "false")
+
+# Add tests directory to path for foundry_init import. Appended, so test packages
+# such as tests/wall_detection never shadow the src packages they test.
 tests_dir = project_root / "tests"
-sys.path.insert(0, str(tests_dir))
+sys.path.append(str(tests_dir))
 
 
 # Store the initialization result at module level to avoid re-running
@@ -115,6 +121,25 @@ def disable_actor_image_generation():
     set_image_generation_enabled(True)
 
 
+@pytest.fixture(autouse=True)
+def reset_gemini_clients():
+    """Drop shared Gemini clients so tests that patch genai.Client get a fresh one."""
+    for module_name in ("util.gemini", "src.util.gemini"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.reset_clients()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_foundry_caches():
+    """Start each test without shared spell/icon caches from earlier tests."""
+    from app.tools.actor_creator import reset_foundry_caches
+    reset_foundry_caches()
+    yield
+    reset_foundry_caches()
+
+
 # Cache for test folder IDs to avoid repeated creation attempts
 _test_folder_ids = {}
 
@@ -4,7 +4,6 @@ Run with: pytest ui/backend/tests/routers/test_files.py -v
 Run integration only: pytest ui/backend/tests/routers/test_files.py -v -m integration
 """
 import pytest
-import base64
 import httpx
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
@@ -123,7 +122,7 @@ class TestUploadFileEndpointUnit:
             'error': None
         })()
 
-        with patch('app.routers.files.upload_file', new_callable=AsyncMock) as mock_upload:
+        with patch('app.routers.files.upload_file_stream', new_callable=AsyncMock) as mock_upload:
             mock_upload.return_value = mock_result
 
             # Create minimal file content
@@ -140,14 +139,37 @@ class TestUploadFileEndpointUnit:
             assert data["success"] is True
             assert data["path"] == "worlds/test/uploaded-maps/castle.webp"
 
-            # Verify upload_file was called with correct args
+            # Verify upload_file_stream was called with correct args
             mock_upload.assert_called_once()
             call_kwargs = mock_upload.call_args.kwargs
             assert call_kwargs["filename"] == "castle.webp"
             assert call_kwargs["destination"] == "uploaded-maps"
-            # Content should be base64-encoded
-            expected_b64 = base64.b64encode(file_content).decode('utf-8')
-            assert call_kwargs["content"] == expected_b64
+            assert call_kwargs["size"] == len(file_content)
+
+    def test_upload_file_endpoint_streams_from_spool(self):
+        """The upload's spooled file is passed through unread, positioned at the start."""
+        mock_result = type('MockResult', (), {
+            'success': True,
+            'path': 'worlds/test/uploaded-maps/castle.webp',
+            'error': None
+        })()
+        received = {}
+
+        async def capture(fileobj, **kwargs):
+            received["content"] = fileobj.read()
+            return mock_result
+
+        file_content = bytes(range(256)) * 10
+
+        with patch('app.routers.files.upload_file_stream', new=capture):
+            response = client.post(
+                "/api/foundry/files/upload",
+                files={"file": ("castle.webp", file_content, "image/webp")},
+                data={"destination": "uploaded-maps"}
+            )
+
+        assert response.status_code == 200
+        assert received["content"] == file_content
 
     def test_upload_file_endpoint_uses_default_destination(self):
         """POST /api/foundry/files/upload uses default destination when not provided."""
@@ -157,7 +179,7 @@ class TestUploadFileEndpointUnit:
             'error': None
         })()
 
-        with patch('app.routers.files.upload_file', new_callable=AsyncMock) as mock_upload:
+        with patch('app.routers.files.upload_file_stream', new_callable=AsyncMock) as mock_upload:
             mock_upload.return_value = mock_result
 
             response = client.post(
@@ -178,7 +200,7 @@ class TestUploadFileEndpointUnit:
             'error': 'No Foundry client connected or timeout waiting for response'
         })()
 
-        with patch('app.routers.files.upload_file', new_callable=AsyncMock) as mock_upload:
+        with patch('app.routers.files.upload_file_stream', new_callable=AsyncMock) as mock_upload:
             mock_upload.return_value = mock_result
 
             response = client.post(
@@ -201,7 +223,7 @@ class TestUploadFileEndpointUnit:
             'error': 'Failed to write file to disk'
         })()
 
-        with patch('app.routers.files.upload_file', new_callable=AsyncMock) as mock_upload:
+        with patch('app.routers.files.upload_file_stream', new_callable=AsyncMock) as mock_upload:
             mock_upload.return_value = mock_result
 
             response = client.post(
@@ -254,7 +276,7 @@ class TestUploadFileEndpointUnit:
             'error': None
         })()
 
-        with patch('app.routers.files.upload_file', new_callable=AsyncMock) as mock_upload:
+        with patch('app.routers.files.upload_file_stream', new_callable=AsyncMock) as mock_upload:
             mock_upload.return_value = mock_result
 
             response = client.post(
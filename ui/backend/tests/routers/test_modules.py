@@ -2,17 +2,33 @@
 
 Run with: pytest ui/backend/tests/routers/test_modules.py -v
 """
+import threading
+
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.routers import modules as modules_router
+from app.routers.modules import _run_module_pipeline
+from app.services.module_jobs import ModuleJobQueue
 
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def module_jobs(tmp_path, monkeypatch):
+    """Keep job state and uploads of endpoint tests in a temporary directory."""
+    queue = ModuleJobQueue(
+        modules_router._run_module_job, jobs_dir=tmp_path / "jobs", runs_dir=tmp_path / "runs"
+    )
+    monkeypatch.setattr(modules_router, "module_jobs", queue)
+    return queue
+
+
 # Path to test PDF relative to this file
 TEST_PDF_PATH = Path(__file__).parent.parent.parent.parent.parent / "data/pdfs/Lost_Mine_of_Phandelver_test.pdf"
 
@@ -305,6 +321,193 @@ class TestCreateFoldersForModule:
                 await create_folders_for_module("Test Module")
 
 
+@pytest.mark.unit
+class TestModuleJobEndpoints:
+    """Test job submission, status, cancel and resume endpoints."""
+
+    PDF = ("module.pdf", b"%PDF-1.4 test", "application/pdf")
+    FOLDERS = {"actors": "folder1", "scenes": "folder2", "journals": "folder3"}
+
+    def _post(self, **data):
+        return client.post(
+            "/api/modules/process",
+            files={"file": self.PDF},
+            data={"module_name": "Job Module", **data},
+        )
+
+    def test_wait_returns_result_with_job_id(self, module_jobs):
+        with patch("app.routers.modules.process_module_sync", return_value={"success": True}) as mock_process, \
+             patch("app.routers.modules.create_folders_for_module", return_value=self.FOLDERS):
+            response = self._post(extract_actors="false")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["folders"] == self.FOLDERS
+        kwargs = mock_process.call_args.kwargs
+        assert kwargs["extract_actors"] is False
+        assert kwargs["folder_ids"] == self.FOLDERS
+        assert kwargs["resume_run_dir"] is None
+
+        job = client.get(f"/api/modules/jobs/{data['job_id']}").json()
+        assert job["status"] == "succeeded"
+        assert job["result"]["success"] is True
+        # Uploads are only kept for resuming unfinished jobs
+        assert not (module_jobs.jobs_dir / data["job_id"]).exists()
+
+    def test_no_wait_returns_queued_job(self, module_jobs):
+        release = threading.Event()
+
+        def slow_process(**kwargs):
+            kwargs["on_progress"]("extracting_text", "Converting...", 15)
+            release.wait(timeout=5)
+            return {"success": True}
+
+        with patch("app.routers.modules.process_module_sync", side_effect=slow_process), \
+             patch("app.routers.modules.create_folders_for_module", return_value=self.FOLDERS), \
+             patch("app.services.module_jobs.broadcast_progress_sync") as broadcast:
+            first = self._post(wait="false").json()
+            second = self._post(wait="false").json()
+            assert second["status"] == "queued"
+            assert second["queue_position"] == 1
+
+            # The second job waits for the single worker; cancel it while queued
+            cancelled = client.post(f"/api/modules/jobs/{second['id']}/cancel").json()
+            assert cancelled["status"] == "cancelled"
+
+            release.set()
+            module_jobs.wait(first["id"]).result(timeout=5)
+
+        job = client.get(f"/api/modules/jobs/{first['id']}").json()
+        assert job["status"] == "succeeded"
+        assert [s["stage"] for s in job["stages"]] == ["extracting_text"]
+        broadcast.assert_called_with("extracting_text", "Converting...", 15, "Job Module", job_id=first["id"])
+
+        listed = client.get("/api/modules/jobs").json()["jobs"]
+        assert {j["id"] for j in listed} == {first["id"], second["id"]}
+
+    def test_resume_failed_job_reuses_run_dir(self, module_jobs):
+        results = [{"success": False, "error": {"stage": "pdf_to_xml", "message": "quota"}}, {"success": True}]
+        with patch("app.routers.modules.process_module_sync", side_effect=results) as mock_process, \
+             patch("app.routers.modules.create_folders_for_module", return_value=self.FOLDERS):
+            data = self._post().json()
+            assert data["success"] is False
+            job_id = data["job_id"]
+            assert client.post(f"/api/modules/jobs/{job_id}/cancel").status_code == 409
+
+            resumed = client.post(f"/api/modules/jobs/{job_id}/resume").json()
+            assert resumed["status"] in ("queued", "running", "succeeded")
+            module_jobs.wait(job_id).result(timeout=5)
+
+        first_call, second_call = mock_process.call_args_list
+        assert second_call.kwargs["resume_run_dir"] == first_call.kwargs["run_dir"]
+        assert client.get(f"/api/modules/jobs/{job_id}").json()["status"] == "succeeded"
+        assert client.post(f"/api/modules/jobs/{job_id}/resume").status_code == 409
+
+    def test_unknown_job_returns_404(self):
+        assert client.get("/api/modules/jobs/missing").status_code == 404
+        assert client.post("/api/modules/jobs/missing/cancel").status_code == 404
+        assert client.post("/api/modules/jobs/missing/resume").status_code == 404
+
+
+@pytest.mark.unit
+class TestModulePipeline:
+    """Test stage scheduling in _run_module_pipeline with every stage mocked."""
+
+    def _run(self, tmp_path, process_chapter, extract_maps, create_scene, **options):
+        pdf_path = tmp_path / "module.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        run_dir = tmp_path / "run"
+        result = {"success": True, "actors": [], "journal_uuid": None, "journal_name": None,
+                  "created": {"journal": None, "actors": [], "scenes": [], "artwork_journal": None}}
+        page_store = MagicMock()
+
+        def fake_extract(pdf, output_dir, chapter_name, page_store):
+            maps = extract_maps()
+            for m in maps:
+                (Path(output_dir) / f"page_{m.page_num:03d}_{m.name.lower().replace(' ', '_')}.png").write_bytes(b"png")
+            return maps
+
+        progress = MagicMock()
+        with patch("app.routers.modules.configure_gemini"), \
+             patch("app.routers.modules._page_store_for", return_value=page_store), \
+             patch("pdf_processing.pdf_to_xml.process_chapter", side_effect=process_chapter), \
+             patch("app.routers.modules.extract_maps_from_pdf", AsyncMock(side_effect=fake_extract)), \
+             patch("app.routers.modules.save_metadata"), \
+             patch("scenes.orchestrate.create_scene_from_map", AsyncMock(side_effect=create_scene)), \
+             patch("app.routers.modules._generate_chapter_artwork",
+                   return_value={"scenes_found": 1, "images_generated": 1}), \
+             patch("app.routers.modules.process_actors_for_run",
+                   return_value={"created_actors": [{"uuid": "Actor.a1", "name": "Goblin"}]}), \
+             patch("app.routers.modules.upload_run_to_foundry",
+                   return_value={"journal_uuid": "JournalEntry.j1"}):
+            output = _run_module_pipeline(
+                pdf_path, run_dir, result, page_store, tmp_path / "cache",
+                module_name="Test Module",
+                extract_journal=options.get("extract_journal", True),
+                extract_actors=options.get("extract_actors", True),
+                extract_battle_maps=options.get("extract_battle_maps", True),
+                generate_scene_artwork=options.get("generate_scene_artwork", True),
+                folder_ids={"scenes": "folder-s"},
+                resume_run_dir=None,
+                progress=progress,
+            )
+        return output, [call.args[0] for call in progress.call_args_list]
+
+    @staticmethod
+    def _scene(image_path, name, **kwargs):
+        return SimpleNamespace(uuid=f"Scene.{name}", name=name, wall_count=3, grid_size=100)
+
+    def test_map_extraction_runs_alongside_xml_conversion(self, tmp_path):
+        """Maps are extracted while XML conversion is still running."""
+        both_running = threading.Barrier(2, timeout=5)
+
+        def process_chapter(pdf, xml_path, logs_dir, resume, page_store):
+            both_running.wait()
+            Path(xml_path).write_text("<chapter/>")
+
+        def extract_maps():
+            both_running.wait()
+            return [SimpleNamespace(page_num=3, name="Cave Map")]
+
+        output, stages = self._run(tmp_path, process_chapter, extract_maps, self._scene)
+
+        assert output["success"] is True
+        assert output["created"]["scenes"] == ["Scene.Cave Map"]
+        assert output["created"]["actors"] == ["Actor.a1"]
+        assert output["journal_uuid"] == "JournalEntry.j1"
+        assert stages[0] == "splitting_pdf"
+        assert stages[-1] == "complete"
+
+    def test_scene_failure_is_not_fatal(self, tmp_path):
+        def process_chapter(pdf, xml_path, logs_dir, resume, page_store):
+            Path(xml_path).write_text("<chapter/>")
+
+        def create_scene(image_path, name, **kwargs):
+            if name == "Broken":
+                raise RuntimeError("no walls")
+            return self._scene(image_path, name)
+
+        maps = [SimpleNamespace(page_num=1, name="Broken"), SimpleNamespace(page_num=2, name="Good")]
+        output, _ = self._run(tmp_path, process_chapter, lambda: maps, create_scene)
+
+        assert output["success"] is True
+        assert output["created"]["scenes"] == ["Scene.Good"]
+
+    def test_xml_failure_reports_stage_and_skips_dependents(self, tmp_path):
+        def process_chapter(pdf, xml_path, logs_dir, resume, page_store):
+            raise RuntimeError("Gemini unavailable")
+
+        output, stages = self._run(
+            tmp_path, process_chapter, lambda: [], self._scene, extract_battle_maps=False
+        )
+
+        assert output["success"] is False
+        assert output["error"] == {"stage": "pdf_to_xml", "message": "Gemini unavailable"}
+        assert output["journal_uuid"] is None
+        assert "complete" not in stages
+
+
 BACKEND_URL = "http://localhost:8000"
 
 
@@ -97,3 +97,23 @@ class TestGeminiServiceFunctionCalling:
         assert response["type"] == "tool_call"
         assert response["tool_call"]["name"] == "generate_images"
         assert response["tool_call"]["parameters"]["prompt"] == "a dragon"
+
+    @pytest.mark.anyio
+    async def test_tool_calls_use_async_generation(self, mock_genai_client):
+        """Test generate_with_tools awaits the async API instead of blocking the loop."""
+        service = GeminiService()
+        schema = ToolSchema(name="test_tool", description="A test tool", parameters={"type": "object"})
+
+        mock_response = Mock()
+        mock_response.text = "Async response"
+        mock_response.candidates = []
+
+        with patch('app.services.gemini_service.generate_content_async', return_value=mock_response) as mock_async:
+            response = await service.generate_with_tools(
+                message="Hello",
+                conversation_history=[],
+                tools=[schema]
+            )
+
+        assert response["text"] == "Async response"
+        assert mock_async.call_args.kwargs["use_cache"] is False
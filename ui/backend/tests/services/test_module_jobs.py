@@ -0,0 +1,87 @@
+"""Tests for the module job queue and its SQLite job store."""
+import threading
+
+import pytest
+
+from app.services.module_jobs import JobStore, ModuleJob, ModuleJobQueue
+
+
+def _queue(tmp_path, runner):
+    return ModuleJobQueue(runner, jobs_dir=tmp_path / "jobs", runs_dir=tmp_path / "runs")
+
+
+@pytest.mark.unit
+class TestJobStore:
+    """Test job persistence."""
+
+    def test_round_trip_and_stage_history(self, tmp_path):
+        store = JobStore(tmp_path / "jobs.sqlite3")
+        store.add(ModuleJob(id="j1", module_name="M", pdf_path="/x.pdf",
+                            options={"extract_actors": False}, folder_ids={"actors": "f1"},
+                            created_at=1.0, queued_at=1.0, updated_at=1.0))
+        store.record_stage("j1", "extracting_text", "Converting...", 15)
+        store.record_stage("j1", "extracting_text", "1 chapter(s) done", 20)
+        store.update("j1", status="failed", error={"stage": "pdf_to_xml", "message": "boom"})
+        store.close()
+
+        reopened = JobStore(tmp_path / "jobs.sqlite3")
+        job = reopened.get("j1")
+        assert job.options == {"extract_actors": False}
+        assert job.folder_ids == {"actors": "f1"}
+        assert job.status == "failed"
+        assert job.error == {"stage": "pdf_to_xml", "message": "boom"}
+        assert (job.stage, job.progress) == ("extracting_text", 20)
+        assert [(s["stage"], s["progress"]) for s in reopened.stages("j1")] == [("extracting_text", 20)]
+
+
+@pytest.mark.unit
+class TestModuleJobQueue:
+    """Test scheduling, cancellation and restart recovery."""
+
+    def test_jobs_run_in_submission_order(self, tmp_path):
+        order = []
+        queue = _queue(tmp_path, lambda job, progress, cancel: order.append(job.module_name) or {"success": True})
+        jobs = [queue.submit(name, "m.pdf", b"%PDF", {}, {}) for name in ("a", "b", "c")]
+        for job in jobs:
+            assert queue.wait(job.id).result(timeout=5).status == "succeeded"
+        assert order == ["a", "b", "c"]
+
+    def test_cancel_running_job_sets_event(self, tmp_path):
+        started = threading.Event()
+
+        def runner(job, progress, cancel):
+            started.set()
+            assert cancel.wait(timeout=5)
+            return {"success": False, "cancelled": True}
+
+        queue = _queue(tmp_path, runner)
+        job = queue.submit("m", "m.pdf", b"%PDF", {}, {})
+        assert started.wait(timeout=5)
+        queue.cancel(job.id)
+        assert queue.wait(job.id).result(timeout=5).status == "cancelled"
+        with pytest.raises(ValueError):
+            queue.cancel(job.id)
+
+    def test_runner_exception_fails_job(self, tmp_path):
+        def runner(job, progress, cancel):
+            raise RuntimeError("crashed")
+
+        queue = _queue(tmp_path, runner)
+        job = queue.wait(queue.submit("m", "m.pdf", b"%PDF", {}, {}).id).result(timeout=5)
+        assert job.status == "failed"
+        assert job.error == {"stage": "job", "message": "crashed"}
+
+    def test_recover_after_restart(self, tmp_path):
+        store = JobStore(tmp_path / "jobs" / "jobs.sqlite3")
+        for job_id, status, queued_at in (("running", "running", 1.0), ("waiting", "queued", 2.0)):
+            store.add(ModuleJob(id=job_id, module_name=job_id, pdf_path="/x.pdf", status=status,
+                                created_at=queued_at, queued_at=queued_at, updated_at=queued_at))
+        store.close()
+
+        ran = []
+        queue = _queue(tmp_path, lambda job, progress, cancel: ran.append(job.id) or {"success": True})
+        queue.recover()
+
+        assert queue.wait("waiting").result(timeout=5).status == "succeeded"
+        assert queue.get("running").status == "interrupted"
+        assert ran == ["waiting"]
@@ -2,7 +2,7 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from app.main import app
 
 
@@ -33,10 +33,9 @@ def test_chat_endpoint_basic(client):
 def test_chat_endpoint_generate_scene_command(client):
     """Test /generate-scene command with image generation."""
     from app.tools.base import ToolResponse
-    from unittest.mock import AsyncMock
 
     with patch('app.routers.chat.gemini_service') as mock_gemini:
-        mock_gemini.generate_scene_description.return_value = "A dark cave entrance"
+        mock_gemini.generate_scene_description = AsyncMock(return_value="A dark cave entrance")
 
         # Mock the image generator tool with async execute
         with patch('app.routers.chat.registry') as mock_registry:
@@ -64,7 +63,7 @@ def test_chat_endpoint_generate_scene_command(client):
 def test_chat_endpoint_generate_scene_fallback(client):
     """Test /generate-scene command falls back gracefully if image generation fails."""
     with patch('app.routers.chat.gemini_service') as mock_gemini:
-        mock_gemini.generate_scene_description.return_value = "A dark cave entrance"
+        mock_gemini.generate_scene_description = AsyncMock(return_value="A dark cave entrance")
 
         # Mock the image generator tool to return None (not found)
         with patch('app.routers.chat.registry') as mock_registry:
@@ -1,8 +1,9 @@
 """Tests for Gemini service."""
 
+import asyncio
 import sys
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 # Mock the util.gemini module before any imports
 sys.modules['util'] = MagicMock()
@@ -40,6 +41,7 @@ def test_generate_chat_response(gemini_service):
 
     assert result == "This is a test response from Gemini."
     gemini_service.api.generate_content.assert_called_once()
+    assert gemini_service.api.generate_content.call_args.kwargs["use_cache"] is False
 
 
 def test_generate_scene_description(gemini_service):
@@ -48,6 +50,8 @@ def test_generate_scene_description(gemini_service):
     mock_response.text = "A dark cave with dripping water and moss-covered walls."
     gemini_service.api.generate_content.return_value = mock_response
 
-    result = gemini_service.generate_scene_description("dark cave")
+    # util.gemini is mocked in this module, so run the blocking call inline
+    with patch('app.services.gemini_service.run_blocking', new=AsyncMock(side_effect=lambda fn: fn())):
+        result = asyncio.run(gemini_service.generate_scene_description("dark cave"))
 
     assert "dark cave" in result.lower() or "dripping water" in result
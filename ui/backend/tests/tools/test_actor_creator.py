@@ -187,6 +187,30 @@ class TestLoadCaches:
         assert spell_cache.spell_count > 0
         assert icon_cache.icon_count > 0
 
+    @pytest.mark.asyncio
+    async def test_load_caches_reuses_shared_caches(self):
+        """Test that repeated load_caches calls don't refetch from Foundry."""
+        from app.tools.actor_creator import load_caches
+
+        mock_spells_result = MagicMock()
+        mock_spells_result.success = True
+        mock_spells_result.results = [
+            MockSpell(name="Fire Bolt", uuid="Compendium.dnd5e.spells.Item.abc")
+        ]
+
+        mock_files_result = MagicMock()
+        mock_files_result.success = True
+        mock_files_result.files = ["icons/magic/fire.webp"]
+
+        with patch('app.tools.actor_creator.list_compendium_items_with_retry', new_callable=AsyncMock, return_value=mock_spells_result) as mock_spells, \
+             patch('app.tools.actor_creator.list_files_with_retry', new_callable=AsyncMock, return_value=mock_files_result) as mock_files:
+            first = await load_caches()
+            second = await load_caches()
+
+        assert first == second
+        assert mock_spells.call_count == 1
+        assert mock_files.call_count == 1
+
     @pytest.mark.asyncio
     async def test_load_caches_raises_on_spell_failure(self):
         """Test that load_caches raises RuntimeError when spell loading fails."""
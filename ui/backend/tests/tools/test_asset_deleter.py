@@ -173,17 +173,48 @@ class TestAssetDeleterToolExecute:
             EntityMatch(uuid="Actor.2", name="Goblin 2", entity_type="actor", folder_id="tw"),
         ]
 
-        # Mock delete_actor to succeed
-        mock_delete_result = MagicMock()
-        mock_delete_result.success = True
+        # Mock the batch delete to succeed for both
+        from app.websocket.push import BatchResult, BatchItemResult
+        mock_batch_result = BatchResult(success=True, results=[
+            BatchItemResult(success=True, uuid="Actor.1"),
+            BatchItemResult(success=True, uuid="Actor.2"),
+        ])
 
         with patch("app.tools.asset_deleter.find_entities", new_callable=AsyncMock, return_value=mock_entities), \
-             patch("app.tools.asset_deleter.delete_actor", new_callable=AsyncMock, return_value=mock_delete_result):
+             patch("app.tools.asset_deleter.delete_documents_batch", new_callable=AsyncMock,
+                   return_value=mock_batch_result) as mock_batch, \
+             patch("app.tools.asset_deleter.delete_actor", new_callable=AsyncMock) as mock_delete:
             result = await tool.execute(entity_type="actor", search_query="goblin", confirm_bulk=True)
 
             assert result.type == "text"
             assert "Deleted 2" in result.message
             assert len(result.data["deleted"]) == 2
+            mock_batch.assert_awaited_once_with(["Actor.1", "Actor.2"])
+            mock_delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_deletion_reports_per_item_failures(self):
+        """Items the batch delete reports as failed are listed under failed."""
+        from app.tools.asset_deleter import AssetDeleterTool, EntityMatch
+        from app.websocket.push import BatchResult, BatchItemResult
+
+        tool = AssetDeleterTool()
+        mock_entities = [
+            EntityMatch(uuid="Scene.1", name="Cave", entity_type="scene", folder_id="tw"),
+            EntityMatch(uuid="Scene.2", name="Keep", entity_type="scene", folder_id="tw"),
+        ]
+        mock_batch_result = BatchResult(success=True, results=[
+            BatchItemResult(success=True, uuid="Scene.1"),
+            BatchItemResult(success=False, uuid="Scene.2", error="Document not found: Scene.2"),
+        ])
+
+        with patch("app.tools.asset_deleter.find_entities", new_callable=AsyncMock, return_value=mock_entities), \
+             patch("app.tools.asset_deleter.delete_documents_batch", new_callable=AsyncMock,
+                   return_value=mock_batch_result):
+            result = await tool.execute(entity_type="scene", search_query="", confirm_bulk=True)
+
+            assert "Deleted 1 scene(s), 1 failed" == result.message
+            assert result.data["failed"] == [{"uuid": "Scene.2", "name": "Keep"}]
 
     @pytest.mark.asyncio
     async def test_no_matches_returns_appropriate_message(self):
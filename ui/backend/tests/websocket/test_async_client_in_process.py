@@ -0,0 +1,57 @@
+"""Test AsyncFoundryClient calling the backend in-process."""
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+import app.main  # noqa: F401 - loads the app, enabling in-process calls
+from app.websocket import push
+from app.websocket.push import PushResult
+from foundry.async_client import AsyncFoundryClient
+
+
+class TestAsyncClientInProcess:
+    """Test routing of AsyncFoundryClient requests through the ASGI app."""
+
+    @pytest.mark.asyncio
+    async def test_calls_routes_without_http(self):
+        """Inside the backend, requests go straight to the routers."""
+        with patch('app.routers.scenes.push_scene', new_callable=AsyncMock) as mock_push:
+            mock_push.return_value = PushResult(success=True, uuid="Scene.abc", name="Cave")
+
+            async with AsyncFoundryClient() as client:
+                assert client.in_process is True
+                result = await client.create_scene("Cave", grid_size=70)
+
+        assert result == {"success": True, "uuid": "Scene.abc", "name": "Cave"}
+        assert mock_push.call_args.args[0]["grid"] == {"size": 70, "type": 1}
+
+    def test_runs_on_backend_loop_from_worker_thread(self):
+        """Requests from another event loop are executed on the backend's main loop."""
+        main_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=main_loop.run_forever, daemon=True)
+        thread.start()
+        loops = []
+
+        async def fake_push(scene, timeout):
+            loops.append(asyncio.get_running_loop())
+            return PushResult(success=True, uuid="Scene.abc", name=scene["name"])
+
+        async def create():
+            async with AsyncFoundryClient() as client:
+                return await client.create_scene("Cave")
+
+        previous = push.get_main_loop()
+        push.set_main_loop(main_loop)
+        try:
+            with patch('app.routers.scenes.push_scene', side_effect=fake_push):
+                result = asyncio.run(create())
+        finally:
+            push.set_main_loop(previous)
+            main_loop.call_soon_threadsafe(main_loop.stop)
+            thread.join()
+            main_loop.close()
+
+        assert result["uuid"] == "Scene.abc"
+        assert loops == [main_loop]
@@ -1,6 +1,11 @@
 """Tests for WebSocket connection manager."""
+import asyncio
+import json
+
 import pytest
-from app.websocket.connection_manager import ConnectionManager
+from app.websocket.connection_manager import (
+    ConnectionManager, COMPRESSION_THRESHOLD, encode_message, decode_message
+)
 
 
 class TestConnectionManager:
@@ -31,6 +36,24 @@ class TestConnectionManager:
 
         assert client_id not in manager.active_connections
 
+    def test_world_fingerprint_from_client_info(self):
+        """world_fingerprint() reflects the info reported by the connected client."""
+        manager = ConnectionManager()
+        client_id = manager.connect(object())
+        assert manager.world_fingerprint() is None
+
+        manager.set_client_info(client_id, {
+            "world_id": "lost-mine",
+            "system_id": "dnd5e",
+            "system_version": "4.1.2",
+            "foundry_version": "12.331",
+        })
+        assert manager.world_fingerprint() == "lost-mine|dnd5e@4.1.2|12.331"
+
+        manager.disconnect(client_id)
+        assert manager.world_fingerprint() is None
+        assert client_id not in manager.client_info
+
     def test_disconnect_nonexistent_client_is_safe(self):
         """disconnect() with unknown client_id doesn't raise."""
         manager = ConnectionManager()
@@ -90,9 +113,9 @@ class TestConnectionManagerBroadcast:
         """broadcast() removes connections that fail to receive (real data test)."""
         manager = ConnectionManager()
 
-        # Create a mock WebSocket that raises on send_json
+        # Create a mock WebSocket that raises on send
         class FailingWebSocket:
-            async def send_json(self, data):
+            async def send_text(self, text):
                 raise ConnectionError("Connection lost")
 
         # Connect the failing WebSocket
@@ -129,8 +152,8 @@ class TestConnectionManagerBroadcast:
         received_messages = []
 
         class SuccessfulWebSocket:
-            async def send_json(self, data):
-                received_messages.append(data)
+            async def send_text(self, text):
+                received_messages.append(json.loads(text))
 
         # Connect the successful WebSocket
         ws = SuccessfulWebSocket()
@@ -168,3 +191,202 @@ class TestConnectionManagerBroadcast:
         assert len(received_messages) == 1
         assert received_messages[0] == actor_data
         assert received_messages[0]["data"]["name"] == "Goblin Shaman"
+
+
+class RecordingWebSocket:
+    """Fake WebSocket that records sent messages and can answer them."""
+
+    def __init__(self, manager=None, reply=False, fail=False):
+        self.manager = manager
+        self.reply = reply
+        self.fail = fail
+        self.sent = []
+
+    async def send_text(self, text):
+        data = json.loads(text)
+        if self.fail:
+            raise ConnectionError("Connection lost")
+        self.sent.append(dict(data))
+        if self.reply and data.get("request_id"):
+            request_id = data["request_id"]
+            asyncio.get_running_loop().call_soon(
+                self.manager.handle_response, request_id, {"type": "ok", "request_id": request_id}
+            )
+
+
+class TestConnectionManagerRouting:
+    """Test least-outstanding routing, health scoring and failover."""
+
+    @pytest.mark.asyncio
+    async def test_requests_spread_across_clients(self):
+        """Concurrent requests go to the client with fewest outstanding requests."""
+        manager = ConnectionManager()
+        ws1, ws2 = RecordingWebSocket(), RecordingWebSocket()
+        manager.connect(ws1)
+        manager.connect(ws2)
+
+        tasks = [asyncio.create_task(manager.broadcast_and_wait({"type": "get_actor"}, timeout=1.0))
+                 for _ in range(4)]
+        await asyncio.sleep(0.01)
+
+        assert len(ws1.sent) == 2
+        assert len(ws2.sent) == 2
+        for ws in (ws1, ws2):
+            for message in ws.sent:
+                manager.handle_response(message["request_id"], {"type": "actor_data"})
+        results = await asyncio.gather(*tasks)
+        assert all(result == {"type": "actor_data"} for result in results)
+        assert all(stats["in_flight"] == 0 for stats in manager.stats()["clients"].values())
+
+    @pytest.mark.asyncio
+    async def test_request_fails_over_when_client_disconnects(self):
+        """A request in flight on a dropped connection is re-sent to another client."""
+        manager = ConnectionManager()
+        ws1 = RecordingWebSocket()
+        client1 = manager.connect(ws1)
+        ws2 = RecordingWebSocket(manager, reply=True)
+        manager.connect(ws2)
+        assert manager.pick_client() == client1  # Ties go to connection order
+
+        task = asyncio.create_task(manager.broadcast_and_wait({"type": "get_actor"}, timeout=1.0))
+        await asyncio.sleep(0.01)
+        assert len(ws1.sent) == 1
+
+        manager.disconnect(client1)
+        result = await task
+
+        assert result["type"] == "ok"
+        assert ws2.sent[0]["request_id"] == ws1.sent[0]["request_id"]
+        assert manager.stats()["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_create_is_not_redispatched_when_client_disconnects(self):
+        """A write delivered to a dropped client is not re-sent, so it cannot run twice."""
+        manager = ConnectionManager()
+        ws1 = RecordingWebSocket()
+        client1 = manager.connect(ws1)
+        ws2 = RecordingWebSocket(manager, reply=True)
+        manager.connect(ws2)
+
+        task = asyncio.create_task(manager.broadcast_and_wait({"type": "actor", "data": {}}, timeout=1.0))
+        await asyncio.sleep(0.01)
+        assert len(ws1.sent) == 1
+
+        manager.disconnect(client1)
+
+        assert await task is None
+        assert ws2.sent == []
+        assert manager.stats()["failovers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_send_failure_fails_over(self):
+        """A client whose socket errors on send is dropped and another client is used."""
+        manager = ConnectionManager()
+        manager.connect(RecordingWebSocket(fail=True))
+        manager.connect(RecordingWebSocket(manager, reply=True))
+
+        result = await manager.broadcast_and_wait({"type": "list_actors"}, timeout=1.0)
+
+        assert result["type"] == "ok"
+        assert manager.connection_count == 1
+
+    @pytest.mark.asyncio
+    async def test_timeouts_mark_client_unhealthy(self):
+        """A hung client stops receiving requests once its error rate is high."""
+        manager = ConnectionManager()
+        hung = RecordingWebSocket()
+        hung_id = manager.connect(hung)
+        healthy = RecordingWebSocket(manager, reply=True)
+        manager.connect(healthy)
+
+        for _ in range(4):
+            manager.client_stats[hung_id].record(failed=True)
+        assert not manager.client_stats[hung_id].healthy
+
+        for _ in range(3):
+            assert await manager.broadcast_and_wait({"type": "get_scene"}, timeout=1.0) is not None
+        assert hung.sent == []
+
+        assert await manager.broadcast_and_wait({"type": "get_scene"}, timeout=0.05) is not None
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_none_and_counts_failure(self):
+        manager = ConnectionManager()
+        client_id = manager.connect(RecordingWebSocket())
+
+        assert await manager.broadcast_and_wait({"type": "get_actor"}, timeout=0.05) is None
+        assert manager.client_stats[client_id].failures == 1
+        assert manager.client_stats[client_id].in_flight == set()
+
+    @pytest.mark.asyncio
+    async def test_ping_records_rtt(self):
+        manager = ConnectionManager()
+        client_id = manager.connect(RecordingWebSocket(manager, reply=True))
+
+        rtt = await manager.ping(client_id, timeout=1.0)
+
+        assert rtt is not None
+        assert manager.stats()["clients"][client_id]["rtt_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_missed_pong_counts_as_failure(self):
+        manager = ConnectionManager()
+        client_id = manager.connect(RecordingWebSocket())
+
+        assert await manager.ping(client_id, timeout=0.05) is None
+        assert manager.client_stats[client_id].failures == 1
+
+
+class TestMessageEncoding:
+    """Test negotiated gzip compression of large messages."""
+
+    def test_small_messages_stay_text(self):
+        """Messages under the threshold are sent as compact JSON text."""
+        frame, size = encode_message({"type": "ping"}, ("gzip",))
+
+        assert frame == '{"type":"ping"}'
+        assert size == len(frame)
+
+    def test_large_messages_round_trip_compressed(self):
+        """Large messages to gzip clients become smaller binary frames that decode back."""
+        message = {"type": "actor", "data": {"walls": [[0, 0, 100, 100]] * 2000}}
+
+        frame, size = encode_message(message, ("gzip",))
+
+        assert isinstance(frame, bytes)
+        assert size >= COMPRESSION_THRESHOLD
+        assert len(frame) < size / 10
+        assert decode_message(frame) == (message, size)
+
+    def test_no_compression_without_negotiation(self):
+        """Clients that did not announce gzip always get text."""
+        frame, _ = encode_message({"data": "x" * COMPRESSION_THRESHOLD})
+
+        assert isinstance(frame, str)
+
+    def test_rejects_unknown_binary_frames(self):
+        """Binary frames that are not encoded messages raise ValueError."""
+        frame, _ = encode_message({"data": "x" * COMPRESSION_THRESHOLD}, ("gzip",))
+
+        with pytest.raises(ValueError):
+            decode_message(frame.replace(b'"encoding":"gzip"', b'"encoding":"zstd"'))
+
+    @pytest.mark.asyncio
+    async def test_counts_bytes_per_client(self):
+        """Byte counters record wire size and JSON size of sent messages."""
+        manager = ConnectionManager()
+        frames = []
+
+        class CompressingWebSocket:
+            async def send_bytes(self, frame):
+                frames.append(frame)
+
+        client_id = manager.connect(CompressingWebSocket())
+        manager.set_client_info(client_id, {"world_id": "w", "encodings": ["gzip", "msgpack"]})
+
+        await manager.broadcast({"type": "scene", "data": {"walls": [[0, 0, 50, 50]] * 5000}})
+
+        stats = manager.stats()["clients"][client_id]
+        assert manager.accepted_encodings(client_id) == ("gzip",)
+        assert stats["bytes_sent"] == len(frames[0])
+        assert stats["json_bytes_sent"] > 10 * stats["bytes_sent"]
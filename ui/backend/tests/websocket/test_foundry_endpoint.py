@@ -105,3 +105,30 @@ class TestFoundryWebSocket:
 
                 # Client IDs should be different
                 assert client_id_1 != client_id_2
+
+
+class TestFoundryWebSocketCompression:
+    """Test compression negotiation on /ws/foundry."""
+
+    def test_welcome_advertises_encodings(self):
+        """The welcome message lists supported encodings and the threshold."""
+        client = TestClient(app)
+
+        with client.websocket_connect("/ws/foundry") as websocket:
+            data = websocket.receive_json()
+            assert data["encodings"] == ["gzip"]
+            assert data["compression_threshold"] > 0
+
+    def test_accepts_compressed_messages(self):
+        """A gzip-encoded binary frame is decoded and handled like a text message."""
+        from app.websocket.connection_manager import encode_message
+
+        client = TestClient(app)
+
+        with client.websocket_connect("/ws/foundry") as websocket:
+            websocket.receive_json()
+
+            frame, _ = encode_message({"type": "ping", "padding": "x" * 100}, ("gzip",), threshold=0)
+            websocket.send_bytes(frame)
+
+            assert websocket.receive_json()["type"] == "pong"
@@ -0,0 +1,107 @@
+"""Test batched create/delete/fetch via WebSocket."""
+import pytest
+from unittest.mock import patch, AsyncMock
+from app.websocket.push import (
+    push_actors_batch, delete_documents_batch, fetch_documents_batch, BATCH_CHUNK_SIZE
+)
+
+
+class TestBatchOperations:
+    """Test batch message round trips and per-item results."""
+
+    @pytest.mark.asyncio
+    async def test_push_actors_batch_sends_one_message(self):
+        """All actors go out in one actors_batch_create message."""
+        mock_response = {
+            "type": "actors_batch_created",
+            "data": {"results": [
+                {"success": True, "uuid": "Actor.a1", "id": "a1", "name": "Goblin"},
+                {"success": False, "error": "validation failed"},
+            ]}
+        }
+        actors = [{"actor": {"name": "Goblin"}}, {"actor": {"name": "Broken"}}]
+
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(return_value=mock_response)
+
+            result = await push_actors_batch(actors)
+
+            mock_manager.broadcast_and_wait.assert_awaited_once()
+            message = mock_manager.broadcast_and_wait.call_args.args[0]
+            assert message == {"type": "actors_batch_create", "data": {"actors": actors}}
+            assert result.success is True
+            assert [r.uuid for r in result.succeeded] == ["Actor.a1"]
+            assert result.failed[0].error == "validation failed"
+
+    @pytest.mark.asyncio
+    async def test_delete_documents_batch_chunks_large_lists(self):
+        """Lists longer than BATCH_CHUNK_SIZE are split, results stay in input order."""
+        uuids = [f"Actor.{i}" for i in range(BATCH_CHUNK_SIZE + 5)]
+
+        async def respond(message, timeout):
+            return {
+                "type": "documents_batch_deleted",
+                "data": {"results": [{"success": True, "uuid": u} for u in message["data"]["uuids"]]}
+            }
+
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(side_effect=respond)
+
+            result = await delete_documents_batch(uuids)
+
+            assert mock_manager.broadcast_and_wait.await_count == 2
+            assert [r.uuid for r in result.results] == uuids
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_marks_only_its_items(self):
+        """A chunk without a response fails its own items; others still succeed."""
+        uuids = [f"Scene.{i}" for i in range(BATCH_CHUNK_SIZE + 1)]
+        ok = {
+            "type": "documents_batch_fetched",
+            "data": {"results": [{"success": True, "uuid": u, "entity": {}} for u in uuids[:BATCH_CHUNK_SIZE]]}
+        }
+
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(side_effect=[ok, None])
+
+            result = await fetch_documents_batch(uuids)
+
+            assert result.success is True
+            assert len(result.succeeded) == BATCH_CHUNK_SIZE
+            assert "No Foundry client connected" in result.results[-1].error
+
+    @pytest.mark.asyncio
+    async def test_no_client_fails_whole_batch(self):
+        """No response at all makes the batch unsuccessful."""
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(return_value=None)
+
+            result = await delete_documents_batch(["Actor.a1", "Actor.a2"])
+
+            assert result.success is False
+            assert len(result.failed) == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_error_response(self):
+        """A batch_error response is surfaced as the batch error."""
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(
+                return_value={"type": "batch_error", "error": "No uuids in batch"}
+            )
+
+            result = await fetch_documents_batch(["Actor.a1"])
+
+            assert result.success is False
+            assert result.error == "No uuids in batch"
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_sends_nothing(self):
+        """An empty list needs no round trip."""
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock()
+
+            result = await push_actors_batch([])
+
+            mock_manager.broadcast_and_wait.assert_not_called()
+            assert result.success is True
+            assert result.results == []
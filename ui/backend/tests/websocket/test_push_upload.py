@@ -3,11 +3,17 @@
 Run with: pytest ui/backend/tests/websocket/test_push_upload.py -v
 Run integration only: pytest ui/backend/tests/websocket/test_push_upload.py -v -m integration
 """
+import asyncio
+import io
+import json
+import struct
+
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch
 
-from app.websocket.push import upload_file
+from app.websocket.connection_manager import ConnectionManager
+from app.websocket.push import upload_file, upload_file_stream
 
 
 BACKEND_URL = "http://localhost:8000"
@@ -93,6 +99,105 @@ class TestUploadFileUnit:
             assert "Unexpected response type" in result.error
 
 
+class FakeFoundryModule:
+    """Partial-upload state of the Foundry module; survives reconnects like the module's memory."""
+
+    def __init__(self):
+        self.uploads = {}
+        self.chunk_frames = 0
+
+
+class FakeFoundrySocket:
+    """Fake Foundry connection implementing the chunked upload protocol."""
+
+    def __init__(self, manager, module, drop_after_chunks=None):
+        self.manager = manager
+        self.module = module
+        self.drop_after_chunks = drop_after_chunks
+        self.client_id = manager.connect(self)
+
+    def _reply(self, request_id, response):
+        response["request_id"] = request_id
+        asyncio.get_running_loop().call_soon(self.manager.handle_response, request_id, response)
+
+    async def send_text(self, text):
+        message = json.loads(text)
+        data = message.get("data", {})
+        upload = self.module.uploads.get(data.get("upload_id"))
+        if message["type"] == "upload_begin":
+            if upload is None or upload["size"] != data["size"]:
+                upload = {"size": data["size"], "filename": data["filename"], "chunks": [None] * data["total_chunks"]}
+                self.module.uploads[data["upload_id"]] = upload
+            next_seq = next((i for i, c in enumerate(upload["chunks"]) if c is None), len(upload["chunks"]))
+            self._reply(message["request_id"], {"type": "upload_ready", "data": {"next_seq": next_seq}})
+        elif message["type"] == "upload_finish":
+            upload["content"] = b"".join(upload["chunks"])
+            self._reply(message["request_id"], {
+                "type": "file_uploaded", "data": {"path": f"worlds/test/uploaded-maps/{upload['filename']}"}
+            })
+
+    async def send_bytes(self, frame):
+        (header_length,) = struct.unpack(">I", frame[:4])
+        header = json.loads(frame[4:4 + header_length])
+        if self.drop_after_chunks is not None and self.module.chunk_frames >= self.drop_after_chunks:
+            self.manager.disconnect(self.client_id)
+            raise ConnectionError("Connection lost")
+        self.module.chunk_frames += 1
+        upload = self.module.uploads[header["data"]["upload_id"]]
+        upload["chunks"][header["data"]["seq"]] = frame[4 + header_length:]
+        self._reply(header["request_id"], {"type": "upload_chunk_ack", "data": header["data"]})
+
+
+@pytest.mark.unit
+class TestUploadFileStreamUnit:
+    """Unit tests for chunked upload_file_stream against a fake Foundry client."""
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_and_reassembles(self):
+        """Content arrives intact in binary chunks, one ack per chunk."""
+        manager, module = ConnectionManager(), FakeFoundryModule()
+        FakeFoundrySocket(manager, module)
+        content = bytes(range(256)) * 40  # 10240 bytes -> 10 chunks of 1 KiB
+
+        with patch('app.websocket.push.foundry_manager', manager):
+            result = await upload_file_stream(io.BytesIO(content), "castle.webp", len(content), chunk_size=1024)
+
+        assert result.success
+        assert result.path == "worlds/test/uploaded-maps/castle.webp"
+        assert module.chunk_frames == 10
+        assert next(iter(module.uploads.values()))["content"] == content
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_reconnect(self):
+        """A dropped connection resumes from the first missing chunk on the new connection."""
+        manager, module = ConnectionManager(), FakeFoundryModule()
+        FakeFoundrySocket(manager, module, drop_after_chunks=4)
+        content = b"x" * 5000 + b"y" * 5000
+
+        async def reconnect():
+            await asyncio.sleep(0.05)
+            FakeFoundrySocket(manager, module)
+
+        with patch('app.websocket.push.foundry_manager', manager):
+            reconnecting = asyncio.create_task(reconnect())
+            result = await upload_file_stream(io.BytesIO(content), "map.webp", len(content), chunk_size=1000)
+            await reconnecting
+
+        assert result.success
+        assert next(iter(module.uploads.values()))["content"] == content
+        # 4 chunks before the drop, then only the remaining 6 are sent
+        assert module.chunk_frames == 10
+
+    @pytest.mark.asyncio
+    async def test_no_client_returns_error(self):
+        """Without a connected client the upload fails immediately."""
+        with patch('app.websocket.push.foundry_manager', ConnectionManager()):
+            result = await upload_file_stream(io.BytesIO(b"data"), "castle.webp", 4)
+
+        assert not result.success
+        assert "No Foundry client connected" in result.error
+
+
 @pytest.mark.integration
 class TestUploadFileIntegration:
     """Integration tests for upload_file (requires Foundry connection)."""
@@ -0,0 +1,110 @@
+"""Tests for the world index and its read-through use in push.py."""
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.websocket.push import list_actors
+from app.websocket.world_index import WorldIndex, IndexedDocument, world_index
+
+
+def _actor(doc_id, name, folder=None):
+    return IndexedDocument(f"Actor.{doc_id}", doc_id, name, "Actor", folder=folder)
+
+
+def _folder(doc_id, name, parent=None):
+    return IndexedDocument(f"Folder.{doc_id}", doc_id, name, "Folder", folder=parent, folder_type="Actor")
+
+
+class TestWorldIndex:
+    """Test loading, event application and lookups."""
+
+    def test_not_live_ignores_loads(self):
+        """Without a client pushing events, nothing is cached."""
+        index = WorldIndex()
+
+        assert index.load("Actor", [_actor("a1", "Goblin")], index.generation("Actor")) is False
+        assert index.documents("Actor") is None
+
+    def test_event_during_list_rejects_load(self):
+        """A list requested before an event arrived may be stale and is not stored."""
+        index = WorldIndex()
+        index.reset(live=True)
+        generation = index.generation("Actor")
+
+        index.apply_event({"action": "create", "document_type": "Actor", "id": "a2", "name": "Orc"})
+
+        assert index.load("Actor", [_actor("a1", "Goblin")], generation) is False
+        assert index.is_loaded("Actor") is False
+
+    def test_events_update_loaded_type(self):
+        """Create, update and delete events keep a loaded type current."""
+        index = WorldIndex()
+        index.reset(live=True)
+        index.load("Actor", [_actor("a1", "Goblin")], index.generation("Actor"))
+
+        index.apply_event({"action": "create", "document_type": "Actor", "id": "a2", "name": "Orc"})
+        index.apply_event({"action": "update", "document_type": "Actor", "id": "a1", "name": "Goblin Boss", "folder": "f1"})
+        index.apply_event({"action": "delete", "document_type": "Actor", "id": "a2"})
+
+        docs = index.documents("Actor")
+        assert [(d.uuid, d.name, d.folder) for d in docs] == [("Actor.a1", "Goblin Boss", "f1")]
+
+    def test_find_by_name_prefers_exact_match(self):
+        """Exact case-insensitive matches win over earlier partial matches."""
+        index = WorldIndex()
+        index.reset(live=True)
+        index.load("Actor", [_actor("a1", "Goblin Boss"), _actor("a2", "goblin")], index.generation("Actor"))
+
+        assert index.find_by_name("Actor", "GOBLIN").id == "a2"
+        assert index.find_by_name("Actor", "boss").id == "a1"
+        assert index.find_by_name("Actor", "Dragon") is None
+
+    def test_folder_path(self):
+        """folder_path walks parents innermost first."""
+        index = WorldIndex()
+        assert index.folder_path("f2") is None
+
+        index.reset(live=True)
+        index.load("Folder", [_folder("f1", "Tablewrite"), _folder("f2", "Goblins", parent="f1")],
+                   index.generation("Folder"))
+
+        assert [f.name for f in index.folder_path("f2")] == ["Goblins", "Tablewrite"]
+
+    def test_reset_drops_loaded_types(self):
+        """A reconnect forgets everything, since events may have been missed."""
+        index = WorldIndex()
+        index.reset(live=True)
+        index.load("Actor", [_actor("a1", "Goblin")], index.generation("Actor"))
+
+        index.reset(live=True)
+
+        assert index.documents("Actor") is None
+
+
+class TestListReadThrough:
+    """Test list_actors serving from the global index."""
+
+    @pytest.fixture(autouse=True)
+    def live_index(self):
+        world_index.reset(live=True)
+        yield
+        world_index.reset(live=False)
+
+    @pytest.mark.asyncio
+    async def test_second_list_is_served_from_index(self):
+        """Only the first list_actors call goes to Foundry."""
+        mock_response = {
+            "type": "actors_list",
+            "data": {"actors": [{"uuid": "Actor.a1", "id": "a1", "name": "Goblin", "folder": "f1"}]}
+        }
+
+        with patch('app.websocket.push.foundry_manager') as mock_manager:
+            mock_manager.broadcast_and_wait = AsyncMock(return_value=mock_response)
+
+            first = await list_actors()
+            world_index.apply_event({"action": "create", "document_type": "Actor", "id": "a2",
+                                     "uuid": "Actor.a2", "name": "Orc"})
+            second = await list_actors()
+
+            mock_manager.broadcast_and_wait.assert_awaited_once()
+            assert [a.name for a in first.actors] == ["Goblin"]
+            assert [a.name for a in second.actors] == ["Goblin", "Orc"]